@@ -2,7 +2,6 @@ import bpy
 from compas_blender.geometry import BlenderMesh
 from compas_blender.utilities import create_layer
 from compas_blender.utilities import clear_layer
-from compas_blender.utilities import draw_cylinder
 from compas_blender.utilities import draw_plane
 from compas_blender.utilities import draw_line
 from compas_blender.utilities import get_meshes
@@ -25,8 +24,8 @@ from compas_fea.structure import Structure
 from compas_fea.utilities import colorbar
 from compas_fea.utilities import extrude_mesh
 from compas_fea.utilities import discretise_faces
-from compas_fea.utilities import postprocess
 from compas_fea.utilities import tets_from_vertices_faces
+from compas_fea.utilities import element_mesh
 from compas_fea.utilities import plotvoxels
 
 from numpy import array
@@ -467,13 +466,14 @@ def plot_concentrated_forces(structure, step, layer=None, scale=1.0):
     except Exception:
         create_layer(layer)
 
+    nkeys = list(structure.results[step]['nodal']['cfx'])
     cfx = array(list(structure.results[step]['nodal']['cfx'].values()))[:, newaxis]
     cfy = array(list(structure.results[step]['nodal']['cfy'].values()))[:, newaxis]
     cfz = array(list(structure.results[step]['nodal']['cfz'].values()))[:, newaxis]
     cf = hstack([cfx, cfy, cfz])
     cfm = norm(cf, axis=1)
     cmax = max(cfm)
-    nodes = array(structure.nodes_xyz())
+    nodes = array(structure.nodes_xyz(nkeys))
 
     for i in where(cfm > 0)[0]:
 
@@ -546,32 +546,13 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
     except Exception:
         create_layer(layer)
 
-    # Node and element data
-
-    nodes = structure.nodes_xyz()
-    elements = [structure.elements[i].nodes for i in sorted(structure.elements, key=int)]
-    nodal_data = structure.results[step]['nodal']
-    nkeys = sorted(structure.nodes, key=int)
-
-    ux = [nodal_data['ux{0}'.format(mode)][i] for i in nkeys]
-    uy = [nodal_data['uy{0}'.format(mode)][i] for i in nkeys]
-    uz = [nodal_data['uz{0}'.format(mode)][i] for i in nkeys]
-
-    try:
-        data = [nodal_data['{0}{1}'.format(field, mode)][i] for i in nkeys]
-        dtype = 'nodal'
-
-    except(Exception):
-        data = structure.results[step]['element'][field]
-        dtype = 'element'
-
     # Postprocess
 
-    result = postprocess(nodes, elements, ux, uy, uz, data, dtype, scale, cbar, 1, iptype, nodal)
+    elements = [structure.elements[i].nodes for i in sorted(structure.elements, key=int)]
+    result = structure.postprocess_results(step, field, scale, cbar, 1, iptype, nodal, mode)
 
     try:
         toc, U, cnodes, fabs, fscaled, celements, eabs = result
-        U = array(U)
         print('\n***** Data processed : {0} s *****'.format(toc))
 
     except Exception:
@@ -579,55 +560,17 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
 
     # Plot meshes
 
-    npts = 8
-    mesh_faces = []
-    block_faces = [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
-    tet_faces = [[0, 2, 1], [1, 2, 3], [1, 3, 0], [0, 3, 2]]
-    pipes = []
+    types = [structure.elements[i].__name__ for i in sorted(structure.elements, key=int)]
+    colours = celements if len(celements) else None
+    vertices, faces, colours = element_mesh(U, elements, types, cnodes, colours, radius=radius, sides=8)
     mesh_add = []
 
-    for element, nodes in enumerate(elements):
-
-        n = len(nodes)
-
-        if n == 2:
-
-            u, v = nodes
-            pipe = draw_cylinder(start=U[u], end=U[v], radius=radius, div=npts, layer=layer)
-            pipes.append(pipe)
-
-            if dtype == 'element':
-                col1 = col2 = celements[element]
-
-            elif dtype == 'nodal':
-                col1 = cnodes[u]
-                col2 = cnodes[v]
-
-            try:
-                blendermesh = BlenderMesh(object=pipe)
-                blendermesh.set_vertices_colors({i: col1 for i in range(0, 2 * npts, 2)})
-                blendermesh.set_vertices_colors({i: col2 for i in range(1, 2 * npts, 2)})
-            except Exception:
-                pass
-
-        elif n in [3, 4]:
-
-            if structure.elements[element].__name__ in ['ShellElement', 'MembraneElement']:
-                mesh_faces.append(nodes)
-            else:
-                for face in tet_faces:
-                    mesh_faces.append([nodes[i] for i in face])
-
-        elif n == 8:
-
-            for block in block_faces:
-                mesh_faces.append([nodes[i] for i in block])
-
-    if mesh_faces:
+    if len(faces):
 
-        bmesh = draw_mesh(name='bmesh', vertices=U, faces=mesh_faces, layer=layer)
+        faces = [face[:3] if face[2] == face[3] else face for face in faces.tolist()]
+        bmesh = draw_mesh(name='bmesh', vertices=vertices, faces=faces, layer=layer)
         blendermesh = BlenderMesh(bmesh)
-        blendermesh.set_vertices_colors({i: col for i, col in enumerate(cnodes)})
+        blendermesh.set_vertices_colors({i: col for i, col in enumerate(colours)})
         mesh_add = [bmesh]
 
     # Plot colourbar
@@ -649,7 +592,7 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
     blendermesh.set_vertices_colors({i: j for i, j in zip(range(len(vertices)), colors)})
 
     set_deselect()
-    set_select(objects=pipes + mesh_add + [cmesh])
+    set_select(objects=mesh_add + [cmesh])
     bpy.context.view_layer.objects.active = cmesh
     bpy.ops.object.join()
 
@@ -699,13 +642,14 @@ def plot_reaction_forces(structure, step, layer=None, scale=1.0):
     except Exception:
         create_layer(layer)
 
+    nkeys = list(structure.results[step]['nodal']['rfx'])
     rfx = array(list(structure.results[step]['nodal']['rfx'].values()))[:, newaxis]
     rfy = array(list(structure.results[step]['nodal']['rfy'].values()))[:, newaxis]
     rfz = array(list(structure.results[step]['nodal']['rfz'].values()))[:, newaxis]
     rf = hstack([rfx, rfy, rfz])
     rfm = norm(rf, axis=1)
     rmax = max(rfm)
-    nodes = array(structure.nodes_xyz())
+    nodes = array(structure.nodes_xyz(nkeys))
 
     for i in where(rfm > 0)[0]:
 
@@ -749,32 +693,12 @@ def plot_voxels(structure, step, field='smises', cbar=[None, None], iptype='mean
 
     """
 
-    # Node and element data
-
-    xyz = structure.nodes_xyz()
-    elements = [structure.elements[i].nodes for i in sorted(structure.elements, key=int)]
-    nodal_data = structure.results[step]['nodal']
-    nkeys = sorted(structure.nodes, key=int)
-
-    ux = [nodal_data['ux{0}'.format(mode)][i] for i in nkeys]
-    uy = [nodal_data['uy{0}'.format(mode)][i] for i in nkeys]
-    uz = [nodal_data['uz{0}'.format(mode)][i] for i in nkeys]
-
-    try:
-        data = [nodal_data[field + str(mode)][key] for key in nkeys]
-        dtype = 'nodal'
-
-    except(Exception):
-        data = structure.results[step]['element'][field]
-        dtype = 'element'
-
     # Postprocess
 
-    result = postprocess(xyz, elements, ux, uy, uz, data, dtype, 1, cbar, 1, iptype, nodal)
+    result = structure.postprocess_results(step, field, 1, cbar, 1, iptype, nodal, mode)
 
     try:
         toc, U, cnodes, fabs, fscaled, celements, eabs = result
-        U = array(U)
         print('\n***** Data processed : {0:.3f} s *****'.format(toc))
 
     except Exception:
@@ -20,16 +20,19 @@ from compas_fea.structure import Structure
 
 
 from compas_fea.utilities import colorbar
+from compas_fea.utilities import derived_field
 from compas_fea.utilities import extrude_mesh
 from compas_fea.utilities import network_order
 
 if not compas.IPY:
     from compas_fea.utilities import meshing
     from compas_fea.utilities import functions
+    from compas_fea.utilities import visualisation
 else:
     from compas.rpc import Proxy
     functions = Proxy('compas_fea.utilities.functions')
     meshing = Proxy('compas_fea.utilities.meshing')
+    visualisation = Proxy('compas_fea.utilities.visualisation')
 
 if compas.RHINO:
     import rhinoscriptsyntax as rs
@@ -649,18 +652,18 @@ def plot_reaction_forces(structure, step, layer=None, scale=1.0):
     rfy = structure.results[step]['nodal']['rfy']
     rfz = structure.results[step]['nodal']['rfz']
 
-    nkeys = rfx.keys()
+    nkeys = list(rfx.keys())
     v = [scale_vector([rfx[i], rfy[i], rfz[i]], -scale * 0.001) for i in nkeys]
     rm = [length_vector(i) for i in v]
     rmax = max(rm)
     nodes = structure.nodes_xyz(nkeys)
 
-    for i in nkeys:
+    for c, i in enumerate(nkeys):
 
-        if rm[i] > 0.001:
-            line = rs.AddLine(nodes[i], add_vectors(nodes[i], v[i]))
+        if rm[c] > 0.001:
+            line = rs.AddLine(nodes[c], add_vectors(nodes[c], v[c]))
             rs.CurveArrows(line, 1)
-            col = [int(j) for j in colorbar(rm[i] / rmax, input='float', type=255)]
+            col = [int(j) for j in colorbar(rm[c] / rmax, input='float', type=255)]
             rs.ObjectColor(line, col)
             vector = [rfx[i], rfy[i], rfz[i]]
             name = json.dumps({'rfx': rfx[i], 'rfy': rfy[i], 'rfz': rfz[i], 'rfm': length_vector(vector)})
@@ -702,18 +705,18 @@ def plot_concentrated_forces(structure, step, layer=None, scale=1.0):
     cfy = structure.results[step]['nodal']['cfy']
     cfz = structure.results[step]['nodal']['cfz']
 
-    nkeys = cfx.keys()
+    nkeys = list(cfx.keys())
     v = [scale_vector([cfx[i], cfy[i], cfz[i]], -scale * 0.001) for i in nkeys]
     rm = [length_vector(i) for i in v]
     rmax = max(rm)
     nodes = structure.nodes_xyz(nkeys)
 
-    for i in nkeys:
+    for c, i in enumerate(nkeys):
 
-        if rm[i]:
-            line = rs.AddLine(nodes[i], add_vectors(nodes[i], v[i]))
+        if rm[c]:
+            line = rs.AddLine(nodes[c], add_vectors(nodes[c], v[c]))
             rs.CurveArrows(line, 1)
-            col = [int(j) for j in colorbar(rm[i] / rmax, input='float', type=255)]
+            col = [int(j) for j in colorbar(rm[c] / rmax, input='float', type=255)]
             rs.ObjectColor(line, col)
             vector = [cfx[i], cfy[i], cfz[i]]
             name = json.dumps({'cfx': cfx[i], 'cfy': cfy[i], 'cfz': cfz[i], 'cfm': length_vector(vector)})
@@ -755,7 +758,12 @@ def plot_mode_shapes(structure, step, layer=None, scale=1.0, radius=1):
     except Exception:
         it = structure.results[step]['info']['description']
 
-    if isinstance(it, list):
+    if 'modes' in structure.results[step]:
+        for mode in structure.results[step]['modes']:
+            layerk = layer + str(mode)
+            plot_data(structure=structure, step=step, field='um', layer=layerk, scale=scale, mode=mode, radius=radius)
+
+    elif isinstance(it, list):
         for c, fk in enumerate(it, 1):
             layerk = layer + str(c)
             plot_data(structure=structure, step=step, field='um', layer=layerk, scale=scale, mode=c, radius=radius)
@@ -845,6 +853,10 @@ def plot_axes(xyz, e11, e22, e33, layer, sc=1):
     rs.ObjectLayer(ez, layer)
 
 
+def _as_list(array):
+    return array.tolist() if hasattr(array, 'tolist') else array
+
+
 def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, cbar=[None, None], iptype='mean',
               nodal='mean', mode='', cbar_size=1):
     """
@@ -882,6 +894,7 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
     Notes
     -----
     - Pipe visualisation of line elements is not based on the element section.
+    - All elements are drawn as one mesh, without the internal faces of solid elements.
 
     """
 
@@ -906,19 +919,23 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
 
     nodes = structure.nodes_xyz()
     elements = [structure.elements[i].nodes for i in sorted(structure.elements, key=int)]
-    nodal_data = structure.results[step]['nodal']
+    results = structure.results[step]
     nkeys = sorted(structure.nodes, key=int)
 
-    ux = [nodal_data['ux{0}'.format(mode)][i] for i in nkeys]
-    uy = [nodal_data['uy{0}'.format(mode)][i] for i in nkeys]
-    uz = [nodal_data['uz{0}'.format(mode)][i] for i in nkeys]
+    u = [derived_field(results, '{0}{1}'.format(i, mode)) for i in ['ux', 'uy', 'uz']]
+    ux, uy, uz = [[values.get(i, 0.) for i in nkeys] for values in u]
 
     try:
-        data = [nodal_data['{0}{1}'.format(field, mode)][i] for i in nkeys]
+        values = derived_field(results, '{0}{1}'.format(field, mode))
+    except KeyError:
+        values = derived_field(results, field)
+
+    if values is results['nodal'].get('{0}{1}'.format(field, mode)):
+        data = [values.get(i) for i in nkeys]
         dtype = 'nodal'
 
-    except(Exception):
-        data = structure.results[step]['element'][field]
+    else:
+        data = values
         dtype = 'element'
 
     # Postprocess
@@ -931,62 +948,13 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
 
         # Plot meshes
 
-        mesh_faces = []
-        line_faces = [[0, 4, 5, 1], [1, 5, 6, 2], [2, 6, 7, 3], [3, 7, 4, 0]]
-        block_faces = [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
-        tet_faces = [[0, 2, 1, 1], [1, 2, 3, 3], [1, 3, 0, 0], [0, 3, 2, 2]]
-
-        for element, nodes in enumerate(elements):
-
-            n = len(nodes)
-
-            if n == 2:
-
-                u, v = nodes
-                sp, ep = U[u], U[v]
-                plane = rs.PlaneFromNormal(sp, subtract_vectors(ep, sp))
-                xa = plane.XAxis
-                ya = plane.YAxis
-                r = radius
-                xa_pr = scale_vector(xa, +r)
-                xa_mr = scale_vector(xa, -r)
-                ya_pr = scale_vector(ya, +r)
-                ya_mr = scale_vector(ya, -r)
-                pts = [add_vectors(sp, xa_pr), add_vectors(sp, ya_pr),
-                       add_vectors(sp, xa_mr), add_vectors(sp, ya_mr),
-                       add_vectors(ep, xa_pr), add_vectors(ep, ya_pr),
-                       add_vectors(ep, xa_mr), add_vectors(ep, ya_mr)]
-                guid = rs.AddMesh(pts, line_faces)
-
-                if dtype == 'element':
-                    col1 = col2 = celements[element]
+        types = [structure.elements[i].__name__ for i in sorted(structure.elements, key=int)]
+        colours = celements if dtype == 'element' else None
+        vertices, faces, colours = visualisation.element_mesh(U, elements, types, cnodes, colours, radius)
 
-                elif dtype == 'nodal':
-                    col1 = cnodes[u]
-                    col2 = cnodes[v]
-
-                rs.MeshVertexColors(guid, [col1] * 4 + [col2] * 4)
-
-            elif n == 3:
-
-                mesh_faces.append(nodes + [nodes[-1]])
-
-            elif n == 4:
-
-                if structure.elements[element].__name__ in ['ShellElement', 'MembraneElement']:
-                    mesh_faces.append(nodes)
-                else:
-                    for face in tet_faces:
-                        mesh_faces.append([nodes[i] for i in face])
-
-            elif n == 8:
-
-                for block in block_faces:
-                    mesh_faces.append([nodes[i] for i in block])
-
-        if mesh_faces:
-            guid = rs.AddMesh(U, mesh_faces)
-            rs.MeshVertexColors(guid, cnodes)
+        if len(faces):
+            guid = rs.AddMesh(_as_list(vertices), _as_list(faces))
+            rs.MeshVertexColors(guid, _as_list(colours))
 
         # Plot colorbar
 
@@ -1024,7 +992,8 @@ def plot_data(structure, step, field='um', layer=None, scale=1.0, radius=0.05, c
 
         if mode != '':
             try:
-                freq = str(round(structure.results[step]['frequencies'][mode - 1], 3))
+                index = results['modes'].index(mode) if 'modes' in results else mode - 1
+                freq = str(round(results['frequencies'][index], 3))
                 rs.AddText('Mode:{0}   Freq:{1}Hz'.format(mode, freq), [xmin, ymin - 1.5 * s, 0], height=h)
             except Exception:
                 pass
@@ -1051,9 +1020,9 @@ def plot_principal_stresses(structure, step, sp, stype, scale, layer=None):
     step : str
         Name of the Step.
     sp : str
-        'sp1' or 'sp5' for stection point 1 or 5.
+        'sp1' or 'sp5' for stection point 1 or 5, 'sp0' for solids.
     stype : str
-        'max' or 'min' for maximum or minimum principal stresses.
+        'max' or 'min' for maximum or minimum principal stresses, or 'mid' for solids.
     scale : float
         Scale on the length of the line markers (usually 10^6).
     layer : str
@@ -1070,13 +1039,12 @@ def plot_principal_stresses(structure, step, sp, stype, scale, layer=None):
     """
 
     data = structure.results[step]['element']
-    axes = data['axes']
-    spr, e = functions.principal_stresses(data)
+    axes = data.get('axes', {})
+    spr, e = functions.principal_stresses(data, section_points=[sp])
 
     stresses = spr[sp][stype]
-    max_stress = max([abs(i) for i in stresses])
-    vectors = list(zip([e[sp][stype][0][i]*stresses[i]/scale for i in range(len(stresses))],
-                       [e[sp][stype][1][i]*stresses[i]/scale for i in range(len(stresses))]))
+    max_stress = max(abs(stresses))
+    vectors = list((e[sp][stype] * stresses / scale).T)
 
     if not layer:
         layer = '{0}_{1}_principal_{2}'.format(step, sp, stype)
@@ -1087,10 +1055,14 @@ def plot_principal_stresses(structure, step, sp, stype, scale, layer=None):
     centroids = [structure.element_centroid(i) for i in sorted(structure.elements, key=int)]
 
     for c, centroid in enumerate(centroids):
-        f2 = Frame(centroid, axes[c][0], axes[c][1])
+        if axes.get(c):
+            f2 = Frame(centroid, axes[c][0], axes[c][1])
+        else:
+            f2 = Frame(centroid, [1, 0, 0], [0, 1, 0])
         T = Transformation.from_frame(f2)
-        v_plus = Vector(vectors[c][0]*0.5, vectors[c][1]*0.5, 0.).transformed(T)
-        v_minus = Vector(-vectors[c][0]*0.5, -vectors[c][1]*0.5, 0.).transformed(T)
+        vector = list(vectors[c]) + [0.] * (3 - len(vectors[c]))
+        v_plus = Vector(*[0.5 * i for i in vector]).transformed(T)
+        v_minus = Vector(*[-0.5 * i for i in vector]).transformed(T)
         id1 = rs.AddLine(add_vectors(centroid, v_minus), add_vectors(centroid, v_plus))
         col1 = colorbar(stresses[c] / max_stress, input='float', type=255)
         rs.ObjectColor(id1, col1)
@@ -1130,19 +1102,23 @@ def plot_voxels(structure, step, field='smises', cbar=[None, None], iptype='mean
 
     xyz = structure.nodes_xyz()
     elements = [structure.elements[i].nodes for i in sorted(structure.elements, key=int)]
-    nodal_data = structure.results[step]['nodal']
+    results = structure.results[step]
     nkeys = sorted(structure.nodes, key=int)
 
-    ux = [nodal_data['ux{0}'.format(mode)][i] for i in nkeys]
-    uy = [nodal_data['uy{0}'.format(mode)][i] for i in nkeys]
-    uz = [nodal_data['uz{0}'.format(mode)][i] for i in nkeys]
+    u = [derived_field(results, '{0}{1}'.format(i, mode)) for i in ['ux', 'uy', 'uz']]
+    ux, uy, uz = [[values.get(i, 0.) for i in nkeys] for values in u]
 
     try:
-        data = [nodal_data[field + str(mode)][key] for key in nkeys]
+        values = derived_field(results, '{0}{1}'.format(field, mode))
+    except KeyError:
+        values = derived_field(results, field)
+
+    if values is results['nodal'].get('{0}{1}'.format(field, mode)):
+        data = [values.get(i) for i in nkeys]
         dtype = 'nodal'
 
-    except(Exception):
-        data = structure.results[step]['element'][field]
+    else:
+        data = values
         dtype = 'element'
 
     # Postprocess
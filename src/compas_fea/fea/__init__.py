@@ -5,7 +5,7 @@ fea
 
 .. currentmodule:: compas_fea.fea
 
-The compas_fea package supports Abaqus, Ansys, Sofistik and OpenSees as analysis backends.
+The compas_fea package supports Abaqus, Ansys, Sofistik and OpenSees as analysis backends, and a native NumPy/SciPy solver.
 
 
 Classes
@@ -53,6 +53,23 @@ ansys
     load_to_results
 
 
+native
+------
+
+.. currentmodule:: compas_fea.fea.native
+
+.. autosummary::
+    :toctree: generated/
+
+    input_generate
+    launch_process
+    extract_data
+    step_states
+    read_history
+    sensitivities
+    topology_optimisation
+
+
 opensees
 --------
 
@@ -2,10 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
+
 from compas_fea.fea import Writer
 
 from compas_fea.fea.abaq import launch_job
 from compas_fea.fea.abaq import odb_extract
+from compas_fea.utilities.modal import pack_mode_shapes
 
 from subprocess import Popen
 from subprocess import PIPE
@@ -261,6 +264,9 @@ def extract_data(structure, fields, exe, output, return_data, components):
             for step in info:
                 structure.results[step]['info'] = info[step]
 
+                if isinstance(info[step].get('description'), dict) and not compas.IPY:
+                    pack_mode_shapes(structure.results[step])
+
             toc2 = time() - tic2
 
             if output:
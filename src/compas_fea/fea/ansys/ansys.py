@@ -24,6 +24,9 @@ from compas_fea.fea.ansys.reading import get_harmonic_data_from_result_files
 from compas_fea.fea.ansys.reading import get_acoustic_radiation_from_results_files
 from compas_fea.fea.ansys.reading import get_nodes_elements_from_result_files
 
+from compas_fea.utilities.harmonic import store_harmonic
+from compas_fea.utilities.modal import store_mode_shapes
+
 
 # Author(s): Tomas Mendez Echenagucia (github.com/tmsmendez)
 
@@ -250,15 +253,14 @@ def write_results_from_rst(structure, fields, steps, license='teaching', sets=No
             write_static_results_from_ansys_rst(structure, fields, step_index=step_index)
         elif stype == 'modal':
             num_modes = structure.steps[skey].modes
-            write_modal_results_from_ansys_rst(name, path, fields, num_modes,
-                                               step_index=step_index, step_name=skey)
+            write_modal_results_from_ansys_rst(structure, fields, num_modes, step_index=step_index)
         elif stype == 'harmonic':
             freq_list = structure.steps[skey].freq_list
             if sets:
                 nodes = []
                 [nodes.extend(structure.sets[s]['selection']) for s in sets]
             else:
-                nodes = None
+                nodes = structure.output_selection(skey)[0]
             write_harmonic_results_from_ansys_rst(name, path, fields, freq_list,
                                                   step_index=step_index, step_name='step', sets=nodes)
         elif stype == 'acoustic':
@@ -307,19 +309,21 @@ def load_to_results(structure, fields, steps):
 
         elif structure.steps[step].__name__ == 'ModalStep':
             rlist = []
-            if 'u' in fields or 'all' in fields:
-                udict = get_modal_shapes_from_result_files(out_path)
-                rlist.append(udict)
             if 'f' in fields or 'all' in fields:
                 fdict = get_modal_freq_from_result_files(out_path)
-                structure.results[step]['frequencies'] = fdict
+                structure.results[step]['frequencies'] = [fdict[i] for i in sorted(fdict)] if fdict else fdict
+            if 'u' in fields or 'all' in fields:
+                shapes, nkeys = get_modal_shapes_from_result_files(out_path)
+                if shapes is not None:
+                    rows, nkeys = _output_rows(structure, step, nkeys)
+                    store_mode_shapes(structure.results[step], shapes[:, rows], nodes=nkeys)
 
         elif structure.steps[step].__name__ == 'HarmonicStep':
             rlist = []
             if 'u' in fields or 'all' in fields:
-                harmonic_disp, frequencies = get_harmonic_data_from_result_files(structure, out_path, step)
-                structure.results[step]['frequencies'] = frequencies
-                rlist.append(harmonic_disp)
+                harmonic_disp, frequencies, nkeys = get_harmonic_data_from_result_files(structure, out_path, step)
+                rows, nkeys = _output_rows(structure, step, nkeys)
+                store_harmonic(structure.results[step], harmonic_disp[:, rows], frequencies, nodes=nkeys)
         elif structure.steps[step].__name__ == 'AcousticStep':
             rlist = None
             tl_data = get_acoustic_radiation_from_results_files(out_path, step)
@@ -328,6 +332,7 @@ def load_to_results(structure, fields, steps):
         if 'geo' in fields:
             nodes, elements = get_nodes_elements_from_result_files(out_path)
             structure.nodes = nodes
+            structure.invalidate_topology()
             for ekey in elements:
                 structure.add_element(elements[ekey]['nodes'], elements[ekey]['type'])
 
@@ -340,6 +345,24 @@ def load_to_results(structure, fields, steps):
 
         if rlist:
             structure.results[step]['nodal'] = {}
+            output = structure.output_selection(step)[0]
             for rdict in rlist:
                 for key in rdict:
-                    structure.results[step]['nodal'][key] = rdict[key]
+                    if output is None:
+                        structure.results[step]['nodal'][key] = rdict[key]
+                    else:
+                        structure.results[step]['nodal'][key] = {i: rdict[key][i] for i in output if i in rdict[key]}
+
+
+def _output_rows(structure, step, nkeys):
+    """Rows of the nodes read from the result files that are in the output selection of the step."""
+
+    output = structure.output_selection(step)[0]
+
+    if output is None:
+        return slice(None), nkeys
+
+    index = {nkey: i for i, nkey in enumerate(nkeys)}
+    output = [i for i in output if i in index]
+
+    return [index[i] for i in output], output
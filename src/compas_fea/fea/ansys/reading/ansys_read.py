@@ -2,6 +2,11 @@ import os
 import re
 from compas.geometry import length_vector
 
+try:
+    import numpy as np
+except ImportError:
+    pass
+
 
 # Author(s): Tomas Mendez Echenagucia (github.com/tmsmendez)
 
@@ -53,88 +58,40 @@ def get_nodes_elements_from_result_files(path):
     return nodes, elements
 
 
-def _get_harmonic_data_from_result_files(path):  # this function works with multiple freqs per step (the old way?)
-    harmonic_path = os.path.join(path, 'harmonic_out')
-    files = os.listdir(harmonic_path)
-
-    real_files = []
-    imag_files = []
-    real_names = []
-    imag_names = []
-
-    for f in files:
-        if f.startswith("node_real"):
-            real_names.append(f)
-        elif f.startswith("node_imag"):
-            imag_names.append(f)
-
-    nkeys = [int(float(n.split('_')[2].split('.')[0])) - 1 for n in real_names]
-
-    for i, f in enumerate(real_names):
-        f = open(os.path.join(harmonic_path, f), 'r')
-        dreal = f.readlines()
-        real_files.append(dreal)
-        f.close()
-
-    for i, f in enumerate(imag_names):
-        f = open(os.path.join(harmonic_path, f), 'r')
-        dimag = f.readlines()
-        imag_files.append(dimag)
-        f.close()
-
-    harmonic_disp = {}
-    if real_files:
-        for i in range(len(real_files)):
-            dreal = real_files[i]
-            dimag = imag_files[i]
-            nkey = nkeys[i]
-
-            harmonic_disp[nkey] = {}
-            for j in range(len(dreal)):
-                real_string = dreal[j].split(',')
-                imag_string = dimag[j].split(',')
-                f = int(float(real_string[0]))
-                del real_string[0]
-                del imag_string[0]
-                real = map(float, real_string)
-                imag = map(float, imag_string)
-                harmonic_disp[nkey][f] = {'real': {'x': real[0], 'y': real[1], 'z': real[2]},
-                                          'imag': {'x': imag[0], 'y': imag[1], 'z': imag[2]}}
-
-    freq_list = sorted(harmonic_disp[nkey].keys(), key=int)
-    freq_list = [int(fr) for fr in freq_list]
-    return harmonic_disp, freq_list
+def _get_harmonic_data_from_result_files(harmonic_path, freq_list):
+    names = [f for f in os.listdir(harmonic_path) if f.startswith('node_real_')]
+    nkeys = sorted(int(float(n.split('_')[2].split('.')[0])) - 1 for n in names)
+    harmonic_disp = np.zeros((len(freq_list), len(nkeys), 3), dtype=complex)
+    for i, nkey in enumerate(nkeys):
+        for part, factor in [('real', 1), ('imag', 1j)]:
+            fname = os.path.join(harmonic_path, 'node_{0}_{1}.txt'.format(part, nkey + 1))
+            harmonic_disp[:, i, :] += factor * np.loadtxt(fname, delimiter=',', ndmin=2)[:len(freq_list), 1:4]
 
+    return harmonic_disp, nkeys
 
-def get_harmonic_data_from_result_files(structure, path, step):
 
-    freq = structure.steps[step].freq_list[0]
-    harmonic_path = os.path.join(path, 'harmonic_out')
-    filename = 'harmonic_disp_real_{0}_Hz.txt'.format(freq)
-    filename_ = 'harmonic_disp_imag_{0}_Hz.txt'.format(freq)
+def get_harmonic_data_from_result_files(structure, path, step):
 
-    fh = open(os.path.join(harmonic_path, filename), 'r')
-    dreal = fh.readlines()
-    fh.close()
+    freq_list = structure.steps[step].freq_list
+    step_index = structure.steps_order.index(step)
+    harmonic_path = os.path.join(path, 'harmonic_out_{0}'.format(step_index))
+    filename = os.path.join(harmonic_path, 'harmonic_disp_{0}_{1}_Hz.txt')
 
-    fh = open(os.path.join(harmonic_path, filename_), 'r')
-    dimag = fh.readlines()
-    fh.close()
+    if not os.path.exists(filename.format('real', freq_list[0])):
+        harmonic_disp, nkeys = _get_harmonic_data_from_result_files(harmonic_path, freq_list)
+        return harmonic_disp, freq_list, nkeys
 
-    harmonic_disp = {}
-    for j in range(len(dreal)):
-        real_string = dreal[j].split(',')
-        imag_string = dimag[j].split(',')
-        nkey = int(float(real_string[0]) - 1)
-        del real_string[0]
-        del imag_string[0]
-        harmonic_disp[nkey] = {}
-        real = map(float, real_string)
-        imag = map(float, imag_string)
-        harmonic_disp[nkey][freq] = {'real': {'x': real[0], 'y': real[1], 'z': real[2]},
-                                     'imag': {'x': imag[0], 'y': imag[1], 'z': imag[2]}}
+    harmonic_disp = None
+    for i, freq in enumerate(freq_list):
+        real = np.loadtxt(filename.format('real', freq), delimiter=',', ndmin=2)
+        imag = np.loadtxt(filename.format('imag', freq), delimiter=',', ndmin=2)
+        order = np.argsort(real[:, 0])
+        if harmonic_disp is None:
+            nkeys = (real[order, 0].astype(int) - 1).tolist()
+            harmonic_disp = np.zeros((len(freq_list), len(nkeys), 3), dtype=complex)
+        harmonic_disp[i] = real[order, 1:4] + 1j * imag[order, 1:4]
 
-    return harmonic_disp, structure.steps[step].freq_list
+    return harmonic_disp, freq_list, nkeys
 
 
 def get_modal_shapes_from_result_files(out_path):
@@ -144,33 +101,15 @@ def get_modal_shapes_from_result_files(out_path):
     except(Exception):
         print('Result files not found')
         return None, None
-    filenames = []
-    for f in files:
-        if f.startswith('modal_shape_'):
-            filenames.append(f)
-    modal_files = []
-    for i in range(len(filenames)):
-        f = 'modal_shape_' + str(i + 1) + '.txt'
-        modal_files.append(open(os.path.join(modal_path, f), 'r'))
-
-    modes_dict = {}
-    for i, f in enumerate(modal_files):
-        modes_dict['ux' + str(i)] = {}
-        modes_dict['uy' + str(i)] = {}
-        modes_dict['uz' + str(i)] = {}
-        modes_dict['um' + str(i)] = {}
-        mode = f.readlines()
-        for j in range(len(mode)):
-            string = mode[j].split(',')
-            a = map(float, string[1:])
-            nkey = int(a[0]) - 1
-            modes_dict['ux' + str(i)][nkey] = a[1]
-            modes_dict['uy' + str(i)][nkey] = a[2]
-            modes_dict['uz' + str(i)][nkey] = a[3]
-            modes_dict['um' + str(i)][nkey] = a[4]
-        f.close()
-
-    return modes_dict
+    count = len([f for f in files if f.startswith('modal_shape_')])
+    shapes = []
+    for i in range(count):
+        data = np.loadtxt(os.path.join(modal_path, 'modal_shape_' + str(i + 1) + '.txt'), delimiter=',', ndmin=2)
+        nkeys = data[:, 0].astype(int) - 1
+        order = np.argsort(nkeys)
+        shapes.append(data[order, 1:4])
+
+    return np.array(shapes).reshape(count, -1, 3), nkeys[order].tolist() if count else []
 
 
 def get_modal_freq_from_result_files(out_path):
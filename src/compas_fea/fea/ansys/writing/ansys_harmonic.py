@@ -64,7 +64,7 @@ def write_harmonic_solve(structure, output_path, filename, skey):
 
 def write_harmonic_results_from_ansys_rst(name, path, fields, freq_list, step_index=0, step_name='step', sets=None):
 
-    step_folder = 'harmonic_out'
+    step_folder = 'harmonic_out_{}'.format(step_index)
     if not os.path.exists(os.path.join(path, name + '_output', step_folder)):
         os.makedirs(os.path.join(path, name + '_output', step_folder))
 
@@ -73,11 +73,11 @@ def write_harmonic_results_from_ansys_rst(name, path, fields, freq_list, step_in
     if type(fields) == str:
         fields = [fields]
     if 'u' in fields or 'all' in fields:
-        if len(freq_list) == 1:
-            freq = freq_list[0]
-            write_request_complex_displacements(path, name, freq, step_index)
-        else:
+        if sets:
             write_request_per_freq_nodal_displacements(path, name, freq_list, step_index, sets)
+        else:
+            for i, freq in enumerate(freq_list):
+                write_request_complex_displacements(path, name, freq, step_index, substep=i + 1)
         # write_something(path, name)
     if 'geo' in fields or 'all' in fields:
         write_request_element_nodes(path, name)
@@ -189,7 +189,7 @@ def write_request_per_freq_nodal_displacements(path, name, freq_list, step_index
     cFile.close()
 
 
-def write_request_complex_displacements(path, name, freq, step_index):
+def write_request_complex_displacements(path, name, freq, step_index, substep=''):
 
     step_folder = 'harmonic_out_{}'.format(step_index)
     filename = name + '_extract.txt'
@@ -197,15 +197,15 @@ def write_request_complex_displacements(path, name, freq, step_index):
 
     fname_real = 'harmonic_disp_real_{0}_Hz'.format(freq)
     fname_imag = 'harmonic_disp_imag_{0}_Hz'.format(freq)
-    name_ = 'nds_d' + str(freq)
-    name_x = 'dispX' + str(freq)
-    name_y = 'dispY' + str(freq)
-    name_z = 'dispZ' + str(freq)
+    name_ = 'nds_d' + str(substep)
+    name_x = 'dispX' + str(substep)
+    name_y = 'dispY' + str(substep)
+    name_z = 'dispZ' + str(substep)
 
     cFile = open(os.path.join(path, filename), 'a')
     cFile.write('/POST1 \n')
     cFile.write('!\n')
-    cFile.write('SET, {0}, , , 0!\n'.format(step_index + 1))
+    cFile.write('SET, {0}, {1}, , 0!\n'.format(step_index + 1, substep))
     cFile.write('*get,numNodes,node,,count \n')
     cFile.write('*set,' + name_x + ', \n')
     cFile.write('*dim,' + name_x + ',array,numNodes,1 \n')
@@ -230,7 +230,7 @@ def write_request_complex_displacements(path, name, freq, step_index):
     cFile = open(os.path.join(path, filename), 'a')
     cFile.write('/POST1 \n')
     cFile.write('!\n')
-    cFile.write('SET, {0}, , , 1!\n'.format(step_index + 1))
+    cFile.write('SET, {0}, {1}, , 1!\n'.format(step_index + 1, substep))
     cFile.write('*get,numNodes,node,,count \n')
     cFile.write('*set,' + name_x + ', \n')
     cFile.write('*dim,' + name_x + ',array,numNodes,1 \n')
@@ -91,7 +91,9 @@ def write_request_modal_freq(path, name, skey, num_modes, step_index):
     cFile.close()
 
 
-def write_request_modal_shapes(path, name, step_name, num_modes, step_index):
+def write_request_modal_shapes(structure, num_modes, step_index):
+    name = structure.name
+    path = structure.path
     filename = name + '_extract.txt'
 
     cFile = open(os.path.join(path, filename), 'a')
@@ -103,10 +105,14 @@ def write_request_modal_shapes(path, name, step_name, num_modes, step_index):
         cFile.write('SET,' + str(step_index + 1) + ',' + str(i + 1) + '\n')
         cFile.write('! Mode ' + str(i + 1) + ' \n \n \n')
         cFile.close()
-        write_request_node_displacements(path, name, step_name, mode=i + 1)
+        write_request_node_displacements(structure, step_index, mode=i + 1)
 
 
-def write_modal_results_from_ansys_rst(name, path, fields, num_modes, step_index=0, step_name='step'):
+def write_modal_results_from_ansys_rst(structure, fields, num_modes, step_index=0):
+    name = structure.name
+    path = structure.path
+    step_name = structure.steps_order[step_index]
+
     if not os.path.exists(os.path.join(path, name + '_output', 'modal_out')):
         os.makedirs(os.path.join(path, name + '_output', 'modal_out'))
 
@@ -114,7 +120,7 @@ def write_modal_results_from_ansys_rst(name, path, fields, num_modes, step_index
     if type(fields) == str:
         fields = [fields]
     if 'u' in fields or 'all' in fields:
-        write_request_modal_shapes(path, name, step_name, num_modes, step_index)
+        write_request_modal_shapes(structure, num_modes, step_index)
     if 'f' in fields or 'all' in fields:
         write_request_modal_freq(path, name, step_name, num_modes, step_index)
     if 'geo' in fields:
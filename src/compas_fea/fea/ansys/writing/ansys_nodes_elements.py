@@ -3,6 +3,8 @@ import os
 from compas.geometry import add_vectors
 from compas.geometry import normalize_vector
 
+from compas_fea.fea.ansys.writing.ansys_process import write_request_node_mask
+
 
 # Author(s): Tomas Mendez Echenagucia (github.com/tmsmendez)
 
@@ -486,6 +488,7 @@ def write_request_node_displacements(structure, step_index, mode=None):
     cFile.write('/POST1 \n')
     cFile.write('!\n')
     cFile.write('*get,numNodes,node,,count \n')
+    mask = write_request_node_mask(structure, step_index, cFile)
     cFile.write('*set,' + name_x + ', \n')
     cFile.write('*dim,' + name_x + ',array,numNodes,1 \n')
     cFile.write('*set,' + name_y + ', \n')
@@ -498,6 +501,7 @@ def write_request_node_displacements(structure, step_index, mode=None):
     cFile.write('*VGET, ' + name_z + ', node, all, u, Z,,,2 \n')
     cFile.write('*vfill,' + name_ + '(1),ramp,1,1 \n')
     cFile.write('*cfopen,' + out_path + '/' + fname + ',txt \n')
+    cFile.write(mask)
     cFile.write('*vwrite, ' + name_ + '(1) , \',\'  , ' + name_x + '(1) , \',\' , ')
     cFile.write(name_y + '(1) , \',\' ,' + name_z + '(1) \n')
     cFile.write('(          F9.0,       A,       ES,           A,          ES,          A,      ES) \n')
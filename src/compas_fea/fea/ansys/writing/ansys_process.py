@@ -1,5 +1,7 @@
 import os
 
+from compas_fea.utilities import identify_ranges
+
 
 # Author(s): Tomas Mendez Echenagucia (github.com/tmsmendez)
 
@@ -76,3 +78,25 @@ def write_request_write_array(structure, fname, out_path, aname, alen, awidth, i
     fh.write('*cfclose \n')
     fh.write('!\n')
     fh.close()
+
+
+def write_request_node_mask(structure, step_index, cFile, mask='nds_mask'):
+    """Writes the NSEL mask of the output nodes of a step and returns the *VMASK command for *vwrite, or ''."""
+
+    nodes = structure.output_selection(structure.steps_order[step_index])[0]
+
+    if nodes is None:
+        return ''
+
+    cFile.write('NSEL, NONE \n')
+
+    for r in identify_ranges(list(nodes)):
+        a, b = r if isinstance(r, tuple) else (r, r)
+        cFile.write('NSEL, A, NODE, , {0}, {1}, 1 \n'.format(a + 1, b + 1))
+
+    cFile.write('*set,{0}, \n'.format(mask))
+    cFile.write('*dim,{0},array,numNodes,1 \n'.format(mask))
+    cFile.write('*VGET, {0}, node, 1, NSEL \n'.format(mask))
+    cFile.write('NSEL, ALL \n')
+
+    return '*VMASK, {0}(1) \n'.format(mask)
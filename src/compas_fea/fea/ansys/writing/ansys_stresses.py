@@ -1,5 +1,7 @@
 import os
 
+from compas_fea.fea.ansys.writing.ansys_process import write_request_node_mask
+
 
 # Author(s): Tomas Mendez Echenagucia (github.com/tmsmendez)
 
@@ -18,6 +20,7 @@ def write_request_nodal_stresses(structure, step_index):
     # cFile.write('SET,'+skey+' \n')
     cFile.write('SHELL,TOP  \n')
     cFile.write('*get,numNodes,node,,count \n')
+    mask = write_request_node_mask(structure, step_index, cFile)
     cFile.write('*set,SXtop, \n')
     cFile.write('*dim,SXtop,array,numNodes,1 \n')
     cFile.write('*set,SYtop, \n')
@@ -44,6 +47,7 @@ def write_request_nodal_stresses(structure, step_index):
 
     cFile.write('*vfill,' + name + '(1),ramp,1,1 \n')
     cFile.write('*cfopen,' + out_path + '/' + fname + ',txt \n')
+    cFile.write(mask)
     cFile.write('*vwrite, ' + name + '(1) , \',\'  , SXtop(1) ,   \',\' ,   SYtop(1) ')
     cFile.write(',   \',\' ,  SZtop(1) , \',\',    SXbot(1) ,   \',\' ,   SYbot(1) ,   \',\' ,  SZbot(1) \n')
     cFile.write('(F9.0, A, ES, A, ES, A, ES, A, ES, A, ES, A, ES) \n')
@@ -93,6 +97,7 @@ def write_request_pricipal_stresses(structure, step_index):
     cFile = open(os.path.join(path, filename), 'a')
     cFile.write('SHELL,TOP  \n')
     cFile.write('*get,numNodes,node,,count \n')
+    mask = write_request_node_mask(structure, step_index, cFile)
     cFile.write('*set,S1top, \n')
     cFile.write('*dim,S1top,array,numNodes,1 \n')
     cFile.write('*set,S2top, \n')
@@ -119,6 +124,7 @@ def write_request_pricipal_stresses(structure, step_index):
 
     cFile.write('*vfill,' + name + '(1),ramp,1,1 \n')
     cFile.write('*cfopen,' + out_path + '/' + fname + ',txt \n')
+    cFile.write(mask)
     cFile.write('*vwrite, ' + name + '(1), \',\', S1top(1), \',\', S2top(1), \',\',')
     cFile.write(' S3top(1), \',\', S1bot(1), \',\', S2bot(1), \',\', S3bot(1) \n')
     cFile.write('(F9.0, A, ES, A, ES, A, ES, A, ES, A, ES, A, ES) \n')
@@ -141,6 +147,7 @@ def write_request_shear_stresses(structure, step_index):
     cFile = open(os.path.join(path, filename), 'a')
     cFile.write('SHELL,TOP  \n')
     cFile.write('*get,numNodes,node,,count \n')
+    mask = write_request_node_mask(structure, step_index, cFile)
     cFile.write('*set,S1top, \n')
     cFile.write('*dim,S1top,array,numNodes,1 \n')
     cFile.write('*set,S2top, \n')
@@ -167,6 +174,7 @@ def write_request_shear_stresses(structure, step_index):
 
     cFile.write('*vfill,' + name + '(1),ramp,1,1 \n')
     cFile.write('*cfopen,' + out_path + '/' + fname + ',txt \n')
+    cFile.write(mask)
     cFile.write('*vwrite, ' + name + '(1), \',\', S1top(1), \',\', S2top(1), \',\',')
     cFile.write(' S3top(1), \',\', S1bot(1), \',\', S2bot(1), \',\', S3bot(1) \n')
     cFile.write('(F9.0, A, ES, A, ES, A, ES, A, ES , A, ES, A, ES) \n')
@@ -189,6 +197,7 @@ def write_request_principal_strains(structure, step_index):
     cFile = open(os.path.join(path, filename), 'a')
     cFile.write('SHELL,TOP  \n')
     cFile.write('*get,numNodes,node,,count \n')
+    mask = write_request_node_mask(structure, step_index, cFile)
     cFile.write('*set,S1top, \n')
     cFile.write('*dim,S1top,array,numNodes,1 \n')
     cFile.write('*set,S2top, \n')
@@ -215,6 +224,7 @@ def write_request_principal_strains(structure, step_index):
 
     cFile.write('*vfill,' + name + '(1),ramp,1,1 \n')
     cFile.write('*cfopen,' + out_path + '/' + fname + ',txt \n')
+    cFile.write(mask)
     cFile.write('*vwrite,' + name + '(1), \',\', S1top(1), \',\', S2top(1), \',\',')
     cFile.write(' S3top(1), \',\', S1bot(1), \',\', S2bot(1), \',\', S3bot(1) \n')
     cFile.write('(F9.0, A, ES, A, ES, A, ES, A, ES, A, ES, A, ES) \n')
@@ -236,6 +246,7 @@ def write_request_reactions(structure, step_index):
 
     cFile = open(os.path.join(path, filename), 'a')
     cFile.write('*get,numNodes,node,,count \n')
+    mask = write_request_node_mask(structure, step_index, cFile)
     cFile.write('*set,RFX, \n')
     cFile.write('*dim,RFX,array,numNodes,1 \n')
     cFile.write('*set,RFY, \n')
@@ -260,6 +271,7 @@ def write_request_reactions(structure, step_index):
 
     cFile.write('*vfill,' + name + '(1),ramp,1,1 \n')
     cFile.write('*cfopen,' + out_path + '/' + fname + ',txt \n')
+    cFile.write(mask)
     cFile.write('*vwrite, ' + name + '(1), \',\', RFX(1), \',\', RFY(1), \',\', ')
     cFile.write('RFZ(1), \',\', RMX(1), \',\', RMY(1), \',\', RMZ(1) \n')
     cFile.write('(F9.0, A, ES, A, ES, A, ES, A, ES, A, ES, A, ES) \n')
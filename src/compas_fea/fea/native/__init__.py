@@ -0,0 +1 @@
+from .native import *  # noqa: F401 F403
@@ -0,0 +1,177 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.elements import spring_deformations
+from compas_fea.fea.native.elements import spring_forces
+from compas_fea.fea.native.elements import spring_stiffness
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'truss_states',
+    'active_set_analysis',
+]
+
+
+slack = 1e-9
+
+
+def truss_states(group, N):
+    """Active states of truss elements from their (trial) axial forces.
+
+    Parameters
+    ----------
+    group : obj
+        Group object of trusses.
+    N : array
+        (m,) axial forces, tension positive.
+
+    Returns
+    -------
+    array
+        (m,) booleans, False for tension-only elements in compression and compression-only elements in tension.
+
+    """
+
+    d = group.data
+
+    return ~(((d['compression'] == 0) & (N < 0)) | ((d['tension'] == 0) & (N > 0)))
+
+
+def active_set_analysis(model, loads, displacements, step):
+    """Static analysis with tension-only and compression-only trusses and piecewise-linear springs.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    loads : dict
+        Load object names and factors.
+    displacements : dict
+        Displacement object names and their factors.
+    step : obj
+        GeneralStep object, step.iterations limits the number of active-set iterations.
+
+    Returns
+    -------
+    dict
+        (n x 6) arrays 'U', 'RF' and 'CF', 'axial' truss forces by element key, the number of 'iterations' and
+        'converged', False if the active set still changed at the last iteration.
+
+    Notes
+    -----
+    - Trusses of materials with tension=False or compression=False are switched off (to a residual stiffness factor
+      ``slack``) when their trial axial force has the wrong sign, and back on when it changes sign again.
+    - SpringSection force-displacement data are followed segment by segment, each segment as a stiffness and a force
+      offset moved to the right hand side.
+    - The stiffness matrix is assembled once into a fixed sparsity pattern, after which only the contributions of the
+      elements that changed state or segment are updated in place.
+
+    """
+
+    groups = model.groups
+    indptr, indices, _ = model.pattern()
+    data = np.zeros(len(indices))
+
+    for gi, group in enumerate(groups):
+        model.scatter(data, gi, slice(None), model.element_stiffness(group))
+
+    K = csr_matrix((data, indices, indptr), shape=(model.ndof, model.ndof))
+    data = K.data
+
+    fixed, values = model.constraints(displacements)
+    free = model.free(K, fixed)
+    gather = csr_matrix((np.arange(1, len(data) + 1), indices, indptr), shape=K.shape)[free][:, free]
+    Kff = gather.copy()
+    gather = gather.data - 1
+
+    F, fe = model.load_vector(loads)
+    N0 = model.prestress(loads)
+
+    trusses = [gi for gi, group in enumerate(groups) if group.kind == 'truss' and
+               not (np.all(group.data['tension']) and np.all(group.data['compression']))]
+    springs = [gi for gi, group in enumerate(groups) if group.kind == 'spring' and
+               any(np.any(group.sections == name) for name in model.tables)]
+
+    active = {gi: np.ones(len(groups[gi].ekeys), dtype=bool) for gi in trusses}
+    segments = {gi: (groups[gi].kc, groups[gi].f0) for gi in springs}
+
+    U = np.zeros(model.ndof)
+    U[fixed] = values
+    converged = False
+
+    for iteration in range(1, max(1, step.iterations) + 1):
+
+        Fe = F.copy()
+
+        for gi in trusses:
+            group = groups[gi]
+            off = ~active[gi]
+            c = group.c[off]
+            np.add.at(Fe, group.dofs[off], -np.hstack([N0[gi][off, None] * c, -N0[gi][off, None] * c]))
+
+        for gi in springs:
+            group = groups[gi]
+            np.add.at(Fe, group.dofs, -spring_forces(group.T, segments[gi][1], group.nn))
+
+        Kff.data = data[gather]
+        U[free] = spsolve(Kff.tocsc(), Fe[free] - K[free][:, fixed].dot(values))
+        changed = False
+
+        for gi in trusses:
+            group = groups[gi]
+            f = model.element_forces(group, U, fe)
+            state = truss_states(group, np.sum(f[:, 3:] * group.c, axis=1))
+            rows = np.nonzero(state != active[gi])[0]
+            if len(rows):
+                sign = np.where(state[rows], 1 - slack, slack - 1)
+                model.scatter(data, gi, rows, sign[:, None, None] * group.k[rows])
+                active[gi] = state
+                changed = True
+
+        for gi in springs:
+            group = groups[gi]
+            k0, f00 = segments[gi]
+            k1, f01 = model.spring_segments(group, spring_deformations(group.T, U[group.dofs], group.nn))
+            rows = np.nonzero(np.any((k1 != k0) | (f01 != f00), axis=1))[0]
+            if len(rows):
+                dk = spring_stiffness(group.T[rows], k1[rows] - k0[rows], group.nn)
+                model.scatter(data, gi, rows, dk)
+                segments[gi] = k1, f01
+                changed = True
+
+        if not changed:
+            converged = True
+            break
+
+    axial = np.full(model.structure.element_count(), np.nan)
+
+    for gi in trusses:
+        group = groups[gi]
+        f = model.element_forces(group, U, fe)
+        axial[group.ekeys] = np.where(active[gi], np.sum(f[:, 3:] * group.c, axis=1), 0.)
+
+    for gi, group in enumerate(groups):
+        if group.kind == 'truss' and gi not in trusses:
+            f = model.element_forces(group, U, fe)
+            axial[group.ekeys] = np.sum(f[:, 3:] * group.c, axis=1)
+
+    RF = K.dot(U) - Fe
+    RF[free] = 0
+
+    return {'U': U.reshape(-1, 6), 'RF': RF.reshape(-1, 6), 'CF': F.reshape(-1, 6), 'axial': axial,
+            'iterations': iteration, 'converged': converged}
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.static import linear_solve
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.linalg import eigh
+    from scipy.sparse.linalg import LinearOperator
+    from scipy.sparse.linalg import eigsh
+    from scipy.sparse.linalg import splu
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'generalised_eigenpairs',
+    'buckling_analysis',
+]
+
+
+def generalised_eigenpairs(A, B, k, solve=None):
+    """Largest eigenvalues of A x = mu B x for symmetric A and symmetric positive definite B.
+
+    Parameters
+    ----------
+    A : obj
+        Sparse symmetric matrix.
+    B : obj
+        Sparse symmetric positive definite matrix.
+    k : int
+        Number of eigenpairs.
+    solve : obj
+        Solver of B x = b, e.g. an existing factorisation of B.
+
+    Returns
+    -------
+    array
+        (k,) eigenvalues in descending order.
+    array
+        (nf x k) eigenvectors.
+
+    Notes
+    -----
+    - Small systems are solved densely.
+
+    """
+
+    nf = A.shape[0]
+    k = min(k, nf)
+
+    if nf <= max(2 * k + 1, 20):
+        mu, x = eigh(A.toarray(), B.toarray())
+        return mu[::-1][:k], x[:, ::-1][:, :k]
+
+    if solve is None:
+        solve = splu(B.tocsc()).solve
+
+    Minv = LinearOperator((nf, nf), matvec=solve, dtype=float)
+    mu, x = eigsh(A, k=k, M=B, Minv=Minv, which='LA')
+    order = np.argsort(mu)[::-1]
+
+    return mu[order], x[:, order]
+
+
+def buckling_analysis(model, held, applied, displacements, modes):
+    """Linear buckling (eigenvalue) analysis.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    held : dict
+        Load object names and factors of the base state from previous steps.
+    applied : dict
+        Load object names and factors of the perturbation loads.
+    displacements : dict
+        Displacement object names and their factors.
+    modes : int
+        Number of buckling modes.
+
+    Returns
+    -------
+    dict
+        (modes,) 'factors' load factors on the perturbation loads and (modes x n x 6) 'shapes'.
+
+    Notes
+    -----
+    - Solves (K + Kg_base) x = lambda (-Kg) x, with Kg the geometric stiffness of a linear static solve of the
+      perturbation loads, as the equivalent (-Kg) x = 1 / lambda (K + Kg_base) x so that the factorisation of the
+      positive definite stiffness matrix is shared by the static solve and the eigensolver.
+    - Mode shapes are normalised to a largest displacement component of 1.
+
+    """
+
+    K = model.stiffness()
+    fixed, values = model.constraints(displacements)
+    free = model.free(K, fixed)
+
+    if held:
+        F, fe = model.load_vector(held)
+        Ub = linear_solve(K, F, fixed, values, free)[0]
+        K = K + model.geometric_stiffness(Ub, fe)
+
+    Kff = K[free][:, free].tocsc()
+    solve = splu(Kff).solve
+
+    F, fe = model.load_vector(applied)
+    Up = linear_solve(K, F, fixed, 0 * values, free, solve=solve)[0]
+    Kg = model.geometric_stiffness(Up, fe)
+
+    mu, x = generalised_eigenpairs(-Kg[free][:, free], Kff, modes, solve=solve)
+    positive = mu > 0
+    mu, x = mu[positive], x[:, positive]
+
+    shapes = np.zeros((len(mu), model.ndof))
+    shapes[:, free] = x.T
+    shapes = shapes.reshape(len(mu), -1, 6)
+    translations = shapes[:, :, :3].reshape(len(mu), -1)
+    peak = translations[np.arange(len(mu)), np.argmax(abs(translations), axis=1)]
+    shapes /= peak[:, None, None]
+
+    return {'factors': 1. / mu, 'shapes': shapes}
@@ -0,0 +1,178 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import diags
+    from scipy.sparse.linalg import factorized
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'amplitude_values',
+    'dynamic_analysis',
+]
+
+
+def amplitude_values(structure, name, times):
+    """Sample an Amplitude object at the given times.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    name : str
+        Amplitude object name, None for a constant value of 1.
+    times : array
+        Times to sample.
+
+    Returns
+    -------
+    array
+        Amplitude values, linearly interpolated and held constant beyond the defined range.
+
+    """
+
+    if name is None:
+        return np.ones(len(times))
+
+    x, y = np.array(structure.misc[name].values, dtype=float).T
+
+    return np.interp(times, x, y)
+
+
+def dynamic_analysis(model, held, applied, displacements, step, U0, filename):
+    """Implicit dynamic time-history analysis with the Hilber-Hughes-Taylor (HHT-alpha) method.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    held : dict
+        Load object names and factors held constant from previous steps.
+    applied : dict
+        Load object names and factors of the step, scaled by the step amplitudes.
+    displacements : dict
+        Displacement object names and their factors.
+    step : obj
+        DynamicStep object.
+    U0 : array
+        (n x 6) initial displacements, the initial velocities are zero.
+    filename : str
+        .npy file to stream the (increments + 1 x n x 6) displacement history to.
+
+    Returns
+    -------
+    dict
+        (n x 6) arrays 'U', 'V', 'A', 'RF' and 'CF' at the end of the step and the 'time' vector.
+
+    Notes
+    -----
+    - M a + C v + K u = f(t) with lumped M and Rayleigh damping C = alpha M + beta K.
+    - With alpha = 0 the method is the Newmark average acceleration method, alpha < 0 adds numerical damping.
+    - The effective stiffness matrix is factorised once for the constant time increment.
+
+    """
+
+    structure = model.structure
+    alpha = step.alpha
+    beta = 0.25 * (1 - alpha)**2
+    gamma = 0.5 * (1 - 2 * alpha)
+    dt = step.increment
+    nt = max(1, int(round(step.duration / dt)))
+    times = np.linspace(0, nt * dt, nt + 1)
+
+    # Matrices
+
+    K = model.stiffness()
+    m = model.mass()
+    C = step.damping[0] * diags(m) + step.damping[1] * K
+    fixed, values = model.constraints(displacements)
+    free = model.free(K, fixed)
+
+    Kff = K[free][:, free]
+    Cff = C[free][:, free].tocsr()
+    mf = m[free]
+
+    # Load history
+
+    F0 = model.load_vector(held)[0]
+    amplitude = step.amplitude
+    parts = []
+
+    for name, fact in applied.items():
+        aname = amplitude.get(name, None) if isinstance(amplitude, dict) else amplitude
+        parts.append((model.load_vector({name: fact})[0], amplitude_values(structure, aname, times)))
+
+    coupling = K[free][:, fixed].dot(values)
+
+    def load(i):
+        F = F0.copy()
+        for Fi, ai in parts:
+            F += ai[i] * Fi
+        return F
+
+    # Initial conditions
+
+    a0 = 1. / (beta * dt**2)
+    a1 = gamma / (beta * dt)
+    a2 = 1. / (beta * dt)
+    a3 = 0.5 / beta - 1
+    a4 = gamma / beta - 1
+    a5 = dt * (0.5 * gamma / beta - 1)
+
+    U = U0.ravel().copy()
+    U[fixed] = values
+    u = U[free]
+    v = np.zeros(len(free))
+    a = np.zeros(len(free))
+    Fn = load(0)[free] - coupling
+    massive = mf > 0
+    a[massive] = ((Fn - Kff.dot(u) - Cff.dot(v)) / np.where(massive, mf, 1))[massive]
+
+    solve = factorized((a0 * diags(mf) + (1 + alpha) * (Kff + a1 * Cff)).tocsc())
+
+    history = np.lib.format.open_memmap(filename, mode='w+', dtype=float, shape=(nt + 1, model.n, 6))
+    history[0] = U.reshape(-1, 6)
+
+    # Time integration
+
+    for i in range(1, nt + 1):
+
+        Fn1 = load(i)[free] - coupling
+        rhs = ((1 + alpha) * Fn1 - alpha * Fn + mf * (a0 * u + a2 * v + a3 * a) +
+               (1 + alpha) * Cff.dot(a1 * u + a4 * v + a5 * a) + alpha * (Cff.dot(v) + Kff.dot(u)))
+
+        un = solve(rhs)
+        an = a0 * (un - u) - a2 * v - a3 * a
+        v = v + dt * ((1 - gamma) * a + gamma * an)
+        u, a, Fn = un, an, Fn1
+
+        U[free] = u
+        history[i] = U.reshape(-1, 6)
+
+    history.flush()
+    del history
+
+    # End state
+
+    V = np.zeros(model.ndof)
+    A = np.zeros(model.ndof)
+    V[free] = v
+    A[free] = a
+    Fend = load(nt)
+
+    RF = K.dot(U) + C.dot(V) - Fend
+    RF[free] = 0
+
+    return {'U': U.reshape(-1, 6), 'V': V.reshape(-1, 6), 'A': A.reshape(-1, 6), 'RF': RF.reshape(-1, 6),
+            'CF': Fend.reshape(-1, 6), 'time': times}
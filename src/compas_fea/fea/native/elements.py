@@ -0,0 +1,1011 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'truss_stiffness',
+    'truss_geometric_stiffness',
+    'truss_corotational',
+    'beam_axes',
+    'beam_stiffness',
+    'beam_geometric_stiffness',
+    'beam_line_load',
+    'spring_axes',
+    'spring_stiffness',
+    'spring_deformations',
+    'spring_forces',
+    'shell_axes',
+    'shell_stiffness',
+    'shell_strains',
+    'shell_geometric_stiffness',
+    'tet_stiffness',
+    'tet_strains',
+    'hex_stiffness',
+    'hex_strains',
+    'solid_geometric_stiffness',
+    'shell_conductivity',
+    'solid_conductivity',
+    'face_areas',
+    'isotropic_matrix',
+    'plane_stress_matrix',
+]
+
+
+gp = 1. / 3**0.5
+
+quad_points = [[-gp, -gp], [gp, -gp], [gp, gp], [-gp, gp]]
+quad_nodes = [[-1., -1.], [1., -1.], [1., 1.], [-1., 1.]]
+
+hex_points = [[i, j, k] for k in [-gp, gp] for j in [-gp, gp] for i in [-gp, gp]]
+hex_nodes = [[-1., -1., -1.], [1., -1., -1.], [1., 1., -1.], [-1., 1., -1.],
+             [-1., -1., 1.], [1., -1., 1.], [1., 1., 1.], [-1., 1., 1.]]
+
+
+# ==============================================================================
+# Materials
+# ==============================================================================
+
+def isotropic_matrix(E, v):
+    """Isotropic 3D elasticity matrices in Voigt order [xx, yy, zz, xy, yz, xz].
+
+    Parameters
+    ----------
+    E : array
+        (m,) Young's moduli.
+    v : array
+        (m,) Poisson's ratios.
+
+    Returns
+    -------
+    array
+        (m x 6 x 6) elasticity matrices.
+
+    """
+
+    m = len(E)
+    lam = E * v / ((1 + v) * (1 - 2 * v))
+    mu = 0.5 * E / (1 + v)
+    D = np.zeros((m, 6, 6))
+    D[:, :3, :3] = lam[:, None, None]
+    D[:, [0, 1, 2], [0, 1, 2]] += 2 * mu[:, None]
+    D[:, [3, 4, 5], [3, 4, 5]] = mu[:, None]
+
+    return D
+
+
+def plane_stress_matrix(E, v):
+    """Isotropic plane stress elasticity matrices in order [xx, yy, xy].
+
+    Parameters
+    ----------
+    E : array
+        (m,) Young's moduli.
+    v : array
+        (m,) Poisson's ratios.
+
+    Returns
+    -------
+    array
+        (m x 3 x 3) elasticity matrices.
+
+    """
+
+    m = len(E)
+    c = E / (1 - v**2)
+    D = np.zeros((m, 3, 3))
+    D[:, 0, 0] = D[:, 1, 1] = c
+    D[:, 0, 1] = D[:, 1, 0] = c * v
+    D[:, 2, 2] = 0.5 * c * (1 - v)
+
+    return D
+
+
+# ==============================================================================
+# 1D
+# ==============================================================================
+
+def truss_stiffness(X, EA):
+    """Global stiffness matrices of 2-noded truss elements.
+
+    Parameters
+    ----------
+    X : array
+        (m x 2 x 3) nodal co-ordinates.
+    EA : array
+        (m,) axial rigidities.
+
+    Returns
+    -------
+    array
+        (m x 6 x 6) stiffness matrices for the translational degrees-of-freedom.
+    array
+        (m,) element lengths.
+    array
+        (m x 3) unit direction vectors.
+
+    """
+
+    d = X[:, 1] - X[:, 0]
+    L = np.linalg.norm(d, axis=1)
+    c = d / L[:, None]
+    k = (EA / L)[:, None, None] * np.einsum('ei,ej->eij', c, c)
+    K = np.zeros((len(L), 6, 6))
+    K[:, :3, :3] = K[:, 3:, 3:] = k
+    K[:, :3, 3:] = K[:, 3:, :3] = -k
+
+    return K, L, c
+
+
+def truss_geometric_stiffness(c, L, N):
+    """Global geometric stiffness matrices of 2-noded truss elements.
+
+    Parameters
+    ----------
+    c : array
+        (m x 3) unit direction vectors.
+    L : array
+        (m,) element lengths.
+    N : array
+        (m,) axial forces, tension positive.
+
+    Returns
+    -------
+    array
+        (m x 6 x 6) geometric stiffness matrices for the translational degrees-of-freedom.
+
+    """
+
+    k = (N / L)[:, None, None] * (np.eye(3) - np.einsum('ei,ej->eij', c, c))
+    K = np.zeros((len(L), 6, 6))
+    K[:, :3, :3] = K[:, 3:, 3:] = k
+    K[:, :3, 3:] = K[:, 3:, :3] = -k
+
+    return K
+
+
+def truss_corotational(X, u, EA, L0, N0, tangent=True):
+    """Co-rotational internal forces and tangent stiffness matrices of 2-noded truss elements.
+
+    Parameters
+    ----------
+    X : array
+        (m x 2 x 3) initial nodal co-ordinates.
+    u : array
+        (m x 6) nodal translations.
+    EA : array
+        (m,) axial rigidities.
+    L0 : array
+        (m,) initial lengths.
+    N0 : array
+        (m,) initial (prestress) axial forces.
+    tangent : bool
+        Compute the tangent stiffness matrices.
+
+    Returns
+    -------
+    array
+        (m x 6) global internal nodal forces.
+    array
+        (m,) axial forces, tension positive.
+    array
+        (m x 6 x 6) tangent stiffness matrices, None if not requested.
+
+    """
+
+    d = X[:, 1] + u[:, 3:] - X[:, 0] - u[:, :3]
+    L = np.linalg.norm(d, axis=1)
+    c = d / L[:, None]
+    N = EA * (L - L0) / L0 + N0
+    f = np.hstack([-N[:, None] * c, N[:, None] * c])
+
+    if not tangent:
+        return f, N, None
+
+    cc = np.einsum('ei,ej->eij', c, c)
+    k = (EA / L0)[:, None, None] * cc + (N / L)[:, None, None] * (np.eye(3) - cc)
+    K = np.zeros((len(L), 6, 6))
+    K[:, :3, :3] = K[:, 3:, 3:] = k
+    K[:, :3, 3:] = K[:, 3:, :3] = -k
+
+    return f, N, K
+
+
+def beam_axes(X, ex):
+    """Local axes of 2-noded beam elements.
+
+    Parameters
+    ----------
+    X : array
+        (m x 2 x 3) nodal co-ordinates.
+    ex : array
+        (m x 3) section axis 1 directions, rows of zeros for the default.
+
+    Returns
+    -------
+    array
+        (m x 3 x 3) rotation matrices with rows [axis, section axis 1, section axis 2].
+    array
+        (m,) element lengths.
+
+    Notes
+    -----
+    - The default section axis 1 is global z, or global y for vertical elements.
+
+    """
+
+    d = X[:, 1] - X[:, 0]
+    L = np.linalg.norm(d, axis=1)
+    e0 = d / L[:, None]
+
+    ref = np.array(ex, dtype=float)
+    default = np.linalg.norm(ref, axis=1) == 0
+    ref[default] = [0., 0., 1.]
+    vertical = default & (abs(e0[:, 2]) > 0.999)
+    ref[vertical] = [0., 1., 0.]
+
+    e1 = ref - np.sum(ref * e0, axis=1)[:, None] * e0
+    e1 /= np.linalg.norm(e1, axis=1)[:, None]
+    e2 = np.cross(e0, e1)
+
+    return np.stack([e0, e1, e2], axis=1), L
+
+
+def beam_stiffness(R, L, E, G, A, I1, I2, J):
+    """Global stiffness matrices of 2-noded Euler-Bernoulli beam elements.
+
+    Parameters
+    ----------
+    R : array
+        (m x 3 x 3) local axes from beam_axes.
+    L : array
+        (m,) element lengths.
+    E, G : array
+        (m,) Young's and shear moduli.
+    A, I1, I2, J : array
+        (m,) area, second moments of area about section axes 1 and 2, torsion constant.
+
+    Returns
+    -------
+    array
+        (m x 12 x 12) global stiffness matrices.
+    array
+        (m x 12 x 12) local stiffness matrices.
+
+    """
+
+    m = len(L)
+    k = np.zeros((m, 12, 12))
+
+    a = E * A / L
+    t = G * J / L
+    k[:, 0, 0] = k[:, 6, 6] = a
+    k[:, 0, 6] = -a
+    k[:, 3, 3] = k[:, 9, 9] = t
+    k[:, 3, 9] = -t
+
+    # Bending in the axis-2 direction (rotation about section axis 1)
+
+    b1 = E * I1
+    k[:, 2, 2] = k[:, 8, 8] = 12 * b1 / L**3
+    k[:, 2, 8] = -12 * b1 / L**3
+    k[:, 2, 4] = k[:, 2, 10] = -6 * b1 / L**2
+    k[:, 4, 8] = k[:, 8, 10] = 6 * b1 / L**2
+    k[:, 4, 4] = k[:, 10, 10] = 4 * b1 / L
+    k[:, 4, 10] = 2 * b1 / L
+
+    # Bending in the axis-1 direction (rotation about section axis 2)
+
+    b2 = E * I2
+    k[:, 1, 1] = k[:, 7, 7] = 12 * b2 / L**3
+    k[:, 1, 7] = -12 * b2 / L**3
+    k[:, 1, 5] = k[:, 1, 11] = 6 * b2 / L**2
+    k[:, 5, 7] = k[:, 7, 11] = -6 * b2 / L**2
+    k[:, 5, 5] = k[:, 11, 11] = 4 * b2 / L
+    k[:, 5, 11] = 2 * b2 / L
+
+    iu = np.triu_indices(12, 1)
+    k[:, iu[1], iu[0]] = k[:, iu[0], iu[1]]
+
+    return _rotate(k, R, 4), k
+
+
+def beam_geometric_stiffness(R, L, N, A, I1, I2):
+    """Global geometric stiffness matrices of 2-noded beam elements.
+
+    Parameters
+    ----------
+    R : array
+        (m x 3 x 3) local axes from beam_axes.
+    L : array
+        (m,) element lengths.
+    N : array
+        (m,) axial forces, tension positive.
+    A, I1, I2 : array
+        (m,) area and second moments of area about section axes 1 and 2.
+
+    Returns
+    -------
+    array
+        (m x 12 x 12) global geometric stiffness matrices.
+
+    """
+
+    m = len(L)
+    k = np.zeros((m, 12, 12))
+
+    for i, j, s in [(1, 5, 1), (2, 4, -1)]:
+        k[:, i, i] = k[:, i + 6, i + 6] = 6. / 5
+        k[:, i, i + 6] = -6. / 5
+        k[:, i, j] = k[:, i, j + 6] = s * L / 10.
+        k[:, j, i + 6] = k[:, i + 6, j + 6] = -s * L / 10.
+        k[:, j, j] = k[:, j + 6, j + 6] = 2 * L**2 / 15.
+        k[:, j, j + 6] = -L**2 / 30.
+
+    Ip = (I1 + I2) / A
+    k[:, 3, 3] = k[:, 9, 9] = Ip
+    k[:, 3, 9] = -Ip
+
+    iu = np.triu_indices(12, 1)
+    k[:, iu[1], iu[0]] = k[:, iu[0], iu[1]]
+    k *= (N / L)[:, None, None]
+
+    return _rotate(k, R, 4)
+
+
+def beam_line_load(R, L, w):
+    """Equivalent nodal loads of uniform line loads on beam elements.
+
+    Parameters
+    ----------
+    R : array
+        (m x 3 x 3) local axes from beam_axes.
+    L : array
+        (m,) element lengths.
+    w : array
+        (m x 3) global load per unit length.
+
+    Returns
+    -------
+    array
+        (m x 12) global equivalent nodal loads.
+    array
+        (m x 12) local equivalent nodal loads.
+
+    """
+
+    wl = np.einsum('eij,ej->ei', R, w)
+    f = np.zeros((len(L), 12))
+    f[:, 0:3] = f[:, 6:9] = 0.5 * wl * L[:, None]
+    f[:, 4] = -wl[:, 2] * L**2 / 12.
+    f[:, 5] = +wl[:, 1] * L**2 / 12.
+    f[:, 10] = -f[:, 4]
+    f[:, 11] = -f[:, 5]
+    fg = np.einsum('eji,eaj->eai', R, f.reshape(-1, 4, 3)).reshape(-1, 12)
+
+    return fg, f
+
+
+def spring_axes(d):
+    """Local axes of spring elements.
+
+    Parameters
+    ----------
+    d : array
+        (m x 3) unit axial directions.
+
+    Returns
+    -------
+    array
+        (m x 3 x 3) rotation matrices with rows [axial, lateral 1, lateral 2].
+
+    """
+
+    ref = np.zeros(d.shape)
+    ref[:, 2] = 1.
+    ref[abs(d[:, 2]) > 0.999] = [0., 1., 0.]
+    e1 = np.cross(ref, d)
+    e1 /= np.linalg.norm(e1, axis=1)[:, None]
+
+    return np.stack([d, e1, np.cross(d, e1)], axis=1)
+
+
+def spring_stiffness(T, k, nn):
+    """Global stiffness matrices of spring elements.
+
+    Parameters
+    ----------
+    T : array
+        (m x 3 x 3) local axes from spring_axes.
+    k : array
+        (m x 6) stiffnesses of the local channels [axial, lateral 1, lateral 2, rotation 1, rotation 2, rotation 3].
+    nn : int
+        Number of nodes per element, 1 for springs to ground or 2.
+
+    Returns
+    -------
+    array
+        (m x 6nn x 6nn) global stiffness matrices.
+
+    """
+
+    m = len(T)
+    kl = np.zeros((m, 6, 6))
+    kl[:, range(6), range(6)] = k
+    kg = _rotate(kl, T, 2)
+
+    if nn == 1:
+        return kg
+
+    K = np.zeros((m, 12, 12))
+    K[:, :6, :6] = K[:, 6:, 6:] = kg
+    K[:, :6, 6:] = K[:, 6:, :6] = -kg
+
+    return K
+
+
+def spring_deformations(T, u, nn):
+    """Local channel deformations of spring elements.
+
+    Parameters
+    ----------
+    T : array
+        (m x 3 x 3) local axes from spring_axes.
+    u : array
+        (m x 6nn) global element displacements.
+    nn : int
+        Number of nodes per element.
+
+    Returns
+    -------
+    array
+        (m x 6) relative displacements and rotations in the local channels.
+
+    """
+
+    u = u.reshape(len(T), nn, 2, 3)
+    du = u[:, -1] - u[:, 0] if nn == 2 else u[:, 0]
+
+    return np.einsum('eij,eaj->eai', T, du).reshape(-1, 6)
+
+
+def spring_forces(T, f, nn):
+    """Global element nodal forces of spring elements from their local channel forces.
+
+    Parameters
+    ----------
+    T : array
+        (m x 3 x 3) local axes from spring_axes.
+    f : array
+        (m x 6) local channel forces and moments.
+    nn : int
+        Number of nodes per element.
+
+    Returns
+    -------
+    array
+        (m x 6nn) global element nodal forces.
+
+    """
+
+    fg = np.einsum('eji,eaj->eai', T, f.reshape(-1, 2, 3)).reshape(-1, 6)
+
+    if nn == 1:
+        return fg
+
+    return np.hstack([-fg, fg])
+
+
+# ==============================================================================
+# 2D
+# ==============================================================================
+
+def _quad_shape(xi, eta):
+    a, b = np.array(quad_nodes).T
+    N = 0.25 * (1 + a * xi) * (1 + b * eta)
+    dN = 0.25 * np.array([a * (1 + b * eta), b * (1 + a * xi)])
+    return N, dN
+
+
+def shell_axes(X, ex):
+    """Local axes of flat 4-noded shell elements (triangles as collapsed quads).
+
+    Parameters
+    ----------
+    X : array
+        (m x 4 x 3) nodal co-ordinates.
+    ex : array
+        (m x 3) reference local x directions, rows of zeros for the default.
+
+    Returns
+    -------
+    array
+        (m x 3 x 3) rotation matrices with rows [e1, e2, e3].
+    array
+        (m x 4 x 2) local in-plane nodal co-ordinates.
+
+    Notes
+    -----
+    - As in Abaqus, the default local 1-direction is the projection of global x, or of global z if the shell normal
+      is within 0.1 degrees of global x.
+
+    """
+
+    e3 = np.cross(X[:, 2] - X[:, 0], X[:, 3] - X[:, 1])
+    e3 /= np.linalg.norm(e3, axis=1)[:, None]
+
+    ref = np.array(ex, dtype=float)
+    default = np.linalg.norm(ref, axis=1) == 0
+    ref[default] = [1., 0., 0.]
+    parallel = default & (abs(e3[:, 0]) > np.cos(np.radians(0.1)))
+    ref[parallel] = [0., 0., 1.]
+
+    e1 = ref - np.sum(ref * e3, axis=1)[:, None] * e3
+    e1 /= np.linalg.norm(e1, axis=1)[:, None]
+    e2 = np.cross(e3, e1)
+    R = np.stack([e1, e2, e3], axis=1)
+
+    xl = np.einsum('eij,enj->eni', R, X - np.mean(X, axis=1)[:, None])[:, :, :2]
+
+    return R, xl
+
+
+def _shell_b(xl, xi, eta):
+    """Membrane, bending and MITC4 shear strain-displacement matrices at a point."""
+
+    m = len(xl)
+    N, dN = _quad_shape(xi, eta)
+    J = np.einsum('an,enb->eab', dN, xl)
+    detJ = J[:, 0, 0] * J[:, 1, 1] - J[:, 0, 1] * J[:, 1, 0]
+    invJ = np.stack([np.stack([J[:, 1, 1], -J[:, 0, 1]], axis=1),
+                     np.stack([-J[:, 1, 0], J[:, 0, 0]], axis=1)], axis=1) / detJ[:, None, None]
+    dNx = np.einsum('eab,bn->ean', invJ, dN)
+
+    Bm = np.zeros((m, 3, 24))
+    Bb = np.zeros((m, 3, 24))
+    Bm[:, 0, 0::6] = dNx[:, 0]
+    Bm[:, 1, 1::6] = dNx[:, 1]
+    Bm[:, 2, 0::6] = dNx[:, 1]
+    Bm[:, 2, 1::6] = dNx[:, 0]
+    Bb[:, 0, 4::6] = dNx[:, 0]
+    Bb[:, 1, 3::6] = -dNx[:, 1]
+    Bb[:, 2, 4::6] = dNx[:, 1]
+    Bb[:, 2, 3::6] = -dNx[:, 0]
+
+    # MITC4 assumed covariant transverse shear strains from the edge mid-point tying points
+
+    def covariant(xt, et, direction):
+        Nt, dNt = _quad_shape(xt, et)
+        Jt = np.einsum('an,enb->eab', dNt, xl)[:, direction]
+        B = np.zeros((m, 24))
+        B[:, 2::6] = dNt[direction]
+        B[:, 4::6] = Nt[None, :] * Jt[:, 0][:, None]
+        B[:, 3::6] = -Nt[None, :] * Jt[:, 1][:, None]
+        return B
+
+    g_xi = 0.5 * (1 + eta) * covariant(0, 1, 0) + 0.5 * (1 - eta) * covariant(0, -1, 0)
+    g_eta = 0.5 * (1 + xi) * covariant(1, 0, 1) + 0.5 * (1 - xi) * covariant(-1, 0, 1)
+    Bs = np.einsum('eab,ebj->eaj', invJ, np.stack([g_xi, g_eta], axis=1))
+
+    return Bm, Bb, Bs, detJ
+
+
+def shell_stiffness(R, xl, E, v, t, membrane=False):
+    """Global stiffness matrices of flat MITC4 shell or membrane elements.
+
+    Parameters
+    ----------
+    R : array
+        (m x 3 x 3) local axes from shell_axes.
+    xl : array
+        (m x 4 x 2) local in-plane nodal co-ordinates from shell_axes.
+    E, v, t : array
+        (m,) Young's moduli, Poisson's ratios and thicknesses.
+    membrane : bool
+        Membrane stiffness only.
+
+    Returns
+    -------
+    array
+        (m x 24 x 24) global stiffness matrices.
+    array
+        (m,) element areas.
+
+    Notes
+    -----
+    - Bending uses Mindlin-Reissner theory with MITC4 transverse shear, membrane and bending 2x2 Gauss integration.
+    - A small drilling stiffness is added to the local rotation about the normal.
+
+    """
+
+    m = len(E)
+    Dp = plane_stress_matrix(E, v)
+    Dm = Dp * t[:, None, None]
+    Db = Dp * (t**3 / 12.)[:, None, None]
+    Ds = (5. / 6) * (0.5 * E / (1 + v) * t)[:, None, None] * np.eye(2)
+
+    k = np.zeros((m, 24, 24))
+    area = np.zeros(m)
+
+    for xi, eta in quad_points:
+        Bm, Bb, Bs, detJ = _shell_b(xl, xi, eta)
+        w = abs(detJ)[:, None, None]
+        area += abs(detJ)
+        k += w * np.einsum('eai,eab,ebj->eij', Bm, Dm, Bm)
+        if not membrane:
+            k += w * np.einsum('eai,eab,ebj->eij', Bb, Db, Bb)
+            k += w * np.einsum('eai,eab,ebj->eij', Bs, Ds, Bs)
+
+    if not membrane:
+        drill = 1e-4 * 0.5 * E / (1 + v) * t * area / 4.
+        k[:, 5::6, 5::6] += drill[:, None, None] * np.eye(4)
+
+    return _rotate(k, R, 8), area
+
+
+def shell_strains(R, xl, u):
+    """Membrane strains, curvatures and transverse shear strains at the 2x2 Gauss points.
+
+    Parameters
+    ----------
+    R : array
+        (m x 3 x 3) local axes from shell_axes.
+    xl : array
+        (m x 4 x 2) local in-plane nodal co-ordinates.
+    u : array
+        (m x 24) global element displacements.
+
+    Returns
+    -------
+    array
+        (m x 4 x 3) membrane strains [exx, eyy, gxy].
+    array
+        (m x 4 x 3) curvatures [kxx, kyy, kxy].
+    array
+        (m x 4 x 2) transverse shear strains [gxz, gyz].
+
+    """
+
+    ul = np.einsum('eij,eaj->eai', R, u.reshape(-1, 8, 3)).reshape(-1, 24)
+    em, kb, gs = [], [], []
+
+    for xi, eta in quad_points:
+        Bm, Bb, Bs, _ = _shell_b(xl, xi, eta)
+        em.append(np.einsum('eij,ej->ei', Bm, ul))
+        kb.append(np.einsum('eij,ej->ei', Bb, ul))
+        gs.append(np.einsum('eij,ej->ei', Bs, ul))
+
+    return np.stack(em, axis=1), np.stack(kb, axis=1), np.stack(gs, axis=1)
+
+
+def shell_geometric_stiffness(R, xl, N):
+    """Global geometric stiffness matrices of flat 4-noded shell or membrane elements.
+
+    Parameters
+    ----------
+    R : array
+        (m x 3 x 3) local axes from shell_axes.
+    xl : array
+        (m x 4 x 2) local in-plane nodal co-ordinates.
+    N : array
+        (m x 4 x 3) membrane forces [Nxx, Nyy, Nxy] at the 2x2 Gauss points.
+
+    Returns
+    -------
+    array
+        (m x 24 x 24) global geometric stiffness matrices.
+
+    """
+
+    m = len(xl)
+    k = np.zeros((m, 24, 24))
+
+    for g, (xi, eta) in enumerate(quad_points):
+        Bm, _, _, detJ = _shell_b(xl, xi, eta)
+        dNx = np.stack([Bm[:, 0, 0::6], Bm[:, 1, 1::6]], axis=1)
+        S = np.stack([np.stack([N[:, g, 0], N[:, g, 2]], axis=1), np.stack([N[:, g, 2], N[:, g, 1]], axis=1)], axis=1)
+        kn = abs(detJ)[:, None, None] * np.einsum('ean,eab,ebo->eno', dNx, S, dNx)
+        for i in range(3):
+            k[:, i::6, i::6] += kn
+
+    return _rotate(k, R, 8)
+
+
+# ==============================================================================
+# 3D
+# ==============================================================================
+
+def _solid_b(dNx):
+    m, _, n = dNx.shape
+    B = np.zeros((m, 6, 3 * n))
+    B[:, 0, 0::3] = dNx[:, 0]
+    B[:, 1, 1::3] = dNx[:, 1]
+    B[:, 2, 2::3] = dNx[:, 2]
+    B[:, 3, 0::3] = dNx[:, 1]
+    B[:, 3, 1::3] = dNx[:, 0]
+    B[:, 4, 1::3] = dNx[:, 2]
+    B[:, 4, 2::3] = dNx[:, 1]
+    B[:, 5, 0::3] = dNx[:, 2]
+    B[:, 5, 2::3] = dNx[:, 0]
+    return B
+
+
+def _tet_b(X):
+    m = len(X)
+    C = np.ones((m, 4, 4))
+    C[:, :, 1:] = X
+    volume = abs(np.linalg.det(C)) / 6.
+    dNx = np.linalg.inv(C)[:, 1:, :]
+    return _solid_b(dNx), volume
+
+
+def tet_stiffness(X, D):
+    """Global stiffness matrices of 4-noded constant strain tetrahedra.
+
+    Parameters
+    ----------
+    X : array
+        (m x 4 x 3) nodal co-ordinates.
+    D : array
+        (m x 6 x 6) elasticity matrices.
+
+    Returns
+    -------
+    array
+        (m x 12 x 12) stiffness matrices for the translational degrees-of-freedom.
+    array
+        (m,) element volumes.
+
+    """
+
+    B, volume = _tet_b(X)
+    k = volume[:, None, None] * np.einsum('eai,eab,ebj->eij', B, D, B)
+
+    return k, volume
+
+
+def tet_strains(X, u):
+    """Strains [exx, eyy, ezz, gxy, gyz, gxz] of 4-noded tetrahedra.
+
+    Parameters
+    ----------
+    X : array
+        (m x 4 x 3) nodal co-ordinates.
+    u : array
+        (m x 12) element translations.
+
+    Returns
+    -------
+    array
+        (m x 1 x 6) strains at the single integration point.
+
+    """
+
+    B, _ = _tet_b(X)
+
+    return np.einsum('eij,ej->ei', B, u)[:, None, :]
+
+
+def _hex_b(X, point):
+    xi, eta, zeta = point
+    a, b, c = np.array(hex_nodes).T
+    dN = 0.125 * np.array([a * (1 + b * eta) * (1 + c * zeta),
+                           b * (1 + a * xi) * (1 + c * zeta),
+                           c * (1 + a * xi) * (1 + b * eta)])
+    J = np.einsum('an,enb->eab', dN, X)
+    detJ = np.linalg.det(J)
+    dNx = np.einsum('eab,bn->ean', np.linalg.inv(J), dN)
+    return _solid_b(dNx), detJ
+
+
+def hex_stiffness(X, D):
+    """Global stiffness matrices of 8-noded hexahedra (pentahedra as collapsed hexahedra).
+
+    Parameters
+    ----------
+    X : array
+        (m x 8 x 3) nodal co-ordinates.
+    D : array
+        (m x 6 x 6) elasticity matrices.
+
+    Returns
+    -------
+    array
+        (m x 24 x 24) stiffness matrices for the translational degrees-of-freedom.
+    array
+        (m,) element volumes.
+
+    Notes
+    -----
+    - Full 2x2x2 Gauss integration.
+
+    """
+
+    k = np.zeros((len(X), 24, 24))
+    volume = np.zeros(len(X))
+
+    for point in hex_points:
+        B, detJ = _hex_b(X, point)
+        w = abs(detJ)
+        volume += w
+        k += w[:, None, None] * np.einsum('eai,eab,ebj->eij', B, D, B)
+
+    return k, volume
+
+
+def hex_strains(X, u):
+    """Strains [exx, eyy, ezz, gxy, gyz, gxz] of 8-noded hexahedra at the 2x2x2 Gauss points.
+
+    Parameters
+    ----------
+    X : array
+        (m x 8 x 3) nodal co-ordinates.
+    u : array
+        (m x 24) element translations.
+
+    Returns
+    -------
+    array
+        (m x 8 x 6) strains at the integration points.
+
+    """
+
+    return np.stack([np.einsum('eij,ej->ei', _hex_b(X, point)[0], u) for point in hex_points], axis=1)
+
+
+def solid_geometric_stiffness(X, S):
+    """Global geometric stiffness matrices of tetrahedra (one point) or hexahedra (2x2x2 Gauss points).
+
+    Parameters
+    ----------
+    X : array
+        (m x 4 x 3) or (m x 8 x 3) nodal co-ordinates.
+    S : array
+        (m x ng x 6) stresses [sxx, syy, szz, sxy, syz, sxz] at the integration points.
+
+    Returns
+    -------
+    array
+        (m x 3nn x 3nn) geometric stiffness matrices for the translational degrees-of-freedom.
+
+    """
+
+    m, nn, _ = X.shape
+    k = np.zeros((m, 3 * nn, 3 * nn))
+
+    if nn == 4:
+        points = [_tet_b(X)]
+    else:
+        points = [_hex_b(X, point) for point in hex_points]
+
+    for g, (B, w) in enumerate(points):
+        dNx = np.stack([B[:, 0, 0::3], B[:, 1, 1::3], B[:, 2, 2::3]], axis=1)
+        s = S[:, g]
+        T = np.stack([s[:, [0, 3, 5]], s[:, [3, 1, 4]], s[:, [5, 4, 2]]], axis=1)
+        kn = abs(w)[:, None, None] * np.einsum('ean,eab,ebo->eno', dNx, T, dNx)
+        for i in range(3):
+            k[:, i::3, i::3] += kn
+
+    return k
+
+
+# ==============================================================================
+# Heat
+# ==============================================================================
+
+def shell_conductivity(xl, k, t):
+    """In-plane conductivity matrices of flat 4-noded shell or membrane elements.
+
+    Parameters
+    ----------
+    xl : array
+        (m x 4 x 2) local in-plane nodal co-ordinates from shell_axes.
+    k, t : array
+        (m,) conductivities and thicknesses.
+
+    Returns
+    -------
+    array
+        (m x 4 x 4) conductivity matrices for the nodal temperatures.
+    array
+        (m,) element areas.
+
+    """
+
+    c = np.zeros((len(xl), 4, 4))
+    area = np.zeros(len(xl))
+
+    for xi, eta in quad_points:
+        Bm, _, _, detJ = _shell_b(xl, xi, eta)
+        dNx = np.stack([Bm[:, 0, 0::6], Bm[:, 1, 1::6]], axis=1)
+        area += abs(detJ)
+        c += (abs(detJ) * k * t)[:, None, None] * np.einsum('ean,eao->eno', dNx, dNx)
+
+    return c, area
+
+
+def solid_conductivity(X, k):
+    """Conductivity matrices of tetrahedra (one point) or hexahedra (2x2x2 Gauss points).
+
+    Parameters
+    ----------
+    X : array
+        (m x 4 x 3) or (m x 8 x 3) nodal co-ordinates.
+    k : array
+        (m,) conductivities.
+
+    Returns
+    -------
+    array
+        (m x nn x nn) conductivity matrices for the nodal temperatures.
+    array
+        (m,) element volumes.
+
+    """
+
+    m, nn, _ = X.shape
+    c = np.zeros((m, nn, nn))
+    volume = np.zeros(m)
+
+    if nn == 4:
+        points = [_tet_b(X)]
+    else:
+        points = [_hex_b(X, point) for point in hex_points]
+
+    for B, w in points:
+        dNx = np.stack([B[:, 0, 0::3], B[:, 1, 1::3], B[:, 2, 2::3]], axis=1)
+        volume += abs(w)
+        c += (abs(w) * k)[:, None, None] * np.einsum('ean,eao->eno', dNx, dNx)
+
+    return c, volume
+
+
+def face_areas(X):
+    """Lumped nodal areas of flat or warped quadrilateral faces (triangles with a repeated last node).
+
+    Parameters
+    ----------
+    X : array
+        (f x 4 x 3) face nodal co-ordinates.
+
+    Returns
+    -------
+    array
+        (f x 4) nodal areas, summing to the face areas.
+
+    Notes
+    -----
+    - The face is split into triangles along both diagonals and the triangle areas are shared equally by their nodes.
+
+    """
+
+    a = np.zeros(X.shape[:2])
+
+    for i, j, k in [(0, 1, 2), (0, 2, 3), (0, 1, 3), (1, 2, 3)]:
+        A = 0.5 * np.linalg.norm(np.cross(X[:, j] - X[:, i], X[:, k] - X[:, i]), axis=1)
+        for n in (i, j, k):
+            a[:, n] += A / 6.
+
+    return a
+
+
+# ==============================================================================
+# Transformations
+# ==============================================================================
+
+def _rotate(k, R, blocks):
+    """Rotate local element matrices of 3x3 blocks to global axes, K = T^T k T."""
+
+    m = len(k)
+    kb = k.reshape(m, blocks, 3, blocks, 3)
+    K = np.einsum('eki,eakbl,elj->eaibj', R, kb, R)
+
+    return K.reshape(m, 3 * blocks, 3 * blocks)
@@ -0,0 +1,103 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import diags
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'harmonic_analysis',
+]
+
+
+_sweep = {}
+
+
+def _initialise(K, M, C, zeta, F):
+    _sweep.update({'K': K, 'M': M, 'C': C, 'zeta': zeta, 'F': F})
+
+
+def _solve(w):
+    K, M, C, zeta, F = [_sweep[i] for i in ['K', 'M', 'C', 'zeta', 'F']]
+    A = (1 + 2j * zeta) * K - w**2 * M + 1j * w * C
+    return spsolve(A.tocsc(), F)
+
+
+def harmonic_analysis(model, applied, displacements, step, cpus=1):
+    """Direct steady-state harmonic analysis over a list of frequencies.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    applied : dict
+        Load object names and factors of the step.
+    displacements : dict
+        Displacement object names and their factors.
+    step : obj
+        HarmonicStep object.
+    cpus : int
+        Number of processes to distribute the frequencies over.
+
+    Returns
+    -------
+    dict
+        (n_freq,) 'frequencies' and (n_freq x n x 6) complex 'harmonic' displacement amplitudes.
+
+    Notes
+    -----
+    - Solves (K - w^2 M + i w C) u = F independently for each frequency w = 2 pi f.
+    - A float step.damping is a constant (hysteretic) damping ratio z, with i w C = 2 i z K, a list is Rayleigh
+      damping [alpha, beta] with C = alpha M + beta K.
+    - HarmonicPressureLoad phases are in radians.
+
+    """
+
+    K = model.stiffness()
+    m = model.mass()
+    fixed, _ = model.constraints(displacements)
+    free = model.free(K, fixed)
+
+    damping = step.damping or 0.
+    zeta, rayleigh = (0., damping) if isinstance(damping, (list, tuple)) else (damping, [0., 0.])
+    C = rayleigh[0] * diags(m) + rayleigh[1] * K
+
+    F = np.zeros(model.ndof, dtype=complex)
+
+    for name, fact in applied.items():
+        phase = model.structure.loads[name].components.get('phase', None) or 0.
+        F += np.exp(1j * phase) * model.load_vector({name: fact})[0]
+
+    args = (K[free][:, free].tocsr(), diags(m[free]).tocsr(), C[free][:, free].tocsr(), zeta, F[free])
+    frequencies = np.array(step.freq_list, dtype=float)
+    omegas = 2 * np.pi * frequencies
+
+    if cpus > 1 and len(omegas) > 1:
+        pool = Pool(processes=min(cpus, len(omegas)), initializer=_initialise, initargs=args)
+        try:
+            solutions = pool.map(_solve, omegas, chunksize=max(1, len(omegas) // (4 * cpus)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _initialise(*args)
+        solutions = [_solve(w) for w in omegas]
+
+    U = np.zeros((len(omegas), model.ndof), dtype=complex)
+    U[:, free] = solutions
+
+    return {'frequencies': frequencies, 'harmonic': U.reshape(len(omegas), -1, 6)}
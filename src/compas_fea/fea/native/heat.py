@@ -0,0 +1,283 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+from compas_fea.fea.native import elements as kernels
+from compas_fea.fea.native.dynamic import amplitude_values
+from compas_fea.fea.native.model import element_selection
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse import diags
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'thermal_properties',
+    'thermal_matrices',
+    'interface_areas',
+    'heat_analysis',
+]
+
+
+stefan_boltzmann = 5.670374419e-8
+
+
+def thermal_properties(model, group, name, T):
+    """Temperature dependent ThermalMaterial data of the elements of a group.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    group : obj
+        Group object.
+    name : str
+        'k' conductivity, 'p' density or 'c' specific heat.
+    T : array
+        (n,) nodal temperatures.
+
+    Returns
+    -------
+    array
+        (m,) values linearly interpolated at the mean element temperatures, held constant beyond the data.
+
+    """
+
+    values = np.zeros(len(group.ekeys))
+    Te = T[group.nodes].mean(axis=1)
+
+    for material, tables in model.thermal.items():
+        rows = group.materials == material
+        x, y = tables[name]
+        values[rows] = np.interp(Te[rows], x, y)
+
+    return values
+
+
+def _thermal_groups(model):
+    return [group for group in model.groups if group.kind in ['shell', 'membrane', 'tet', 'hex'] and
+            any(np.any(group.materials == name) for name in model.thermal)]
+
+
+def thermal_matrices(model, T):
+    """Assemble the conductivity matrix and lumped heat capacities of the shell and solid elements.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    T : array
+        (n,) nodal temperatures to evaluate the material data at.
+
+    Returns
+    -------
+    obj
+        (n x n) sparse CSR conductivity matrix.
+    array
+        (n,) nodal heat capacities.
+
+    Notes
+    -----
+    - Shells and membranes conduct in their plane only, through their thickness.
+
+    """
+
+    rows, cols, vals = [], [], []
+    C = np.zeros(model.n)
+
+    for group in _thermal_groups(model):
+
+        X = model.coordinates(group)
+        k = thermal_properties(model, group, 'k', T)
+
+        if group.kind in ['shell', 'membrane']:
+            _, xl = kernels.shell_axes(X, group.data['ex'])
+            c, area = kernels.shell_conductivity(xl, k, group.data['t'])
+            size = area * group.data['t']
+        else:
+            c, size = kernels.solid_conductivity(X, k)
+
+        nn = group.nodes.shape[1]
+        rows.append(np.repeat(group.nodes, nn, axis=1).ravel())
+        cols.append(np.tile(group.nodes, (1, nn)).ravel())
+        vals.append(c.ravel())
+        capacity = thermal_properties(model, group, 'p', T) * thermal_properties(model, group, 'c', T) * size
+        np.add.at(C, group.nodes, capacity[:, None] * group.weights)
+
+    if not rows:
+        return coo_matrix((model.n, model.n)).tocsr(), C
+
+    K = coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(model.n, model.n))
+
+    return K.tocsr(), C
+
+
+def interface_areas(model, interface):
+    """Lumped nodal areas of a HeatTransfer interface.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    interface : str, list
+        Element set name(s) and/or element keys of the interface.
+
+    Returns
+    -------
+    array
+        (n,) nodal areas.
+
+    Notes
+    -----
+    - Shell and membrane elements contribute one face, solid elements their faces on the outside of the mesh.
+
+    """
+
+    ekeys = np.array(element_selection(model.structure, interface), dtype=int)
+    a = np.zeros(model.n)
+
+    for group in model.groups:
+        if group.kind in ['shell', 'membrane']:
+            rows = np.nonzero(np.isin(group.ekeys, ekeys))[0]
+            if len(rows):
+                np.add.at(a, group.nodes[rows], kernels.face_areas(model.coordinates(group)[rows]))
+
+    faces, owners = model.external_faces()
+    faces = faces[np.isin(owners, ekeys)]
+    np.add.at(a, faces, kernels.face_areas(model.xyz[faces]))
+
+    return a
+
+
+def heat_analysis(model, step, T0, filename, iterations=100, tolerance=1e-6):
+    """Steady-state or transient heat conduction analysis with film and radiation boundary conditions.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    step : obj
+        HeatStep object.
+    T0 : array
+        (n,) initial nodal temperatures.
+    filename : str
+        .npy file to stream the (increments + 1 x n) temperature history of a transient step to.
+    iterations : int
+        Maximum number of fixed-point iterations per increment for radiation and temperature dependent data.
+    tolerance : float
+        Relative temperature change for convergence of the fixed-point iterations.
+
+    Returns
+    -------
+    dict
+        (n,) nodal temperatures 'T' at the end of the step, and for transient steps the increment 'time' vector.
+
+    Notes
+    -----
+    - step.interaction names one or a list of HeatTransfer objects, each with a film q = h (T_sink - T) and a
+      radiation q = e s (T_ambient^4 - T^4) condition on its interface, with the sink and ambient temperatures scaled
+      by the interaction amplitude over the step time. Temperatures are absolute for radiation.
+    - Transient steps use backward Euler increments of duration / increments, halved when the largest temperature
+      change of an increment exceeds step.dTmax and grown again when it is well below.
+    - The history file is memory-mapped with step.increments + 1 rows, doubled on disk if cutbacks need more. Rows
+      beyond the length of the returned time vector are unused.
+
+    """
+
+    structure = model.structure
+    names = step.interaction if isinstance(step.interaction, list) else [step.interaction]
+    interactions = [structure.interactions[name] for name in names]
+    areas = [interface_areas(model, i.interface) for i in interactions]
+
+    K0, C0 = thermal_matrices(model, T0)
+    active = np.nonzero((np.asarray(abs(K0).sum(axis=1)).ravel() > 0) | (C0 > 0))[0]
+    dependent = any(len(tables[i][0]) > 1 for tables in model.thermal.values() for i in ['k', 'p', 'c'])
+
+    def system(T, t):
+        K, C = thermal_matrices(model, T) if dependent else (K0, C0)
+        h = np.zeros(model.n)
+        f = np.zeros(model.n)
+        for interaction, a in zip(interactions, areas):
+            scale = amplitude_values(structure, interaction.amplitude, [t])[0]
+            if interaction.film_coef:
+                h += interaction.film_coef * a
+                f += interaction.film_coef * a * interaction.sink_temp * scale
+            if interaction.emissivity:
+                Ta = interaction.ambient_temp * scale
+                hr = interaction.emissivity * stefan_boltzmann * a * (T**2 + Ta**2) * (T + Ta)
+                h += hr
+                f += hr * Ta
+        return (K + diags(h)).tocsr()[active][:, active], f[active], C[active]
+
+    def solve(T, t, dt):
+        Tn = T.copy()
+        for iteration in range(iterations):
+            A, f, c = system(Tn, t)
+            if dt:
+                A = A + diags(c / dt)
+                f = f + c / dt * T[active]
+            Ti = Tn.copy()
+            Ti[active] = spsolve(A.tocsc(), f)
+            change = np.max(abs(Ti - Tn))
+            Tn = Ti
+            if change <= tolerance * max(1., np.max(abs(Tn))):
+                break
+        return Tn
+
+    T = np.array(T0, dtype=float)
+
+    if step.steady:
+        return {'T': solve(T, step.duration, None)}
+
+    dt0 = step.duration / max(1, step.increments)
+    dt = dt0
+    t = 0.
+    times = [t]
+    history = np.lib.format.open_memmap(filename, mode='w+', dtype=float, shape=(max(1, step.increments) + 1, model.n))
+    history[0] = T
+
+    while t < step.duration * (1 - 1e-12):
+
+        dt = min(dt, step.duration - t)
+        Tn = solve(T, t + dt, dt)
+        change = np.max(abs(Tn - T))
+
+        if step.dTmax and change > step.dTmax and dt > 1e-3 * dt0:
+            dt *= 0.5
+            continue
+
+        t += dt
+        T = Tn
+
+        if len(times) == len(history):
+            grown = np.lib.format.open_memmap(filename + '.tmp', mode='w+', dtype=float, shape=(2 * len(times), model.n))
+            grown[:len(times)] = history
+            grown.flush()
+            del grown, history
+            os.remove(filename)
+            os.rename(filename + '.tmp', filename)
+            history = np.lib.format.open_memmap(filename, mode='r+')
+
+        history[len(times)] = T
+        times.append(t)
+
+        if not step.dTmax or change < 0.5 * step.dTmax:
+            dt = min(1.5 * dt, dt0)
+
+    history.flush()
+    del history
+
+    return {'T': T, 'time': np.array(times)}
@@ -0,0 +1,1133 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native import elements as kernels
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import coo_matrix
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'Model',
+    'node_selection',
+    'element_selection',
+]
+
+
+dofs = ['x', 'y', 'z', 'xx', 'yy', 'zz']
+
+truss_sections = ['TrussSection', 'StrutSection', 'TieSection']
+beam_sections = ['AngleSection', 'BoxSection', 'CircularSection', 'GeneralSection', 'ISection', 'PipeSection',
+                 'RectangularSection', 'TrapezoidalSection']
+
+solid_faces = {
+    'tet': [[0, 2, 1, 1], [0, 1, 3, 3], [1, 2, 3, 3], [0, 3, 2, 2]],
+    'hex': [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]],
+}
+
+
+def node_selection(structure, nodes):
+    """Resolve node set names and/or node keys to a list of node keys.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    nodes : str, int, list
+        Node set name(s) and/or node keys.
+
+    Returns
+    -------
+    list
+        Node keys.
+
+    """
+
+    if isinstance(nodes, (str, int)):
+        nodes = [nodes]
+
+    keys = []
+
+    for node in nodes:
+        if isinstance(node, str):
+            keys.extend(structure.sets[node].selection)
+        else:
+            keys.append(node)
+
+    return keys
+
+
+def element_selection(structure, elements):
+    """Resolve element set names and/or element keys to a list of element keys.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    elements : str, int, list
+        Element set name(s) and/or element keys.
+
+    Returns
+    -------
+    list
+        Element keys.
+
+    """
+
+    return node_selection(structure, elements)
+
+
+class Group(object):
+    """Elements of one formulation with their vectorised properties.
+
+    Parameters
+    ----------
+    kind : str
+        'truss', 'beam', 'spring', 'shell', 'membrane', 'tet', 'hex' or 'mass'.
+    nn : int
+        Number of nodes per element.
+    superelement : str
+        Name of the Superelement object the elements belong to, if any.
+
+    Attributes
+    ----------
+    kind : str
+        Element formulation.
+    nn : int
+        Number of nodes per element.
+    superelement : str
+        Superelement name or None.
+    ekeys : array
+        (m,) element keys.
+    nodes : array
+        (m x nn) element node keys, triangles and pentahedra are stored collapsed.
+    dofs : array
+        (m x nd) global degree-of-freedom numbers of the element matrices.
+    weights : array
+        (m x nn) lumping weights of the element nodes.
+    data : dict
+        (m,) arrays of material and section data.
+    sections : array
+        (m,) section names.
+    materials : array
+        (m,) material names.
+    k : array
+        (m x nd x nd) global element stiffness matrices.
+
+    """
+
+    def __init__(self, kind, nn, superelement=None):
+        self.kind = kind
+        self.nn = nn
+        self.superelement = superelement
+        self.ekeys = []
+        self.nodes = []
+        self.sections = []
+        self.materials = []
+        self.data = {}
+        self.k = None
+
+    def append(self, ekey, nodes, section, material, **data):
+        self.ekeys.append(ekey)
+        self.nodes.append(nodes)
+        self.sections.append(section)
+        self.materials.append(material)
+        for key, value in data.items():
+            self.data.setdefault(key, []).append(value)
+
+    def finalise(self):
+        self.ekeys = np.array(self.ekeys, dtype=int)
+        self.nodes = np.array(self.nodes, dtype=int)
+        self.sections = np.array(self.sections)
+        self.materials = np.array(self.materials)
+        self.data = {key: np.array(value, dtype=float) for key, value in self.data.items()}
+
+        if self.kind in ['truss', 'tet', 'hex']:
+            local = [0, 1, 2]
+        else:
+            local = [0, 1, 2, 3, 4, 5]
+
+        self.dofs = (6 * self.nodes[:, :, None] + np.array(local)[None, None, :]).reshape(len(self.ekeys), -1)
+
+        weights = np.ones(self.nodes.shape) / self.nn
+        collapsed = self.nodes[:, -1] == self.nodes[:, -2]
+
+        if self.kind in ['shell', 'membrane']:
+            weights[collapsed] = [1. / 3, 1. / 3, 1. / 3, 0.]
+        elif self.kind == 'hex':
+            weights[collapsed] = [1. / 6, 1. / 6, 1. / 6, 0., 1. / 6, 1. / 6, 1. / 6, 0.]
+
+        self.weights = weights
+
+
+class Model(object):
+    """Assembled arrays of a Structure for the native solvers.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+
+    Attributes
+    ----------
+    structure : obj
+        Structure object.
+    n : int
+        Number of nodes.
+    ndof : int
+        Number of degrees-of-freedom, six per node.
+    xyz : array
+        (n x 3) nodal co-ordinates.
+    groups : list
+        Group objects of the elements that have element properties.
+    index : dict
+        Element key to (group number, row) look-up.
+    tables : dict
+        SpringSection name to {channel: (displacements, forces)} piecewise-linear spring data.
+    thermal : dict
+        ThermalMaterial name to {'k', 'p', 'c': (temperatures, values)} conductivity, density and specific heat data.
+    superelements : list
+        Names of the Superelement objects, their elements are grouped separately.
+
+    Notes
+    -----
+    - Elements are grouped by formulation: truss, Euler-Bernoulli beam, spring, MITC4 shell, membrane, 4-noded
+      tetrahedron and 8-noded hexahedron. Triangles and pentahedra are collapsed quadrilaterals and hexahedra.
+    - Only the elastic part (E, v) of each material is used.
+    - Masses are lumped at the translational degrees-of-freedom.
+
+    """
+
+    def __init__(self, structure):
+        self.structure = structure
+        self.n = structure.node_count()
+        self.ndof = 6 * self.n
+        self.xyz = np.array(structure.nodes_xyz(range(self.n)), dtype=float)
+        self.groups = []
+        self.index = {}
+        self.tables = {}
+        self.thermal = {}
+        self.superelements = []
+        self._pattern = None
+        self._build()
+
+    # ==============================================================================
+    # Groups
+    # ==============================================================================
+
+    def _build(self):
+
+        structure = self.structure
+        groups = {}
+        members = {}
+
+        for name in sorted(structure.misc):
+            if structure.misc[name].__name__ == 'Superelement':
+                self.superelements.append(name)
+                members.update((ekey, name) for ekey in element_selection(structure, structure.misc[name].elements))
+
+        for key in sorted(structure.element_properties):
+
+            prop = structure.element_properties[key]
+            section = structure.sections[prop.section]
+            stype = section.__name__
+            geometry = section.geometry or {}
+            material = structure.materials.get(prop.material)
+            mat = {}
+            selection = prop.elements if prop.elements else structure.sets[prop.elset].selection
+
+            if material is not None and material.__name__ == 'ThermalMaterial':
+                self._thermal_tables(material)
+
+            elif material is not None:
+
+                if 'E' not in material.E:
+                    raise NotImplementedError('***** Native solver requires isotropic materials: {0} *****'.format(
+                        material.name))
+
+                E = material.E['E']
+                v = material.v['v']
+                p = material.p or 0.
+                tension = getattr(material, 'tension', True) is not False
+                compression = getattr(material, 'compression', True) is not False
+                mat = {'E': E, 'v': v, 'G': 0.5 * E / (1 + v), 'p': p, 'tension': tension,
+                       'compression': compression}
+
+            for ekey in selection:
+
+                element = structure.elements[ekey]
+                nodes = list(element.nodes)
+                nn = len(nodes)
+                ex = element.axes.get('ex', None) or [0, 0, 0]
+
+                if stype in truss_sections:
+                    kind, data = 'truss', dict(mat, A=geometry['A'])
+
+                elif stype == 'SpringSection':
+                    stiffness = section.stiffness
+                    self._spring_tables(section)
+                    kind, data = 'spring', {'kx': stiffness.get('axial', 0), 'ky': stiffness.get('lateral', 0),
+                                            'kr': stiffness.get('rotation', 0), 'ex': ex}
+
+                elif stype in ['ShellSection', 'MembraneSection']:
+                    kind = 'shell' if stype == 'ShellSection' else 'membrane'
+                    data = dict(mat, t=geometry['t'], ex=ex)
+                    if nn == 3:
+                        nodes.append(nodes[2])
+
+                elif stype == 'SolidSection':
+                    if nn == 4:
+                        kind = 'tet'
+                    else:
+                        kind = 'hex'
+                        if nn == 6:
+                            nodes = nodes[:3] + [nodes[2]] + nodes[3:] + [nodes[5]]
+                    data = dict(mat)
+
+                elif stype == 'MassSection':
+                    kind, data = 'mass', {'m': element.mass or 0}
+
+                elif stype in beam_sections:
+                    kind = 'beam'
+                    data = dict(mat, A=geometry['A'], I1=geometry['Ixx'], I2=geometry['Iyy'], J=geometry['J'], ex=ex)
+
+                else:
+                    raise NotImplementedError('***** Native solver does not support {0} *****'.format(stype))
+
+                superelement = members.get(ekey, '') if kind != 'mass' else ''
+                gkey = (kind, len(nodes), superelement)
+
+                if gkey not in groups:
+                    groups[gkey] = Group(kind=kind, nn=len(nodes), superelement=superelement or None)
+
+                groups[gkey].append(ekey, nodes, section.name, prop.material, **data)
+
+        for gkey in sorted(groups):
+            group = groups[gkey]
+            group.finalise()
+            self.groups.append(group)
+
+        for gi, group in enumerate(self.groups):
+            for row, ekey in enumerate(group.ekeys):
+                self.index[int(ekey)] = (gi, row)
+
+    def _thermal_tables(self, material):
+
+        tables = {}
+
+        for name, values in [('k', material.conductivity), ('p', material.p), ('c', material.sheat)]:
+            y, x = np.array(values, dtype=float).reshape(-1, 2).T
+            order = np.argsort(x)
+            tables[name] = x[order], y[order]
+
+        self.thermal[material.name] = tables
+
+    def _spring_tables(self, section):
+
+        tables = {}
+
+        for direction, channels in [('axial', [0]), ('lateral', [1, 2]), ('rotation', [3, 4, 5])]:
+            forces = (section.forces or {}).get(direction, None)
+            displacements = (section.displacements or {}).get(direction, None)
+            if forces and displacements:
+                x, y = np.array(displacements, dtype=float), np.array(forces, dtype=float)
+                order = np.argsort(x)
+                for channel in channels:
+                    tables[channel] = x[order], y[order]
+
+        if tables:
+            self.tables[section.name] = tables
+
+    def coordinates(self, group):
+        """Nodal co-ordinates of the elements of a group.
+
+        Parameters
+        ----------
+        group : obj
+            Group object.
+
+        Returns
+        -------
+        array
+            (m x nn x 3) co-ordinates.
+
+        """
+
+        return self.xyz[group.nodes]
+
+    # ==============================================================================
+    # Element matrices
+    # ==============================================================================
+
+    def element_stiffness(self, group):
+        """Compute and store the global element stiffness matrices of a group.
+
+        Parameters
+        ----------
+        group : obj
+            Group object.
+
+        Returns
+        -------
+        array
+            (m x nd x nd) element stiffness matrices.
+
+        """
+
+        if group.k is not None:
+            return group.k
+
+        X = self.coordinates(group)
+        d = group.data
+
+        if group.kind == 'truss':
+            group.k, group.L, group.c = kernels.truss_stiffness(X, d['E'] * d['A'])
+            group.size = group.L * d['A']
+
+        elif group.kind == 'beam':
+            group.R, group.L = kernels.beam_axes(X, d['ex'])
+            group.k, group.kl = kernels.beam_stiffness(group.R, group.L, d['E'], d['G'], d['A'], d['I1'], d['I2'],
+                                                       d['J'])
+            group.size = group.L * d['A']
+
+        elif group.kind == 'spring':
+            group.c = self._spring_directions(group)
+            group.T = kernels.spring_axes(group.c)
+            group.kc, group.f0 = self.spring_segments(group, np.zeros((len(group.ekeys), 6)))
+            group.k = kernels.spring_stiffness(group.T, group.kc, group.nn)
+            group.size = np.zeros(len(group.ekeys))
+
+        elif group.kind in ['shell', 'membrane']:
+            group.R, group.xl = kernels.shell_axes(X, d['ex'])
+            group.k, group.area = kernels.shell_stiffness(group.R, group.xl, d['E'], d['v'], d['t'],
+                                                          membrane=group.kind == 'membrane')
+            group.size = group.area * d['t']
+
+        elif group.kind == 'tet':
+            group.D = kernels.isotropic_matrix(d['E'], d['v'])
+            group.k, group.size = kernels.tet_stiffness(X, group.D)
+
+        elif group.kind == 'hex':
+            group.D = kernels.isotropic_matrix(d['E'], d['v'])
+            group.k, group.size = kernels.hex_stiffness(X, group.D)
+
+        elif group.kind == 'mass':
+            group.k = np.zeros((len(group.ekeys), 6, 6))
+            group.size = np.zeros(len(group.ekeys))
+
+        return group.k
+
+    def external_faces(self):
+        """External faces of the solid elements.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        array
+            (f x 4) face node keys ordered outwards, triangles with a repeated last node.
+        array
+            (f,) element keys of the faces.
+
+        """
+
+        faces, ekeys = [], []
+
+        for group in self.groups:
+            if group.kind in solid_faces:
+                for face in solid_faces[group.kind]:
+                    faces.append(group.nodes[:, face])
+                    ekeys.append(group.ekeys)
+
+        if not faces:
+            return np.zeros((0, 4), dtype=int), np.zeros(0, dtype=int)
+
+        faces = np.vstack(faces)
+        ekeys = np.concatenate(ekeys)
+        repeated = np.nonzero(np.any(faces != np.roll(faces, 1, axis=1), axis=1) &
+                              np.any(faces == np.roll(faces, 1, axis=1), axis=1))[0]
+
+        for i in repeated:
+            face = [j for k, j in enumerate(faces[i]) if j != faces[i][k - 1]]
+            faces[i] = (face + [face[-1]] * 4)[:4] if len(face) > 2 else -1
+
+        keys = np.sort(faces, axis=1)
+        keys[:, 1:][keys[:, 1:] == keys[:, :-1]] = -1
+        _, inverse, counts = np.unique(np.sort(keys, axis=1), axis=0, return_inverse=True, return_counts=True)
+        external = (counts[inverse.ravel()] == 1) & (faces[:, 0] >= 0)
+
+        return faces[external], ekeys[external]
+
+    def _spring_directions(self, group):
+
+        ex = np.array(group.data['ex'])
+        ex[np.linalg.norm(ex, axis=1) == 0] = [1., 0., 0.]
+
+        if group.nn == 2:
+            X = self.coordinates(group)
+            d = X[:, 1] - X[:, 0]
+            L = np.linalg.norm(d, axis=1)
+            ex[L > 0] = d[L > 0]
+
+        return ex / np.linalg.norm(ex, axis=1)[:, None]
+
+    def spring_segments(self, group, delta):
+        """Stiffnesses and force offsets of the spring channels at given deformations.
+
+        Parameters
+        ----------
+        group : obj
+            Group object of springs.
+        delta : array
+            (m x 6) local channel deformations.
+
+        Returns
+        -------
+        array
+            (m x 6) channel stiffnesses.
+        array
+            (m x 6) channel force offsets, with channel forces k * delta + f0.
+
+        Notes
+        -----
+        - Channels with force-displacement data use the segment containing the deformation, extrapolating the end
+          segments, others use the linear SpringSection stiffness.
+
+        """
+
+        d = group.data
+        k = np.stack([d['kx'], d['ky'], d['ky'], d['kr'], d['kr'], d['kr']], axis=1)
+        f0 = np.zeros(k.shape)
+
+        for name, tables in self.tables.items():
+            rows = np.nonzero(group.sections == name)[0]
+            for channel, (x, y) in tables.items():
+                j = np.clip(np.searchsorted(x, delta[rows, channel], side='right') - 1, 0, len(x) - 2)
+                slope = (y[j + 1] - y[j]) / (x[j + 1] - x[j])
+                k[rows, channel] = slope
+                f0[rows, channel] = y[j] - slope * x[j]
+
+        return k, f0
+
+    # ==============================================================================
+    # Assembly
+    # ==============================================================================
+
+    def pattern(self):
+        """Sparsity pattern of the global stiffness matrix of all groups.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        array
+            (ndof + 1,) CSR row pointers.
+        array
+            (nnz,) CSR column indices.
+        list
+            (m x nd * nd) positions of the element matrix entries of each group in the CSR data.
+
+        Notes
+        -----
+        - The pattern is computed once and stored, for in-place updates of the stiffness data of selected elements.
+
+        """
+
+        if self._pattern is None:
+
+            keys = [np.zeros(0, dtype=int)]
+
+            for group in self.groups:
+                nd = group.dofs.shape[1]
+                rows = np.repeat(group.dofs, nd, axis=1)
+                cols = np.tile(group.dofs, (1, nd))
+                keys.append((rows * self.ndof + cols).ravel())
+
+            unique, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+            indptr = np.concatenate([[0], np.cumsum(np.bincount(unique // self.ndof, minlength=self.ndof))])
+            sizes = np.cumsum([len(i) for i in keys[1:]])[:-1]
+            split = np.split(inverse.ravel(), sizes)
+            positions = [i.reshape(len(group.ekeys), -1) for i, group in zip(split, self.groups)]
+            self._pattern = indptr, unique % self.ndof, positions
+
+        return self._pattern
+
+    def scatter(self, data, gi, rows, k):
+        """Add element matrices of selected elements of a group into CSR data in place.
+
+        Parameters
+        ----------
+        data : array
+            (nnz,) CSR data of a matrix with the stiffness pattern.
+        gi : int
+            Group number.
+        rows : array
+            Rows of the elements in the group.
+        k : array
+            (len(rows) x nd x nd) element matrices to add.
+
+        Returns
+        -------
+        None
+
+        """
+
+        positions = self.pattern()[2][gi][rows]
+        data += np.bincount(positions.ravel(), k.ravel(), minlength=len(data))
+
+    def assemble(self, matrices, groups=None):
+        """Assemble element matrices into a global sparse matrix.
+
+        Parameters
+        ----------
+        matrices : list
+            (m x nd x nd) element matrices for each group in ``groups``.
+        groups : list
+            Group objects, defaults to all groups.
+
+        Returns
+        -------
+        obj
+            (ndof x ndof) sparse CSR matrix.
+
+        """
+
+        if groups is None:
+            groups = self.groups
+
+        rows, cols, vals = [], [], []
+
+        for group, k in zip(groups, matrices):
+            nd = group.dofs.shape[1]
+            rows.append(np.repeat(group.dofs, nd, axis=1).ravel())
+            cols.append(np.tile(group.dofs, (1, nd)).ravel())
+            vals.append(k.ravel())
+
+        if not rows:
+            return coo_matrix((self.ndof, self.ndof)).tocsr()
+
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        vals = np.concatenate(vals)
+
+        return coo_matrix((vals, (rows, cols)), shape=(self.ndof, self.ndof)).tocsr()
+
+    def stiffness(self, factors=None):
+        """Assemble the global stiffness matrix.
+
+        Parameters
+        ----------
+        factors : array
+            Stiffness factors indexed by element key, e.g. element densities.
+
+        Returns
+        -------
+        obj
+            (ndof x ndof) sparse CSR stiffness matrix.
+
+        """
+
+        matrices = []
+
+        for group in self.groups:
+            k = self.element_stiffness(group)
+            if factors is not None:
+                k = k * np.asarray(factors)[group.ekeys][:, None, None]
+            matrices.append(k)
+
+        return self.assemble(matrices)
+
+    def geometric_stiffness(self, U, fe=None):
+        """Assemble the global geometric stiffness matrix of a displaced state.
+
+        Parameters
+        ----------
+        U : array
+            (ndof,) nodal displacements of the linear static state.
+        fe : dict
+            Element equivalent nodal loads from load_vector.
+
+        Returns
+        -------
+        obj
+            (ndof x ndof) sparse CSR geometric stiffness matrix.
+
+        Notes
+        -----
+        - Uses the truss and beam axial forces, shell and membrane membrane forces and solid stresses.
+
+        """
+
+        matrices, groups = [], []
+
+        for group in self.groups:
+
+            self.element_stiffness(group)
+            d = group.data
+
+            if group.kind == 'truss':
+                f = self.element_forces(group, U, fe)
+                N = np.sum(f[:, 3:] * group.c, axis=1)
+                kg = kernels.truss_geometric_stiffness(group.c, group.L, N)
+
+            elif group.kind == 'beam':
+                f = self.element_forces(group, U, fe)
+                N = np.sum(f[:, 6:9] * group.R[:, 0], axis=1)
+                kg = kernels.beam_geometric_stiffness(group.R, group.L, N, d['A'], d['I1'], d['I2'])
+
+            elif group.kind in ['shell', 'membrane']:
+                em = kernels.shell_strains(group.R, group.xl, U[group.dofs])[0]
+                Dp = kernels.plane_stress_matrix(d['E'], d['v'])
+                N = d['t'][:, None, None] * np.einsum('eab,egb->ega', Dp, em)
+                kg = kernels.shell_geometric_stiffness(group.R, group.xl, N)
+
+            elif group.kind in ['tet', 'hex']:
+                X = self.coordinates(group)
+                u = U[group.dofs]
+                e = kernels.tet_strains(X, u) if group.kind == 'tet' else kernels.hex_strains(X, u)
+                S = np.einsum('eab,egb->ega', group.D, e)
+                kg = kernels.solid_geometric_stiffness(X, S)
+
+            else:
+                continue
+
+            matrices.append(kg)
+            groups.append(group)
+
+        return self.assemble(matrices, groups)
+
+    def mass(self):
+        """Lumped mass vector of the translational degrees-of-freedom.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        array
+            (ndof,) diagonal of the mass matrix.
+
+        Notes
+        -----
+        - Includes element masses from the material density, Node.mass and MassElement masses.
+
+        """
+
+        m = np.zeros(self.n)
+
+        for group in self.groups:
+            self.element_stiffness(group)
+            if group.kind == 'mass':
+                me = group.data['m']
+            else:
+                me = group.data.get('p', np.zeros(len(group.ekeys))) * group.size
+            np.add.at(m, group.nodes, me[:, None] * group.weights)
+
+        m += np.array([getattr(self.structure.nodes[i], 'mass', 0) or 0 for i in range(self.n)], dtype=float)
+
+        M = np.zeros((self.n, 6))
+        M[:, :3] = m[:, None]
+
+        return M.ravel()
+
+    # ==============================================================================
+    # Loads and boundary conditions
+    # ==============================================================================
+
+    def load_vector(self, loads):
+        """Assemble the global load vector.
+
+        Parameters
+        ----------
+        loads : dict
+            Load object names and their factors.
+
+        Returns
+        -------
+        array
+            (ndof,) equivalent nodal loads.
+        dict
+            Group number to (m x nd) element equivalent nodal loads, for element force recovery.
+
+        """
+
+        structure = self.structure
+        F = np.zeros((self.n, 6))
+        fe = {}
+
+        for name, fact in loads.items():
+
+            load = structure.loads[name]
+            ltype = load.__name__
+            com = load.components
+
+            if ltype in ['PointLoad', 'HarmonicPointLoad']:
+                for node in node_selection(structure, load.nodes):
+                    F[node] += [fact * (com.get(dof, 0) or 0) for dof in dofs]
+
+            elif ltype in ['PointLoads', 'TributaryLoad']:
+                for node, coms in com.items():
+                    F[node] += [fact * (coms.get(dof, 0) or 0) for dof in dofs]
+
+            elif ltype in ['GravityLoad', 'LineLoad', 'AreaLoad', 'HarmonicPressureLoad', 'PrestressLoad']:
+                for gi, rows in self._rows(element_selection(structure, load.elements)).items():
+                    group = self.groups[gi]
+                    self.element_stiffness(group)
+                    f = self._element_load(group, rows, load, fact)
+                    np.add.at(F.ravel(), group.dofs[rows], f)
+                    fe.setdefault(gi, np.zeros(group.dofs.shape))
+                    np.add.at(fe[gi], rows, f)
+
+            else:
+                raise NotImplementedError('***** Native solver does not support {0} *****'.format(ltype))
+
+        return F.ravel(), fe
+
+    def _rows(self, ekeys):
+        rows = {}
+        for ekey in ekeys:
+            if ekey in self.index:
+                gi, row = self.index[ekey]
+                rows.setdefault(gi, []).append(row)
+        return {gi: np.array(i, dtype=int) for gi, i in rows.items()}
+
+    def _element_load(self, group, rows, load, fact):
+
+        ltype = load.__name__
+        com = load.components
+        m = len(rows)
+        nd = group.dofs.shape[1]
+        ndn = nd // group.nn
+        f = np.zeros((m, group.nn, ndn))
+
+        if ltype == 'GravityLoad':
+            g = fact * load.g * np.array([com['x'], com['y'], com['z']], dtype=float)
+            W = group.data['p'][rows] * group.size[rows]
+
+            if group.kind == 'beam':
+                return kernels.beam_line_load(group.R[rows], group.L[rows], (W / group.L[rows])[:, None] * g)[0]
+
+            f[:, :, :3] = (W[:, None] * group.weights[rows])[:, :, None] * g
+
+        elif ltype == 'LineLoad':
+
+            if group.kind == 'beam':
+                if load.axes == 'local':
+                    R = group.R[rows]
+                    w = fact * (com['x'] * R[:, 1] + com['y'] * R[:, 2])
+                else:
+                    w = fact * np.tile([com['x'], com['y'], com['z']], (m, 1))
+                return kernels.beam_line_load(group.R[rows], group.L[rows], w)[0]
+
+            elif group.kind == 'truss':
+                w = fact * np.array([com['x'], com['y'], com['z']], dtype=float)
+                f[:, :, :3] = (0.5 * group.L[rows])[:, None, None] * w
+
+            else:
+                raise NotImplementedError('***** Native LineLoad requires beam or truss elements *****')
+
+        elif ltype in ['AreaLoad', 'HarmonicPressureLoad']:
+
+            if group.kind not in ['shell', 'membrane']:
+                raise NotImplementedError('***** Native {0} requires shell or membrane elements *****'.format(ltype))
+
+            R = group.R[rows]
+
+            if ltype == 'HarmonicPressureLoad':
+                q = -fact * com['pressure'] * R[:, 2]
+            elif load.axes == 'local':
+                q = fact * (com['x'] * R[:, 0] + com['y'] * R[:, 1] - com['z'] * R[:, 2])
+            else:
+                q = fact * np.tile([com['x'], com['y'], com['z']], (m, 1))
+
+            f[:, :, :3] = (group.area[rows][:, None] * group.weights[rows])[:, :, None] * q[:, None, :]
+
+        elif ltype == 'PrestressLoad':
+
+            if group.kind != 'truss':
+                raise NotImplementedError('***** Native PrestressLoad requires truss elements *****')
+
+            N0 = fact * com['sxx'] * group.data['A'][rows]
+            c = group.c[rows]
+            f[:, 0, :3] = N0[:, None] * c
+            f[:, 1, :3] = -N0[:, None] * c
+
+        return f.reshape(m, nd)
+
+    def prestress(self, loads):
+        """Initial axial forces of truss elements from PrestressLoad objects.
+
+        Parameters
+        ----------
+        loads : dict
+            Load object names and their factors, loads other than PrestressLoad are ignored.
+
+        Returns
+        -------
+        dict
+            Group number to (m,) initial axial forces, for the truss groups.
+
+        """
+
+        N0 = {gi: np.zeros(len(group.ekeys)) for gi, group in enumerate(self.groups) if group.kind == 'truss'}
+
+        for name, fact in loads.items():
+            load = self.structure.loads[name]
+            if load.__name__ == 'PrestressLoad':
+                for gi, rows in self._rows(element_selection(self.structure, load.elements)).items():
+                    if gi in N0:
+                        N0[gi][rows] += fact * load.components['sxx'] * self.groups[gi].data['A'][rows]
+
+        return N0
+
+    def constraints(self, displacements):
+        """Constrained degrees-of-freedom and their prescribed values.
+
+        Parameters
+        ----------
+        displacements : dict
+            Displacement object names and their factors.
+
+        Returns
+        -------
+        array
+            Constrained degree-of-freedom numbers.
+        array
+            Prescribed values.
+
+        """
+
+        structure = self.structure
+        prescribed = {}
+
+        for name, fact in displacements.items():
+
+            displacement = structure.displacements[name]
+
+            if displacement.axes != 'global':
+                raise NotImplementedError('***** Native solver supports global displacements only *****')
+
+            com = displacement.components
+
+            for node in node_selection(structure, displacement.nodes):
+                for c, dof in enumerate(dofs):
+                    if com[dof] is not None:
+                        prescribed[6 * node + c] = fact * com[dof]
+
+        fixed = np.array(sorted(prescribed), dtype=int)
+        values = np.array([prescribed[i] for i in fixed], dtype=float)
+
+        return fixed, values
+
+    def free(self, K, fixed):
+        """Active unconstrained degrees-of-freedom.
+
+        Parameters
+        ----------
+        K : obj
+            Global stiffness matrix.
+        fixed : array
+            Constrained degree-of-freedom numbers.
+
+        Returns
+        -------
+        array
+            Free degree-of-freedom numbers.
+
+        Notes
+        -----
+        - Degrees-of-freedom without stiffness, e.g. rotations of truss or solid nodes, are excluded.
+
+        """
+
+        active = K.diagonal() > 0
+        active[fixed] = False
+
+        return np.nonzero(active)[0]
+
+    # ==============================================================================
+    # Results
+    # ==============================================================================
+
+    def element_forces(self, group, U, fe=None):
+        """Global element end forces of a group from the nodal displacements.
+
+        Parameters
+        ----------
+        group : obj
+            Group object.
+        U : array
+            (ndof,) nodal displacements.
+        fe : dict, array
+            Element equivalent nodal loads from load_vector, or (m x nd) element loads of the group.
+
+        Returns
+        -------
+        array
+            (m x nd) element forces.
+
+        """
+
+        k = self.element_stiffness(group)
+        f = np.einsum('eij,ej->ei', k, U[group.dofs])
+
+        if isinstance(fe, dict):
+            fe = fe.get(self.groups.index(group)) if group in self.groups else None
+
+        if fe is not None:
+            f -= fe
+
+        return f
+
+    def element_results(self, U, fields, fe=None, axial=None):
+        """Element results of all groups in the structure.results layout.
+
+        Parameters
+        ----------
+        U : array
+            (ndof,) nodal displacements.
+        fields : list
+            Data field requests, 's', 'e', 'sf', 'sm' or 'spf'.
+        fe : dict
+            Element equivalent nodal loads from load_vector.
+        axial : array
+            Truss axial forces indexed by element key, e.g. from a geometrically non-linear analysis.
+
+        Returns
+        -------
+        dict
+            Element results {field: {element: {ip_sp: value}}}.
+
+        """
+
+        results = {}
+
+        for group in self.groups:
+            for field, (ids, values) in self._group_results(group, U, fe, axial).items():
+                if _field_of(field) not in fields:
+                    continue
+                data = results.setdefault(field, {})
+                if field == 'axes':
+                    data.update(zip(group.ekeys.tolist(), values.tolist()))
+                    continue
+                for ekey, row in zip(group.ekeys.tolist(), values.tolist()):
+                    data[ekey] = dict(zip(ids, row))
+
+        return results
+
+    def _group_results(self, group, U, fe, axial=None):
+
+        self.element_stiffness(group)
+        d = group.data
+        kind = group.kind
+        out = {}
+
+        if kind == 'truss':
+            if axial is None:
+                f = self.element_forces(group, U, fe)
+                N = np.sum(f[:, 3:] * group.c, axis=1)[:, None]
+            else:
+                N = np.asarray(axial)[group.ekeys][:, None]
+            ids = ['ip1_sp0']
+            out['sf1'] = ids, N
+            out['sxx'] = ids, N / d['A'][:, None]
+            out['exx'] = ids, N / (d['A'] * d['E'])[:, None]
+            out['smises'] = ids, abs(N / d['A'][:, None])
+
+        elif kind == 'beam':
+            f = self.element_forces(group, U, fe)
+            fl = np.einsum('eij,eaj->eai', group.R, f.reshape(-1, 4, 3)).reshape(-1, 12)
+            ids = ['ip1_sp0', 'ip2_sp0']
+            for name, i in [('sf1', 0), ('sf2', 1), ('sf3', 2), ('sm3', 3), ('sm1', 4), ('sm2', 5)]:
+                out[name] = ids, np.stack([-fl[:, i], fl[:, i + 6]], axis=1)
+
+        elif kind == 'spring':
+            delta = kernels.spring_deformations(group.T, U[group.dofs], group.nn)
+            k, f0 = self.spring_segments(group, delta)
+            f = k * delta + f0
+            for name, i in [('spfx', 0), ('spfy', 1), ('spfz', 2)]:
+                out[name] = ['ip1_sp0'], f[:, i:i + 1]
+
+        elif kind in ['shell', 'membrane']:
+            em, kb, gs = kernels.shell_strains(group.R, group.xl, U[group.dofs])
+            t = d['t'][:, None, None]
+            Dp = kernels.plane_stress_matrix(d['E'], d['v'])
+            N = t * np.einsum('eab,egb->ega', Dp, em)
+            points = range(1, 5)
+
+            if kind == 'shell':
+                M = t**3 / 12. * np.einsum('eab,egb->ega', Dp, kb)
+                Q = (5. / 6) * (d['G'][:, None, None] * t) * gs
+                sps = [('sp1', -0.5), ('sp5', 0.5)]
+            else:
+                M = kb = 0 * N
+                sps = [('sp0', 0.)]
+
+            ids = ['ip{0}_{1}'.format(i, sp) for i in points for sp, _ in sps]
+            s = np.stack([N / t + 12 * f * M / t**2 for _, f in sps], axis=2).reshape(len(N), -1, 3)
+            e = np.stack([em + f * t * kb for _, f in sps], axis=2).reshape(len(N), -1, 3)
+
+            for name, i in [('sxx', 0), ('syy', 1), ('sxy', 2)]:
+                out[name] = ids, s[:, :, i]
+            for name, i in [('exx', 0), ('eyy', 1), ('exy', 2)]:
+                out[name] = ids, e[:, :, i]
+            out['smises'] = ids, np.sqrt(s[:, :, 0]**2 - s[:, :, 0] * s[:, :, 1] + s[:, :, 1]**2 + 3 * s[:, :, 2]**2)
+
+            ids = ['ip{0}_sp0'.format(i) for i in points]
+            for name, i in [('sf1', 0), ('sf2', 1), ('sf3', 2)]:
+                out[name] = ids, N[:, :, i]
+            if kind == 'shell':
+                for name, i in [('sf4', 0), ('sf5', 1)]:
+                    out[name] = ids, Q[:, :, i]
+                for name, i in [('sm1', 0), ('sm2', 1), ('sm3', 2)]:
+                    out[name] = ids, M[:, :, i]
+
+            out['axes'] = None, group.R
+
+        elif kind in ['tet', 'hex']:
+            u = U[group.dofs]
+            X = self.coordinates(group)
+            e = kernels.tet_strains(X, u) if kind == 'tet' else kernels.hex_strains(X, u)
+            s = np.einsum('eab,egb->ega', group.D, e)
+            ids = ['ip{0}_sp0'.format(i) for i in range(1, e.shape[1] + 1)]
+
+            for name, i in [('sxx', 0), ('syy', 1), ('szz', 2), ('sxy', 3), ('syz', 4), ('sxz', 5)]:
+                out[name] = ids, s[:, :, i]
+            for name, i in [('exx', 0), ('eyy', 1), ('ezz', 2), ('exy', 3), ('eyz', 4), ('exz', 5)]:
+                out[name] = ids, e[:, :, i]
+
+            sxx, syy, szz, sxy, syz, sxz = [s[:, :, i] for i in range(6)]
+            out['smises'] = ids, np.sqrt(0.5 * ((sxx - syy)**2 + (syy - szz)**2 + (szz - sxx)**2) +
+                                         3 * (sxy**2 + syz**2 + sxz**2))
+
+        return out
+
+
+def _field_of(component):
+    """The data field request that a result component belongs to."""
+
+    if component in ['axes', 'smises'] or component.startswith('s') and component[1] in 'xyz':
+        return 's'
+    if component.startswith('sf'):
+        return 'sf'
+    if component.startswith('sm'):
+        return 'sm'
+    if component.startswith('spf'):
+        return 'spf'
+    return 'e'
@@ -0,0 +1,481 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.activeset import active_set_analysis
+from compas_fea.fea.native.buckling import buckling_analysis
+from compas_fea.fea.native.model import Model
+from compas_fea.fea.native.nonlinear import nonlinear_analysis
+from compas_fea.fea.native.sensitivity import sensitivity_analysis
+from compas_fea.fea.native.static import static_analysis
+from compas_fea.fea.native.dynamic import dynamic_analysis
+from compas_fea.fea.native.harmonic import harmonic_analysis
+from compas_fea.fea.native.heat import heat_analysis
+from compas_fea.fea.native.topology import simp_analysis
+from compas_fea.utilities.harmonic import store_harmonic
+from compas_fea.utilities.modal import store_mode_shapes
+
+from time import time
+
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'input_generate',
+    'launch_process',
+    'extract_data',
+    'step_states',
+    'read_history',
+    'sensitivities',
+    'topology_optimisation',
+]
+
+
+node_fields = {'u': ('U', 0), 'ur': ('U', 3), 'rf': ('RF', 0), 'rm': ('RF', 3), 'cf': ('CF', 0), 'cm': ('CF', 3)}
+
+
+def _temp(structure):
+    return '{0}{1}/'.format(structure.path, structure.name)
+
+
+def _results_file(structure, step):
+    return '{0}{1}-{2}.npz'.format(_temp(structure), structure.name, step)
+
+
+def _history_file(structure, step):
+    return '{0}{1}-{2}-history.npy'.format(_temp(structure), structure.name, step)
+
+
+def step_states(structure):
+    """Walk the analysis steps and their active loads and displacements.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+
+    Yields
+    ------
+    str
+        Step key.
+    obj
+        Step object.
+    dict
+        Load names and factors held from previous GeneralSteps.
+    dict
+        Load names and factors of the step itself.
+    dict
+        Displacement names and factors active in the step.
+
+    Notes
+    -----
+    - GeneralStep loads propagate to later steps unless a step has modify=False, perturbation and dynamic step loads
+      do not propagate.
+    - A step without loads of its own uses the loads of the step named by its ``step`` attribute, if any.
+
+    """
+
+    steps = structure.steps
+    order = structure.steps_order
+
+    held = {}
+    displacements = {name: 1. for name in steps[order[0]].displacements}
+
+    for key in order[1:]:
+
+        step = steps[key]
+        factor = getattr(step, 'factor', 1.)
+
+        def fact(name):
+            return factor.get(name, 1.) if isinstance(factor, dict) else factor
+
+        names = getattr(step, 'loads', [])
+
+        if not names and getattr(step, 'step', None):
+            names = steps[step.step].loads
+
+        applied = {name: fact(name) for name in names}
+        active = dict(displacements)
+        active.update({name: fact(name) for name in getattr(step, 'displacements', [])})
+
+        if step.__name__ == 'GeneralStep' and not step.modify:
+            held = {}
+
+        yield key, step, dict(held), applied, active
+
+        if step.__name__ in ['GeneralStep', 'DynamicStep']:
+            displacements = active
+
+        if step.__name__ == 'GeneralStep':
+            held.update(applied)
+
+
+def input_generate(structure, fields, output):
+    """Prepares the native analysis folder of the Structure object.
+
+    Parameters
+    ----------
+    structure : obj
+        The Structure object to read from.
+    fields : list
+        Data field requests.
+    output : bool
+        Print terminal output.
+
+    Returns
+    -------
+    None
+
+    """
+
+    temp = _temp(structure)
+
+    if not os.path.exists(temp):
+        os.makedirs(temp)
+
+    for file in os.listdir(temp):
+        if file.startswith('{0}-'.format(structure.name)) and os.path.splitext(file)[1] in ['.npz', '.npy']:
+            os.remove(os.path.join(temp, file))
+
+    if output:
+        print('***** Native analysis folder prepared: {0} *****\n'.format(temp))
+
+
+def launch_process(structure, cpus, output):
+    """Runs the analysis through the native NumPy/SciPy solvers.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    cpus : int
+        Number of processes for the HarmonicStep frequency sweeps.
+    output : bool
+        Print terminal output.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - GeneralStep objects are analysed as linear static steps, or with nlgeom (the GeneralStep default) as
+      geometrically non-linear steps if the model has truss elements and otherwise only springs and masses, or with
+      nlmat by active-set iterations if the model has tension-only or compression-only trusses or springs with
+      force-displacement data. Other models with nlgeom are analysed linearly, with a message if output is True and
+      nlgeom False in the step info.
+    - DynamicStep objects are analysed by HHT-alpha time integration from the state of the previous step.
+    - BucklingStep objects are linear buckling analyses of the step loads about the base state of the previous steps.
+    - HarmonicStep objects are direct steady-state analyses, with the frequencies distributed over a process pool.
+    - HeatStep objects are steady-state or transient heat conduction analyses, starting from step.temp0 or the
+      temperatures of the previous HeatStep.
+
+    """
+
+    tic = time()
+
+    model = Model(structure)
+    U = np.zeros((model.n, 6))
+    T = None
+    previous = {}
+    kinds = set(group.kind for group in model.groups)
+    trusses = 'truss' in kinds and kinds.issubset(['truss', 'spring', 'mass'])
+    switching = bool(model.tables) or any(
+        group.kind == 'truss' and not (np.all(group.data['tension']) and np.all(group.data['compression']))
+        for group in model.groups)
+
+    if output:
+        print('***** Native model assembled: {0:.3f} s *****\n'.format(time() - tic))
+
+    for key, step, held, applied, displacements in step_states(structure):
+
+        tic = time()
+        stype = step.__name__
+
+        if stype == 'GeneralStep':
+            loads = dict(held)
+            loads.update(applied)
+            if step.nlgeom and trusses:
+                data = nonlinear_analysis(model, previous, loads, displacements, step, U)
+            elif step.nlmat and switching:
+                data = active_set_analysis(model, loads, displacements, step)
+            else:
+                data = static_analysis(model, loads, displacements)
+                if step.nlgeom and output:
+                    print('***** Native nlgeom is only for truss, spring and mass models, step {0} analysed linearly *****\n'.format(key))
+            data['nlgeom'] = step.nlgeom and trusses
+            previous = loads
+
+        elif stype == 'DynamicStep':
+            data = dynamic_analysis(model, held, applied, displacements, step, U, _history_file(structure, key))
+
+        elif stype == 'BucklingStep':
+            data = buckling_analysis(model, held, applied, displacements, step.modes)
+
+        elif stype == 'HarmonicStep':
+            data = harmonic_analysis(model, applied, displacements, step, cpus=cpus)
+
+        elif stype == 'HeatStep':
+            T0 = np.full(model.n, float(step.temp0)) if T is None else T
+            data = heat_analysis(model, step, T0, _history_file(structure, key))
+            T = data['T']
+
+        else:
+            if output:
+                print('***** Native solver does not support {0}, step {1} skipped *****\n'.format(stype, key))
+            continue
+
+        if 'U' in data:
+            U = data['U']
+
+        np.savez(_results_file(structure, key), **data)
+
+        if output:
+            print('***** Native {0} {1} analysed: {2:.3f} s *****\n'.format(stype, key, time() - tic))
+
+
+def extract_data(structure, fields, steps='all', output=True):
+    """Extract data from the native analysis files into structure.results.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    fields : list, str
+        Data field requests.
+    steps : list, str
+        Steps to extract from, 'all' or 'last'.
+    output : bool
+        Print terminal output.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - Only the nodes and elements of the output_nodes and output_elements sets of a Step are extracted.
+
+    """
+
+    tic = time()
+
+    if isinstance(fields, str):
+        fields = [fields]
+
+    if steps == 'all':
+        steps = structure.steps_order[1:]
+    elif steps == 'last':
+        steps = [structure.steps_order[-1]]
+    elif isinstance(steps, str):
+        steps = [steps]
+
+    model = None
+    nodes = list(range(structure.node_count()))
+
+    for key, step, held, applied, displacements in step_states(structure):
+
+        file = _results_file(structure, key)
+
+        if key not in steps or not os.path.exists(file):
+            continue
+
+        data = np.load(file)
+        results = structure.results[key] = {'nodal': {}, 'element': {}}
+        nodal = results['nodal']
+        selection, elements = structure.output_selection(key)
+        rows, keys = (slice(None), nodes) if selection is None else (selection, selection)
+
+        for field, (name, i) in node_fields.items():
+            if field in fields and name in data:
+                _nodal_field(nodal, field, data[name][rows, i:i + 3], keys)
+
+        if 'T' in data and 'nt' in fields:
+            nodal['nt'] = dict(zip(keys, data['T'][rows].tolist()))
+
+        if 'shapes' in data:
+            for field in ['u', 'ur']:
+                if field in fields:
+                    i = node_fields[field][1]
+                    store_mode_shapes(results, data['shapes'][:, rows, i:i + 3], field=field, nodes=keys)
+
+        if 'factors' in data:
+            factors = data['factors'].tolist()
+            results['factors'] = factors
+            results['info'] = {'description': {mode: 'Mode {0}: EigenValue = {1:.5g}'.format(mode, factor)
+                                               for mode, factor in enumerate(factors, 1)}}
+
+        if 'harmonic' in data:
+            results['frequencies'] = data['frequencies'].tolist()
+            for field in ['u', 'ur']:
+                if field in fields:
+                    i = node_fields[field][1]
+                    store_harmonic(results, data['harmonic'][:, rows, i:i + 3], data['frequencies'], field=field, nodes=keys)
+
+        element_fields = [i for i in fields if i in ['s', 'e', 'sf', 'sm', 'spf']]
+
+        if element_fields and 'U' in data:
+            if model is None:
+                model = Model(structure)
+            loads = dict(held)
+            loads.update(applied)
+            fe = model.load_vector(loads)[1] if step.__name__ == 'GeneralStep' else None
+            axial = data['axial'] if 'axial' in data else None
+            results['element'] = model.element_results(data['U'].ravel(), element_fields, fe, axial)
+
+            if elements is not None:
+                for field, values in results['element'].items():
+                    results['element'][field] = {ekey: values[ekey] for ekey in elements if ekey in values}
+
+        if 'convergence' in data:
+            results['info'] = {'description': step.__name__, 'convergence': [
+                {'increment': int(i), 'factor': float(f), 'iterations': int(n), 'residual': float(r),
+                 'residuals': data['residuals'][data['residuals'][:, 0] == i, 2].tolist()}
+                for i, f, n, r in data['convergence']]}
+
+            if 'converged' in data:
+                results['info']['converged'] = bool(data['converged'])
+                results['info']['factor'] = float(data['factor'])
+
+                if output and not data['converged']:
+                    reason = 'singular tangent stiffness' if data['singular'] else 'no convergence'
+                    print('***** Native step {0} stopped at load factor {1:.4g}, {2} *****\n'.format(
+                        key, float(data['factor']), reason))
+
+        if 'iterations' in data:
+            results['info'] = {'description': step.__name__, 'iterations': int(data['iterations']),
+                               'converged': bool(data['converged'])}
+
+            if output and not data['converged']:
+                print('***** Native active-set step {0} did not converge in {1} iterations *****\n'.format(
+                    key, int(data['iterations'])))
+
+        if 'time' in data:
+            results['info'] = {'description': step.__name__, 'time': data['time'].tolist(),
+                               'history': _history_file(structure, key)}
+
+        if 'nlgeom' in data:
+            results.setdefault('info', {'description': step.__name__})['nlgeom'] = bool(data['nlgeom'])
+
+    if output:
+        print('***** Data extracted from native results: {0:.3f} s *****\n'.format(time() - tic))
+
+
+def _nodal_field(nodal, field, values, nodes):
+    for j, c in enumerate('xyz'):
+        nodal['{0}{1}'.format(field, c)] = dict(zip(nodes, values[:, j].tolist()))
+    nodal['{0}m'.format(field)] = dict(zip(nodes, np.linalg.norm(values, axis=1).tolist()))
+
+
+def read_history(structure, step, mmap_mode='r'):
+    """Read the streamed displacement history of a DynamicStep or temperature history of a HeatStep.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    step : str
+        DynamicStep or HeatStep key.
+    mmap_mode : str
+        NumPy memory-map mode, None to load into memory.
+
+    Returns
+    -------
+    array
+        (increments + 1) times.
+    array
+        (increments + 1 x n x 6) nodal displacements and rotations, or (increments + 1 x n) nodal temperatures of a
+        transient HeatStep.
+
+    """
+
+    time = np.load(_results_file(structure, step))['time']
+    U = np.load(_history_file(structure, step), mmap_mode=mmap_mode)
+
+    return time, U[:len(time)]
+
+
+def sensitivities(structure, step, responses, parameters):
+    """Adjoint sensitivities of the linear static solution of a GeneralStep with respect to section parameters.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    step : str
+        GeneralStep key.
+    responses : list
+        'compliance', ('u', node, component) and ('s', element, field, point) responses.
+    parameters : list
+        (section name, parameter) pairs, e.g. ('shell', 't'), ('bar', 'A'), ('rect', 'b') or ('pipe', 'r').
+
+    Returns
+    -------
+    dict
+        (r,) 'responses', and by 'section.parameter' the section 'elements' and (r x m) element 'gradients'.
+
+    """
+
+    loads, displacements = _step_loads(structure, step)
+
+    return sensitivity_analysis(Model(structure), loads, displacements, responses, parameters)
+
+
+def topology_optimisation(structure, step, elements, volume_fraction=0.5, penalty=3., radius=None, iterations=100,
+                          tolerance=0.01, method='oc', output=True):
+    """SIMP topology optimisation of the compliance of the linear static solution of a GeneralStep.
+
+    Parameters
+    ----------
+    structure : obj
+        Structure object.
+    step : str
+        GeneralStep key.
+    elements : str, list
+        Element set name(s) and/or element keys of the design domain.
+    volume_fraction : float
+        Allowed fraction of the design domain volume.
+    penalty : float
+        SIMP penalisation exponent.
+    radius : float
+        Sensitivity filter radius, None for 1.5 times the mean design element size.
+    iterations : int
+        Maximum number of iterations.
+    tolerance : float
+        Largest density change for convergence.
+    method : str
+        'oc' optimality criteria or 'mma' method of moving asymptotes.
+    output : bool
+        Print terminal output.
+
+    Returns
+    -------
+    dict
+        Design 'elements' and their 'densities', and the 'history' of compliance, volume and timings per iteration.
+
+    """
+
+    loads, displacements = _step_loads(structure, step)
+
+    return simp_analysis(Model(structure), loads, displacements, elements, volume_fraction=volume_fraction,
+                         penalty=penalty, radius=radius, iterations=iterations, tolerance=tolerance, method=method,
+                         output=output)
+
+
+def _step_loads(structure, step):
+
+    for key, _, held, applied, displacements in step_states(structure):
+        if key == step:
+            loads = dict(held)
+            loads.update(applied)
+            return loads, displacements
+
+    raise KeyError('***** Step {0} not found *****'.format(step))
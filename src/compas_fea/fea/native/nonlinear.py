@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.activeset import slack
+from compas_fea.fea.native.activeset import truss_states
+from compas_fea.fea.native.elements import truss_corotational
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse.linalg import MatrixRankWarning
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    pass
+
+import warnings
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'nonlinear_analysis',
+]
+
+
+def _external(structure, loads):
+    return {name: fact for name, fact in loads.items() if structure.loads[name].__name__ != 'PrestressLoad'}
+
+
+def nonlinear_analysis(model, start, loads, displacements, step, U0, line_searches=5, cutbacks=5):
+    """Geometrically non-linear static analysis of truss and cable structures.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    start : dict
+        Load object names and factors at the start of the step.
+    loads : dict
+        Load object names and factors at the end of the step.
+    displacements : dict
+        Displacement object names and their factors.
+    step : obj
+        GeneralStep object, with the increments, iterations and tolerance.
+    U0 : array
+        (n x 6) displacements at the start of the step.
+    line_searches : int
+        Maximum number of line search iterations per Newton iteration.
+    cutbacks : int
+        Maximum number of successive increment halvings when an increment does not converge.
+
+    Returns
+    -------
+    dict
+        (n x 6) arrays 'U', 'RF' and 'CF', truss 'axial' forces by element key, 'convergence' rows of
+        [increment, load factor, iterations, residual], 'residuals' rows of [increment, iteration, residual],
+        'converged', the load 'factor' reached and 'singular', True if the step stopped at a singular tangent stiffness.
+
+    Notes
+    -----
+    - Truss elements are co-rotational, other elements (springs, masses) are linear.
+    - Tension-only and compression-only trusses carry no force when their axial force has the wrong sign.
+    - Loads, prestress and prescribed displacements are ramped linearly from their start values over the increments.
+    - Each increment is solved by Newton-Raphson iterations with a line search on the residual along the search
+      direction, until the residual norm is below the tolerance relative to the external and internal force norms.
+    - An increment that does not converge, or meets a singular tangent stiffness, is halved, and doubled again after
+      each converged increment up to 1 / step.increments. After the cutbacks the step stops with converged False and
+      the last converged state, at the load factor reached.
+
+    """
+
+    structure = model.structure
+    groups = model.groups
+    trusses = [gi for gi, group in enumerate(groups) if group.kind == 'truss']
+    linear = [group for group in groups if group.kind != 'truss']
+    K = model.stiffness()
+    Klin = model.assemble([group.k for group in linear], linear)
+
+    F0 = model.load_vector(_external(structure, start))[0]
+    F1 = model.load_vector(_external(structure, loads))[0]
+    N00 = model.prestress(start)
+    N01 = model.prestress(loads)
+    fixed, values = model.constraints(displacements)
+    active = K.diagonal() > 0
+
+    for gi in trusses:
+        active[groups[gi].dofs] = True
+
+    active[fixed] = False
+    free = np.nonzero(active)[0]
+
+    U = U0.ravel().copy()
+    V0 = U[fixed].copy()
+    X = {gi: model.coordinates(groups[gi]) for gi in trusses}
+    EA = {gi: groups[gi].data['E'] * groups[gi].data['A'] for gi in trusses}
+
+    def internal(U, lam, tangent):
+        Fint = Klin.dot(U)
+        matrices = []
+        axial = np.full(structure.element_count(), np.nan)
+        for gi in trusses:
+            group = groups[gi]
+            N0 = N00[gi] + lam * (N01[gi] - N00[gi])
+            f, N, k = truss_corotational(X[gi], U[group.dofs], EA[gi], group.L, N0, tangent)
+            off = ~truss_states(group, N)
+            if np.any(off):
+                f[off] *= slack
+                N[off] = 0.
+                if tangent:
+                    k[off] *= slack
+            np.add.at(Fint, group.dofs, f)
+            matrices.append(k)
+            axial[group.ekeys] = N
+        Kt = Klin + model.assemble(matrices, [groups[gi] for gi in trusses]) if tangent else None
+        return Fint, Kt, axial
+
+    increment = 0
+    lam = 0.
+    dlam0 = dlam = 1. / max(1, step.increments)
+    cuts = 0
+    convergence = []
+    residuals = []
+
+    while lam < 1 - 1e-12:
+
+        lam1 = 1. if lam + dlam > 1 - 1e-12 else lam + dlam
+        Ut = U.copy()
+        Ut[fixed] = V0 + lam1 * (values - V0)
+        Fext = F0 + lam1 * (F1 - F0)
+        log = []
+        singular = False
+
+        for iteration in range(step.iterations + 1):
+
+            Fint, Kt, axial = internal(Ut, lam1, True)
+            R = (Fext - Fint)[free]
+            ref = max(np.linalg.norm(Fext), np.linalg.norm(Fint), 1e-12)
+            log.append(np.linalg.norm(R) / ref)
+
+            if log[-1] <= step.tolerance or iteration == step.iterations:
+                break
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', MatrixRankWarning)
+                try:
+                    du = spsolve(Kt[free][:, free].tocsc(), R)
+                except MatrixRankWarning:
+                    du = None
+
+            if du is None or not np.all(np.isfinite(du)):
+                singular = True
+                break
+
+            g0 = du.dot(R)
+            s = 1.
+
+            for _ in range(line_searches):
+                trial = Ut.copy()
+                trial[free] += s * du
+                g = du.dot((Fext - internal(trial, lam1, False)[0])[free])
+                if abs(g) <= 0.5 * abs(g0) or g == g0:
+                    break
+                s = min(1., max(0.1, s * g0 / (g0 - g)))
+
+            Ut[free] += s * du
+
+        if log[-1] <= step.tolerance and not singular:
+            increment += 1
+            U, lam, cuts = Ut, lam1, 0
+            dlam = min(dlam0, 2 * dlam)
+            convergence.append([increment, lam, len(log) - 1, log[-1]])
+            residuals.extend([increment, i, r] for i, r in enumerate(log))
+
+        elif cuts < cutbacks:
+            dlam *= 0.5
+            cuts += 1
+
+        else:
+            break
+
+    Fext = F0 + lam * (F1 - F0)
+    Fint, _, axial = internal(U, lam, False)
+    RF = Fint - Fext
+    RF[free] = 0
+
+    return {'U': U.reshape(-1, 6), 'RF': RF.reshape(-1, 6), 'CF': Fext.reshape(-1, 6), 'axial': axial,
+            'convergence': np.array(convergence).reshape(-1, 4), 'residuals': np.array(residuals).reshape(-1, 3),
+            'converged': lam >= 1 - 1e-12, 'factor': lam, 'singular': singular}
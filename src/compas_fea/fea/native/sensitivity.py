@@ -0,0 +1,266 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.model import Group
+from compas_fea.fea.native.model import element_selection
+from compas_fea.fea.native.static import linear_solve
+
+import inspect
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse.linalg import splu
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'section_derivatives',
+    'sensitivity_analysis',
+]
+
+
+components = {'x': 0, 'y': 1, 'z': 2, 'xx': 3, 'yy': 4, 'zz': 5}
+
+parameter_data = {
+    'truss': {'A': 'A'},
+    'shell': {'t': 't'},
+    'membrane': {'t': 't'},
+    'beam': {'A': 'A', 'Ixx': 'I1', 'Iyy': 'I2', 'J': 'J'},
+}
+
+
+def section_derivatives(section, parameter):
+    """Derivatives of the section geometry used by the native elements with respect to a section parameter.
+
+    Parameters
+    ----------
+    section : obj
+        Section object, e.g. ShellSection, TrussSection, RectangularSection or PipeSection.
+    parameter : str
+        Name of a constructor argument of the section, e.g. 't', 'A', 'b', 'h' or 'r'.
+
+    Returns
+    -------
+    dict
+        Derivatives of the section geometry values, e.g. {'A': dA/dp, 'Ixx': dIxx/dp, ...}.
+
+    Notes
+    -----
+    - Derived section geometry is differentiated by central differences of the Section class itself.
+
+    """
+
+    cls = type(section)
+    arguments = [i for i in inspect.signature(cls.__init__).parameters if i not in ['self', 'name']]
+
+    if parameter not in arguments or parameter not in section.geometry:
+        raise ValueError('***** {0} has no parameter {1} *****'.format(section.__name__, parameter))
+
+    value = section.geometry[parameter]
+    h = 1e-6 * (abs(value) or 1.)
+    geometry = []
+
+    for step in [h, -h]:
+        args = {i: section.geometry[i] for i in arguments}
+        args[parameter] = value + step
+        geometry.append(cls(name=section.name, **args).geometry)
+
+    return {key: (geometry[0][key] - geometry[1][key]) / (2 * h) for key in geometry[0]
+            if isinstance(geometry[0][key], (int, float))}
+
+
+def _subgroup(group, rows, copies=1):
+
+    sub = Group(kind=group.kind, nn=group.nn)
+    rows = np.tile(rows, copies)
+    sub.ekeys = group.ekeys[rows]
+    sub.nodes = group.nodes[rows]
+    sub.sections = group.sections[rows]
+    sub.materials = group.materials[rows]
+    sub.data = {key: value[rows].copy() for key, value in group.data.items()}
+    sub.dofs = group.dofs[rows]
+    sub.weights = group.weights[rows]
+
+    return sub
+
+
+def _perturbed(group, rows, derivatives, h):
+
+    sub = _subgroup(group, rows, copies=2)
+    m = len(rows)
+
+    for key, name in parameter_data[group.kind].items():
+        if derivatives.get(key, 0):
+            sub.data[name][:m] += h * derivatives[key]
+            sub.data[name][m:] -= h * derivatives[key]
+
+    return sub, m
+
+
+def sensitivity_analysis(model, loads, displacements, responses, parameters):
+    """Adjoint sensitivities of a linear static solution with respect to section parameters.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    loads : dict
+        Load object names and their factors.
+    displacements : dict
+        Displacement object names and their factors.
+    responses : list
+        Responses, 'compliance', ('u', node, component) with component 'x', 'y', 'z', 'xx', 'yy' or 'zz', or
+        ('s', element, field, point) for an element result such as ('s', 5, 'sxx', 'ip1_sp1') or ('s', 2, 'sf1',
+        'ip1_sp0').
+    parameters : list
+        (section name, parameter) pairs, e.g. ('shell', 't'), ('bar', 'A') or ('rect', 'h').
+
+    Returns
+    -------
+    dict
+        (r,) 'responses' values, and by 'section.parameter' the (m,) 'elements' keys of the section and the (r x m)
+        'gradients' of the responses with respect to the parameter of each element.
+
+    Notes
+    -----
+    - One adjoint system K L = dr/du is solved for all responses with the factorisation of the static solve, after
+      which each element gradient is L_e^T (df_e/dp - dk_e/dp u_e) plus the explicit derivative of the response.
+    - Element matrix and load derivatives are semi-analytic, by central differences of the element kernels.
+    - Summing the gradients of a section over its elements gives the gradient of the shared section parameter.
+
+    """
+
+    structure = model.structure
+    K = model.stiffness()
+    F, fe = model.load_vector(loads)
+    fixed, values = model.constraints(displacements)
+    free = model.free(K, fixed)
+    solve = splu(K[free][:, free].tocsc()).solve
+    U, _ = linear_solve(K, F, fixed, values, free, solve=solve)
+
+    # Responses and their derivatives with respect to U
+
+    r = len(responses)
+    R = np.zeros(r)
+    dRdU = np.zeros((model.ndof, r))
+    explicit = {}
+
+    for i, response in enumerate(responses):
+
+        if response == 'compliance':
+            R[i] = F.dot(U)
+            dRdU[:, i] = F
+
+        elif response[0] == 'u':
+            dof = 6 * response[1] + components[response[2]]
+            R[i] = U[dof]
+            dRdU[dof, i] = 1.
+
+        elif response[0] == 's':
+            gi, row = model.index[response[1]]
+            R[i], dRdU[:, i], explicit[i] = _element_response(model, gi, row, U, loads, response[2], response[3])
+
+        else:
+            raise ValueError('***** Unknown response {0} *****'.format(response))
+
+    L = np.zeros((model.ndof, r))
+    L[free] = solve(dRdU[free]).reshape(len(free), r)
+
+    # Element gradients
+
+    compliance = [i for i, response in enumerate(responses) if response == 'compliance']
+    gradients, elements = {}, {}
+
+    for name, parameter in parameters:
+
+        derivatives = section_derivatives(structure.sections[name], parameter)
+        key = '{0}.{1}'.format(name, parameter)
+        keys, columns = [], []
+
+        for gi, group in enumerate(model.groups):
+
+            rows = np.nonzero(group.sections == name)[0]
+
+            if not len(rows) or group.kind not in parameter_data:
+                continue
+
+            d = parameter_data[group.kind]
+            p = structure.sections[name].geometry[parameter]
+            h = 1e-6 * (abs(p) or 1.)
+            sub, m = _perturbed(group, rows, derivatives, h)
+            k = model.element_stiffness(sub)
+            dk = (k[:m] - k[m:]) / (2 * h)
+            df = _element_loads(model, sub, loads)
+            df = (df[:m] - df[m:]) / (2 * h)
+
+            u = U[group.dofs[rows]]
+            pseudo = df - np.einsum('eij,ej->ei', dk, u)
+            g = np.einsum('eir,ei->re', L[group.dofs[rows]], pseudo)
+
+            for i in compliance:
+                g[i] += np.einsum('ei,ei->e', df, u)
+
+            for i, (egi, erow, dsdp) in explicit.items():
+                if egi == gi and erow in rows and any(derivatives.get(j, 0) for j in d):
+                    g[i, np.nonzero(rows == erow)[0][0]] += dsdp(derivatives, h)
+
+            keys.append(group.ekeys[rows])
+            columns.append(g)
+
+        elements[key] = np.concatenate(keys) if keys else np.zeros(0, dtype=int)
+        gradients[key] = np.hstack(columns) if columns else np.zeros((r, 0))
+
+    return {'responses': R, 'elements': elements, 'gradients': gradients}
+
+
+def _element_loads(model, group, loads):
+
+    f = np.zeros(group.dofs.shape)
+    model.element_stiffness(group)
+
+    for name, fact in loads.items():
+        load = model.structure.loads[name]
+        if load.__name__ in ['GravityLoad', 'LineLoad', 'AreaLoad', 'PrestressLoad']:
+            rows = np.nonzero(np.isin(group.ekeys, element_selection(model.structure, load.elements)))[0]
+            if len(rows):
+                f[rows] += model._element_load(group, rows, load, fact)
+
+    return f
+
+
+def _element_response(model, gi, row, U, loads, field, point):
+
+    group = model.groups[gi]
+    nd = group.dofs.shape[1]
+    ue = U[group.dofs[row]]
+    du = 1e-6 * (np.max(abs(ue)) or 1.)
+
+    def evaluate(u, data=None):
+        copies = len(u)
+        sub = _subgroup(group, np.array([row]), copies)
+        sub.dofs = np.arange(copies * nd).reshape(copies, nd)
+        sub.data.update(data or {})
+        ids, out = model._group_results(sub, u.ravel(), _element_loads(model, sub, loads))[field]
+        return out[:, list(ids).index(point)]
+
+    s = evaluate(np.vstack([ue, ue + du * np.eye(nd)]))
+    dRdU = np.zeros(model.ndof)
+    dRdU[group.dofs[row]] = (s[1:] - s[0]) / du
+
+    def dsdp(derivatives, h):
+        data = {}
+        for key, name in parameter_data[group.kind].items():
+            data[name] = group.data[name][row] + np.array([h, -h]) * derivatives.get(key, 0)
+        s = evaluate(np.vstack([ue, ue]), data)
+        return (s[0] - s[1]) / (2 * h)
+
+    return s[0], dRdU, (gi, row, dsdp)
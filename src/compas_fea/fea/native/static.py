@@ -0,0 +1,106 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.superelement import condensed_system
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse.linalg import factorized
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'linear_solve',
+    'static_analysis',
+]
+
+
+def linear_solve(K, F, fixed, values, free, solve=None):
+    """Solve K U = F for the free degrees-of-freedom with prescribed values at the fixed ones.
+
+    Parameters
+    ----------
+    K : obj
+        (ndof x ndof) sparse CSR stiffness matrix.
+    F : array
+        (ndof,) load vector.
+    fixed : array
+        Constrained degree-of-freedom numbers.
+    values : array
+        Prescribed values of the constrained degrees-of-freedom.
+    free : array
+        Free degree-of-freedom numbers.
+    solve : obj
+        Factorised solver of K[free, free] to re-use.
+
+    Returns
+    -------
+    array
+        (ndof,) displacements.
+    obj
+        Factorised solver of K[free, free].
+
+    """
+
+    U = np.zeros(K.shape[0])
+    U[fixed] = values
+
+    if solve is None:
+        solve = factorized(K[free][:, free].tocsc())
+
+    U[free] = solve(F[free] - K[free][:, fixed].dot(values))
+
+    return U, solve
+
+
+def static_analysis(model, loads, displacements):
+    """Linear static analysis.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    loads : dict
+        Load object names and their factors.
+    displacements : dict
+        Displacement object names and their factors.
+
+    Returns
+    -------
+    dict
+        (n x 6) arrays 'U' displacements, 'RF' reactions and 'CF' applied nodal loads.
+
+    Notes
+    -----
+    - Superelements are solved through their condensed stiffness and load on the interface degrees-of-freedom, after
+      which their interior displacements are recovered.
+
+    """
+
+    F, _ = model.load_vector(loads)
+    fixed, values = model.constraints(displacements)
+
+    if model.superelements:
+        K, Fr, condensed = condensed_system(model, F, fixed)
+    else:
+        K, Fr, condensed = model.stiffness(), F, []
+
+    free = model.free(K, fixed)
+    U, _ = linear_solve(K, Fr, fixed, values, free)
+
+    for c in condensed:
+        c.recover(U, F)
+
+    RF = K.dot(U) - Fr
+    RF[free] = 0
+
+    return {'U': U.reshape(-1, 6), 'RF': RF.reshape(-1, 6), 'CF': F.reshape(-1, 6)}
@@ -0,0 +1,252 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import hashlib
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.linalg import splu
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'Condensed',
+    'superelement_key',
+    'condense',
+    'condensed_system',
+    'clear_cache',
+]
+
+
+cache_size = 16
+
+_cache = OrderedDict()
+
+
+class Condensed(object):
+    """Stiffness of a substructure statically condensed onto its interface degrees-of-freedom.
+
+    Parameters
+    ----------
+    boundary : array
+        (nb,) interface degree-of-freedom numbers.
+    interior : array
+        (ni,) interior degree-of-freedom numbers.
+    K : array
+        (nb x nb) dense condensed stiffness matrix.
+    Kib : obj
+        (ni x nb) sparse interior-interface stiffness coupling.
+    solve : obj
+        Factorised solver of the interior stiffness matrix.
+
+    """
+
+    def __init__(self, boundary, interior, K, Kib, solve):
+        self.boundary = boundary
+        self.interior = interior
+        self.K = K
+        self.Kib = Kib
+        self.solve = solve
+
+    def load(self, F):
+        """Interface loads equivalent to the interior loads.
+
+        Parameters
+        ----------
+        F : array
+            (ndof,) load vector.
+
+        Returns
+        -------
+        array
+            (nb,) condensed loads to add at the interface degrees-of-freedom.
+
+        """
+
+        Fi = F[self.interior]
+
+        if not np.any(Fi):
+            return np.zeros(len(self.boundary))
+
+        return -self.Kib.T.dot(self.solve(Fi))
+
+    def recover(self, U, F):
+        """Recover the interior displacements from the interface displacements.
+
+        Parameters
+        ----------
+        U : array
+            (ndof,) displacements, the interior degrees-of-freedom are filled in place.
+        F : array
+            (ndof,) load vector.
+
+        Returns
+        -------
+        None
+
+        """
+
+        if len(self.interior):
+            U[self.interior] = self.solve(F[self.interior] - self.Kib.dot(U[self.boundary]))
+
+
+def _split(model, name, fixed):
+
+    inside = [group for group in model.groups if group.superelement == name]
+    outside = [group.dofs.ravel() for group in model.groups if group.superelement != name]
+    dofs = np.unique(np.concatenate([group.dofs.ravel() for group in inside]))
+    shared = np.union1d(np.concatenate(outside + [np.zeros(0, dtype=int)]), fixed)
+    interior = np.setdiff1d(dofs, shared)
+    boundary = np.setdiff1d(dofs, interior)
+
+    return inside, boundary, interior
+
+
+def superelement_key(model, groups, boundary, interior):
+    """Content hash of the element groups of a superelement and its degree-of-freedom partition.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    groups : list
+        Group objects of the superelement.
+    boundary, interior : array
+        Interface and interior degree-of-freedom numbers.
+
+    Returns
+    -------
+    str
+        SHA-1 hex digest of the element kinds, connectivity, nodal co-ordinates, element data and partition.
+
+    """
+
+    sha = hashlib.sha1()
+
+    for group in groups:
+        sha.update(group.kind.encode())
+        sha.update(np.ascontiguousarray(group.nodes).tobytes())
+        sha.update(np.ascontiguousarray(model.xyz[group.nodes]).tobytes())
+        for key in sorted(group.data):
+            sha.update(key.encode())
+            sha.update(np.ascontiguousarray(group.data[key]).tobytes())
+        if group.kind == 'spring':
+            for section in sorted(set(group.sections.tolist())):
+                for channel, table in sorted(model.tables.get(section, {}).items()):
+                    sha.update(np.array([channel]).tobytes() + np.ascontiguousarray(table).tobytes())
+
+    sha.update(np.ascontiguousarray(boundary).tobytes())
+    sha.update(np.ascontiguousarray(interior).tobytes())
+
+    return sha.hexdigest()
+
+
+def condense(model, name, fixed):
+    """Condense the stiffness of a superelement onto the degrees-of-freedom it shares with the rest of the model.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    name : str
+        Superelement name.
+    fixed : array
+        Constrained degree-of-freedom numbers, which are kept on the interface.
+
+    Returns
+    -------
+    obj
+        Condensed object, from the cache if the superelement is unchanged.
+
+    Notes
+    -----
+    - Only the element matrices of a superelement that is not in the cache are computed.
+    - The cache holds the last ``cache_size`` condensed superelements.
+
+    """
+
+    groups, boundary, interior = _split(model, name, fixed)
+    key = superelement_key(model, groups, boundary, interior)
+
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    K = model.assemble([model.element_stiffness(group) for group in groups], groups)
+    Kii = K[interior][:, interior].tocsc()
+    Kib = K[interior][:, boundary].tocsr()
+    solve = splu(Kii).solve if len(interior) else None
+    Kc = K[boundary][:, boundary].toarray()
+
+    if len(interior) and len(boundary):
+        Kc -= Kib.T.dot(solve(Kib.toarray()))
+
+    condensed = _cache[key] = Condensed(boundary, interior, 0.5 * (Kc + Kc.T), Kib, solve)
+
+    while len(_cache) > cache_size:
+        _cache.popitem(last=False)
+
+    return condensed
+
+
+def condensed_system(model, F, fixed):
+    """Stiffness matrix and load vector with all superelements condensed onto their interfaces.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    F : array
+        (ndof,) load vector.
+    fixed : array
+        Constrained degree-of-freedom numbers.
+
+    Returns
+    -------
+    obj
+        (ndof x ndof) sparse CSR stiffness matrix, empty at the interior degrees-of-freedom.
+    array
+        (ndof,) load vector with the interior loads condensed onto the interfaces.
+    list
+        Condensed objects, to recover the interior displacements.
+
+    """
+
+    groups = [group for group in model.groups if group.superelement is None]
+    K = model.assemble([model.element_stiffness(group) for group in groups], groups).tocoo()
+    rows, cols, vals = [K.row], [K.col], [K.data]
+    Fr = F.copy()
+    condensed = []
+
+    for name in model.superelements:
+        if not any(group.superelement == name for group in model.groups):
+            continue
+        c = condense(model, name, fixed)
+        nb = len(c.boundary)
+        rows.append(np.repeat(c.boundary, nb))
+        cols.append(np.tile(c.boundary, nb))
+        vals.append(c.K.ravel())
+        Fr[c.boundary] += c.load(F)
+        Fr[c.interior] = 0
+        condensed.append(c)
+
+    K = coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=K.shape)
+
+    return K.tocsr(), Fr, condensed
+
+
+def clear_cache():
+    """Empty the cache of condensed superelements."""
+    _cache.clear()
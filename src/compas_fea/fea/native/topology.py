@@ -0,0 +1,341 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.fea.native.model import element_selection
+
+from time import time
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import factorized
+    from scipy.spatial import cKDTree
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'density_filter',
+    'oc_update',
+    'mma_update',
+    'simp_analysis',
+]
+
+
+def density_filter(centroids, radius):
+    """Sparse linear hat filter matrix over element neighbourhoods.
+
+    Parameters
+    ----------
+    centroids : array
+        (m x 3) element centroids.
+    radius : float
+        Filter radius.
+
+    Returns
+    -------
+    obj
+        (m x m) sparse CSR matrix with H_ij = max(0, radius - d_ij).
+    array
+        (m,) row sums of H.
+
+    """
+
+    tree = cKDTree(centroids)
+    D = tree.sparse_distance_matrix(tree, radius, output_type='coo_matrix')
+    m = len(centroids)
+    rows = np.concatenate([D.row, np.arange(m)])
+    cols = np.concatenate([D.col, np.arange(m)])
+    vals = np.concatenate([radius - D.data, np.full(m, radius)])
+    vals[:len(D.data)][D.row == D.col] = 0
+    H = coo_matrix((vals, (rows, cols)), shape=(m, m)).tocsr()
+    H.eliminate_zeros()
+
+    return H, np.asarray(H.sum(axis=1)).ravel()
+
+
+def oc_update(x, dc, dv, volume, move=0.2, eta=0.5, xmin=0.):
+    """Optimality criteria update of the densities.
+
+    Parameters
+    ----------
+    x : array
+        (m,) current densities.
+    dc : array
+        (m,) compliance sensitivities (negative).
+    dv : array
+        (m,) volume sensitivities (element volumes).
+    volume : float
+        Allowed total volume.
+    move : float
+        Largest density change.
+    eta : float
+        Damping exponent.
+    xmin : float
+        Lower density bound.
+
+    Returns
+    -------
+    array
+        (m,) new densities.
+
+    """
+
+    l1, l2 = 0., 1e9
+    B = (np.maximum(0., -dc) / dv)**eta
+
+    while (l2 - l1) / (l1 + l2) > 1e-6:
+        lmid = 0.5 * (l1 + l2)
+        xnew = np.clip(x * B / lmid**eta, np.maximum(xmin, x - move), np.minimum(1., x + move))
+        if dv.dot(xnew) > volume:
+            l1 = lmid
+        else:
+            l2 = lmid
+
+    return xnew
+
+
+def mma_update(x, dc, dv, volume, state, move=0.2, xmin=0.):
+    """Method of moving asymptotes update of the densities for compliance with one volume constraint.
+
+    Parameters
+    ----------
+    x : array
+        (m,) current densities.
+    dc : array
+        (m,) compliance sensitivities.
+    dv : array
+        (m,) volume sensitivities (element volumes).
+    volume : float
+        Allowed total volume.
+    state : dict
+        Previous densities 'x1', 'x2' and asymptotes 'L', 'U', updated in place.
+    move : float
+        Largest density change.
+    xmin : float
+        Lower density bound.
+
+    Returns
+    -------
+    array
+        (m,) new densities.
+
+    Notes
+    -----
+    - Asymptotes follow Svanberg's update, the convex sub-problem is solved through its dual by bisection on the
+      single Lagrange multiplier.
+
+    """
+
+    xmax = 1.
+    span = xmax - xmin
+    x1, x2 = state.get('x1'), state.get('x2')
+
+    if x2 is None:
+        L = x - 0.5 * span
+        U = x + 0.5 * span
+    else:
+        sign = (x - x1) * (x1 - x2)
+        gamma = np.where(sign > 0, 1.2, np.where(sign < 0, 0.7, 1.))
+        L = np.clip(x - gamma * (x1 - state['L']), x - 10 * span, x - 0.01 * span)
+        U = np.clip(x + gamma * (state['U'] - x1), x + 0.01 * span, x + 10 * span)
+
+    alpha = np.maximum.reduce([np.full(len(x), xmin), L + 0.1 * (x - L), x - move * span])
+    beta = np.minimum.reduce([np.full(len(x), xmax), U - 0.1 * (U - x), x + move * span])
+
+    scale = max(abs(dc).max(), 1e-30)
+    p0 = (U - x)**2 * (np.maximum(dc, 0) / scale + 1e-5 / span)
+    q0 = (x - L)**2 * (np.maximum(-dc, 0) / scale + 1e-5 / span)
+    p1 = (U - x)**2 * np.maximum(dv, 0)
+    q1 = (x - L)**2 * np.maximum(-dv, 0)
+    r1 = dv.dot(x) - volume - np.sum(p1 / (U - x) + q1 / (x - L))
+
+    def primal(lam):
+        P, Q = np.sqrt(p0 + lam * p1), np.sqrt(q0 + lam * q1)
+        return np.clip((P * L + Q * U) / (P + Q), alpha, beta)
+
+    def constraint(xs):
+        return np.sum(p1 / (U - xs) + q1 / (xs - L)) + r1
+
+    l1, l2 = 0., 1.
+    while constraint(primal(l2)) > 0 and l2 < 1e12:
+        l2 *= 10
+
+    for _ in range(100):
+        lmid = 0.5 * (l1 + l2)
+        if constraint(primal(lmid)) > 0:
+            l1 = lmid
+        else:
+            l2 = lmid
+        if l2 - l1 < 1e-9 * (1 + l2):
+            break
+
+    state.update({'x2': x1, 'x1': x, 'L': L, 'U': U})
+
+    return primal(l2)
+
+
+def simp_analysis(model, loads, displacements, elements, volume_fraction=0.5, penalty=3., radius=None,
+                  iterations=100, tolerance=0.01, method='oc', move=0.2, Emin=1e-9, output=True):
+    """SIMP topology optimisation of the compliance of a linear static load case.
+
+    Parameters
+    ----------
+    model : obj
+        Model object.
+    loads : dict
+        Load object names and their factors.
+    displacements : dict
+        Displacement object names and their factors.
+    elements : str, list
+        Element set name(s) and/or element keys of the design domain.
+    volume_fraction : float
+        Allowed fraction of the design domain volume.
+    penalty : float
+        SIMP penalisation exponent p of E = Emin + x^p (1 - Emin).
+    radius : float
+        Sensitivity filter radius, None for 1.5 times the mean design element size.
+    iterations : int
+        Maximum number of iterations.
+    tolerance : float
+        Largest density change for convergence.
+    method : str
+        'oc' optimality criteria or 'mma' method of moving asymptotes.
+    move : float
+        Largest density change per iteration.
+    Emin : float
+        Relative stiffness of void elements.
+    output : bool
+        Print terminal output.
+
+    Returns
+    -------
+    dict
+        (m,) design 'elements' keys and 'densities', and the 'history' of compliance, volume fraction, change and the
+        per-iteration 'timings' of assembly, solve, sensitivities, filter and update.
+
+    Notes
+    -----
+    - Element matrices are computed once, the global stiffness data are a sparse product of a precomputed
+      element-to-pattern matrix with the element stiffness factors.
+    - Loads are taken as design independent.
+
+    """
+
+    groups = model.groups
+    indptr, indices, positions = model.pattern()
+    design = np.array(element_selection(model.structure, elements), dtype=int)
+
+    # Element-to-pattern matrix
+
+    rows, cols, vals, sizes, lengths, centroids, ekeys = [], [], [], [], [], [], []
+    offset = 0
+
+    for gi, group in enumerate(groups):
+        k = model.element_stiffness(group)
+        m = len(group.ekeys)
+        rows.append(positions[gi].ravel())
+        cols.append(np.repeat(np.arange(offset, offset + m), k.shape[1] * k.shape[2]))
+        vals.append(k.ravel())
+        sizes.append(group.size)
+        if group.kind in ['truss', 'beam']:
+            lengths.append(group.L)
+        elif group.kind in ['shell', 'membrane']:
+            lengths.append(np.sqrt(group.area))
+        else:
+            lengths.append(group.size**(1. / 3))
+        centroids.append(model.coordinates(group).mean(axis=1))
+        ekeys.append(group.ekeys)
+        offset += m
+
+    ne = offset
+    P = coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                   shape=(len(indices), ne)).tocsr()
+    ekeys = np.concatenate(ekeys)
+    sizes = np.concatenate(sizes)
+    lengths = np.concatenate(lengths)
+    centroids = np.vstack(centroids)
+    d = np.nonzero(np.isin(ekeys, design))[0]
+
+    K = csr_matrix((P.dot(np.ones(ne)), indices, indptr), shape=(model.ndof, model.ndof))
+    F = model.load_vector(loads)[0]
+    fixed, values = model.constraints(displacements)
+    free = model.free(K, fixed)
+    gather = csr_matrix((np.arange(1, len(indices) + 1), indices, indptr), shape=K.shape)[free][:, free]
+    Kff = gather.copy()
+    gather = gather.data - 1
+
+    # Filter
+
+    v = sizes[d]
+
+    if radius is None:
+        radius = 1.5 * np.mean(lengths[d])
+
+    H, Hs = density_filter(centroids[d], radius)
+
+    # Iterations
+
+    x = np.full(len(d), volume_fraction)
+    factors = np.ones(ne)
+    volume = volume_fraction * v.sum()
+    state = {}
+    history = []
+    U = np.zeros(model.ndof)
+    U[fixed] = values
+
+    for iteration in range(1, iterations + 1):
+
+        tic = time()
+        factors[d] = Emin + x**penalty * (1 - Emin)
+        K.data = P.dot(factors)
+        Kff.data = K.data[gather]
+        Ff = F[free] - K[free][:, fixed].dot(values) if np.any(values) else F[free]
+        t1 = time()
+
+        U[free] = factorized(Kff.tocsc())(Ff)
+        t2 = time()
+
+        ce = np.zeros(ne)
+        offset = 0
+        for group in groups:
+            u = U[group.dofs]
+            ce[offset:offset + len(u)] = np.einsum('ei,eij,ej->e', u, group.k, u)
+            offset += len(u)
+        compliance = factors.dot(ce)
+        dc = -penalty * x**(penalty - 1) * (1 - Emin) * ce[d]
+        t3 = time()
+
+        dc = H.dot(x * dc) / Hs / np.maximum(1e-3, x)
+        t4 = time()
+
+        if method == 'mma':
+            xnew = mma_update(x, dc, v, volume, state, move=move)
+        else:
+            xnew = oc_update(x, dc, v, volume, move=move)
+
+        change = np.max(abs(xnew - x))
+        x = xnew
+        t5 = time()
+
+        history.append({'iteration': iteration, 'compliance': compliance, 'volume': v.dot(x) / v.sum(),
+                        'change': change, 'timings': {'assembly': t1 - tic, 'solve': t2 - t1, 'sensitivity': t3 - t2,
+                                                      'filter': t4 - t3, 'update': t5 - t4}})
+
+        if output:
+            print('***** SIMP iteration {0}: compliance {1:.5g}, volume {2:.3f}, change {3:.3f}, {4:.3f} s *****'.format(
+                iteration, compliance, history[-1]['volume'], change, t5 - tic))
+
+        if change < tolerance:
+            break
+
+    return {'elements': ekeys[d], 'densities': x, 'history': history}
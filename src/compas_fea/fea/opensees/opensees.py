@@ -2,7 +2,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import compas
+
 from compas_fea.fea import Writer
+from compas_fea.utilities.modal import store_mode_shapes
 
 from subprocess import Popen
 from subprocess import PIPE
@@ -146,6 +149,8 @@ def extract_data(structure, fields):
     temp = '{0}{1}/'.format(path, name)
 
     step = structure.steps_order[1]
+    output = structure.output_selection(step)[0]
+    output = range(structure.node_count()) if output is None else output
     results = structure.results[step] = {'nodal': {}, 'element': {}}
     nodal = results['nodal']
     element = results['element']
@@ -200,10 +205,10 @@ def extract_data(structure, fields):
                     dofz = data[2::3]
                     dofm = [sqrt(u**2 + v**2 + w**2) for u, v, w in zip(dofx, dofy, dofz)]
 
-                    nodal['{0}x'.format(field)] = {i: dofx[i] for i in nodes}
-                    nodal['{0}y'.format(field)] = {i: dofy[i] for i in nodes}
-                    nodal['{0}z'.format(field)] = {i: dofz[i] for i in nodes}
-                    nodal['{0}m'.format(field)] = {i: dofm[i] for i in nodes}
+                    nodal['{0}x'.format(field)] = dict(zip(output, dofx))
+                    nodal['{0}y'.format(field)] = dict(zip(output, dofy))
+                    nodal['{0}z'.format(field)] = dict(zip(output, dofz))
+                    nodal['{0}m'.format(field)] = dict(zip(output, dofm))
 
                     print('***** {0}.out data loaded *****'.format(file))
 
@@ -309,16 +314,14 @@ def extract_data(structure, fields):
 
     else:
 
-        nodes = range(structure.node_count())
-
         file = '{0}_frequencies'.format(step)
 
         with open('{0}{1}.txt'.format(temp, file), 'r') as f:
             lines = f.readlines()
-        data = [float(i.rstrip('\n')) for i in lines]
+        frequencies = [float(i.rstrip('\n')) for i in lines]
 
-        structure.results[step]['frequencies'] = data
-        structure.results[step]['masses'] = [0 for i in data]
+        structure.results[step]['masses'] = [0 for i in frequencies]
+        modes, shapes = [], []
 
         for mode in range(structure.steps[step].modes):
 
@@ -328,20 +331,25 @@ def extract_data(structure, fields):
 
                 with open('{0}{1}.out'.format(temp, file), 'r') as f:
                     lines = f.readlines()
-                data = [float(i) for i in lines[-1].split(' ')]
-
-                dofx = data[0::3]
-                dofy = data[1::3]
-                dofz = data[2::3]
-                dofm = [sqrt(u**2 + v**2 + w**2) for u, v, w in zip(dofx, dofy, dofz)]
 
-                nodal['ux{0}'.format(mode + 1)] = {i: dofx[i] for i in nodes}
-                nodal['uy{0}'.format(mode + 1)] = {i: dofy[i] for i in nodes}
-                nodal['uz{0}'.format(mode + 1)] = {i: dofz[i] for i in nodes}
-                nodal['um{0}'.format(mode + 1)] = {i: dofm[i] for i in nodes}
+                data = [float(i) for i in lines[-1].split()]
+                shapes.append([data[i:i + 3] for i in range(0, len(data), 3)])
+                modes.append(mode + 1)
 
                 print('***** {0}.out data loaded *****'.format(file))
 
             except Exception:
 
                 print('***** {0}.out data not loaded/saved'.format(file))
+
+        if shapes and not compas.IPY:
+            store_mode_shapes(structure.results[step], shapes, frequencies=[frequencies[i - 1] for i in modes],
+                              modes=modes, nodes=output)
+
+        else:
+            structure.results[step]['frequencies'] = frequencies
+
+            for mode, shape in zip(modes, shapes):
+                for i, c in enumerate('xyz'):
+                    nodal['u{0}{1}'.format(c, mode)] = {node: u[i] for node, u in zip(output, shape)}
+                nodal['um{0}'.format(mode)] = {node: sqrt(x**2 + y**2 + z**2) for node, (x, y, z) in zip(output, shape)}
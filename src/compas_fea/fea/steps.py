@@ -14,6 +14,12 @@ __all__ = [
 dofs = ['x', 'y', 'z', 'xx', 'yy', 'zz']
 
 
+def _set_names(names):
+    if names is None:
+        return [None]
+    return [names] if isinstance(names, str) else names
+
+
 class Steps(object):
 
     def __init__(self):
@@ -57,6 +63,7 @@ class Steps(object):
             modify = getattr(step, 'modify', None)
             nlgeom = 'YES' if getattr(step, 'nlgeom', None) else 'NO'
             op = 'MOD' if modify else 'NEW'
+            output_nodes, output_elements = self.structure.output_selection(key)
 
             # =====================================================================================================
             # =====================================================================================================
@@ -410,6 +417,11 @@ class Steps(object):
 
                 # Node recorders
 
+                if output_nodes is None:
+                    node_range = '-nodeRange 1 {0}'.format(self.structure.node_count())
+                else:
+                    node_range = '-node {0}'.format(' '.join([str(i + 1) for i in output_nodes]))
+
                 node_output = {
                     'u':  '1 2 3 disp',
                     'ur': '4 5 6 disp',
@@ -425,12 +437,11 @@ class Steps(object):
                     self.write_subsection('Node recorders')
 
                     prefix = 'recorder Node -file {0}{1}_'.format(temp, key)
-                    n = self.structure.node_count()
 
                     for field in node_output:
                         if field in fields:
                             dof = node_output[field]
-                            self.write_line('{0}{1}.out -time -nodeRange 1 {2} -dof {3}'.format(prefix, field, n, dof))
+                            self.write_line('{0}{1}.out -time {2} -dof {3}'.format(prefix, field, node_range, dof))
                             self.blank_line()
 
                     # Sort elements
@@ -441,9 +452,13 @@ class Steps(object):
                     truss_ekeys = []
                     beam_ekeys = []
                     spring_ekeys = []
+                    selected = None if output_elements is None else set(output_elements)
 
                     for ekey, element in self.structure.elements.items():
 
+                        if selected is not None and ekey not in selected:
+                            continue
+
                         etype = element.__name__
                         n = '{0} '.format(ekey + 1)
 
@@ -516,8 +531,7 @@ class Steps(object):
 
                     for mode in range(modes):
                         prefix = 'recorder Node -file {0}{1}_u_mode-{2}'.format(temp, key, mode + 1)
-                        n = self.structure.node_count()
-                        self.write_line('{0}.out -nodeRange 1 {1} -dof 1 2 3 "eigen {2}"'.format(prefix, n, mode + 1))
+                        self.write_line('{0}.out {1} -dof 1 2 3 "eigen {2}"'.format(prefix, node_range, mode + 1))
                         self.blank_line()
 
                     self.write_subsection('Eigen analysis')
@@ -558,17 +572,22 @@ class Steps(object):
 
                 self.write_line('*OUTPUT, FIELD')
                 self.blank_line()
-                self.write_line('*NODE OUTPUT')
-                self.blank_line()
-                self.write_line(', '.join([i.upper() for i in node_fields if i in fields]))
-                self.blank_line()
-                self.write_line('*ELEMENT OUTPUT')
-                self.blank_line()
-                self.write_line(', '.join([i.upper() for i in element_fields if (i in fields and i != 'rbfor')]))
 
-                if 'rbfor' in fields:
-                    self.write_line('*ELEMENT OUTPUT, REBAR')
-                    self.write_line('RBFOR')
+                for nset in _set_names(getattr(step, 'output_nodes', None)):
+                    self.write_line('*NODE OUTPUT{0}'.format(', NSET={0}'.format(nset) if nset else ''))
+                    self.blank_line()
+                    self.write_line(', '.join([i.upper() for i in node_fields if i in fields]))
+                    self.blank_line()
+
+                for elset in _set_names(getattr(step, 'output_elements', None)):
+                    scope = ', ELSET={0}'.format(elset) if elset else ''
+                    self.write_line('*ELEMENT OUTPUT{0}'.format(scope))
+                    self.blank_line()
+                    self.write_line(', '.join([i.upper() for i in element_fields if (i in fields and i != 'rbfor')]))
+
+                    if 'rbfor' in fields:
+                        self.write_line('*ELEMENT OUTPUT, REBAR{0}'.format(scope))
+                        self.write_line('RBFOR')
 
                 self.blank_line()
                 self.write_line('*END STEP')
@@ -124,6 +124,7 @@ material
     ElasticOrthotropic
     ElasticPlastic
     Steel
+    ThermalMaterial
 
 
 misc
@@ -135,6 +136,7 @@ misc
     Misc
     Amplitude
     Temperatures
+    Superelement
 
 
 section
@@ -169,9 +171,11 @@ step
 
     Step
     GeneralStep
+    HeatStep
     ModalStep
     HarmonicStep
     BucklingStep
+    DynamicStep
 
 
 """
@@ -233,12 +237,14 @@ from .material import (
     Stiff,
     ElasticOrthotropic,
     ElasticPlastic,
-    Steel
+    Steel,
+    ThermalMaterial
 )
 from .misc import (
     Misc,
     Amplitude,
-    Temperatures
+    Temperatures,
+    Superelement
 )
 from .node import Node
 from .section import (
@@ -264,10 +270,12 @@ from .set import Set
 from .step import (
     Step,
     GeneralStep,
+    HeatStep,
     ModalStep,
     HarmonicStep,
     BucklingStep,
-    AcousticStep
+    AcousticStep,
+    DynamicStep
 )
 from .structure import Structure
 
@@ -330,12 +338,14 @@ __all__ = [
     'ElasticOrthotropic',
     'ElasticPlastic',
     'Steel',
+    'ThermalMaterial',
 
     'Node',
 
     'Misc',
     'Amplitude',
     'Temperatures',
+    'Superelement',
 
     'Section',
     'AngleSection',
@@ -359,10 +369,12 @@ __all__ = [
 
     'Step',
     'GeneralStep',
+    'HeatStep',
     'ModalStep',
     'HarmonicStep',
     'BucklingStep',
     'AcousticStep',
+    'DynamicStep',
 
     'Structure'
 ]
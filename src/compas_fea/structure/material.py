@@ -17,7 +17,7 @@ __all__ = [
     'Stiff',
     'ElasticOrthotropic',
     'ElasticPlastic',
-    # 'ThermalMaterial',
+    'ThermalMaterial',
     'Steel'
 ]
 
@@ -9,7 +9,8 @@ from __future__ import print_function
 __all__ = [
     'Misc',
     'Amplitude',
-    'Temperatures'
+    'Temperatures',
+    'Superelement',
 ]
 
 
@@ -99,3 +100,32 @@ class Temperatures(Misc):
         self.values = values
         self.tend = tend
         self.attr_list.extend(['file', 'values', 'tend'])
+
+
+class Superelement(Misc):
+    """Define a substructure to be statically condensed onto its interface by the native solver.
+
+    Parameters
+    ----------
+    name : str
+        Superelement object name.
+    elements : str, list
+        Element set name(s) and/or element keys of the substructure.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - The condensed stiffness is cached and re-used while the elements, their nodes and properties are unchanged.
+
+    """
+
+    def __init__(self, name, elements):
+        Misc.__init__(self, name=name)
+
+        self.__name__ = 'Superelement'
+        self.name = name
+        self.elements = elements
+        self.attr_list.extend(['elements'])
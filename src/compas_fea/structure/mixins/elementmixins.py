@@ -19,6 +19,16 @@ from compas_fea.structure.element import PentahedronElement
 from compas_fea.structure.element import HexahedronElement
 from compas_fea.structure.element import MassElement
 
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.sparse import csr_matrix
+except ImportError:
+    pass
+
 # Author(s): Andrew Liew (github.com/andrewliew), Tomas Mendez Echenagucia (github.com/tmsmendez)
 
 __all__ = [
@@ -87,6 +97,7 @@ class ElementMixins(object):
                 self.elements[ekey] = element
 
                 self.add_element_to_element_index(ekey, nodes)
+                self.invalidate_topology()
 
             return ekey
 
@@ -260,6 +271,7 @@ class ElementMixins(object):
         element.nodes = nodes
         element.number = ekey
         self.elements[ekey] = element
+        self.invalidate_topology()
         return ekey
 
     def add_virtual_element(self, nodes, type, thermal=False, axes={}):
@@ -328,3 +340,142 @@ class ElementMixins(object):
 
         for element in elements:
             self.elements[element].element_property = element_property.name
+
+    # ==============================================================================
+    # Topology
+    # ==============================================================================
+
+    def invalidate_topology(self):
+        """Clear the cached element connectivity, incidence and adjacency matrices.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Called when nodes or elements are added, and to be called after the nodes of elements are edited.
+        - Increments the topology version, the key of the cache entries that depend on the connectivity.
+
+        """
+
+        self._topology = None
+        self._topology_version = getattr(self, '_topology_version', 0) + 1
+
+    def _topology_cache(self):
+
+        cache = getattr(self, '_topology', None)
+
+        if cache is None:
+            cache = self._topology = {'key': getattr(self, '_topology_version', 0)}
+
+        return cache
+
+    def element_nodes_array(self):
+        """Element connectivity as an array, computed once and cached.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        array
+            (m x k) node numbers of each element key, padded with -1, for m = structure.element_count().
+
+        """
+
+        cache = self._topology_cache()
+
+        if 'connectivity' not in cache:
+            ekeys = np.array(sorted(self.elements, key=int), dtype=np.int64)
+            lengths = np.array([len(self.elements[i].nodes) for i in ekeys], dtype=np.int64)
+            connectivity = np.full((self.element_count(), max(1, lengths.max(initial=0))), -1, dtype=np.int64)
+            rows = np.repeat(ekeys, lengths)
+            cols = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            connectivity[rows, cols] = [int(j) for i in ekeys for j in self.elements[i].nodes]
+            cache['connectivity'] = connectivity
+
+        return cache['connectivity']
+
+    def node_element_incidence(self):
+        """Node to element incidence matrix, computed once and cached.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        obj
+            (n x m) sparse CSR matrix, with a 1 where a node belongs to an element.
+
+        """
+
+        cache = self._topology_cache()
+
+        if 'incidence' not in cache:
+            connectivity = self.element_nodes_array()
+            used = (connectivity >= 0).ravel()
+            cols = np.repeat(np.arange(connectivity.shape[0]), connectivity.shape[1])[used]
+            rows = connectivity.ravel()[used]
+            cache['incidence'] = csr_matrix((np.ones(len(rows)), (rows, cols)),
+                                            shape=(self.node_count(), connectivity.shape[0]))
+
+        return cache['incidence']
+
+    def element_adjacency(self):
+        """Element to element adjacency through shared nodes, computed once and cached.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        obj
+            (m x m) sparse CSR matrix of the number of nodes shared by two different elements.
+
+        """
+
+        cache = self._topology_cache()
+
+        if 'elements' not in cache:
+            N = self.node_element_incidence()
+            cache['elements'] = _offdiagonal(N.T.dot(N))
+
+        return cache['elements']
+
+    def node_adjacency(self):
+        """Node to node adjacency through shared elements, computed once and cached.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        obj
+            (n x n) sparse CSR matrix of the number of elements shared by two different nodes.
+
+        """
+
+        cache = self._topology_cache()
+
+        if 'nodes' not in cache:
+            N = self.node_element_incidence()
+            cache['nodes'] = _offdiagonal(N.dot(N.T))
+
+        return cache['nodes']
+
+
+def _offdiagonal(A):
+
+    A = A.tocoo()
+    keep = A.row != A.col
+
+    return csr_matrix((A.data[keep], (A.row[keep], A.col[keep])), shape=A.shape)
@@ -59,6 +59,8 @@ class NodeMixins(object):
             else:
                 self.add_node_to_node_index(key=key, xyz=xyz)
 
+            self.invalidate_topology()
+
         return key
 
     def add_nodes(self, nodes, ex=[1, 0, 0], ey=[0, 1, 0], ez=[0, 0, 1]):
@@ -9,11 +9,12 @@ from __future__ import print_function
 __all__ = [
     'Step',
     'GeneralStep',
-    # 'HeatStep',
+    'HeatStep',
     'ModalStep',
     'HarmonicStep',
     'BucklingStep',
-    'AcousticStep'
+    'AcousticStep',
+    'DynamicStep',
 ]
 
 
@@ -35,6 +36,8 @@ class Step(object):
     def __init__(self, name):
         self.__name__ = 'StepObject'
         self.name = name
+        self.output_nodes = None
+        self.output_elements = None
         self.attr_list = ['name']
 
     def __str__(self):
@@ -67,7 +70,8 @@ class GeneralStep(Step):
     factor : float, dict
         Proportionality factor(s) on the loads and displacements.
     nlgeom : bool
-        Analyse non-linear geometry effects.
+        Analyse non-linear geometry effects. The native solver does so only for models of trusses, springs and
+        masses, and analyses other models linearly.
     nlmat : bool
         Analyse non-linear material effects.
     displacements : list
@@ -78,10 +82,15 @@ class GeneralStep(Step):
         'static','static,riks'.
     modify : bool
         Modify the previously added loads.
+    output_nodes : str, list
+        Node set name(s) to write and extract nodal output for, None for all nodes.
+    output_elements : str, list
+        Element set name(s) to write and extract element output for, None for all elements.
 
     """
 
-    def __init__(self, name, increments=100, iterations=100, tolerance=0.01, factor=1.0, nlgeom=True, nlmat=True, displacements=None, loads=None, type='static', modify=True):
+    def __init__(self, name, increments=100, iterations=100, tolerance=0.01, factor=1.0, nlgeom=True, nlmat=True, displacements=None, loads=None, type='static',
+                 modify=True, output_nodes=None, output_elements=None):
         Step.__init__(self, name=name)
 
         if not displacements:
@@ -101,9 +110,11 @@ class GeneralStep(Step):
         self.displacements = displacements
         self.loads = loads
         self.modify = modify
+        self.output_nodes = output_nodes
+        self.output_elements = output_elements
         self.type = type
         self.attr_list.extend(['increments', 'iterations', 'factor', 'nlgeom', 'nlmat', 'displacements', 'loads',
-                               'type', 'tolerance', 'modify'])
+                               'type', 'tolerance', 'modify', 'output_nodes', 'output_elements'])
 
 
 class HeatStep(Step):
@@ -125,10 +136,13 @@ class HeatStep(Step):
         'heat transfer'.
     duration : float
         Duration of step.
+    steady : bool
+        Steady-state analysis at the end of the step, else transient.
 
     """
 
-    def __init__(self, name, interaction, increments=100, temp0=20, dTmax=1, type='heat transfer', duration=1):
+    def __init__(self, name, interaction, increments=100, temp0=20, dTmax=1, type='heat transfer', duration=1,
+                 steady=False):
         Step.__init__(self, name=name)
 
         self.__name__ = 'HeatStep'
@@ -139,7 +153,8 @@ class HeatStep(Step):
         self.dTmax = dTmax
         self.type = type
         self.duration = duration
-        self.attr_list.extend(['interaction', 'increments', 'temp0', 'dTmax', 'type', 'duration'])
+        self.steady = steady
+        self.attr_list.extend(['interaction', 'increments', 'temp0', 'dTmax', 'type', 'duration', 'steady'])
 
 
 class ModalStep(Step):
@@ -157,10 +172,15 @@ class ModalStep(Step):
         Displacement object names.
     type : str
         'modal'.
+    output_nodes : str, list
+        Node set name(s) to write and extract nodal output for, None for all nodes.
+    output_elements : str, list
+        Element set name(s) to write and extract element output for, None for all elements.
 
     """
 
-    def __init__(self, name, modes=10, increments=100, displacements=None, type='modal'):
+    def __init__(self, name, modes=10, increments=100, displacements=None, type='modal', output_nodes=None,
+                 output_elements=None):
         Step.__init__(self, name=name)
 
         if not displacements:
@@ -172,7 +192,9 @@ class ModalStep(Step):
         self.increments = increments
         self.displacements = displacements
         self.type = type
-        self.attr_list.extend(['modes', 'increments', 'displacements', 'type'])
+        self.output_nodes = output_nodes
+        self.output_elements = output_elements
+        self.attr_list.extend(['modes', 'increments', 'displacements', 'type', 'output_nodes', 'output_elements'])
 
 
 class HarmonicStep(Step):
@@ -194,10 +216,15 @@ class HarmonicStep(Step):
         Constant harmonic damping ratio.
     type : str
         'harmonic'.
+    output_nodes : str, list
+        Node set name(s) to write and extract nodal output for, None for all nodes.
+    output_elements : str, list
+        Element set name(s) to write and extract element output for, None for all elements.
 
     """
 
-    def __init__(self, name, freq_list, displacements=None, loads=None, factor=1.0, damping=None, type='harmonic'):
+    def __init__(self, name, freq_list, displacements=None, loads=None, factor=1.0, damping=None, type='harmonic',
+                 output_nodes=None, output_elements=None):
         Step.__init__(self, name=name)
 
         if not displacements:
@@ -214,7 +241,10 @@ class HarmonicStep(Step):
         self.factor = factor
         self.damping = damping
         self.type = type
-        self.attr_list.extend(['freq_list', 'displacements', 'loads', 'factor', 'damping', 'type'])
+        self.output_nodes = output_nodes
+        self.output_elements = output_elements
+        self.attr_list.extend(['freq_list', 'displacements', 'loads', 'factor', 'damping', 'type', 'output_nodes',
+                               'output_elements'])
 
 
 class BucklingStep(Step):
@@ -238,11 +268,15 @@ class BucklingStep(Step):
         'buckle'.
     step : str
         Step to copy loads and displacements from.
+    output_nodes : str, list
+        Node set name(s) to write and extract nodal output for, None for all nodes.
+    output_elements : str, list
+        Element set name(s) to write and extract element output for, None for all elements.
 
     """
 
     def __init__(self, name, modes=5, increments=100, factor=1., displacements=None, loads=None, type='buckle',
-                 step=None):
+                 step=None, output_nodes=None, output_elements=None):
         Step.__init__(self, name=name)
 
         if not displacements:
@@ -260,7 +294,10 @@ class BucklingStep(Step):
         self.loads = loads
         self.type = type
         self.step = step
-        self.attr_list.extend(['modes', 'increments', 'factor', 'displacements', 'loads', 'type', 'step'])
+        self.output_nodes = output_nodes
+        self.output_elements = output_elements
+        self.attr_list.extend(['modes', 'increments', 'factor', 'displacements', 'loads', 'type', 'step',
+                               'output_nodes', 'output_elements'])
 
 
 class AcousticStep(Step):
@@ -317,3 +354,63 @@ class AcousticStep(Step):
         self.type = type
         self.attr_list.extend(['freq_range', 'freq_step', 'displacements', 'sources', 'samples', 'loads', 'factor',
                                'damping', 'type'])
+
+
+class DynamicStep(Step):
+    """Initialises DynamicStep object for use in an implicit dynamic time-history analysis.
+
+    Parameters
+    ----------
+    name : str
+        Name of the DynamicStep.
+    duration : float
+        Duration of the step.
+    increment : float
+        Time increment.
+    displacements : list
+        Displacement object names.
+    loads : list
+        Load object names.
+    amplitude : str, dict
+        Amplitude object name(s) of the load time histories, as for factor.
+    factor : float, dict
+        Proportionality factor(s) on the loads and displacements.
+    damping : list
+        Rayleigh damping coefficients [alpha, beta] for C = alpha M + beta K.
+    alpha : float
+        Hilber-Hughes-Taylor numerical damping parameter in [-1/3, 0], 0 for Newmark average acceleration.
+    type : str
+        'dynamic'.
+
+    Notes
+    -----
+    - Analysed by the 'native' solver only.
+
+    """
+
+    def __init__(self, name, duration=1., increment=0.01, displacements=None, loads=None, amplitude=None, factor=1.,
+                 damping=None, alpha=0., type='dynamic'):
+        Step.__init__(self, name=name)
+
+        if not displacements:
+            displacements = []
+
+        if not loads:
+            loads = []
+
+        if not damping:
+            damping = [0., 0.]
+
+        self.__name__ = 'DynamicStep'
+        self.name = name
+        self.duration = duration
+        self.increment = increment
+        self.displacements = displacements
+        self.loads = loads
+        self.amplitude = amplitude
+        self.factor = factor
+        self.damping = damping
+        self.alpha = alpha
+        self.type = type
+        self.attr_list.extend(['duration', 'increment', 'displacements', 'loads', 'amplitude', 'factor', 'damping',
+                               'alpha', 'type'])
@@ -4,6 +4,8 @@ from __future__ import print_function
 
 from compas_fea.fea.abaq import abaq
 from compas_fea.fea.ansys import ansys
+from compas_fea.fea.native import native
+from compas_fea.fea.native.model import Model
 from compas_fea.fea.opensees import opensees
 
 # from compas_fea.utilities import combine_all_sets
@@ -16,9 +18,25 @@ from compas_fea.structure.mixins.objectmixins import ObjectMixins
 # from compas_fea.structure.displacement import *
 from compas_fea.structure.set import Set
 
+from compas_fea.utilities.combination import combine_results
+from compas_fea.utilities.combination import envelope_results
+from compas_fea.utilities.derived import derived_field
+from compas_fea.utilities.functions import postprocess_colours
+from compas_fea.utilities.spectrum import frequency_response
+from compas_fea.utilities.spectrum import response_spectrum
+from compas_fea.utilities.functions import process_data
+
+from collections import OrderedDict
+from time import time
+
 import pickle
 import os
 
+try:
+    import numpy as np
+except ImportError:
+    pass
+
 
 # Author(s): Andrew Liew (github.com/andrewliew), Tomas Mendez Echenagucia (github.com/tmsmendez)
 
@@ -84,9 +102,13 @@ class Structure(ObjectMixins, ElementMixins, NodeMixins):
         Element objects for virtual elements.
     virtual_element_index : dict
         Index of virtual elements (element centroid geometric keys).
+    postprocess_cache_size : int
+        Number of processed result fields kept by postprocess_results.
 
     """
 
+    postprocess_cache_size = 32
+
     def __init__(self, path, name='compas_fea-Structure'):
         self.constraints = {}
         self.displacements = {}
@@ -111,6 +133,9 @@ class Structure(ObjectMixins, ElementMixins, NodeMixins):
         self.virtual_node_index = {}
         self.virtual_elements = {}
         self.virtual_element_index = {}
+        self._topology = None
+        self._topology_version = 0
+        self._postprocessed = None
 
     def __str__(self):
         n = self.node_count()
@@ -501,6 +526,35 @@ Steps
 
         self.steps_order = order
 
+    def output_selection(self, step):
+        """Nodes and elements that the output of a Step is scoped to by its output_nodes and output_elements sets.
+
+        Parameters
+        ----------
+        step : str
+            Name of the Step.
+
+        Returns
+        -------
+        list
+            Sorted node keys, None for all nodes.
+        list
+            Sorted element keys, None for all elements.
+
+        """
+
+        selection = []
+
+        for names in [getattr(self.steps[step], 'output_nodes', None), getattr(self.steps[step], 'output_elements', None)]:
+
+            if names is None:
+                selection.append(None)
+            else:
+                names = [names] if isinstance(names, str) else names
+                selection.append(sorted(set(i for name in names for i in self.sets[name].selection), key=int))
+
+        return selection[0], selection[1]
+
     # ==============================================================================
     # Analysis
     # ==============================================================================
@@ -511,7 +565,7 @@ Steps
         Parameters
         ----------
         software : str
-            Analysis software / library to use, 'abaqus', 'opensees', or 'ansys'.
+            Analysis software / library to use, 'abaqus', 'opensees', 'ansys' or 'native'.
         fields : list, str
             Data field requests.
         output : bool
@@ -537,13 +591,16 @@ Steps
         elif software == 'opensees':
             opensees.input_generate(self, fields=fields, output=output, ndof=ndof)
 
+        elif software == 'native':
+            native.input_generate(self, fields=fields, output=output)
+
     def analyse(self, software, exe=None, cpus=4, license='research', delete=True, output=True):
         """Runs the analysis through the chosen FEA software / library.
 
         Parameters
         ----------
         software : str
-            Analysis software / library to use, 'abaqus', 'opensees' or 'ansys'.
+            Analysis software / library to use, 'abaqus', 'opensees', 'ansys' or 'native'.
         exe : str
             Full terminal command to bypass subprocess defaults.
         cpus : int
@@ -571,6 +628,9 @@ Steps
         elif software == 'opensees':
             opensees.launch_process(self, exe=exe, output=output)
 
+        elif software == 'native':
+            native.launch_process(self, cpus=cpus, output=output)
+
     def extract_data(self, software, fields='u', steps='all', exe=None, sets=None, license='research', output=True,
                      return_data=True, components=None):
         """Extracts data from the analysis output files.
@@ -578,7 +638,7 @@ Steps
         Parameters
         ----------
         software : str
-            Analysis software / library to use, 'abaqus', 'opensees' or 'ansys'.
+            Analysis software / library to use, 'abaqus', 'opensees', 'ansys' or 'native'.
         fields : list, str
             Data field requests.
         steps : list
@@ -602,6 +662,8 @@ Steps
 
         """
 
+        self.invalidate_results()
+
         if software == 'abaqus':
             abaq.extract_data(self, fields=fields, exe=exe, output=output, return_data=return_data,
                               components=components)
@@ -612,6 +674,9 @@ Steps
         elif software == 'opensees':
             opensees.extract_data(self, fields=fields)
 
+        elif software == 'native':
+            native.extract_data(self, fields=fields, steps=steps, output=output)
+
     def analyse_and_extract(self, software, fields='u', exe=None, cpus=4, license='research', output=True, save=False,
                             return_data=True, components=None, ndof=6):
         """Runs the analysis through the chosen FEA software / library and extracts data.
@@ -619,7 +684,7 @@ Steps
         Parameters
         ----------
         software : str
-            Analysis software / library to use, 'abaqus', 'opensees' or 'ansys'.
+            Analysis software / library to use, 'abaqus', 'opensees', 'ansys' or 'native'.
         fields : list, str
             Data field requests.
         exe : str
@@ -671,13 +736,19 @@ Steps
         dict
             The nodal results for the requested field.
 
+        Notes
+        -----
+        - Registered derived fields, e.g. 'um' or 'stresca', are computed and stored on first access.
+        - 'all' gives the stored nodes, which are those of the output_nodes sets of the Step if given. Requested
+          nodes without results give None.
+
         """
 
         data = {}
-        rdict = self.results[step]['nodal']
+        values = derived_field(self.results[step], field)
 
         if nodes == 'all':
-            keys = list(self.nodes.keys())
+            keys = list(values)
 
         elif isinstance(nodes, str):
             keys = self.sets[nodes].selection
@@ -686,7 +757,7 @@ Steps
             keys = nodes
 
         for key in keys:
-            data[key] = rdict[field][key]
+            data[key] = values.get(key)
 
         return data
 
@@ -707,13 +778,19 @@ Steps
         dict
             The element results for the requested field.
 
+        Notes
+        -----
+        - Registered derived fields, e.g. 'um' or 'stresca', are computed and stored on first access.
+        - 'all' gives the stored elements, which are those of the output_elements sets of the Step if given.
+          Requested elements without results give None.
+
         """
 
         data = {}
-        rdict = self.results[step]['element']
+        values = derived_field(self.results[step], field)
 
         if elements == 'all':
-            keys = list(self.elements.keys())
+            keys = list(values)
 
         elif isinstance(elements, str):
             keys = self.sets[elements].selection
@@ -722,10 +799,329 @@ Steps
             keys = elements
 
         for key in keys:
-            data[key] = rdict[field][key]
+            data[key] = values.get(key)
 
         return data
 
+    def add_combination(self, name, factors, fields=None):
+        """Add the results of a load combination of linear steps as a virtual step.
+
+        Parameters
+        ----------
+        name : str
+            Name of the combination, used as its key in structure.results.
+        factors : dict
+            Step or combination keys and their load factors, e.g. {'dead': 1.35, 'live': 1.5}.
+        fields : list
+            Nodal and element fields to combine, None for all stored fields that are linear in the loads.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - No analysis is run, the stored results are superposed, see combine_results. Derived fields such as 'um' or
+          'smises' are computed from the combined components on access.
+        - The combination is not added to structure.steps and is not written to input files.
+        - The results of GeneralSteps that hold the loads of previous steps include them, use modify=False for
+          independent load cases.
+
+        """
+
+        if name in self.steps:
+            raise ValueError('***** {0} is the name of a Step *****'.format(name))
+
+        missing = [step for step in factors if step not in self.results]
+
+        if missing:
+            raise KeyError('***** No results for {0} *****'.format(', '.join(map(str, missing))))
+
+        self.results[name] = combine_results(self.results, factors, fields=fields)
+        self.invalidate_results(name)
+
+    def add_envelope(self, name, cases, fields, modes=None):
+        """Add the envelope of result fields over steps, combinations or modes as a virtual step.
+
+        Parameters
+        ----------
+        name : str
+            Name of the envelope, used as its key in structure.results.
+        cases : list, dict
+            Keys of stored steps and combinations, or {name: factors} of load combinations superposed one at a time.
+        fields : list
+            Nodal and/or element fields, stored or derived, e.g. ['ux', 'uy', 'uz', 'sf1', 'smises'].
+        modes : list
+            Mode numbers to envelope for each case, for modal results.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Each field holds the signed value of largest magnitude, so that plot_data(structure, name, field) plots the
+          envelope on the deformed shape of the enveloped displacements, see envelope_results.
+
+        """
+
+        if name in self.steps:
+            raise ValueError('***** {0} is the name of a Step *****'.format(name))
+
+        self.results[name] = envelope_results(self.results, cases, fields, modes=modes)
+        self.invalidate_results(name)
+
+    def add_frequency_response(self, name, step, frequencies, loads, damping=0.05, modes=None, nodes=None,
+                               masses=None):
+        """Add harmonic displacements by modal superposition of modal results as a virtual step.
+
+        Parameters
+        ----------
+        name : str
+            Name of the analysis, used as its key in structure.results.
+        step : str
+            Modal step with frequencies and mode shapes in structure.results.
+        frequencies : list
+            Excitation frequencies [Hz].
+        loads : list, dict
+            Load names, or load names and factors, applied with the phase of their components if any.
+        damping : float, array
+            Modal damping ratio(s).
+        modes : list
+            Mode numbers to superpose, None for all.
+        nodes : list
+            Node keys to return displacements for, None for all.
+        masses : array
+            (n,) lumped nodal masses, None for the element, MassElement and Node masses of the structure.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Complex (f x n x 3) displacements are stored in structure.results[name]['harmonic']['u'] as for a native
+          HarmonicStep, see frequency_response.
+
+        """
+
+        if name in self.steps:
+            raise ValueError('***** {0} is the name of a Step *****'.format(name))
+
+        model = Model(self)
+
+        if masses is None:
+            masses = model.mass().reshape(-1, 6)[:, :3]
+
+        if not isinstance(loads, dict):
+            loads = {load: 1. for load in loads}
+
+        F = np.zeros(model.ndof, dtype=complex)
+
+        for load, factor in loads.items():
+            phase = self.loads[load].components.get('phase', None) or 0.
+            F += np.exp(1j * phase) * model.load_vector({load: factor})[0]
+
+        self.results[name] = frequency_response(self.results[step], masses, F.reshape(-1, 6)[:, :3], frequencies,
+                                                damping=damping, modes=modes, nodes=sorted(self.nodes, key=int),
+                                                output=nodes)
+        self.invalidate_results(name)
+
+    def add_response_spectrum(self, name, step, spectrum, directions='x', damping=0.05, method='cqc', modes=None,
+                              masses=None):
+        """Add the peak responses of a response spectrum analysis of modal results as a virtual step.
+
+        Parameters
+        ----------
+        name : str
+            Name of the analysis, used as its key in structure.results.
+        step : str
+            Modal step with frequencies and mode shapes in structure.results.
+        spectrum : obj, array
+            Function of the periods returning the spectral accelerations, or an (p x 2) table of periods and
+            accelerations.
+        directions : str, dict
+            Directions of excitation, e.g. 'x' or {'x': 1., 'y': 0.3}.
+        damping : float, array
+            Modal damping ratio(s) for CQC.
+        method : str
+            Modal combination, 'cqc', 'srss' or 'abs'.
+        modes : list
+            Mode numbers to include, None for all.
+        masses : array
+            (n,) lumped nodal masses, None for the element, MassElement and Node masses of the structure.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - No time-history analysis is run, see response_spectrum.
+
+        """
+
+        if name in self.steps:
+            raise ValueError('***** {0} is the name of a Step *****'.format(name))
+
+        if masses is None:
+            masses = Model(self).mass().reshape(-1, 6)[:, :3]
+
+        self.results[name] = response_spectrum(self.results[step], masses, spectrum, directions=directions,
+                                               damping=damping, method=method, modes=modes,
+                                               nodes=sorted(self.nodes, key=int))
+        self.invalidate_results(name)
+
+    def invalidate_results(self, step=None):
+        """Clear the processed result fields cached by postprocess_results.
+
+        Parameters
+        ----------
+        step : str
+            Only clear the fields of this Step, None for all Steps.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Called by extract_data, and to be called after editing values of structure.results in place.
+
+        """
+
+        cache = getattr(self, '_postprocessed', None)
+
+        if cache is None:
+            return
+
+        if step is None:
+            cache.clear()
+        else:
+            for key in [key for key in cache if key[0] == step]:
+                del cache[key]
+
+    def processed_results(self, step, field, mode='', iptype='mean', nodal='mean'):
+        """Nodal displacements and processed nodal and element data of a field, computed once and cached.
+
+        Parameters
+        ----------
+        step : str
+            Name of the Step.
+        field : str
+            Nodal or element field, e.g. 'um', 'sxx' or 'smises'.
+        mode : int, str
+            Mode or frequency number, for modal, harmonic or buckling analysis.
+        iptype : str
+            'mean', 'max' or 'min' of an element's integration point data.
+        nodal : str
+            'mean', 'max' or 'min' for nodal values.
+
+        Returns
+        -------
+        dict
+            'xyz' (n x 3) nodal co-ordinates, 'dU' (n x 3) nodal displacements, 'vn' (n,) nodal data, 've' (m,)
+            element data or None, and 'dtype' 'nodal' or 'element'.
+
+        Notes
+        -----
+        - Entries are keyed by (step, field, mode, iptype, nodal), the least recently used are dropped beyond
+          postprocess_cache_size.
+        - An entry is recomputed if the results dictionaries of the Step or field are replaced, or nodes or elements
+          are added.
+        - Nodes outside the output_nodes sets of the Step have zero displacement and NaN nodal data.
+
+        """
+
+        cache = getattr(self, '_postprocessed', None)
+
+        if cache is None:
+            cache = self._postprocessed = OrderedDict()
+
+        key = (step, field, str(mode), iptype, nodal)
+        results = self.results[step]
+        name = '{0}{1}'.format(field, mode)
+
+        try:
+            data = derived_field(results, name)
+        except KeyError:
+            data = derived_field(results, field)
+
+        nodal_data = results['nodal']
+        dtype = 'nodal' if nodal_data.get(name) is data else 'element'
+
+        sources = (results, nodal_data, data)
+        version = (len(data), self._topology_cache()['key'])
+        entry = cache.get(key)
+
+        if entry is not None and entry['version'] == version and all(i is j for i, j in zip(entry['sources'], sources)):
+            cache.move_to_end(key)
+            return entry
+
+        nkeys = sorted(self.nodes, key=int)
+        u = [derived_field(results, '{0}{1}'.format(i, mode)) for i in ['ux', 'uy', 'uz']]
+        dU = np.array([[values.get(node, 0.) for values in u] for node in nkeys], dtype=np.float64).reshape(-1, 3)
+
+        if dtype == 'nodal':
+            data = [data.get(node) for node in nkeys]
+
+        vn, ve = process_data(data=data, dtype=dtype, iptype=iptype, nodal=nodal,
+                              elements=self.node_element_incidence(), n=len(nkeys))
+
+        entry = cache[key] = {'xyz': np.array(self.nodes_xyz(nkeys), dtype=np.float64).reshape(-1, 3), 'dU': dU,
+                              'vn': vn, 've': ve, 'dtype': dtype, 'sources': sources, 'version': version}
+
+        while len(cache) > self.postprocess_cache_size:
+            cache.popitem(last=False)
+
+        return entry
+
+    def postprocess_results(self, step, field, scale=1., cbar=[None, None], ctype=1, iptype='mean', nodal='mean',
+                            mode='', buffers=False):
+        """Post-process a result field for plotting, re-using the cached processed data.
+
+        Parameters
+        ----------
+        step : str
+            Name of the Step.
+        field : str
+            Nodal or element field, e.g. 'um', 'sxx' or 'smises'.
+        scale : float
+            Scale displacements for the deformed plot.
+        cbar : list
+            Minimum and maximum limits on the colorbar.
+        ctype : int
+            RGB color type, 1 or 255.
+        iptype : str
+            'mean', 'max' or 'min' of an element's integration point data.
+        nodal : str
+            'mean', 'max' or 'min' for nodal values.
+        mode : int, str
+            Mode or frequency number, for modal, harmonic or buckling analysis.
+        buffers : bool
+            Return bytes instead of arrays.
+
+        Returns
+        -------
+        tuple
+            As postprocess_arrays.
+
+        Notes
+        -----
+        - Only the deformed co-ordinates, normalisation and colours are recomputed when the scale or colorbar limits
+          change.
+
+        """
+
+        tic = time()
+
+        entry = self.processed_results(step, field, mode=mode, iptype=iptype, nodal=nodal)
+        U, cnodes, fabs, fscaled, celements, eabs = postprocess_colours(entry['xyz'], entry['dU'], entry['vn'],
+                                                                        entry['ve'], entry['dtype'], scale, cbar,
+                                                                        ctype, buffers=buffers)
+
+        return time() - tic, U, cnodes, fabs, fscaled, celements, eabs
+
     # ==============================================================================
     # Summary
     # ==============================================================================
@@ -23,11 +23,49 @@ functions
     network_order
     normalise_data
     principal_stresses
+    principal_values_2d
+    principal_values_3d
     process_data
     postprocess
+    postprocess_arrays
+    postprocess_colours
     # plotvoxels
 
 
+combination
+===========
+
+.. autosummary::
+    :toctree: generated/
+
+    combinable_fields
+    combine_results
+    Envelope
+    envelope_results
+
+
+derived
+=======
+
+.. autosummary::
+    :toctree: generated/
+
+    derived_field
+    register_derived_field
+
+
+harmonic
+========
+
+.. autosummary::
+    :toctree: generated/
+
+    store_harmonic
+    harmonic_amplitude
+    harmonic_phase
+    harmonic_field
+
+
 meshing
 =======
 
@@ -38,6 +76,58 @@ meshing
     extrude_mesh
     tets_from_vertices_faces
 
+
+modal
+=====
+
+.. autosummary::
+    :toctree: generated/
+
+    store_mode_shapes
+    pack_mode_shapes
+    mode_shape_field
+    mode_shapes
+    modal_assurance_criterion
+    pair_modes
+    nearest_nodes
+    modal_assurance
+
+
+spectrum
+========
+
+.. autosummary::
+    :toctree: generated/
+
+    modal_participation
+    cqc_correlation
+    combine_modal
+    response_spectrum
+    frequency_response
+
+
+surrogate
+=========
+
+.. autosummary::
+    :toctree: generated/
+
+    snapshot_vector
+    Surrogate
+    surrogate_from_results
+
+
+visualisation
+=============
+
+.. autosummary::
+    :toctree: generated/
+
+    connectivity_array
+    element_mesh
+    external_faces
+    pipe_mesh
+
 """
 from __future__ import absolute_import
 
@@ -49,17 +139,66 @@ from .functions import (
     network_order,
     normalise_data,
     postprocess,
+    postprocess_arrays,
+    postprocess_colours,
     process_data,
     principal_stresses,
+    principal_values_2d,
+    principal_values_3d,
     # plotvoxels,
     identify_ranges,
     mesh_from_shell_elements
 )
+from .combination import (
+    combinable_fields,
+    combine_results,
+    Envelope,
+    envelope_results,
+)
+from .derived import (
+    derived_fields,
+    derived_field,
+    register_derived_field,
+)
+from .harmonic import (
+    store_harmonic,
+    harmonic_amplitude,
+    harmonic_phase,
+    harmonic_field,
+)
 from .meshing import (
     discretise_faces,
     extrude_mesh,
     tets_from_vertices_faces,
 )
+from .modal import (
+    store_mode_shapes,
+    pack_mode_shapes,
+    mode_shape_field,
+    mode_shapes,
+    modal_assurance_criterion,
+    pair_modes,
+    nearest_nodes,
+    modal_assurance,
+)
+from .spectrum import (
+    modal_participation,
+    cqc_correlation,
+    combine_modal,
+    response_spectrum,
+    frequency_response,
+)
+from .surrogate import (
+    snapshot_vector,
+    Surrogate,
+    surrogate_from_results,
+)
+from .visualisation import (
+    connectivity_array,
+    element_mesh,
+    external_faces,
+    pipe_mesh,
+)
 
 __all__ = [
     'colorbar',
@@ -69,13 +208,55 @@ __all__ = [
     'network_order',
     'normalise_data',
     'postprocess',
+    'postprocess_arrays',
+    'postprocess_colours',
     'process_data',
     'principal_stresses',
+    'principal_values_2d',
+    'principal_values_3d',
     # 'plotvoxels',
     'identify_ranges',
     'mesh_from_shell_elements',
 
+    'combinable_fields',
+    'combine_results',
+    'Envelope',
+    'envelope_results',
+
+    'derived_fields',
+    'derived_field',
+    'register_derived_field',
+
+    'store_harmonic',
+    'harmonic_amplitude',
+    'harmonic_phase',
+    'harmonic_field',
+
     'discretise_faces',
     'extrude_mesh',
     'tets_from_vertices_faces',
+
+    'store_mode_shapes',
+    'pack_mode_shapes',
+    'mode_shape_field',
+    'mode_shapes',
+    'modal_assurance_criterion',
+    'pair_modes',
+    'nearest_nodes',
+    'modal_assurance',
+
+    'modal_participation',
+    'cqc_correlation',
+    'combine_modal',
+    'response_spectrum',
+    'frequency_response',
+
+    'snapshot_vector',
+    'Surrogate',
+    'surrogate_from_results',
+
+    'connectivity_array',
+    'element_mesh',
+    'external_faces',
+    'pipe_mesh',
 ]
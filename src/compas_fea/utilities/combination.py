@@ -0,0 +1,348 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.utilities.derived import derived_field
+from compas_fea.utilities.derived import derived_fields
+from compas_fea.utilities.derived import _as_results
+from compas_fea.utilities.derived import _components
+from compas_fea.utilities.derived import _dtype
+from compas_fea.utilities.derived import _evaluate
+from compas_fea.utilities.derived import _layout
+from compas_fea.utilities.derived import _lookup
+from compas_fea.utilities.derived import _values
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'combinable_fields',
+    'combine_results',
+    'Envelope',
+    'envelope_results',
+]
+
+
+def _derived(field):
+    return _lookup(field)[0] is not None
+
+
+def combinable_fields(results, steps):
+    """Nodal and element fields stored for all of the steps that are linear in the loads.
+
+    Parameters
+    ----------
+    results : dict
+        Results dictionary of a Structure, i.e. structure.results.
+    steps : list
+        Step keys.
+
+    Returns
+    -------
+    list
+        Nodal fields.
+    list
+        Element fields.
+
+    Notes
+    -----
+    - Registered derived fields such as 'um', 'smises' or 'smaxp' are not linear in the loads, they are left out and
+      derived again from the combined components on access.
+
+    """
+
+    fields = []
+
+    for dtype in ['nodal', 'element']:
+        names = [set(results[step].get(dtype, {})) for step in steps]
+        common = set.intersection(*names) if names else set()
+        fields.append(sorted(i for i in common if i != 'axes' and not _derived(i)))
+
+    return fields[0], fields[1]
+
+
+def combine_results(results, factors, fields=None):
+    """Linear combination of the stored results of several steps.
+
+    Parameters
+    ----------
+    results : dict
+        Results dictionary of a Structure, i.e. structure.results.
+    factors : dict
+        Step keys and their load factors, e.g. {'dead': 1.35, 'live': 1.5}.
+    fields : list
+        Nodal and element fields to combine, e.g. ['ux', 'uy', 'uz', 'sxx'], None for all combinable fields.
+
+    Returns
+    -------
+    dict
+        {'nodal': {field: {node: value}}, 'element': {field: {element: {point: value}}}, 'info': {...}} results of
+        the combination, in the format of the results of one step.
+
+    Notes
+    -----
+    - Valid for the results of linear analyses, where each step holds the response to its own load case.
+    - Each field is gathered into a (steps x entries) array and combined with one product by the factors, all
+      nodes, elements and integration points at once. Entries missing from any step give None.
+    - Element 'axes' are copied from the first step.
+
+    """
+
+    steps = list(factors)
+    f = np.array([factors[step] for step in steps], dtype=np.float64)
+    nodal_fields, element_fields = combinable_fields(results, steps)
+
+    if fields is not None:
+        nodal_fields = [i for i in nodal_fields if i in fields]
+        element_fields = [i for i in element_fields if i in fields]
+
+    combined = {'nodal': {}, 'element': {}, 'info': {'description': 'Combination', 'factors': dict(factors)}}
+
+    for dtype, names in [('nodal', nodal_fields), ('element', element_fields)]:
+        for field in names:
+            layout = _layout(results[steps[0]][dtype][field], dtype)
+            values = np.array([_values(results[step][dtype][field], layout) for step in steps], dtype=np.float64)
+            combined[dtype][field] = _as_results(layout, f.dot(values.reshape(len(steps), -1)))
+
+    if 'axes' in results[steps[0]].get('element', {}):
+        combined['element']['axes'] = results[steps[0]]['element']['axes']
+
+    return combined
+
+
+class Envelope(object):
+    """Running maximum, minimum and absolute maximum of result fields over many steps, combinations or modes.
+
+    Parameters
+    ----------
+    fields : list
+        Nodal and/or element fields, stored or derived, e.g. ['ux', 'uy', 'uz', 'sf1', 'sm1', 'smises'].
+
+    Attributes
+    ----------
+    cases : list
+        Keys of the cases added so far.
+
+    Notes
+    -----
+    - Only (entries,) arrays of the current extremes and of the cases governing them are kept, memory does not grow
+      with the number of cases.
+    - The nodes, elements and integration points are those of the first case with the field, entries missing in a
+      case are ignored.
+    - Derived fields are evaluated for each case without being stored in its results.
+
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.cases = []
+        self.data = {}
+
+    def add(self, results, key, mode=''):
+        """Update the envelope with the results of one case.
+
+        Parameters
+        ----------
+        results : dict
+            Results of one step or combination, i.e. structure.results[step].
+        key : str
+            Name of the case.
+        mode : int, str
+            Mode or frequency number of modal, harmonic or buckling results, the nodal fields of which are suffixed.
+
+        Returns
+        -------
+        None
+
+        """
+
+        case = self._case(key)
+
+        for field in self.fields:
+
+            name = '{0}{1}'.format(field, mode)
+
+            try:
+                values = derived_field(results, name, store=False)
+            except KeyError:
+                name = field
+                values = derived_field(results, field, store=False)
+
+            if field not in self.data:
+                self.layout(field, _dtype(results, name), values)
+
+            self.update(field, np.array(_values(values, self.data[field]['layout']), dtype=np.float64), case)
+
+    def _case(self, key):
+        self.cases.append(key)
+        return len(self.cases) - 1
+
+    def layout(self, field, dtype, values):
+        """Set the nodes, or elements and integration points, of a field from a field dictionary.
+
+        Parameters
+        ----------
+        field : str
+            Field name.
+        dtype : str
+            'nodal' or 'element'.
+        values : dict
+            {node: value} or {element: {point: value}} field dictionary.
+
+        Returns
+        -------
+        tuple
+            Layout of the flat value arrays of the field.
+
+        """
+
+        layout = _layout(values, dtype)
+        n = len(layout[0]) if dtype == 'nodal' else sum(map(len, layout[1]))
+        self.data[field] = {'dtype': dtype, 'layout': layout, 'max': np.full(n, -np.inf), 'min': np.full(n, np.inf),
+                            'abs': np.zeros(n), 'imax': np.full(n, -1), 'imin': np.full(n, -1), 'iabs': np.full(n, -1)}
+
+        return layout
+
+    def update(self, field, values, case):
+        """Update the extremes of a field with flat values in its layout.
+
+        Parameters
+        ----------
+        field : str
+            Field name.
+        values : array
+            (entries,) values of the case, NaN where missing.
+        case : int
+            Index of the case in Envelope.cases.
+
+        Returns
+        -------
+        None
+
+        """
+
+        entry = self.data[field]
+        v = values
+
+        for name, better in [('max', v > entry['max']), ('min', v < entry['min']),
+                             ('abs', (abs(v) > abs(entry['abs'])) | (entry['iabs'] < 0) & ~np.isnan(v))]:
+            entry[name][better] = v[better]
+            entry['i' + name][better] = case
+
+    def results(self):
+        """The envelope in the format of the results of one step.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            Nodal and element fields of the signed values of largest magnitude under their own names, e.g. 'ux' for
+            deformed plots, and the extremes as '{field}_max' and '{field}_min'. 'envelope' holds the 'cases' and for
+            each field the 'max', 'min' and 'abs' governing case keys in the same format.
+
+        """
+
+        out = {'nodal': {}, 'element': {}, 'envelope': {'cases': list(self.cases)},
+               'info': {'description': 'Envelope', 'cases': list(self.cases)}}
+        cases = np.array(list(self.cases) + [None], dtype=object)
+
+        for field, entry in self.data.items():
+
+            store = out[entry['dtype']]
+            governing = out['envelope'][field] = {}
+
+            for name, suffix in [('abs', ''), ('max', '_max'), ('min', '_min')]:
+                index = entry['i' + name]
+                store[field + suffix] = _as_results(entry['layout'], np.where(index >= 0, entry[name], np.nan))
+                governing[name] = _as_results(entry['layout'], cases[index].tolist())
+
+        return out
+
+
+def envelope_results(results, cases, fields, modes=None):
+    """Envelope of result fields over stored steps, load combinations or modes, adding one case at a time.
+
+    Parameters
+    ----------
+    results : dict
+        Results dictionary of a Structure, i.e. structure.results.
+    cases : list, dict
+        Keys of stored steps and combinations, or {name: factors} of load combinations, e.g. {'ULS1': {'dead': 1.35,
+        'live': 1.5}}, which are superposed one at a time without being stored.
+    fields : list
+        Nodal and/or element fields, stored or derived.
+    modes : list
+        Mode numbers to envelope for each key of a list of cases, e.g. range(1, 11) for modal results.
+
+    Returns
+    -------
+    dict
+        Envelope results, see Envelope.results.
+
+    Notes
+    -----
+    - For combinations, the components of each field are gathered once from the combined steps into (steps x
+      entries) arrays, each combination is then one product by its factors and the derived fields are evaluated on
+      the combined arrays.
+    - An entry missing in a step is missing in the combinations with a non-zero factor on that step only.
+
+    """
+
+    envelope = Envelope(fields)
+
+    if not isinstance(cases, dict):
+        for key in cases:
+            for mode in (modes or ['']):
+                envelope.add(results[key], key if modes is None else '{0}-{1}'.format(key, mode), mode=mode)
+        return envelope.results()
+
+    steps = sorted(set(step for factors in cases.values() for step in factors), key=str)
+    tables = {field: _field_table(results, steps, field, envelope) for field in fields}
+
+    for key, factors in cases.items():
+        case = envelope._case(key)
+        f = np.array([factors.get(step, 0.) for step in steps], dtype=np.float64)
+        for field, (entry, names, optional, arrays, missing) in tables.items():
+            combined = {name: f.dot(arrays[name]) for name in names}
+            for name, rows in missing.items():
+                combined[name][(f != 0).dot(rows)] = np.nan
+            values = combined[field] if entry is None else _evaluate(entry, combined, optional)
+            envelope.update(field, values, case)
+
+    return envelope.results()
+
+
+def _field_table(results, steps, field, envelope):
+
+    name, mode = _lookup(field)
+    first = results[steps[0]]
+
+    if name is None:
+        dtype = 'nodal' if field in first.get('nodal', {}) else 'element'
+        entry, components, present, names = None, [field], [], [field]
+    else:
+        entry = derived_fields[name]
+        dtype = entry['dtype']
+        components, present, names = _components(entry, mode, first[dtype], field)
+
+    layout = envelope.layout(field, dtype, first[dtype][components[0]])
+    arrays = {i: np.array([_values(results[step][dtype].get(j, {}), layout) for step in steps],
+                          dtype=np.float64).reshape(len(steps), -1) for i, j in zip(names, components + present)}
+    missing = {}
+
+    for i, array in arrays.items():
+        rows = np.isnan(array)
+        if rows.any():
+            array[rows] = 0.
+            missing[i] = rows
+
+    return entry, names, names[len(components):], arrays, missing
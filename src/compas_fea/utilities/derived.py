@@ -0,0 +1,311 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from itertools import chain
+
+import re
+
+from compas_fea.utilities.harmonic import harmonic_field
+from compas_fea.utilities.modal import mode_shape_field
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'derived_fields',
+    'register_derived_field',
+    'derived_field',
+]
+
+
+derived_fields = {}
+
+stress_components = ['sxx', 'syy', 'szz', 'sxy', 'syz', 'sxz']
+
+strain_components = ['exx', 'eyy', 'ezz', 'exy', 'eyz', 'exz']
+
+
+def register_derived_field(name, dtype, components, function, optional=None):
+    """Register a field derived from stored result components.
+
+    Parameters
+    ----------
+    name : str
+        Name of the derived field, e.g. 'stresca'.
+    dtype : str
+        'nodal' or 'element'.
+    components : list
+        Stored fields that must all be present, e.g. ['ux', 'uy', 'uz'].
+    function : obj
+        Function of a dict {component: (N,) array} returning the (N,) derived values, vectorised over the nodes or
+        the element integration points.
+    optional : list
+        Stored fields passed to the function only when present, e.g. ['szz', 'syz', 'sxz'] for plane states.
+
+    Returns
+    -------
+    None
+
+    """
+
+    derived_fields[name] = {'dtype': dtype, 'components': list(components), 'optional': list(optional or []),
+                            'function': function}
+
+
+def _lookup(field):
+
+    if field in derived_fields:
+        return field, ''
+
+    base, mode = re.match(r'^(.*?)(\d*)$', field).groups()
+
+    if mode and derived_fields.get(base, {}).get('dtype') == 'nodal':
+        return base, mode
+
+    return None, None
+
+
+def derived_field(results, field, store=True):
+    """A stored result field, or a registered derived field computed and stored on first access.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one Step, i.e. structure.results[step].
+    field : str
+        Field name, e.g. 'ux', 'um', 'um3' for mode 3, 'smises', 'stresca', 'smaxp' or 'sed'.
+    store : bool
+        Store the derived field and the mode or frequency fields it is computed from in results, False to only
+        return it.
+
+    Returns
+    -------
+    dict
+        {node: value} for nodal fields or {element: {point: value}} for element fields.
+
+    Notes
+    -----
+    - Derived fields are stored in results['nodal'] or results['element'] next to their components, so that they are
+      computed once and then read like any stored field. Fields stored by an analysis backend are never replaced.
+    - Missing values of the required components give None, missing optional components count as zero, e.g. szz of
+      shells in a model with solids.
+    - Nodal fields of one mode or frequency, e.g. 'ux3' or 'uxa3', are read from stored mode shape or harmonic
+      arrays, see store_mode_shapes and store_harmonic.
+
+    """
+
+    nodal = results.setdefault('nodal', {}) if store else results.get('nodal', {})
+    element = results.setdefault('element', {}) if store else results.get('element', {})
+
+    if field in nodal:
+        return nodal[field]
+
+    if field in element:
+        return element[field]
+
+    values = _mode_shape(results, field, store)
+
+    if values is not None:
+        return values
+
+    name, mode = _lookup(field)
+
+    if name is None:
+        raise KeyError('***** Field {0} is not stored or registered as a derived field *****'.format(field))
+
+    entry = derived_fields[name]
+    target = nodal if entry['dtype'] == 'nodal' else element
+    source = target if store else dict(target)
+
+    if mode:
+        for i in entry['components'] + entry['optional']:
+            values = _mode_shape(results, '{0}{1}'.format(i, mode), store)
+            if values is not None:
+                source['{0}{1}'.format(i, mode)] = values
+
+    components, present, names = _components(entry, mode, source, field)
+    layout = _layout(source[components[0]], entry['dtype'])
+    arrays = {i: np.array(_values(source[j], layout), dtype=np.float64) for i, j in zip(names, components + present)}
+    values = _as_results(layout, _evaluate(entry, arrays, names[len(components):]))
+
+    if store:
+        target[field] = values
+
+    return values
+
+
+def _mode_shape(results, field, store=True):
+
+    values = results.get('nodal', {}).get(field)
+
+    if values is None:
+        values = mode_shape_field(results, field)
+        if values is None:
+            values = harmonic_field(results, field)
+        if values is not None and store:
+            results['nodal'][field] = values
+
+    return values
+
+
+def _dtype(results, field):
+    """'nodal' or 'element' for a stored or derived field of one Step."""
+
+    if field in results.get('element', {}):
+        return 'element'
+
+    name = _lookup(field)[0]
+
+    if field not in results.get('nodal', {}) and name is not None:
+        return derived_fields[name]['dtype']
+
+    return 'nodal'
+
+
+def _components(entry, mode, store, field):
+
+    components = ['{0}{1}'.format(i, mode) for i in entry['components']]
+    missing = [i for i in components if i not in store]
+
+    if missing:
+        raise KeyError('***** Field {0} needs the missing fields {1} *****'.format(field, ', '.join(missing)))
+
+    present = ['{0}{1}'.format(i, mode) for i in entry['optional'] if '{0}{1}'.format(i, mode) in store]
+    names = [i[:len(i) - len(mode)] if mode else i for i in components + present]
+
+    return components, present, names
+
+
+def _evaluate(entry, arrays, optional):
+
+    for i in optional:
+        arrays[i] = np.where(np.isnan(arrays[i]), 0., arrays[i])
+
+    return entry['function'](arrays)
+
+
+def _layout(field, dtype):
+    """Nodes, or elements and their integration points, of a field in the order of its flat value arrays."""
+
+    if dtype == 'nodal':
+        return list(field), None
+
+    ekeys = [ekey for ekey in field if field[ekey]]
+
+    return ekeys, [list(field[ekey]) for ekey in ekeys]
+
+
+def _values(field, layout):
+    """Flat list of the values of a field in a layout, None where missing."""
+
+    keys, points = layout
+
+    if points is None:
+        return [field.get(key) for key in keys]
+
+    return list(chain.from_iterable([(field.get(ekey) or {}).get(point) for point in ids]
+                                    for ekey, ids in zip(keys, points)))
+
+
+def _as_results(layout, values):
+    """Field dictionary of flat values in a layout, NaN values give None."""
+
+    keys, points = layout
+
+    if not isinstance(values, list):
+        values = values.tolist()
+
+    if points is None:
+        return {key: (None if value != value else value) for key, value in zip(keys, values)}
+
+    out = {}
+    start = 0
+
+    for ekey, ids in zip(keys, points):
+        out[ekey] = {point: (None if value != value else value) for point, value in zip(ids, values[start:start + len(ids)])}
+        start += len(ids)
+
+    return out
+
+
+# ==============================================================================
+# Definitions
+# ==============================================================================
+
+def _magnitude(c):
+    return np.sqrt(sum(value**2 for value in c.values()))
+
+
+def _mises(c):
+    sxx, syy, szz, sxy, syz, sxz = [c.get(i, 0) for i in stress_components]
+    return np.sqrt(0.5 * ((sxx - syy)**2 + (syy - szz)**2 + (szz - sxx)**2) + 3 * (sxy**2 + syz**2 + sxz**2))
+
+
+def _principals(c):
+    sxx, syy, szz, sxy, syz, sxz = [c.get(i, 0) * np.ones(len(c['sxx'])) for i in stress_components]
+    A = np.stack([np.stack([sxx, sxy, sxz], axis=-1),
+                  np.stack([sxy, syy, syz], axis=-1),
+                  np.stack([sxz, syz, szz], axis=-1)], axis=-2)
+    ok = np.all(np.isfinite(A), axis=(1, 2))
+    w = np.full((len(A), 3), np.nan)
+    w[ok] = np.linalg.eigvalsh(A[ok])
+    return w
+
+
+def _planar(c):
+    return not any(i in c for i in ['szz', 'syz', 'sxz'])
+
+
+def _in_plane(c):
+    centre = 0.5 * (c['sxx'] + c['syy'])
+    radius = np.hypot(0.5 * (c['sxx'] - c['syy']), c.get('sxy', 0))
+    return centre, radius
+
+
+def _maxp(c):
+    if _planar(c):
+        centre, radius = _in_plane(c)
+        return centre + radius
+    return _principals(c)[:, 2]
+
+
+def _minp(c):
+    if _planar(c):
+        centre, radius = _in_plane(c)
+        return centre - radius
+    return _principals(c)[:, 0]
+
+
+def _midp(c):
+    return _principals(c)[:, 1]
+
+
+def _tresca(c):
+    w = _principals(c)
+    return w[:, 2] - w[:, 0]
+
+
+def _energy_density(c):
+    return 0.5 * sum(c[s] * c[e] for s, e in zip(stress_components, strain_components) if s in c and e in c)
+
+
+for _field in ['u', 'ur', 'rf', 'rm', 'cf', 'cm']:
+    register_derived_field('{0}m'.format(_field), 'nodal', ['{0}{1}'.format(_field, i) for i in 'xyz'], _magnitude)
+
+for _field in ['u', 'ur']:
+    register_derived_field('{0}ma'.format(_field), 'nodal', ['{0}{1}a'.format(_field, i) for i in 'xyz'], _magnitude)
+
+register_derived_field('smises', 'element', ['sxx'], _mises, optional=['syy', 'szz', 'sxy', 'syz', 'sxz'])
+register_derived_field('stresca', 'element', ['sxx'], _tresca, optional=['syy', 'szz', 'sxy', 'syz', 'sxz'])
+register_derived_field('smaxp', 'element', ['sxx', 'syy'], _maxp, optional=['szz', 'sxy', 'syz', 'sxz'])
+register_derived_field('sminp', 'element', ['sxx', 'syy'], _minp, optional=['szz', 'sxy', 'syz', 'sxz'])
+register_derived_field('smidp', 'element', ['sxx', 'syy', 'szz'], _midp, optional=['sxy', 'syz', 'sxz'])
+register_derived_field('sed', 'element', ['sxx', 'exx'], _energy_density,
+                       optional=['syy', 'szz', 'sxy', 'syz', 'sxz', 'eyy', 'ezz', 'exy', 'eyz', 'exz'])
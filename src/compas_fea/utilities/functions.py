@@ -10,6 +10,7 @@ from compas.utilities import geometric_key
 from time import time
 
 from operator import itemgetter
+from itertools import chain
 from itertools import groupby
 
 try:
@@ -18,13 +19,6 @@ except ImportError:
     pass
 
 
-try:
-    # from scipy.interpolate import griddata
-    from scipy.sparse import csr_matrix
-except ImportError:
-    pass
-
-
 # Author(s): Andrew Liew (github.com/andrewliew)
 
 
@@ -36,8 +30,12 @@ __all__ = [
     'network_order',
     'normalise_data',
     'postprocess',
+    'postprocess_arrays',
+    'postprocess_colours',
     'process_data',
     'principal_stresses',
+    'principal_values_2d',
+    'principal_values_3d',
     # 'plotvoxels',
     'identify_ranges',
     'mesh_from_shell_elements'
@@ -49,16 +47,17 @@ def process_data(data, dtype, iptype, nodal, elements, n):
 
     Parameters
     ----------
-    data : dict
-        Unprocessed analysis results data.
+    data : dict, array
+        Unprocessed analysis results data, for elements also an (m x p) array with NaN for missing points.
     dtype : str
         'nodal' or 'element'.
     iptype : str
-        'mean', 'max' or 'min' of an element's integration point data.
+        'mean', 'max', 'min' or 'abs' (maximum absolute) of an element's integration point data.
     nodal : str
         'mean', 'max' or 'min' for nodal data conversion.
-    elements : list
-        Node numbers for each element.
+    elements : list, array, obj
+        Node numbers for each element, an (m x k) array padded with -1 or an (n x m) sparse node-element incidence
+        matrix, see Structure.node_element_incidence.
     n : int
         Number of nodes.
 
@@ -69,91 +68,74 @@ def process_data(data, dtype, iptype, nodal, elements, n):
     array
         Data values for each element.
 
+    Notes
+    -----
+    - Element data may have any number of integration points, None values are ignored. Elements without data and
+      nodes without elements get 0.
+
     """
 
     if dtype == 'nodal':
 
-        vn = np.array(data)[:, np.newaxis]
+        vn = np.array(data, dtype=np.float64)[:, np.newaxis]
         ve = None
 
     elif dtype == 'element':
 
-        m = len(elements)
-        lengths = np.zeros(m, dtype=np.int64)
-        data_array = np.zeros((m, 20), dtype=np.float64)
-
-        iptypes = {'max': 0, 'min': 1, 'mean': 2, 'abs': 3}
-
-        for ekey, item in data.items():
-            fdata = list(item.values())
-            j = int(ekey)
-
-            if None in fdata:
-                fdata = [i for i in fdata if i is not None]
-
-            if fdata:
-                length = len(fdata)
-                lengths[j] = length
-                data_array[j, :length] = fdata
-
-        rows, cols = [], []
-
-        for ekey, nodes in enumerate(elements):
-            rows.extend([ekey] * len(nodes))
-            cols.extend(nodes)
-        vals = [1] * len(rows)
-
-        A = csr_matrix((vals, (rows, cols)), shape=(m, n))
-        AT = A.transpose()
-
-        def _process(data_array, lengths, iptype):
-
-            m = len(lengths)
-            ve = np.zeros((m, 1))
-
-            for i in range(m):
-
-                if iptype == 0:
-                    ve[i] = max(data_array[i, :lengths[i]])
+        m = elements.shape[1] if hasattr(elements, 'tocsr') else len(elements)
+        ve = np.zeros((m, 1))
 
-                elif iptype == 1:
-                    ve[i] = min(data_array[i, :lengths[i]])
+        # Integration point data as an (m x p) table padded with NaN
 
-                elif iptype == 2:
-                    ve[i] = np.mean(data_array[i, :lengths[i]])
+        if isinstance(data, np.ndarray):
+            table = np.full((m, 1), np.nan) if not data.size else data.reshape(len(data), -1).astype(np.float64)
+            ekeys = np.arange(len(table))
 
-                elif iptype == 3:
-                    ve[i] = max(abs(data_array[i, :lengths[i]]))
-
-            return ve
-
-        def _nodal(rows, cols, nodal, ve, n):
-
-            vn = np.zeros((n, 1))
-
-            for i in range(len(rows)):
-
-                node = cols[i]
-                element = rows[i]
-
-                if nodal == 0:
-                    if ve[element] > vn[node]:
-                        vn[node] = ve[element]
+        else:
+            values = [item or {} for item in data.values()]
+            ekeys = np.fromiter(map(int, data), dtype=np.int64, count=len(data))
+            counts = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+            flat = np.array(list(chain.from_iterable(map(dict.values, values))), dtype=np.float64)
+            table = np.full((len(counts), max(1, counts.max(initial=0))), np.nan)
+            starts = np.cumsum(counts) - counts
+            table[np.repeat(np.arange(len(counts)), counts), np.arange(len(flat)) - np.repeat(starts, counts)] = flat
+
+        missing = np.isnan(table)
+        number = table.shape[1] - missing.sum(axis=1)
+
+        if iptype == 'mean':
+            values = np.where(missing, 0, table).sum(axis=1) / np.maximum(number, 1)
+        elif iptype == 'min':
+            values = np.where(missing, np.inf, table).min(axis=1)
+        else:
+            values = np.where(missing, -np.inf, abs(table) if iptype == 'abs' else table).max(axis=1)
 
-                elif nodal == 1:
-                    if ve[element] < vn[node]:
-                        vn[node] = ve[element]
+        ve[ekeys, 0] = np.where(number > 0, values, 0)
 
-            return vn
+        # Element values to nodes
 
-        ve = _process(data_array, lengths, iptypes[iptype])
+        if hasattr(elements, 'tocsr'):
+            A = elements.tocsr()
+            rows = A.indices
+            cols = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+        elif isinstance(elements, np.ndarray):
+            used = (elements >= 0).ravel()
+            rows = np.repeat(np.arange(m), elements.shape[1])[used]
+            cols = elements.ravel()[used]
+        else:
+            lengths = np.fromiter(map(len, elements), dtype=np.int64, count=m)
+            cols = np.fromiter(chain.from_iterable(elements), dtype=np.int64, count=int(lengths.sum()))
+            rows = np.repeat(np.arange(m), lengths)
 
         if nodal == 'mean':
-            vsum = np.asarray(AT.dot(ve))
-            vn = vsum / AT.sum(1)
+            vsum = np.bincount(cols, ve[rows, 0], minlength=n)
+            vn = (vsum / np.maximum(np.bincount(cols, minlength=n), 1))[:, np.newaxis]
 
         else:
-            vn = _nodal(rows, cols, 0 if nodal == 'max' else 1, ve, n)
+            vn = np.full(n, -np.inf if nodal == 'max' else np.inf)
+            (np.maximum if nodal == 'max' else np.minimum).at(vn, cols, ve[rows, 0])
+            vn[np.isinf(vn)] = 0
+            vn = vn[:, np.newaxis]
 
     return vn, ve
 
@@ -202,7 +184,7 @@ def colorbar(fsc, input='array', type=255):
     Returns
     -------
     array, list
-        (n x 3) array of RGB values or single RGB list.
+        (n x 3) array of RGB values or single RGB list, grey for NaN values.
 
     """
 
@@ -215,6 +197,7 @@ def colorbar(fsc, input='array', type=255):
         rgb = np.hstack([r, g, b])
         rgb[rgb > 1] = 1
         rgb[rgb < 0] = 0
+        rgb[np.isnan(rgb)] = 0.5
 
         return rgb * type
 
@@ -444,16 +427,17 @@ def normalise_data(data, cmin, cmax):
     Returns
     -------
     array
-        -1 to 1 scaled data.
+        -1 to 1 scaled data, NaN values are kept.
     float
         The maximum absolute unscaled value.
 
     """
-    f = np.asarray(data)
-    fmax = cmax if cmax is not None else max(abs(f))
-    fmin = cmin if cmin is not None else min(abs(f))
+    f = np.asarray(data, dtype=np.float64)
+    finite = abs(f[np.isfinite(f)])
+    fmax = cmax if cmax is not None else (np.max(finite) if finite.size else 0.)
+    fmin = cmin if cmin is not None else (np.min(finite) if finite.size else 0.)
     fabs = max([abs(fmin), abs(fmax)])
-    fscaled = f / fabs if fabs else f
+    fscaled = f / fabs if fabs else f.copy()
     fscaled[fscaled > +1] = +1
     fscaled[fscaled < -1] = -1
 
@@ -467,8 +451,8 @@ def postprocess(nodes, elements, ux, uy, uz, data, dtype, scale, cbar, ctype, ip
     ----------
     nodes : list
         [[x, y, z], ..] co-ordinates of each node.
-    elements : list
-        Node numbers that each element connects.
+    elements : list, obj
+        Node numbers that each element connects, or the sparse node-element incidence matrix.
     ux : list
         List of nodal x displacements.
     uy : list
@@ -507,31 +491,149 @@ def postprocess(nodes, elements, ux, uy, uz, data, dtype, scale, cbar, ctype, ip
     float
         Absolute maximum element data value.
 
+    Notes
+    -----
+    - Lists of the results of postprocess_arrays, for front-ends that cannot receive arrays.
+
     """
+
+    toc, U, cnodes, fabs, fscaled, celements, eabs = postprocess_arrays(nodes, elements, ux, uy, uz, data, dtype,
+                                                                        scale, cbar, ctype, iptype, nodal)
+
+    return toc, U.tolist(), cnodes.tolist(), fabs, fscaled.tolist(), celements.tolist(), eabs
+
+
+def postprocess_arrays(nodes, elements, ux, uy, uz, data, dtype, scale, cbar, ctype, iptype, nodal, buffers=False):
+    """Post-process data from analysis results for given step and field, returning arrays.
+
+    Parameters
+    ----------
+    nodes : list, array
+        [[x, y, z], ..] co-ordinates of each node.
+    elements : list, array, obj
+        Node numbers that each element connects, an (m x k) array padded with -1 or the sparse node-element incidence
+        matrix.
+    ux, uy, uz : list, array
+        Nodal x, y and z displacements.
+    data : dic, list, array
+        Unprocessed data.
+    dtype : str
+        'nodal' or 'element'.
+    scale : float
+        Scale displacements for the deformed plot.
+    cbar : list
+        Minimum and maximum limits on the colorbar.
+    ctype : int
+        RGB color type, 1 for float32 colours or 255 for uint8 colours.
+    iptype : str
+        'mean', 'max' or 'min' of an element's integration point data.
+    nodal : str
+        'mean', 'max' or 'min' for nodal values.
+    buffers : bool
+        Return bytes of float32 co-ordinates and scaled data, and of the colours, instead of arrays.
+
+    Returns
+    -------
+    float
+        Time taken to process data.
+    array
+        (n x 3) scaled deformed nodal co-ordinates.
+    array
+        (n x 3) nodal colors.
+    float
+        Absolute maximum nodal data value.
+    array
+        (n,) normalised data values.
+    array
+        (m x 3) element colors, (0 x 3) for nodal data.
+    float
+        Absolute maximum element data value.
+
+    """
+
     tic = time()
 
-    dU = np.hstack((np.array(ux)[:, np.newaxis], np.array(uy)[:, np.newaxis], np.array(uz)[:, np.newaxis]))
-    U = [list(i) for i in list(np.array(nodes) + scale * dU)]
+    dU = np.column_stack([np.asarray(ux, dtype=np.float64), np.asarray(uy, dtype=np.float64),
+                          np.asarray(uz, dtype=np.float64)])
+
+    vn, ve = process_data(data=data, dtype=dtype, iptype=iptype, nodal=nodal, elements=elements, n=len(dU))
+
+    U, cnodes, fabs, fscaled, celements, eabs = postprocess_colours(nodes, dU, vn, ve, dtype, scale, cbar, ctype,
+                                                                    buffers=buffers)
+
+    toc = time() - tic
+
+    return toc, U, cnodes, fabs, fscaled, celements, eabs
 
-    vn, ve = process_data(data=data, dtype=dtype, iptype=iptype, nodal=nodal, elements=elements, n=len(U))
+
+def postprocess_colours(nodes, dU, vn, ve, dtype, scale, cbar, ctype, buffers=False):
+    """Deformed co-ordinates, scaled data and colours of processed nodal and element data.
+
+    Parameters
+    ----------
+    nodes : list, array
+        [[x, y, z], ..] co-ordinates of each node.
+    dU : array
+        (n x 3) nodal displacements.
+    vn : array
+        (n,) nodal data from process_data.
+    ve : array
+        (m,) element data from process_data, None for nodal data.
+    dtype : str
+        'nodal' or 'element'.
+    scale : float
+        Scale displacements for the deformed plot.
+    cbar : list
+        Minimum and maximum limits on the colorbar.
+    ctype : int
+        RGB color type, 1 for float32 colours or 255 for uint8 colours.
+    buffers : bool
+        Return bytes instead of arrays, see postprocess_arrays.
+
+    Returns
+    -------
+    array
+        (n x 3) scaled deformed nodal co-ordinates.
+    array
+        (n x 3) nodal colors.
+    float
+        Absolute maximum nodal data value.
+    array
+        (n,) normalised data values.
+    array
+        (m x 3) element colors, (0 x 3) for nodal data.
+    float
+        Absolute maximum element data value.
+
+    Notes
+    -----
+    - The last stage of postprocess_arrays, to re-colour processed data for new scales and colorbar limits.
+
+    """
+
+    U = np.asarray(nodes, dtype=np.float64) + scale * np.asarray(dU, dtype=np.float64)
+
+    colours = np.uint8 if ctype == 255 else np.float32
 
     fscaled, fabs = normalise_data(data=vn, cmin=cbar[0], cmax=cbar[1])
-    cnodes = colorbar(fsc=fscaled, input='array', type=ctype)
+    cnodes = np.ascontiguousarray(colorbar(fsc=fscaled, input='array', type=ctype), dtype=colours)
 
     if dtype == 'element':
         escaled, eabs = normalise_data(data=ve, cmin=cbar[0], cmax=cbar[1])
-        celements = colorbar(fsc=escaled, input='array', type=ctype)
-        celements_ = [list(i) for i in list(celements)]
+        celements = np.ascontiguousarray(colorbar(fsc=escaled, input='array', type=ctype), dtype=colours)
     else:
         eabs = 0
-        celements_ = []
+        celements = np.zeros((0, 3), dtype=colours)
 
-    toc = time() - tic
-    cnodes_ = [list(i) for i in list(cnodes)]
-    fabs_ = float(fabs)
-    fscaled_ = [float(i) for i in list(fscaled)]
+    fscaled = np.ascontiguousarray(fscaled, dtype=np.float64).ravel()
 
-    return toc, U, cnodes_, fabs_, fscaled_, celements_, float(eabs)
+    if buffers:
+        U = U.astype(np.float32).tobytes()
+        fscaled = fscaled.astype(np.float32).tobytes()
+        cnodes = cnodes.tobytes()
+        celements = celements.tobytes()
+
+    return U, cnodes, float(fabs), fscaled, celements, float(eabs)
 
 
 # def plotvoxels(values, U, vdx, indexing=None):
@@ -576,52 +678,186 @@ def postprocess(nodes, elements, ux, uy, uz, data, dtype, scale, cbar, ctype, ip
 #     return Am
 
 
-def principal_stresses(data):
-    """ Performs principal stress calculations solving the eigenvalues problem.
+def _point_table(field, ekeys):
+    """(m x p) table of integration point data, NaN where missing, and the p point names."""
+
+    items = [field.get(ekey) or {} for ekey in ekeys]
+    counts = np.fromiter(map(len, items), dtype=np.int64, count=len(items))
+    names = list(chain.from_iterable(map(dict.keys, items)))
+    flat = np.array(list(chain.from_iterable(map(dict.values, items))), dtype=np.float64)
+    points = sorted(set(names))
+    index = {point: i for i, point in enumerate(points)}
+    cols = np.fromiter(map(index.__getitem__, names), dtype=np.int64, count=len(names))
+    table = np.full((len(items), len(points)), np.nan)
+    table[np.repeat(np.arange(len(items)), counts), cols] = flat
+
+    return table, points
+
+
+def principal_values_2d(sxx, syy, sxy):
+    """Closed-form principal values and directions of symmetric 2x2 tensors.
+
+    Parameters
+    ----------
+    sxx, syy, sxy : array
+        Tensor components of any, equal, shape.
+
+    Returns
+    -------
+    array
+        (..., 2) principal values, largest first.
+    array
+        (..., 2, 2) unit principal directions, [..., :, i] for principal value i.
+
+    """
+
+    c = 0.5 * (sxx + syy)
+    r = np.hypot(0.5 * (sxx - syy), sxy)
+    theta = 0.5 * np.arctan2(2 * sxy, sxx - syy)
+    cos, sin = np.cos(theta), np.sin(theta)
+    w = np.stack([c + r, c - r], axis=-1)
+    v = np.stack([np.stack([cos, -sin], axis=-1), np.stack([sin, cos], axis=-1)], axis=-2)
+
+    return w, v
+
+
+def principal_values_3d(sxx, syy, szz, sxy, syz, sxz):
+    """Closed-form principal values and directions of symmetric 3x3 tensors.
+
+    Parameters
+    ----------
+    sxx, syy, szz, sxy, syz, sxz : array
+        Tensor components of any, equal, shape.
+
+    Returns
+    -------
+    array
+        (..., 3) principal values, largest first.
+    array
+        (..., 3, 3) unit principal directions, [..., :, i] for principal value i.
+
+    Notes
+    -----
+    - Eigenvalues by the trigonometric solution of the characteristic cubic, eigenvectors from cross products of the
+      rows of the shifted tensor, with orthogonal completion for repeated eigenvalues.
+
+    """
+
+    A = np.stack([np.stack([sxx, sxy, sxz], axis=-1),
+                  np.stack([sxy, syy, syz], axis=-1),
+                  np.stack([sxz, syz, szz], axis=-1)], axis=-2).astype(np.float64)
+    q = np.trace(A, axis1=-2, axis2=-1) / 3.
+    eye = np.eye(3)
+    p = np.sqrt(np.sum((A - q[..., None, None] * eye)**2, axis=(-2, -1)) / 6.)
+    scale = np.where(p > 0, p, 1.)
+    B = (A - q[..., None, None] * eye) / scale[..., None, None]
+    phi = np.arccos(np.clip(0.5 * np.linalg.det(B), -1, 1)) / 3.
+    b = np.stack([2 * np.cos(phi), 2 * np.cos(phi + 2 * np.pi / 3), 2 * np.cos(phi + 4 * np.pi / 3)], axis=-1)
+    b = np.sort(b, axis=-1)[..., ::-1]
+    w = q[..., None] + p[..., None] * b
+
+    def vector(beta):
+        C = B - beta[..., None, None] * eye
+        crosses = np.stack([np.cross(C[..., 0, :], C[..., 1, :]), np.cross(C[..., 1, :], C[..., 2, :]),
+                            np.cross(C[..., 2, :], C[..., 0, :])], axis=-2)
+        norms = np.linalg.norm(crosses, axis=-1)
+        best = np.argmax(norms, axis=-1)
+        v = np.take_along_axis(crosses, best[..., None, None], axis=-2)[..., 0, :]
+        n = np.take_along_axis(norms, best[..., None], axis=-1)[..., 0]
+        return v / np.where(n > 0, n, 1.)[..., None], n > 1e-6
+
+    def unit(v):
+        n = np.linalg.norm(v, axis=-1)
+        return v / np.where(n > 0, n, 1.)[..., None]
+
+    def perpendicular(v):
+        return unit(np.cross(v, eye[np.argmin(abs(v), axis=-1)]))
+
+    v1, ok1 = vector(b[..., 0])
+    v3, ok3 = vector(b[..., 2])
+    isotropic = (~ok1 & ~ok3) | (p <= 1e-12 * abs(q))
+    v1 = np.where(isotropic[..., None], eye[0], v1)
+    v3 = np.where(isotropic[..., None], eye[2], v3)
+    v1 = np.where((~ok1 & ok3 & ~isotropic)[..., None], perpendicular(v3), v1)
+    v3 = np.where((ok1 & ~ok3 & ~isotropic)[..., None], perpendicular(v1), v3)
+    v3 = unit(v3 - np.sum(v3 * v1, axis=-1)[..., None] * v1)
+    v2 = np.cross(v3, v1)
+
+    return w, np.stack([v1, v2, v3], axis=-1)
+
+
+def principal_stresses(data, section_points=None):
+    """Principal stresses and their directions for all elements and section points at once.
 
     Parameters
     ----------
     data : dic
         Element data from structure.results for the Step.
+    section_points : list
+        Section points to process, e.g. ['sp1', 'sp5'] for shells or ['sp0'] for solids, defaults to all present.
 
     Returns
     -------
     spr: dict
         dictionary with the principal stresses of each element organised per
-        `stress_type` ('max', 'min') and `section_point` ('sp1, 'sp5').
+        `stress_type` ('max', 'min', and 'mid' for solids) and `section_point` ('sp1, 'sp5').
         {section_point: {stress_type: array([element_0, elemnt_1, ...])}}
     e: dict
-        dictionary with the principal stresses vector components in World coordinates
-        of each element organised per `stress_type` ('max', 'min') and
-        `section_point` ('sp1, 'sp5').
+        dictionary with the principal stresses vector components of each element organised per
+        `stress_type` and `section_point`, in the local axes of shells and the global axes of solids.
         {section_point: {stress_type: array([element_0_x, elemnt_1_x, ...],
-        [element_0_y, elemnt_1_y, ...])}}
+        [element_0_y, elemnt_1_y, ...])}}, with a z row if the data have solid elements.
+
+    Notes
+    -----
+    - Stresses are the mean values of the integration points of each section point, elements are in the order of
+      their keys and elements without data at a section point have zero principal stresses.
+    - Elements with 'szz' data are solved as 3x3 tensors, all others as 2x2 plane stress tensors.
 
-    Warnings
-    --------
-    The function is experimental and works only for shell elements at the moment.
     """
-    components = ['sxx', 'sxy', 'syy']
-    stype = ['max', 'min']
-    section_points = ['sp1', 'sp5']
 
-    stress_results = list(zip(*[data[stress_name].values() for stress_name in components]))
-    spr = {sp: {st: np.zeros((len(stress_results))) for st in stype} for sp in section_points}
-    e = {sp: {k: np.zeros((2, len(stress_results))) for k in stype} for sp in section_points}
+    ekeys = sorted(data['sxx'], key=int)
+    m = len(ekeys)
+    tables = {}
+
+    for name in ['sxx', 'syy', 'sxy', 'szz', 'syz', 'sxz']:
+        tables[name] = _point_table(data.get(name, {}), ekeys)
+
+    suffixes = np.array([i.split('_')[-1] for i in tables['sxx'][1]], dtype=str)
+
+    if section_points is None:
+        section_points = sorted(set(i.split('_')[-1] for i in tables['sxx'][1]))
+
+    solid = np.any(~np.isnan(tables['szz'][0]), axis=1) if tables['szz'][0].size else np.zeros(m, dtype=bool)
+    three = bool(np.any(solid))
+    stype = ['max', 'mid', 'min'] if three else ['max', 'min']
+    spr, e = {}, {}
+
     for sp in section_points:
-        for c, element_stresses in enumerate(stress_results):
-            # Stresses are computed as mean values of the integration points
-            stress_vector = [np.mean(np.array([v for k, v in i.items() if sp in k])) for i in element_stresses]
-            # The principal stresses and their directions are computed solving the eigenvalues problem
-            stress_matrix = np.array([(stress_vector[0], stress_vector[1]),
-                                      (stress_vector[1], stress_vector[2])])
-            w_sp, v_sp = np.linalg.eig(stress_matrix)
-            # sort by larger to smaller eigenvalue
-            idx = w_sp.argsort()[::-1]
-            w_sp = w_sp[idx]
-            v_sp = v_sp[:, idx]
-            # populate results
-            for v, k in enumerate(stype):
-                spr[sp][k][c] += w_sp[v]
-                e[sp][k][:, c] += v_sp[:, v]
+
+        mean = {}
+        for name, (table, points) in tables.items():
+            mask = np.array([i.split('_')[-1] == sp for i in points], dtype=bool)
+            values = table[:, mask] if mask.size else np.zeros((m, 0))
+            valid = ~np.isnan(values)
+            mean[name] = np.where(valid, values, 0).sum(axis=1) / np.maximum(valid.sum(axis=1), 1)
+
+        number = np.sum(~np.isnan(tables['sxx'][0][:, suffixes == sp]), axis=1) if len(suffixes) else np.zeros(m)
+        w = np.zeros((m, 3 if three else 2))
+        v = np.zeros((m, 3 if three else 2, 3 if three else 2))
+
+        w2, v2 = principal_values_2d(mean['sxx'], mean['syy'], mean['sxy'])
+        w[:, [0, -1]] = w2
+        v[:, :2, [0, -1]] = v2
+
+        if three:
+            w3, v3 = principal_values_3d(*[mean[i][solid] for i in ['sxx', 'syy', 'szz', 'sxy', 'syz', 'sxz']])
+            w[solid] = w3
+            v[solid] = v3
+
+        w[number == 0] = 0
+        v[number == 0] = 0
+        spr[sp] = {k: w[:, i] for i, k in enumerate(stype)}
+        e[sp] = {k: v[:, :, i].T for i, k in enumerate(stype)}
+
     return spr, e
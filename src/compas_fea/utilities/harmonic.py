@@ -0,0 +1,134 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'store_harmonic',
+    'harmonic_amplitude',
+    'harmonic_phase',
+    'harmonic_field',
+]
+
+
+def store_harmonic(results, U, frequencies, field='u', nodes=None):
+    """Store complex harmonic results of a step as one array.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one step, i.e. structure.results[step].
+    U : array
+        (f x n x 3) complex amplitudes.
+    frequencies : list
+        (f,) excitation frequencies [Hz].
+    field : str
+        'u' displacements or 'ur' rotations.
+    nodes : list
+        (n,) node keys, None for 0 to n - 1.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - The amplitudes are stored as results['harmonic'][field], with results['frequencies'] and results['nodes'].
+      Amplitudes and phases are computed from them when requested, see harmonic_field.
+
+    """
+
+    U = np.asarray(U, dtype=np.complex128)
+
+    results.setdefault('harmonic', {})[field] = U
+    results['frequencies'] = [float(i) for i in frequencies]
+    results['nodes'] = list(range(U.shape[1])) if nodes is None else list(nodes)
+
+
+def harmonic_amplitude(results, field='u'):
+    """Amplitudes of stored complex harmonic results.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one harmonic step.
+    field : str
+        'u' or 'ur'.
+
+    Returns
+    -------
+    array
+        (f x n x 3) amplitudes.
+
+    """
+
+    return abs(results['harmonic'][field])
+
+
+def harmonic_phase(results, field='u', degrees=False):
+    """Phase angles of stored complex harmonic results.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one harmonic step.
+    field : str
+        'u' or 'ur'.
+    degrees : bool
+        Angles in degrees, else radians.
+
+    Returns
+    -------
+    array
+        (f x n x 3) phase angles, positive ahead of the load.
+
+    """
+
+    return np.angle(results['harmonic'][field], deg=degrees)
+
+
+def harmonic_field(results, field):
+    """A nodal field at one frequency, read from the stored complex harmonic results.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one harmonic step.
+    field : str
+        Component and frequency number starting at 1, e.g. 'ux3' for the real part, 'uxa3' for the amplitude or
+        'uxp3' for the phase [rad] of ux at the third frequency.
+
+    Returns
+    -------
+    dict
+        {node: value} at the frequency, None if the field is not stored as a harmonic array.
+
+    """
+
+    match = re.match(r'^(ur|u)([xyz])([ap]?)(\d+)$', field)
+    harmonic = results.get('harmonic', {})
+
+    if not match or match.group(1) not in harmonic:
+        return None
+
+    U = harmonic[match.group(1)]
+    i = int(match.group(4)) - 1
+
+    if not 0 <= i < len(U):
+        return None
+
+    values = U[i, :, 'xyz'.index(match.group(2))]
+    values = {'': np.real, 'a': np.abs, 'p': np.angle}[match.group(3)](values)
+    nodes = results.get('nodes') or range(len(values))
+
+    return dict(zip(nodes, values.tolist()))
@@ -0,0 +1,342 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+try:
+    from scipy.optimize import linear_sum_assignment
+    from scipy.spatial import cKDTree
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'store_mode_shapes',
+    'pack_mode_shapes',
+    'mode_shape_field',
+    'mode_shapes',
+    'modal_assurance_criterion',
+    'pair_modes',
+    'nearest_nodes',
+    'modal_assurance',
+]
+
+
+def store_mode_shapes(results, shapes, frequencies=None, field='u', modes=None, nodes=None):
+    """Store mode shapes of a modal or buckling step as one array.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one step, i.e. structure.results[step].
+    shapes : array
+        (k x n x 3) mode shapes.
+    frequencies : list
+        (k,) natural frequencies [Hz], None to leave results['frequencies'] as it is.
+    field : str
+        'u' translations or 'ur' rotations.
+    modes : list
+        (k,) mode numbers, None for 1 to k.
+    nodes : list
+        (n,) node keys, None for 0 to n - 1.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - The shapes are stored as results['shapes'][field], with results['modes'] and results['nodes'], and
+      results['frequencies'] in the order of the modes.
+    - Nodal fields of each mode, e.g. 'ux3' or 'um3', are not stored, they are read from the array on first access
+      through derived_field.
+
+    """
+
+    shapes = np.asarray(shapes, dtype=np.float64)
+    k, n = shapes.shape[:2]
+
+    results.setdefault('shapes', {})[field] = shapes
+    results['modes'] = list(range(1, k + 1)) if modes is None else [int(i) for i in modes]
+    results['nodes'] = list(range(n)) if nodes is None else list(nodes)
+
+    if frequencies is not None:
+        results['frequencies'] = [float(i) for i in frequencies]
+
+
+def pack_mode_shapes(results, base=1):
+    """Move nodal fields of each mode, e.g. 'ux1', 'uy1', 'uz1', into mode shape arrays.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one modal or buckling step, with nodal fields suffixed by the mode number.
+    base : int
+        Number of the first mode, e.g. 1 if 0 is the base state, and of the first entry of results['frequencies'].
+        Modes before it or without a frequency are dropped.
+
+    Returns
+    -------
+    None
+
+    """
+
+    nodal = results.get('nodal', {})
+    found = {}
+
+    for name in list(nodal):
+        match = re.match(r'^(ur|u)([xyzm])(\d+)$', name)
+        if match:
+            found.setdefault(match.group(1), {}).setdefault(int(match.group(3)), []).append(match.group(2))
+
+    frequencies = results.get('frequencies')
+
+    if isinstance(frequencies, dict):
+        frequencies = [frequencies[i] for i in sorted(frequencies)]
+
+    for field in ['u', 'ur']:
+
+        modes = sorted(i for i, components in found.get(field, {}).items() if set('xyz') <= set(components))
+
+        modes = [i for i in modes if i >= base and (frequencies is None or i - base < len(frequencies))]
+
+        if not modes:
+            continue
+
+        nodes = sorted(nodal['{0}x{1}'.format(field, modes[0])], key=int)
+        shapes = np.array([[[nodal['{0}{1}{2}'.format(field, c, mode)].get(node) for c in 'xyz'] for node in nodes]
+                           for mode in modes], dtype=np.float64).reshape(len(modes), len(nodes), 3)
+
+        for mode in found[field]:
+            for c in found[field][mode]:
+                del nodal['{0}{1}{2}'.format(field, c, mode)]
+
+        store_mode_shapes(results, np.nan_to_num(shapes), field=field, modes=modes, nodes=nodes,
+                          frequencies=None if frequencies is None else [frequencies[i - base] for i in modes])
+
+
+def mode_shape_field(results, field):
+    """A nodal field of one mode, read from the stored mode shape arrays.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one modal or buckling step.
+    field : str
+        Component and mode number, e.g. 'ux3' or 'urz1'.
+
+    Returns
+    -------
+    dict
+        {node: value} of the mode, None if the mode shape is not stored as an array.
+
+    """
+
+    match = re.match(r'^(ur|u)([xyz])(\d+)$', field)
+    shapes = results.get('shapes', {})
+
+    if not match or match.group(1) not in shapes or int(match.group(3)) not in results.get('modes', []):
+        return None
+
+    values = shapes[match.group(1)][results['modes'].index(int(match.group(3))), :, 'xyz'.index(match.group(2))]
+
+    return dict(zip(results['nodes'], values.tolist()))
+
+
+def mode_shapes(results, modes=None, nodes=None, field='u'):
+    """Mode shapes of modal or buckling results as one array.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one modal step, i.e. structure.results[step], with stored mode shape arrays or with nodal 'ux1',
+        'uy1', 'uz1', ... fields.
+    modes : list
+        Mode numbers, starting at 1, None for all modes with shapes.
+    nodes : list
+        Node keys, None for all nodes of the mode shapes in sorted order.
+    field : str
+        'u' translations or 'ur' rotations.
+
+    Returns
+    -------
+    array
+        (k,) mode numbers.
+    array
+        (k,) natural frequencies [Hz], or load factors of buckling results.
+    array
+        (k x n x 3) mode shapes.
+    list
+        (n,) node keys.
+
+    """
+
+    if field not in results.get('shapes', {}):
+        pack_mode_shapes(results)
+
+    if field not in results.get('shapes', {}):
+        raise KeyError('***** No {0} mode shapes in the results *****'.format(field))
+
+    stored = results['modes']
+    values = results.get('frequencies', results.get('factors'))
+    values = [values[i] for i in sorted(values)] if isinstance(values, dict) else values
+    index = list(range(len(stored))) if modes is None else [stored.index(int(i)) for i in modes]
+    shapes = results['shapes'][field][index]
+
+    if nodes is None:
+        nodes = sorted(results['nodes'], key=int)
+
+    if list(nodes) != results['nodes']:
+        rows = {node: i for i, node in enumerate(results['nodes'])}
+        shapes = shapes[:, [rows[node] for node in nodes]]
+
+    frequencies = np.array([values[i] for i in index], dtype=np.float64) if values else np.full(len(index), np.nan)
+
+    return np.array([stored[i] for i in index]), frequencies, shapes, list(nodes)
+
+
+def modal_assurance_criterion(A, B):
+    """Modal Assurance Criterion between two sets of mode shapes.
+
+    Parameters
+    ----------
+    A : array
+        (k1 x ...) first mode shapes, e.g. (k1 x n x 3), real or complex.
+    B : array
+        (k2 x ...) second mode shapes at the same degrees-of-freedom.
+
+    Returns
+    -------
+    array
+        (k1 x k2) MAC values |a_i^H b_j|^2 / (a_i^H a_i b_j^H b_j), between 0 and 1.
+
+    """
+
+    A = np.asarray(A).reshape(len(A), -1)
+    B = np.asarray(B).reshape(len(B), -1)
+    AB = np.conj(A).dot(B.T)
+    aa = np.real(np.sum(np.conj(A) * A, axis=1))
+    bb = np.real(np.sum(np.conj(B) * B, axis=1))
+    norm = aa[:, None] * bb[None, :]
+
+    return np.where(norm > 0, abs(AB)**2 / np.where(norm > 0, norm, 1.), 0.)
+
+
+def pair_modes(mac, threshold=0.):
+    """Pair the modes of two sets with the largest total MAC.
+
+    Parameters
+    ----------
+    mac : array
+        (k1 x k2) MAC matrix.
+    threshold : float
+        Smallest MAC value of a pair.
+
+    Returns
+    -------
+    list
+        [(i, j, mac), ...] row and column indices of the pairs, ordered by i.
+
+    Notes
+    -----
+    - One-to-one assignment by the Hungarian algorithm, so that two modes of one set are never paired with the same
+      mode of the other, as can happen when taking the largest MAC of each row.
+
+    """
+
+    mac = np.asarray(mac, dtype=np.float64)
+    rows, cols = linear_sum_assignment(-mac)
+
+    return [(int(i), int(j), float(mac[i, j])) for i, j in zip(rows, cols) if mac[i, j] >= threshold]
+
+
+def nearest_nodes(xyz1, xyz2):
+    """Nearest nodes of a second mesh to the nodes of a first mesh.
+
+    Parameters
+    ----------
+    xyz1 : array
+        (n1 x 3) co-ordinates of the first nodes.
+    xyz2 : array
+        (n2 x 3) co-ordinates of the second nodes.
+
+    Returns
+    -------
+    array
+        (n1,) rows of xyz2 nearest to each row of xyz1.
+    array
+        (n1,) distances.
+
+    """
+
+    distances, rows = cKDTree(np.asarray(xyz2, dtype=np.float64)).query(np.asarray(xyz1, dtype=np.float64))
+
+    return rows, distances
+
+
+def modal_assurance(structure1, step1, structure2=None, step2=None, nodes=None, modes1=None, modes2=None,
+                    threshold=0.):
+    """MAC matrix and mode pairs between the modal results of two structures, or of two steps of one structure.
+
+    Parameters
+    ----------
+    structure1 : obj
+        Structure object with modal results.
+    step1 : str
+        Modal step of structure1.
+    structure2 : obj
+        Second Structure object, None for structure1.
+    step2 : str
+        Modal step of structure2, None for step1.
+    nodes : str, list
+        Node set name or node keys of structure1 to compare, None for all nodes.
+    modes1, modes2 : list
+        Mode numbers to compare, None for all.
+    threshold : float
+        Smallest MAC value of a mode pair.
+
+    Returns
+    -------
+    dict
+        (k1 x k2) 'mac' matrix, 'pairs' [(mode1, mode2, mac), ...], the (k1,) and (k2,) 'modes1', 'modes2' and
+        'frequencies1', 'frequencies2', and the (n,) 'distances' from each node of structure1 to the node of
+        structure2 it is compared with.
+
+    Notes
+    -----
+    - Nodes of structure1 are mapped to the nearest nodes of structure2, so that meshes that differ can be compared.
+      The backends, mode normalisations and numbers of modes of the two results may differ.
+
+    """
+
+    structure2 = structure1 if structure2 is None else structure2
+    step2 = step1 if step2 is None else step2
+
+    if nodes is None:
+        nodes = sorted(structure1.nodes, key=int)
+    elif isinstance(nodes, str):
+        nodes = structure1.sets[nodes].selection
+
+    if structure2 is structure1:
+        nodes2, distances = list(nodes), np.zeros(len(nodes))
+    else:
+        keys2 = sorted(structure2.nodes, key=int)
+        rows, distances = nearest_nodes(structure1.nodes_xyz(nodes), structure2.nodes_xyz(keys2))
+        nodes2 = [keys2[i] for i in rows]
+
+    modes1, f1, A, _ = mode_shapes(structure1.results[step1], modes=modes1, nodes=nodes)
+    modes2, f2, B, _ = mode_shapes(structure2.results[step2], modes=modes2, nodes=nodes2)
+    mac = modal_assurance_criterion(A, B)
+    pairs = [(int(modes1[i]), int(modes2[j]), value) for i, j, value in pair_modes(mac, threshold)]
+
+    return {'mac': mac, 'pairs': pairs, 'modes1': modes1, 'modes2': modes2, 'frequencies1': f1, 'frequencies2': f2,
+            'distances': distances}
@@ -0,0 +1,276 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas_fea.utilities.derived import _as_results
+from compas_fea.utilities.modal import mode_shapes
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'modal_participation',
+    'cqc_correlation',
+    'combine_modal',
+    'response_spectrum',
+    'frequency_response',
+]
+
+
+def modal_participation(shapes, masses):
+    """Participation factors and effective masses of mode shapes with a lumped mass.
+
+    Parameters
+    ----------
+    shapes : array
+        (k x n x 3) mode shapes.
+    masses : array
+        (n,) lumped nodal masses, or (n x 3) masses of each direction.
+
+    Returns
+    -------
+    dict
+        'generalised' (k,) modal masses, 'factors' (k x 3) participation factors, 'effective' (k x 3) effective masses,
+        'ratios' (k x 3) effective mass fractions, 'cumulative' (k x 3) cumulative fractions and 'total' (3,) masses in
+        x, y and z.
+
+    Notes
+    -----
+    - The factors are independent of the mode shape normalisation, only the products of the factors and the shapes
+      are physical.
+
+    """
+
+    m = np.asarray(masses, dtype=np.float64)
+    m = np.repeat(m[:, None], 3, axis=1) if m.ndim == 1 else m
+
+    generalised = np.einsum('knc,nc,knc->k', shapes, m, shapes)
+    L = np.einsum('knc,nc->kc', shapes, m)
+    factors = L / np.where(generalised > 0, generalised, 1.)[:, None]
+    effective = L * factors
+    total = m.sum(axis=0)
+    ratios = effective / np.where(total > 0, total, 1.)
+
+    return {'generalised': generalised, 'factors': factors, 'effective': effective, 'ratios': ratios,
+            'cumulative': np.cumsum(ratios, axis=0), 'total': total}
+
+
+def cqc_correlation(frequencies, damping=0.05):
+    """Modal correlation coefficients of the complete quadratic combination.
+
+    Parameters
+    ----------
+    frequencies : array
+        (k,) natural frequencies.
+    damping : float, array
+        Damping ratio, or (k,) damping ratios of each mode.
+
+    Returns
+    -------
+    array
+        (k x k) correlation coefficients, with ones on the diagonal.
+
+    Notes
+    -----
+    - Der Kiureghian's coefficients for white-noise input, for unequal modal damping.
+
+    """
+
+    w = np.asarray(frequencies, dtype=np.float64)
+    z = np.broadcast_to(np.asarray(damping, dtype=np.float64), w.shape)
+    r = w[None, :] / w[:, None]
+    zi, zj = z[:, None], z[None, :]
+    numerator = 8 * np.sqrt(zi * zj) * (zi + r * zj) * r**1.5
+    denominator = (1 - r**2)**2 + 4 * zi * zj * r * (1 + r**2) + 4 * (zi**2 + zj**2) * r**2
+
+    return numerator / denominator
+
+
+def combine_modal(values, method='cqc', rho=None):
+    """Combine peak modal responses.
+
+    Parameters
+    ----------
+    values : array
+        (k x ...) signed peak responses of each mode.
+    method : str
+        'srss' square root of the sum of squares, 'cqc' complete quadratic combination or 'abs' sum of absolute values.
+    rho : array
+        (k x k) correlation coefficients for 'cqc', see cqc_correlation.
+
+    Returns
+    -------
+    array
+        (...) combined peak responses.
+
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+
+    if method == 'abs':
+        return np.sum(abs(values), axis=0)
+
+    if method == 'srss':
+        return np.sqrt(np.sum(values**2, axis=0))
+
+    if method == 'cqc':
+        flat = values.reshape(len(values), -1)
+        return np.sqrt(np.maximum(np.einsum('ie,ij,je->e', flat, rho, flat), 0)).reshape(values.shape[1:])
+
+    raise ValueError('***** Unknown modal combination {0} *****'.format(method))
+
+
+def response_spectrum(results, masses, spectrum, directions='x', damping=0.05, method='cqc', modes=None, nodes=None):
+    """Response spectrum analysis of stored modal results.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one modal step, i.e. structure.results[step].
+    masses : array
+        (n,) lumped nodal masses in the order of nodes, or (n x 3) masses of each direction.
+    spectrum : obj, array
+        Function of the (k,) periods [s] returning the (k,) spectral accelerations, or an (p x 2) table of periods and
+        accelerations that is interpolated.
+    directions : str, dict
+        Directions of excitation, e.g. 'x', 'xy' or {'x': 1., 'y': 0.3, 'z': 0.7} with factors on the spectrum. The
+        responses to each direction are combined by SRSS.
+    damping : float, array
+        Damping ratio, or (k,) damping ratios of each mode, for CQC.
+    method : str
+        Modal combination, 'cqc', 'srss' or 'abs'.
+    modes : list
+        Mode numbers to include, None for all.
+    nodes : list
+        Node keys in the order of masses, None for all nodes in sorted order.
+
+    Returns
+    -------
+    dict
+        Results in the format of one step, with nodal peak displacements 'ux', 'uy', 'uz' and inertial forces 'cfx',
+        'cfy', 'cfz', and 'spectrum' data of each mode: 'modes', 'frequencies', 'periods', 'accelerations',
+        'participation' (see modal_participation), the (3,) combined peak 'base_shear' in x, y and z and the (k x 3)
+        'modal_base_shear'.
+
+    Notes
+    -----
+    - The peak response of mode i to direction d is Gamma_id Sa(T_i) / omega_i^2 phi_i for displacements and
+      Gamma_id Sa(T_i) M phi_i for forces, computed for all modes and nodes at once before the modal combination.
+    - Combined peaks are positive, the signs of the modal responses are lost.
+
+    """
+
+    modes, frequencies, shapes, nodes = mode_shapes(results, modes=modes, nodes=nodes)
+    m = np.asarray(masses, dtype=np.float64)
+    m = np.repeat(m[:, None], 3, axis=1) if m.ndim == 1 else m
+
+    periods = 1. / frequencies
+    omega = 2 * np.pi * frequencies
+
+    if callable(spectrum):
+        Sa = np.asarray(spectrum(periods), dtype=np.float64) * np.ones(len(periods))
+    else:
+        table = np.asarray(spectrum, dtype=np.float64)
+        Sa = np.interp(periods, table[:, 0], table[:, 1])
+
+    if not isinstance(directions, dict):
+        directions = {d: 1. for d in directions}
+
+    participation = modal_participation(shapes, m)
+    rho = cqc_correlation(omega, damping) if method == 'cqc' else None
+
+    U = np.zeros((len(nodes), 3))
+    F = np.zeros((len(nodes), 3))
+    V = np.zeros(3)
+    Vm = np.zeros((len(modes), 3))
+
+    for d, factor in directions.items():
+        j = 'xyz'.index(d)
+        a = participation['factors'][:, j] * Sa * factor
+        u = (a / omega**2)[:, None, None] * shapes
+        f = a[:, None, None] * m[None, :, :] * shapes
+        v = a[:, None] * np.einsum('knc,nc->kc', shapes, m)
+        U += combine_modal(u, method, rho)**2
+        F += combine_modal(f, method, rho)**2
+        V += combine_modal(v, method, rho)**2
+        Vm += v**2
+
+    U, F, V, Vm = np.sqrt(U), np.sqrt(F), np.sqrt(V), np.sqrt(Vm)
+    layout = (list(nodes), None)
+    nodal = {}
+
+    for i, c in enumerate('xyz'):
+        nodal['u{0}'.format(c)] = _as_results(layout, U[:, i])
+        nodal['cf{0}'.format(c)] = _as_results(layout, F[:, i])
+
+    return {'nodal': nodal, 'element': {},
+            'spectrum': {'modes': modes.tolist(), 'frequencies': frequencies.tolist(), 'periods': periods.tolist(),
+                         'accelerations': Sa.tolist(), 'participation': participation, 'base_shear': V.tolist(),
+                         'modal_base_shear': Vm.tolist()},
+            'info': {'description': 'Response spectrum', 'method': method, 'directions': dict(directions)}}
+
+
+def frequency_response(results, masses, loads, frequencies, damping=0.05, modes=None, nodes=None, output=None):
+    """Steady-state harmonic displacements by superposition of stored modes with modal damping.
+
+    Parameters
+    ----------
+    results : dict
+        Results of one modal step, i.e. structure.results[step].
+    masses : array
+        (n,) lumped nodal masses in the order of nodes, or (n x 3) masses of each direction.
+    loads : array
+        (n x 3) real or complex nodal load amplitudes in the order of nodes, complex for phases.
+    frequencies : list
+        (f,) excitation frequencies [Hz].
+    damping : float, array
+        Modal damping ratio, or (k,) damping ratios of each mode.
+    modes : list
+        Mode numbers to superpose, None for all.
+    nodes : list
+        Node keys in the order of masses and loads, None for all nodes in sorted order.
+    output : list
+        Node keys to return displacements for, None for all nodes.
+
+    Returns
+    -------
+    dict
+        Results in the format of one HarmonicStep, with (f,) 'frequencies' and the (f x n x 3) complex displacement
+        amplitudes 'harmonic' {'u': array} of the output 'nodes'.
+
+    Notes
+    -----
+    - q_i = phi_i^T F / (m_i (w_i^2 - w^2 + 2 i z_i w_i w)) for all frequencies and modes at once, and u = sum q_i
+      phi_i over the output nodes only.
+    - Truncating the modes leaves out the quasi-static response of the higher modes.
+
+    """
+
+    modes, fn, shapes, nodes = mode_shapes(results, modes=modes, nodes=nodes)
+    m = np.asarray(masses, dtype=np.float64)
+    m = np.repeat(m[:, None], 3, axis=1) if m.ndim == 1 else m
+
+    wn = 2 * np.pi * fn
+    w = 2 * np.pi * np.asarray(frequencies, dtype=np.float64)
+    zeta = np.broadcast_to(np.asarray(damping, dtype=np.float64), wn.shape)
+
+    generalised = np.einsum('knc,nc,knc->k', shapes, m, shapes)
+    p = np.einsum('knc,nc->k', shapes, np.asarray(loads).reshape(-1, 3))
+    H = 1. / (generalised[None, :] * (wn[None, :]**2 - w[:, None]**2 + 2j * zeta[None, :] * wn[None, :] * w[:, None]))
+
+    if output is None:
+        rows, output = slice(None), list(nodes)
+    else:
+        index = {node: i for i, node in enumerate(nodes)}
+        rows = [index[node] for node in output]
+
+    U = np.einsum('fk,knc->fnc', H * p[None, :], shapes[:, rows])
+
+    return {'nodal': {}, 'element': {}, 'frequencies': [float(i) for i in frequencies], 'harmonic': {'u': U}, 'nodes': list(output),
+            'info': {'description': 'Frequency response', 'modes': modes.tolist()}}
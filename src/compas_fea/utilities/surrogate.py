@@ -0,0 +1,326 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'snapshot_vector',
+    'Surrogate',
+    'surrogate_from_results',
+]
+
+
+def snapshot_vector(results, step, fields, keys=None):
+    """Flatten the nodal and element results of a step into one snapshot vector.
+
+    Parameters
+    ----------
+    results : dict
+        Results dictionary of a Structure, i.e. structure.results.
+    step : str
+        Step key.
+    fields : list
+        Nodal fields, e.g. 'ux', 'uz' or 'rfz', and/or element fields, e.g. 'smises' or 'sxx'.
+    keys : list
+        (field, node) and (field, element, point) entries to extract, from a previous snapshot.
+
+    Returns
+    -------
+    array
+        (d,) snapshot values.
+    list
+        (d,) (field, node) and (field, element, point) keys of the values.
+
+    """
+
+    data = results[step]
+
+    if keys is None:
+        keys = []
+        for field in fields:
+            if field in data.get('nodal', {}):
+                keys.extend((field, node) for node in sorted(data['nodal'][field]))
+            elif field in data.get('element', {}):
+                values = data['element'][field]
+                keys.extend((field, ekey, point) for ekey in sorted(values) for point in sorted(values[ekey] or {}))
+            else:
+                raise KeyError('***** Field {0} not in the results of step {1} *****'.format(field, step))
+
+    values = np.zeros(len(keys))
+
+    for i, key in enumerate(keys):
+        if len(key) == 2:
+            value = data['nodal'][key[0]][key[1]]
+        else:
+            value = data['element'][key[0]][key[1]][key[2]]
+        values[i] = value if value is not None else np.nan
+
+    return values, keys
+
+
+class Surrogate(object):
+    """Reduced-order surrogate of result fields over a parameter space.
+
+    Parameters
+    ----------
+    parameters : array
+        (N x p) parameter values of the N snapshots.
+    snapshots : array
+        (N x d) snapshot vectors of the results fields.
+    method : str
+        'rbf' cubic radial basis functions with a linear tail, or 'gp' Gaussian process regression, for the POD
+        coefficients.
+    energy : float
+        Fraction of the snapshot energy kept by the POD modes.
+    modes : int
+        Number of POD modes, overrides energy.
+    keys : list
+        (d,) keys of the snapshot entries, see snapshot_vector.
+
+    Attributes
+    ----------
+    mean : array
+        (d,) mean snapshot.
+    basis : array
+        (d x r) orthonormal POD modes.
+    singular_values : array
+        (N,) singular values of the centred snapshots.
+    errors : dict
+        'truncation' relative POD error and 'loo' relative leave-one-out error of the snapshots, and 'dofs' the (d,)
+        root-mean-square leave-one-out error of each entry.
+
+    Notes
+    -----
+    - Snapshots are centred and reduced by a truncated singular value decomposition, the r modal coefficients are
+      interpolated over the parameters scaled to the unit box. A prediction costs one (N,) kernel evaluation and a
+      (d x r) product.
+    - Leave-one-out errors are closed form from the inverse of the interpolation matrix (Rippa's formula).
+
+    """
+
+    def __init__(self, parameters, snapshots, method='rbf', energy=0.9999, modes=None, keys=None):
+
+        P = np.array(parameters, dtype=float)
+        X = np.array(snapshots, dtype=float)
+
+        if P.ndim == 1:
+            P = P[:, None]
+
+        if np.any(np.isnan(X)):
+            raise ValueError('***** Snapshots contain missing values *****')
+
+        self.method = method
+        self.keys = keys
+        self.lower = P.min(axis=0)
+        self.range = np.where(P.max(axis=0) > self.lower, P.max(axis=0) - self.lower, 1.)
+        self.points = self._scale(P)
+
+        self.mean = X.mean(axis=0)
+        Phi, S, Vt = np.linalg.svd((X - self.mean).T, full_matrices=False)
+        cumulative = np.cumsum(S**2) / max(np.sum(S**2), 1e-300)
+
+        if modes is None:
+            modes = int(np.searchsorted(cumulative, energy - 1e-12) + 1)
+
+        r = max(1, min(modes, len(S)))
+        self.basis = Phi[:, :r]
+        self.singular_values = S
+        self.coefficients = (S[:r, None] * Vt[:r]).T
+
+        if method == 'gp':
+            self._fit_gp()
+        elif method == 'rbf':
+            self._fit_rbf()
+        else:
+            raise ValueError('***** Unknown surrogate method {0} *****'.format(method))
+
+        norm = np.sqrt(np.sum((X - self.mean)**2)) or 1.
+        residual = self.loo.dot(self.basis.T)
+        self.errors = {
+            'truncation': np.sqrt(max(0., 1 - cumulative[r - 1])),
+            'loo': np.sqrt(np.sum(residual**2)) / norm,
+            'dofs': np.sqrt(np.mean(residual**2, axis=0)),
+        }
+
+    def _scale(self, P):
+        return (np.atleast_2d(P) - self.lower) / self.range
+
+    def _distances(self, P):
+        return np.sqrt(np.sum((P[:, None, :] - self.points[None, :, :])**2, axis=2))
+
+    def _tail(self, P):
+        return np.hstack([np.ones((len(P), 1)), P]) if len(self.points) > P.shape[1] + 1 else np.ones((len(P), 1))
+
+    def _fit_rbf(self):
+
+        N = len(self.points)
+        Q = self._tail(self.points)
+        q = Q.shape[1]
+        A = np.zeros((N + q, N + q))
+        A[:N, :N] = self._distances(self.points)**3
+        A[:N, N:] = Q
+        A[N:, :N] = Q.T
+        Ai = np.linalg.pinv(A)
+        b = np.vstack([self.coefficients, np.zeros((q, self.coefficients.shape[1]))])
+        self.weights = Ai.dot(b)
+        self.loo = self.weights[:N] / np.diag(Ai)[:N, None]
+
+    def _correlation(self, D):
+        return np.exp(-0.5 * (D / self.length)**2)
+
+    def _fit_gp(self, nugget=1e-10):
+
+        N = len(self.points)
+        D = self._distances(self.points)
+        Y = self.coefficients
+        best = None
+
+        for length in np.logspace(-2, 1, 61):
+            R = np.exp(-0.5 * (D / length)**2) + nugget * np.eye(N)
+            try:
+                L = np.linalg.cholesky(R)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = np.linalg.solve(L.T, np.linalg.solve(L, Y))
+            variance = np.maximum(np.sum(Y * alpha, axis=0) / N, 1e-300)
+            likelihood = -0.5 * N * np.sum(np.log(variance)) - Y.shape[1] * np.sum(np.log(np.diag(L)))
+            if best is None or likelihood > best[0]:
+                best = likelihood, length, R, variance
+
+        _, self.length, R, self.variance = best
+        self.Ri = np.linalg.inv(R)
+        self.weights = self.Ri.dot(Y)
+        self.loo = self.weights / np.diag(self.Ri)[:, None]
+
+    def predict_coefficients(self, parameters):
+        """Predict the POD coefficients.
+
+        Parameters
+        ----------
+        parameters : array
+            (p,) or (M x p) parameter values.
+
+        Returns
+        -------
+        array
+            (M x r) modal coefficients.
+        array
+            (M x r) standard deviations of the coefficients for 'gp', else None.
+
+        """
+
+        P = self._scale(parameters)
+        D = self._distances(P)
+
+        if self.method == 'rbf':
+            return np.hstack([D**3, self._tail(P)]).dot(self.weights), None
+
+        r = self._correlation(D)
+        var = np.maximum(1 - np.einsum('mi,ij,mj->m', r, self.Ri, r), 0)
+
+        return r.dot(self.weights), np.sqrt(var[:, None] * self.variance[None, :])
+
+    def predict(self, parameters):
+        """Predict the snapshot vectors and their error estimates.
+
+        Parameters
+        ----------
+        parameters : array
+            (p,) or (M x p) parameter values.
+
+        Returns
+        -------
+        array
+            (M x d) predicted snapshots.
+        array
+            (M x d) error estimates, the Gaussian process standard deviation for 'gp' or the leave-one-out error of
+            each entry for 'rbf'.
+
+        """
+
+        a, s = self.predict_coefficients(parameters)
+        X = self.mean + a.dot(self.basis.T)
+
+        if s is None:
+            E = np.tile(self.errors['dofs'], (len(X), 1))
+        else:
+            E = np.sqrt((s**2).dot(self.basis.T**2))
+
+        return X, E
+
+    def fields(self, parameters):
+        """Predict the result fields for one set of parameters in the structure.results format.
+
+        Parameters
+        ----------
+        parameters : array
+            (p,) parameter values.
+
+        Returns
+        -------
+        dict
+            {'nodal': {field: {node: value}}, 'element': {field: {element: {point: value}}}} predictions.
+        dict
+            Error estimates in the same format.
+
+        """
+
+        if self.keys is None:
+            raise ValueError('***** The surrogate has no snapshot keys *****')
+
+        X, E = self.predict(parameters)
+        out = [{'nodal': {}, 'element': {}}, {'nodal': {}, 'element': {}}]
+
+        for data, values in zip(out, [X[0], E[0]]):
+            for key, value in zip(self.keys, values):
+                if len(key) == 2:
+                    data['nodal'].setdefault(key[0], {})[key[1]] = float(value)
+                else:
+                    data['element'].setdefault(key[0], {}).setdefault(key[1], {})[key[2]] = float(value)
+
+        return out[0], out[1]
+
+
+def surrogate_from_results(results, parameters, step, fields, method='rbf', energy=0.9999, modes=None):
+    """Build a Surrogate from the stored results of a parametric sweep.
+
+    Parameters
+    ----------
+    results : list
+        Structure objects or their results dictionaries, one per parameter set.
+    parameters : array
+        (N x p) parameter values of each analysis.
+    step : str
+        Step key.
+    fields : list
+        Nodal and/or element fields to include, e.g. ['ux', 'uy', 'uz', 'smises'].
+    method : str
+        'rbf' or 'gp'.
+    energy : float
+        Fraction of the snapshot energy kept by the POD modes.
+    modes : int
+        Number of POD modes, overrides energy.
+
+    Returns
+    -------
+    obj
+        Surrogate object.
+
+    """
+
+    snapshots = []
+    keys = None
+
+    for item in results:
+        x, keys = snapshot_vector(getattr(item, 'results', item), step, fields, keys)
+        snapshots.append(x)
+
+    return Surrogate(parameters, snapshots, method=method, energy=energy, modes=modes, keys=keys)
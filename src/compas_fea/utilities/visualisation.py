@@ -0,0 +1,235 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+
+# Author(s): Andrew Liew (github.com/andrewliew)
+
+
+__all__ = [
+    'connectivity_array',
+    'pipe_mesh',
+    'external_faces',
+    'element_mesh',
+]
+
+
+line_types = ['BeamElement', 'TrussElement', 'TieElement', 'StrutElement', 'SpringElement']
+
+face_types = ['ShellElement', 'MembraneElement', 'FaceElement']
+
+solid_types = ['SolidElement', 'TetrahedronElement', 'PentahedronElement', 'HexahedronElement']
+
+solid_faces = {
+    4: [[0, 2, 1, 1], [0, 1, 3, 3], [1, 2, 3, 3], [0, 3, 2, 2]],
+    6: [[0, 2, 1, 1], [3, 4, 5, 5], [0, 1, 4, 3], [1, 2, 5, 4], [2, 0, 3, 5]],
+    8: [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]],
+}
+
+
+def connectivity_array(elements):
+    """Element connectivity as an array padded with -1.
+
+    Parameters
+    ----------
+    elements : list, array
+        Node numbers of each element, or an (m x k) array already padded with -1.
+
+    Returns
+    -------
+    array
+        (m x k) node numbers.
+
+    """
+
+    if isinstance(elements, np.ndarray):
+        return elements.astype(np.int64)
+
+    lengths = np.array([len(nodes) for nodes in elements], dtype=np.int64)
+    connectivity = np.full((len(elements), max(1, lengths.max(initial=0))), -1, dtype=np.int64)
+    mask = np.arange(connectivity.shape[1]) < lengths[:, None]
+    connectivity[mask] = [int(i) for nodes in elements for i in nodes]
+
+    return connectivity
+
+
+def pipe_mesh(start, end, radius=0.05, sides=4):
+    """Vertices and faces of open pipes of polygonal section along line segments.
+
+    Parameters
+    ----------
+    start, end : array
+        (m x 3) end points of the segments.
+    radius : float
+        Pipe radius.
+    sides : int
+        Number of sides of the pipe section.
+
+    Returns
+    -------
+    array
+        (2 m sides x 3) vertices, the start ring then the end ring of each pipe.
+    array
+        (m sides x 4) quad faces.
+
+    """
+
+    start = np.asarray(start, dtype=np.float64).reshape(-1, 3)
+    end = np.asarray(end, dtype=np.float64).reshape(-1, 3)
+    m = len(start)
+
+    d = end - start
+    d /= np.where(np.linalg.norm(d, axis=1) > 0, np.linalg.norm(d, axis=1), 1.)[:, None]
+    axis = np.eye(3)[np.argmin(abs(d), axis=1)]
+    e1 = np.cross(d, axis)
+    e1 /= np.where(np.linalg.norm(e1, axis=1) > 0, np.linalg.norm(e1, axis=1), 1.)[:, None]
+    e2 = np.cross(d, e1)
+
+    angles = 2 * np.pi * np.arange(sides) / sides
+    ring = radius * (np.cos(angles)[None, :, None] * e1[:, None, :] + np.sin(angles)[None, :, None] * e2[:, None, :])
+    vertices = np.concatenate([start[:, None, :] + ring, end[:, None, :] + ring], axis=1).reshape(-1, 3)
+
+    i = np.arange(sides)
+    j = (i + 1) % sides
+    local = np.stack([i, i + sides, j + sides, j], axis=1)
+    faces = (local[None, :, :] + (2 * sides * np.arange(m))[:, None, None]).reshape(-1, 4)
+
+    return vertices, faces
+
+
+def external_faces(connectivity, cull=True):
+    """Faces of solid elements, optionally without the internal faces shared by two elements.
+
+    Parameters
+    ----------
+    connectivity : array
+        (m x k) node numbers of tetrahedra (4), pentahedra (6) and hexahedra (8), padded with -1.
+    cull : bool
+        Remove faces shared by two elements.
+
+    Returns
+    -------
+    array
+        (f x 4) outward node numbers of the faces, triangles repeat their last node.
+    array
+        (f,) rows of the elements owning the faces.
+
+    """
+
+    connectivity = np.asarray(connectivity, dtype=np.int64)
+    nn = np.sum(connectivity >= 0, axis=1)
+    faces, owners = [np.zeros((0, 4), dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+
+    for n, local in solid_faces.items():
+        rows = np.nonzero(nn == n)[0]
+        if len(rows):
+            faces.append(connectivity[rows][:, local].reshape(-1, 4))
+            owners.append(np.repeat(rows, len(local)))
+
+    faces = np.vstack(faces)
+    owners = np.concatenate(owners)
+
+    if cull and len(faces):
+        keys = np.sort(faces, axis=1)
+        keys[:, 1:][keys[:, 1:] == keys[:, :-1]] = -1
+        keys = np.sort(keys, axis=1)
+        order = np.lexsort(keys.T[::-1])
+        same = np.all(keys[order][1:] == keys[order][:-1], axis=1)
+        shared = np.zeros(len(keys), dtype=bool)
+        shared[1:] |= same
+        shared[:-1] |= same
+        keep = np.empty(len(keys), dtype=bool)
+        keep[order] = ~shared
+        faces, owners = faces[keep], owners[keep]
+
+    return faces, owners
+
+
+def element_mesh(xyz, elements, types, node_colours=None, element_colours=None, radius=0.05, sides=4, cull=True):
+    """One merged mesh of pipes for line elements, and faces for shell and solid elements.
+
+    Parameters
+    ----------
+    xyz : array
+        (n x 3) (deformed) nodal co-ordinates.
+    elements : list, array
+        Node numbers of each element, or an (m x k) array padded with -1.
+    types : list
+        (m,) element class names, e.g. 'BeamElement', 'ShellElement' or 'HexahedronElement'.
+    node_colours : array
+        (n x 3) nodal colours for the vertices.
+    element_colours : array
+        (m x 3) element colours, used for the pipes of line elements instead of the nodal colours.
+    radius : float
+        Radius of the pipes.
+    sides : int
+        Number of sides of the pipes.
+    cull : bool
+        Leave out the faces shared by two solid elements.
+
+    Returns
+    -------
+    array
+        (v x 3) vertices.
+    array
+        (f x 4) quad faces, triangles repeat their last vertex.
+    array
+        (v x 3) vertex colours, None without colours.
+
+    Notes
+    -----
+    - Shell and solid faces share the vertices of the nodes they use, each pipe has its own 2 x sides vertices.
+
+    """
+
+    xyz = np.asarray(xyz, dtype=np.float64)
+    connectivity = connectivity_array(elements)
+    connectivity = np.hstack([connectivity, np.full((len(connectivity), max(0, 4 - connectivity.shape[1])), -1)])
+    types = np.asarray(types)
+    nn = np.sum(connectivity >= 0, axis=1)
+
+    # Shell and solid faces
+
+    shells = np.nonzero(np.isin(types, face_types) & (nn >= 3))[0]
+    quads = connectivity[shells][:, :4].copy()
+    quads[:, 3] = np.where(nn[shells] == 3, quads[:, 2], quads[:, 3])
+
+    solids = np.nonzero(np.isin(types, solid_types))[0]
+    faces = np.vstack([quads, external_faces(connectivity[solids], cull=cull)[0]])
+
+    used, faces = np.unique(faces, return_inverse=True)
+    faces = faces.reshape(-1, 4)
+    vertices = [xyz[used]]
+    colours = None if node_colours is None else [np.asarray(node_colours)[used]]
+
+    # Pipes
+
+    lines = np.nonzero(np.isin(types, line_types) & (nn == 2))[0]
+
+    if len(lines):
+        u, v = connectivity[lines, 0], connectivity[lines, 1]
+        pipes, pipe_faces = pipe_mesh(xyz[u], xyz[v], radius=radius, sides=sides)
+        faces = np.vstack([faces, pipe_faces + len(used)])
+        vertices.append(pipes)
+
+        if colours is not None or element_colours is not None:
+            if element_colours is not None:
+                c = np.asarray(element_colours)[lines]
+                c1 = c2 = c
+            else:
+                c1, c2 = np.asarray(node_colours)[u], np.asarray(node_colours)[v]
+            pipe_colours = np.concatenate([np.repeat(c1[:, None, :], sides, axis=1),
+                                           np.repeat(c2[:, None, :], sides, axis=1)], axis=1).reshape(-1, 3)
+            if colours is None:
+                colours = [np.zeros((len(used), 3), dtype=pipe_colours.dtype)]
+            colours.append(pipe_colours)
+
+    vertices = np.vstack(vertices)
+    colours = None if colours is None else np.vstack(colours)
+
+    return vertices, faces, colours
@@ -0,0 +1,24 @@
+import numpy as np
+
+from scipy.linalg import eigh
+
+
+m = np.array([2., 2., 1.]) * 1000
+k = np.array([3., 2., 1.]) * 1e6
+K = np.array([[k[0] + k[1], -k[1], 0], [-k[1], k[1] + k[2], -k[2]], [0, -k[2], k[2]]])
+M = np.diag(m)
+w2, V = eigh(K, M)
+natural_frequencies = np.sqrt(w2) / (2 * np.pi)
+
+
+def shear_building():
+    """Modal results of a three-storey shear building on nodes 1-3, with mode i scaled by i + 1."""
+
+    nodal = {}
+
+    for i in range(3):
+        nodal['ux{0}'.format(i + 1)] = {j + 1: V[j, i] * (i + 2.) for j in range(3)}
+        nodal['uy{0}'.format(i + 1)] = {j + 1: 0. for j in range(3)}
+        nodal['uz{0}'.format(i + 1)] = {j + 1: 0. for j in range(3)}
+
+    return {'nodal': nodal, 'frequencies': natural_frequencies.tolist()}
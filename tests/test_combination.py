@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PinnedDisplacement
+from compas_fea.structure import PointLoad
+from compas_fea.structure import Structure
+from compas_fea.structure import TrussSection
+from compas_fea.utilities.combination import combinable_fields
+from compas_fea.utilities.combination import combine_results
+
+
+results = {
+    'dead': {'nodal': {'ux': {0: 1., 1: 2.}, 'um': {0: 1., 1: 2.}},
+             'element': {'sxx': {0: {'ip1': 10., 'ip2': -4.}}, 'syy': {0: {'ip1': 1., 'ip2': 1.}},
+                         'axes': {0: {'ex': [1, 0, 0]}}}},
+    'live': {'nodal': {'ux': {0: -3., 1: None}, 'um': {0: 3., 1: 0.}},
+             'element': {'sxx': {0: {'ip1': 2., 'ip2': 6.}}}},
+}
+
+
+def test_hand_sums():
+
+    combined = combine_results(results, {'dead': 1.35, 'live': 1.5})
+
+    assert combined['nodal']['ux'][0] == 1.35 * 1 + 1.5 * -3
+    assert combined['nodal']['ux'][1] is None
+    assert combined['element']['sxx'][0] == {'ip1': 1.35 * 10 + 1.5 * 2, 'ip2': 1.35 * -4 + 1.5 * 6}
+    assert combined['element']['axes'] is results['dead']['element']['axes']
+    assert combined['info']['factors'] == {'dead': 1.35, 'live': 1.5}
+
+
+def test_combinable_fields():
+
+    assert combinable_fields(results, ['dead', 'live']) == (['ux'], ['sxx'])
+    assert combinable_fields(results, ['dead']) == (['ux'], ['sxx', 'syy'])
+    assert combine_results(results, {'dead': 1.}, fields=['syy'])['element'] == {
+        'syy': {0: {'ip1': 1., 'ip2': 1.}}, 'axes': results['dead']['element']['axes']}
+
+
+def truss(path):
+
+    mdl = Structure(name='truss', path=path)
+
+    for xyz in [[0, 0, 0], [1, 0, 0], [2, 0, 0], [1, 0, 1]]:
+        mdl.add_node(xyz)
+
+    ekeys = [mdl.add_element(nodes=nodes, type='TrussElement') for nodes in [[0, 1], [1, 2], [0, 3], [1, 3], [2, 3]]]
+    mdl.add_set('bars', 'element', ekeys)
+    mdl.add_set('supports', 'node', [0, 2])
+    mdl.add_set('nodes', 'node', [0, 1, 2, 3])
+    mdl.add_set('top', 'node', [3])
+    mdl.add_set('middle', 'node', [1])
+    mdl.add_material(ElasticIsotropic(name='mat', E=1e6, v=0.3, p=0))
+    mdl.add_section(TrussSection(name='sec', A=1.))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='bars'))
+    mdl.add_displacement(PinnedDisplacement(name='pin', nodes='supports'))
+    mdl.add_displacement(GeneralDisplacement(name='plane', nodes='nodes', y=0))
+    mdl.add_load(PointLoad(name='p', nodes='top', x=20., z=-100.))
+    mdl.add_load(PointLoad(name='q', nodes='middle', z=-50.))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'plane']))
+    mdl.add_step(GeneralStep(name='p', loads=['p'], nlgeom=False))
+    mdl.add_step(GeneralStep(name='q', loads=['q'], modify=False, nlgeom=False))
+    mdl.add_step(GeneralStep(name='pq', loads=['p', 'q'], factor={'p': 1.35, 'q': 1.5}, modify=False, nlgeom=False))
+    mdl.steps_order = ['bc', 'p', 'q', 'pq']
+    mdl.analyse_and_extract('native', fields=['u', 'rf', 's'], output=False)
+
+    return mdl
+
+
+def test_combination_equals_factored_step(tmp_path):
+
+    mdl = truss('{0}/'.format(tmp_path))
+    mdl.add_combination('ULS', {'p': 1.35, 'q': 1.5})
+    combined, reference = mdl.results['ULS'], mdl.results['pq']
+
+    for field in ['ux', 'uz', 'rfx', 'rfz', 'um']:
+        a = mdl.get_nodal_results('ULS', field)
+        b = mdl.get_nodal_results('pq', field)
+        assert np.allclose([a[i] for i in range(4)], [b[i] for i in range(4)], rtol=1e-10, atol=1e-14)
+
+    for ekey in range(5):
+        assert abs(combined['element']['sxx'][ekey]['ip1_sp0'] - reference['element']['sxx'][ekey]['ip1_sp0']) < 1e-8
+
+    assert 'ULS' not in mdl.steps
+
+    with pytest.raises(ValueError):
+        mdl.add_combination('p', {'q': 1.})
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from compas_fea.utilities.derived import derived_field
+from compas_fea.utilities.derived import derived_fields
+from compas_fea.utilities.derived import register_derived_field
+
+
+def uniaxial():
+    return {'nodal': {'ux': {0: 3., 1: 0.}, 'uy': {0: 4., 1: 0.}, 'uz': {0: 0., 1: 2.}},
+            'element': {'sxx': {0: {'ip1_sp1': 100., 'ip2_sp1': 50.}}, 'syy': {0: {'ip1_sp1': 0., 'ip2_sp1': 0.}},
+                        'sxy': {0: {'ip1_sp1': 0., 'ip2_sp1': 50.}}}}
+
+
+def test_magnitude():
+
+    results = uniaxial()
+
+    assert derived_field(results, 'um') == {0: 5., 1: 2.}
+    assert 'um' in results['nodal']
+
+
+def test_plane_stress_fields():
+
+    results = uniaxial()
+    mises = derived_field(results, 'smises')[0]
+
+    assert abs(mises['ip1_sp1'] - 100.) < 1e-12
+    assert abs(mises['ip2_sp1'] - np.sqrt(50.**2 + 3 * 50.**2)) < 1e-12
+    assert abs(derived_field(results, 'smaxp')[0]['ip2_sp1'] - (25. + np.hypot(25., 50.))) < 1e-12
+    assert abs(derived_field(results, 'sminp')[0]['ip2_sp1'] - (25. - np.hypot(25., 50.))) < 1e-12
+    assert abs(derived_field(results, 'stresca')[0]['ip1_sp1'] - 100.) < 1e-12
+
+
+def test_solid_principal_stresses():
+
+    rng = np.random.default_rng(0)
+    A = rng.normal(size=(3, 3))
+    A = A + A.T
+    names = {'sxx': (0, 0), 'syy': (1, 1), 'szz': (2, 2), 'sxy': (0, 1), 'syz': (1, 2), 'sxz': (0, 2)}
+    results = {'element': {name: {0: {'ip1_sp0': A[i, j]}} for name, (i, j) in names.items()}}
+    w = np.linalg.eigvalsh(A)
+
+    assert abs(derived_field(results, 'smaxp')[0]['ip1_sp0'] - w[2]) < 1e-12
+    assert abs(derived_field(results, 'smidp')[0]['ip1_sp0'] - w[1]) < 1e-12
+    assert abs(derived_field(results, 'sminp')[0]['ip1_sp0'] - w[0]) < 1e-12
+    assert abs(derived_field(results, 'stresca')[0]['ip1_sp0'] - (w[2] - w[0])) < 1e-12
+
+
+def test_strain_energy_density():
+
+    results = {'element': {'sxx': {0: {'ip1_sp0': 200.}}, 'exx': {0: {'ip1_sp0': 0.001}},
+                           'sxy': {0: {'ip1_sp0': 50.}}, 'exy': {0: {'ip1_sp0': 0.002}}}}
+
+    assert abs(derived_field(results, 'sed')[0]['ip1_sp0'] - 0.5 * (200 * 0.001 + 50 * 0.002)) < 1e-12
+
+
+def test_stored_fields_not_replaced():
+
+    results = uniaxial()
+    results['nodal']['um'] = {0: -1., 1: -1.}
+
+    assert derived_field(results, 'um') == {0: -1., 1: -1.}
+    assert derived_field(results, 'ux') is results['nodal']['ux']
+
+
+def test_mode_suffix_and_missing_values():
+
+    results = {'nodal': {'ux2': {0: 0., 1: 6.}, 'uy2': {0: 0., 1: 8.}, 'uz2': {0: 1., 1: None}}}
+    um2 = derived_field(results, 'um2')
+
+    assert um2[0] == 1.
+    assert um2[1] is None
+
+
+def test_register_and_unknown_fields():
+
+    register_derived_field('sxx2', 'element', ['sxx'], lambda c: 2 * c['sxx'])
+
+    try:
+        assert derived_field(uniaxial(), 'sxx2')[0] == {'ip1_sp1': 200., 'ip2_sp1': 100.}
+    finally:
+        del derived_fields['sxx2']
+
+    with pytest.raises(KeyError):
+        derived_field(uniaxial(), 'nothing')
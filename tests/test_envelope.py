@@ -0,0 +1,90 @@
+import numpy as np
+
+from compas_fea.utilities.combination import Envelope
+from compas_fea.utilities.combination import combine_results
+from compas_fea.utilities.combination import envelope_results
+from compas_fea.utilities.derived import derived_field
+
+
+def step(ux, uy, sxx, syy, sxy):
+    return {'nodal': {'ux': dict(enumerate(ux)), 'uy': dict(enumerate(uy)), 'uz': {0: 0., 1: 0., 2: 0.}},
+            'element': {'sxx': {0: {'ip1': sxx[0], 'ip2': sxx[1]}}, 'syy': {0: {'ip1': syy[0], 'ip2': syy[1]}},
+                        'sxy': {0: {'ip1': sxy[0], 'ip2': sxy[1]}}}}
+
+
+results = {
+    'a': step([1., -4., 0.], [0., 3., 0.], [10., 0.], [0., 5.], [0., 1.]),
+    'b': step([-2., 1., 0.], [0., 0., 1.], [-20., 3.], [0., 0.], [5., 0.]),
+    'c': step([0.5, 2., None], [0., 0., 0.], [5., -8.], [5., 0.], [0., 0.]),
+}
+
+
+def test_stored_steps():
+
+    env = envelope_results(results, ['a', 'b', 'c'], ['ux', 'um', 'sxx'])
+    nodal = env['nodal']
+
+    assert nodal['ux_max'] == {0: 1., 1: 2., 2: 0.}
+    assert nodal['ux_min'] == {0: -2., 1: -4., 2: 0.}
+    assert nodal['ux'] == {0: -2., 1: -4., 2: 0.}
+    assert nodal['um'] == {0: 2., 1: 5., 2: 1.}
+    assert env['element']['sxx'][0] == {'ip1': -20., 'ip2': -8.}
+    assert env['element']['sxx_max'][0] == {'ip1': 10., 'ip2': 3.}
+    assert env['envelope']['ux']['max'] == {0: 'a', 1: 'c', 2: 'a'}
+    assert env['envelope']['sxx']['abs'][0] == {'ip1': 'b', 'ip2': 'c'}
+    assert env['envelope']['cases'] == ['a', 'b', 'c']
+    assert all('um' not in results[key]['nodal'] for key in 'abc')
+
+
+def test_combinations_against_brute_force():
+
+    rng = np.random.default_rng(0)
+    cases = {'C{0}'.format(i): dict(zip('abc', f)) for i, f in enumerate(rng.uniform(-1.5, 1.5, (50, 3)))}
+    env = envelope_results(results, cases, ['uy', 'smises', 'smaxp'])
+
+    for field, ekey, point in [('smises', 0, 'ip1'), ('smises', 0, 'ip2'), ('smaxp', 0, 'ip2')]:
+        values = {key: derived_field(combine_results(results, f), field)[ekey][point] for key, f in cases.items()}
+        governing = max(values, key=values.get)
+
+        assert abs(env['element'][field + '_max'][ekey][point] - values[governing]) < 1e-12
+        assert env['envelope'][field]['max'][ekey][point] == governing
+
+    values = [combine_results(results, f)['nodal']['uy'][1] for f in cases.values()]
+    assert abs(env['nodal']['uy_min'][1] - min(values)) < 1e-12
+    assert abs(env['nodal']['uy'][1] - values[int(np.argmax(np.abs(values)))]) < 1e-12
+
+
+def test_modes():
+
+    modal = {'m': {'nodal': {'ux1': {0: 1., 1: -2.}, 'uy1': {0: 0., 1: 0.}, 'uz1': {0: 0., 1: 0.},
+                             'ux2': {0: -3., 1: 1.}, 'uy2': {0: 0., 1: 0.}, 'uz2': {0: 0., 1: 0.}}, 'element': {}}}
+    env = envelope_results(modal, ['m'], ['ux', 'um'], modes=[1, 2])
+
+    assert env['nodal']['ux'] == {0: -3., 1: -2.}
+    assert env['nodal']['um_max'] == {0: 3., 1: 2.}
+    assert env['envelope']['ux']['abs'] == {0: 'm-2', 1: 'm-1'}
+    assert sorted(modal['m']['nodal']) == ['ux1', 'ux2', 'uy1', 'uy2', 'uz1', 'uz2']
+
+
+def test_missing_entries_in_combinations():
+
+    env = envelope_results(results, {'ab': {'a': 1., 'b': 2.}, 'ac': {'a': 1., 'c': 1.}}, ['ux', 'um'])
+
+    assert env['nodal']['ux_max'] == {0: 1.5, 1: -2., 2: 0.}
+    assert env['envelope']['ux']['max'] == {0: 'ac', 1: 'ab', 2: 'ab'}
+    assert env['nodal']['um_max'][2] == 2.
+
+    env = envelope_results(results, {'ac': {'a': 1., 'c': 1.}}, ['ux'])
+
+    assert env['nodal']['ux'][2] is None
+
+
+def test_running_envelope():
+
+    envelope = Envelope(['ux'])
+
+    for key in ['a', 'b', 'c']:
+        envelope.add(results[key], key)
+
+    assert envelope.cases == ['a', 'b', 'c']
+    assert envelope.results()['nodal']['ux_max'] == envelope_results(results, ['a', 'b', 'c'], ['ux'])['nodal']['ux_max']
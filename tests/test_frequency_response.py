@@ -0,0 +1,59 @@
+import numpy as np
+
+from tests.buildings import K
+from tests.buildings import M
+from tests.buildings import V
+from tests.buildings import m
+from tests.buildings import shear_building
+from tests.buildings import w2
+from compas_fea.utilities.spectrum import frequency_response
+
+
+frequencies = np.linspace(0.5, 20, 60)
+
+
+def test_undamped_direct_solve():
+
+    F = np.zeros((3, 3))
+    F[2, 0] = 1000.
+    out = frequency_response(shear_building(), m, F, frequencies, damping=0.)
+
+    for i, f in enumerate(frequencies):
+        u = np.linalg.solve(K - (2 * np.pi * f)**2 * M, F[:, 0])
+        assert np.allclose(out['harmonic']['u'][i, :, 0], u, rtol=1e-10)
+
+    assert out['harmonic']['u'].shape == (60, 3, 3)
+    assert np.allclose(out['harmonic']['u'][:, :, 1:], 0)
+    assert out['nodes'] == [1, 2, 3]
+
+
+def test_modal_damping_direct_solve():
+
+    F = np.zeros((3, 3), dtype=complex)
+    F[2, 0] = 1000.
+    F[0, 0] = 500j
+    zeta = 0.03
+    wn = np.sqrt(w2)
+    C = M.dot(V).dot(np.diag(2 * zeta * wn / np.diag(V.T.dot(M).dot(V)))).dot(V.T).dot(M)
+    out = frequency_response(shear_building(), m, F, frequencies, damping=zeta, output=[3])
+
+    assert out['harmonic']['u'].shape == (60, 1, 3)
+    assert out['nodes'] == [3]
+
+    for i, f in enumerate(frequencies):
+        w = 2 * np.pi * f
+        u = np.linalg.solve(K - w**2 * M + 1j * w * C, F[:, 0])
+        assert abs(out['harmonic']['u'][i, 0, 0] - u[2]) < 1e-10 * abs(u[2])
+
+
+def test_truncated_modes():
+
+    F = np.zeros((3, 3))
+    F[2, 0] = 1000.
+    full = frequency_response(shear_building(), m, F, [0.5], damping=0.05)['harmonic']['u'][0, :, 0]
+    first = frequency_response(shear_building(), m, F, [0.5], damping=0.05, modes=[1])['harmonic']['u'][0, :, 0]
+    rest = frequency_response(shear_building(), m, F, [0.5], damping=0.05, modes=[2, 3])['harmonic']['u'][0, :, 0]
+    q = V[:, 0].dot(F[:, 0]) / (w2[0] - np.pi**2 + 2j * 0.05 * np.sqrt(w2[0]) * np.pi)
+
+    assert np.allclose(first, q * V[:, 0])
+    assert np.allclose(first + rest, full)
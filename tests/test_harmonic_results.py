@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+
+from compas_fea.fea.ansys.ansys import load_to_results
+from compas_fea.structure import HarmonicStep
+from compas_fea.structure import Structure
+from compas_fea.utilities.derived import derived_field
+from compas_fea.utilities.harmonic import harmonic_amplitude
+from compas_fea.utilities.harmonic import harmonic_field
+from compas_fea.utilities.harmonic import harmonic_phase
+from compas_fea.utilities.harmonic import store_harmonic
+
+
+U = np.array([[[3 + 4j, 0, 0], [1j, 2, 0]], [[-1, 0, 1j], [0, 0, 0]]])
+
+
+def test_store_amplitude_and_phase():
+
+    results = {}
+    store_harmonic(results, U, [5, 7], nodes=[4, 9])
+
+    assert results['frequencies'] == [5., 7.]
+    assert results['nodes'] == [4, 9]
+    assert results['harmonic']['u'].dtype == np.complex128
+    assert np.allclose(harmonic_amplitude(results)[0, 0], [5, 0, 0])
+    assert np.allclose(harmonic_phase(results, degrees=True)[:, :, 0], [[np.degrees(np.arctan2(4, 3)), 90], [180, 0]])
+
+
+def test_frequency_fields():
+
+    results = {}
+    store_harmonic(results, U, [5, 7], nodes=[4, 9])
+
+    assert harmonic_field(results, 'ux1') == {4: 3., 9: 0.}
+    assert harmonic_field(results, 'uxa1') == {4: 5., 9: 1.}
+    assert harmonic_field(results, 'uzp2') == {4: np.pi / 2, 9: 0.}
+    assert harmonic_field(results, 'ux3') is None
+    assert derived_field(results, 'uma1') == {4: 5., 9: np.sqrt(5)}
+    assert derived_field(results, 'um2') == {4: 1., 9: 0.}
+
+
+def harmonic_structure(path):
+
+    mdl = Structure(name='harmonic', path=path)
+
+    for i in range(3):
+        mdl.add_node([i, 0, 0])
+
+    mdl.add_set('two', 'node', [1, 2])
+    mdl.add_step(HarmonicStep(name='a', freq_list=[5, 7]))
+    mdl.add_step(HarmonicStep(name='b', freq_list=[5, 7], output_nodes='two'))
+    mdl.steps_order = ['a', 'b']
+
+    return mdl
+
+
+def write(path, name, rows):
+    with open(os.path.join(path, name), 'w') as f:
+        f.write('\n'.join(', '.join(str(i) for i in row) for row in rows) + '\n')
+
+
+def test_ansys_frequency_files(tmp_path):
+
+    mdl = harmonic_structure('{0}/'.format(tmp_path))
+    folder = '{0}/harmonic_output/harmonic_out_0'.format(tmp_path)
+    os.makedirs(folder)
+
+    for i, f in enumerate([5, 7]):
+        write(folder, 'harmonic_disp_real_{0}_Hz.txt'.format(f), [[3, 1, 2, 3 + i], [1, 4, 5, 6], [2, 0, 0, 0]])
+        write(folder, 'harmonic_disp_imag_{0}_Hz.txt'.format(f), [[3, 0.1, 0, 0], [1, 0, 0, 0], [2, 0, 1, 0]])
+
+    load_to_results(mdl, ['u'], 'a')
+    results = mdl.results['a']
+
+    assert results['nodes'] == [0, 1, 2]
+    assert results['frequencies'] == [5., 7.]
+    assert np.allclose(results['harmonic']['u'][:, 0], [[4, 5, 6], [4, 5, 6]])
+    assert np.allclose(results['harmonic']['u'][:, 2], [[1 + 0.1j, 2, 3], [1 + 0.1j, 2, 4]])
+    assert np.allclose(results['harmonic']['u'][:, 1, 1], [1j, 1j])
+
+
+def test_ansys_node_files_with_output_set(tmp_path):
+
+    mdl = harmonic_structure('{0}/'.format(tmp_path))
+    folder = '{0}/harmonic_output/harmonic_out_1'.format(tmp_path)
+    os.makedirs(folder)
+
+    for node, scale in [(1, 1.), (2, 2.)]:
+        write(folder, 'node_real_{0}.txt'.format(node + 1), [[5, scale, 0, 0], [7, 0, scale, 0]])
+        write(folder, 'node_imag_{0}.txt'.format(node + 1), [[5, 0, 0, scale], [7, 0, 0, 0]])
+
+    load_to_results(mdl, ['u'], 'b')
+    results = mdl.results['b']
+
+    assert results['nodes'] == [1, 2]
+    assert results['harmonic']['u'].shape == (2, 2, 3)
+    assert np.allclose(results['harmonic']['u'][0, 1], [2, 0, 2j])
+    assert np.allclose(results['harmonic']['u'][1, 0], [0, 1, 0])
+    assert mdl.get_nodal_results('b', 'uya2') == {1: 1., 2: 2.}
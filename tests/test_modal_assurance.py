@@ -0,0 +1,71 @@
+import numpy as np
+
+from compas_fea.structure import Structure
+from compas_fea.utilities.modal import modal_assurance
+from compas_fea.utilities.modal import modal_assurance_criterion
+from compas_fea.utilities.modal import pair_modes
+
+
+def beam(path, n, order, scale):
+
+    mdl = Structure(name='beam', path=path)
+
+    for i in range(n + 1):
+        mdl.add_node([2. * i / n, 0, 0])
+
+    results = {'nodal': {}, 'frequencies': [float(k) for k in order]}
+
+    for mode, k in enumerate(order, 1):
+        for c in 'xyz':
+            results['nodal']['u{0}{1}'.format(c, mode)] = {
+                i: scale * np.sin(k * np.pi * i / n) if c == 'z' else 0. for i in range(n + 1)}
+
+    mdl.results['modal'] = results
+
+    return mdl
+
+
+def test_identities():
+
+    rng = np.random.default_rng(0)
+    A = rng.normal(size=(4, 10, 3))
+    Q = np.linalg.qr(rng.normal(size=(30, 4)))[0].T
+
+    assert np.allclose(np.diag(modal_assurance_criterion(A, A)), 1)
+    assert np.allclose(modal_assurance_criterion(A, -3.5 * A), modal_assurance_criterion(A, A))
+    assert np.allclose(modal_assurance_criterion(A, A), modal_assurance_criterion(A, A).T)
+    assert np.allclose(modal_assurance_criterion(Q, Q), np.eye(4))
+    assert np.all((modal_assurance_criterion(A, A[::-1]) >= 0) & (modal_assurance_criterion(A, A[::-1]) <= 1 + 1e-12))
+    assert np.allclose(modal_assurance_criterion(np.array([[1, 1j]]), np.array([[1j, -1]])), 1)
+    assert modal_assurance_criterion(np.zeros((1, 3)), np.ones((1, 3)))[0, 0] == 0
+
+
+def test_pair_modes():
+
+    mac = np.array([[0.9, 0.8, 0.], [0.85, 0.1, 0.], [0., 0., 0.2]])
+
+    assert pair_modes(mac) == [(0, 1, 0.8), (1, 0, 0.85), (2, 2, 0.2)]
+    assert pair_modes(mac, threshold=0.5) == [(0, 1, 0.8), (1, 0, 0.85)]
+
+
+def test_different_meshes_and_order(tmp_path):
+
+    a = beam('{0}/'.format(tmp_path), 20, [1, 2, 3, 4], 1.)
+    b = beam('{0}/'.format(tmp_path), 40, [2, 1, 4, 3], -5.)
+    out = modal_assurance(a, 'modal', b)
+
+    assert [p[:2] for p in out['pairs']] == [(1, 2), (2, 1), (3, 4), (4, 3)]
+    assert np.allclose([p[2] for p in out['pairs']], 1)
+    assert np.allclose(out['distances'], 0)
+    assert np.allclose(out['mac'][0], [0, 1, 0, 0], atol=1e-12)
+    assert out['frequencies2'].tolist() == [2., 1., 4., 3.]
+
+
+def test_node_and_mode_selection(tmp_path):
+
+    a = beam('{0}/'.format(tmp_path), 20, [1, 2, 3, 4], 1.)
+    out = modal_assurance(a, 'modal', nodes=[1, 5, 10, 15], modes2=[2, 3])
+
+    assert out['mac'].shape == (4, 2)
+    assert [p[:2] for p in out['pairs']] == [(2, 2), (3, 3)]
+    assert list(out['modes2']) == [2, 3]
@@ -0,0 +1,123 @@
+import os
+
+import compas
+import numpy as np
+
+from compas_fea.fea import opensees
+from compas_fea.fea.ansys.ansys import load_to_results
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import ModalStep
+from compas_fea.structure import Structure
+from compas_fea.utilities.derived import derived_field
+from compas_fea.utilities.modal import mode_shape_field
+from compas_fea.utilities.modal import mode_shapes
+from compas_fea.utilities.modal import pack_mode_shapes
+from compas_fea.utilities.modal import store_mode_shapes
+
+
+shapes = np.array([[[0, 0, 0], [0, 3, 4], [1, 2, 2]], [[0, 0, 0], [1, 0, 0], [0, -1, 0]]], dtype=float)
+
+
+def test_store_and_derive():
+
+    results = {}
+    store_mode_shapes(results, shapes, frequencies=[1.5, 3.], nodes=[10, 11, 12])
+
+    assert results['modes'] == [1, 2]
+    assert results['nodes'] == [10, 11, 12]
+    assert mode_shape_field(results, 'uy1') == {10: 0., 11: 3., 12: 2.}
+    assert mode_shape_field(results, 'uy3') is None
+    assert derived_field(results, 'um1') == {10: 0., 11: 5., 12: 3.}
+    assert derived_field(results, 'ux2') == {10: 0., 11: 1., 12: 0.}
+
+    modes, frequencies, selected, nodes = mode_shapes(results, modes=[2], nodes=[12, 11])
+
+    assert modes.tolist() == [2] and frequencies.tolist() == [3.]
+    assert np.allclose(selected, shapes[[1]][:, [2, 1]])
+    assert nodes == [12, 11]
+
+
+def test_pack_nodal_fields():
+
+    nodal = {}
+
+    for mode in range(3):
+        for i, c in enumerate('xyz'):
+            nodal['u{0}{1}'.format(c, mode)] = {node: mode * 10. + node + i for node in range(3)}
+        nodal['um{0}'.format(mode)] = {node: 0. for node in range(3)}
+
+    results = {'nodal': nodal, 'frequencies': {0: 2., 1: 4.}}
+    pack_mode_shapes(results, base=1)
+
+    assert results['modes'] == [1, 2]
+    assert results['frequencies'] == [2., 4.]
+    assert results['shapes']['u'].shape == (2, 3, 3)
+    assert results['shapes']['u'][1, 2].tolist() == [22., 23., 24.]
+    assert not any(name.startswith('u') for name in results['nodal'])
+
+
+def modal_structure(path):
+
+    mdl = Structure(name='modal', path=path)
+
+    for i in range(3):
+        mdl.add_node([i, 0, 0])
+
+    mdl.add_step(GeneralStep(name='bc'))
+    mdl.add_step(ModalStep(name='modal', modes=2))
+    mdl.steps_order = ['bc', 'modal']
+
+    return mdl
+
+
+def test_opensees_reader(tmp_path, monkeypatch):
+
+    mdl = modal_structure('{0}/'.format(tmp_path))
+    os.makedirs('{0}/modal'.format(tmp_path))
+
+    with open('{0}/modal/modal_frequencies.txt'.format(tmp_path), 'w') as f:
+        f.write('1.5\n3.0\n')
+
+    for mode, shape in enumerate(shapes, 1):
+        with open('{0}/modal/modal_u_mode-{1}.out'.format(tmp_path, mode), 'w') as f:
+            f.write('0.1 0.1 0.1 0.1 0.1 0.1 0.1 0.1 0.1\n' + ' '.join(str(i) for i in shape.ravel()) + '\n')
+
+    opensees.extract_data(mdl, ['u'])
+    results = mdl.results['modal']
+
+    assert results['modes'] == [1, 2]
+    assert results['frequencies'] == [1.5, 3.]
+    assert np.allclose(results['shapes']['u'], shapes)
+    assert mdl.get_nodal_results('modal', 'um1') == {0: 0., 1: 5., 2: 3.}
+
+    monkeypatch.setattr(compas, 'IPY', True)
+    opensees.extract_data(mdl, ['u'])
+    results = mdl.results['modal']
+
+    assert 'shapes' not in results
+    assert results['nodal']['uy1'] == {0: 0., 1: 3., 2: 2.}
+    assert results['nodal']['um1'] == {0: 0., 1: 5., 2: 3.}
+
+
+def test_ansys_reader(tmp_path):
+
+    mdl = modal_structure('{0}/'.format(tmp_path))
+    folder = '{0}/modal_output/modal_out'.format(tmp_path)
+    os.makedirs(folder)
+
+    with open('{0}/modal_freq.txt'.format(folder), 'w') as f:
+        f.write('1, 1.5\n2, 3.0\n')
+
+    for mode, shape in enumerate(shapes, 1):
+        with open('{0}/modal_shape_{1}.txt'.format(folder, mode), 'w') as f:
+            for node in [2, 0, 1]:
+                f.write('{0}, {1}, {2}, {3}\n'.format(node + 1, *shape[node]))
+
+    load_to_results(mdl, ['u', 'f'], 'modal')
+    results = mdl.results['modal']
+
+    assert results['modes'] == [1, 2]
+    assert results['nodes'] == [0, 1, 2]
+    assert results['frequencies'] == [1.5, 3.]
+    assert np.allclose(results['shapes']['u'], shapes)
+    assert mdl.get_nodal_results('modal', 'uz1') == {0: 0., 1: 4., 2: 2.}
@@ -0,0 +1,109 @@
+import numpy as np
+
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PinnedDisplacement
+from compas_fea.structure import PointLoad
+from compas_fea.structure import SpringSection
+from compas_fea.structure import Structure
+from compas_fea.structure import TrussSection
+
+
+P = 10.
+
+
+def braced_frame(path, x, iterations=100):
+
+    mdl = Structure(name='frame', path=path)
+
+    for xyz in [[0, 0, 0], [1, 0, 0], [1.2, 0, 1], [0, 0, 1]]:
+        mdl.add_node(xyz)
+
+    frame = [mdl.add_element(nodes=nodes, type='TrussElement') for nodes in [[0, 3], [1, 2], [3, 2]]]
+    braces = [mdl.add_element(nodes=nodes, type='TrussElement') for nodes in [[0, 2], [1, 3]]]
+    mdl.add_set('frame', 'element', frame)
+    mdl.add_set('braces', 'element', braces)
+    mdl.add_set('base', 'node', [0, 1])
+    mdl.add_set('nodes', 'node', [0, 1, 2, 3])
+    mdl.add_set('top', 'node', [3])
+    mdl.add_material(ElasticIsotropic(name='steel', E=1e5, v=0.3, p=0))
+    mdl.add_material(ElasticIsotropic(name='rod', E=1e5, v=0.3, p=0, compression=False))
+    mdl.add_section(TrussSection(name='sec', A=1.))
+    mdl.add_element_properties(ElementProperties(name='ep_frame', material='steel', section='sec', elset='frame'))
+    mdl.add_element_properties(ElementProperties(name='ep_braces', material='rod', section='sec', elset='braces'))
+    mdl.add_displacement(PinnedDisplacement(name='pin', nodes='base'))
+    mdl.add_displacement(GeneralDisplacement(name='plane', nodes='nodes', y=0))
+    mdl.add_load(PointLoad(name='p', nodes='top', x=x))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'plane']))
+    mdl.add_step(GeneralStep(name='load', loads=['p'], nlgeom=False, iterations=iterations))
+    mdl.steps_order = ['bc', 'load']
+    mdl.analyse_and_extract('native', fields=['u', 'rf', 'sf'], output=False)
+
+    return mdl.results['load']
+
+
+def axial(results, ekey):
+    return results['element']['sf1'][ekey]['ip1_sp0']
+
+
+def test_tension_only_bracing(tmp_path):
+
+    results = braced_frame('{0}/'.format(tmp_path), P)
+
+    assert abs(axial(results, 3) - P * np.sqrt(2.44)) < 1e-6
+    assert axial(results, 4) == 0.
+    assert abs(axial(results, 0)) < 1e-6
+    assert abs(axial(results, 1) + P * np.sqrt(1.04)) < 1e-6
+    assert abs(axial(results, 2) + P) < 1e-6
+    assert abs(results['nodal']['rfx'][0] + 1.2 * P) < 1e-6
+    assert abs(results['nodal']['rfx'][1] - 0.2 * P) < 1e-6
+    assert results['info']['iterations'] >= 2
+    assert results['info']['converged'] is True
+
+
+def test_iteration_limit_not_converged(tmp_path, capsys):
+
+    results = braced_frame('{0}/'.format(tmp_path), P, iterations=1)
+
+    assert results['info']['iterations'] == 1
+    assert results['info']['converged'] is False
+    assert capsys.readouterr().out == ''
+
+
+def test_load_reversal_switches_braces(tmp_path):
+
+    results = braced_frame('{0}/'.format(tmp_path), -P)
+
+    assert axial(results, 3) == 0.
+    assert abs(axial(results, 4) - P * np.sqrt(2)) < 1e-6
+    assert abs(axial(results, 0) + P) < 1e-6
+    assert abs(axial(results, 1)) < 1e-6
+    assert abs(axial(results, 2)) < 1e-6
+
+
+def test_piecewise_linear_spring(tmp_path):
+
+    mdl = Structure(name='spring', path='{0}/'.format(tmp_path))
+    mdl.add_node([0, 0, 0])
+    mdl.add_node([1, 0, 0])
+    mdl.add_set('spring', 'element', [mdl.add_element(nodes=[0, 1], type='SpringElement')])
+    mdl.add_set('a', 'node', [0])
+    mdl.add_set('b', 'node', [1])
+    mdl.add_section(SpringSection(name='sec', forces={'axial': [-100, 0, 100, 200]},
+                                  displacements={'axial': [-1, 0, 0.1, 1]}))
+    mdl.add_element_properties(ElementProperties(name='ep', section='sec', elset='spring'))
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='a'))
+    mdl.add_displacement(GeneralDisplacement(name='guide', nodes='b', y=0, z=0, xx=0, yy=0, zz=0))
+    mdl.add_load(PointLoad(name='p', nodes='b', x=150.))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix', 'guide']))
+    mdl.add_step(GeneralStep(name='load', loads=['p'], nlgeom=False))
+    mdl.steps_order = ['bc', 'load']
+    mdl.analyse_and_extract('native', fields=['u', 'rf', 'spf'], output=False)
+    results = mdl.results['load']
+
+    assert abs(results['nodal']['ux'][1] - (0.1 + 50 * 0.9 / 100)) < 1e-10
+    assert abs(results['element']['spfx'][0]['ip1_sp0'] - 150.) < 1e-8
+    assert abs(results['nodal']['rfx'][0] + 150.) < 1e-8
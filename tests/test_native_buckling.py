@@ -0,0 +1,84 @@
+import numpy as np
+
+from compas_fea.structure import BucklingStep
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PointLoad
+from compas_fea.structure import RectangularSection
+from compas_fea.structure import Structure
+
+
+E = 200e9
+L = 3.
+b, h = 0.1, 0.2
+P = 1000.
+
+
+def column(path, preload=None, modes=3):
+
+    mdl = Structure(name='column', path=path)
+    n = 20
+
+    for i in range(n + 1):
+        mdl.add_node([0, 0, L * i / n])
+
+    ekeys = [mdl.add_element(nodes=[i, i + 1], type='BeamElement', axes={'ex': [1, 0, 0]}) for i in range(n)]
+    mdl.add_set('elements', 'element', ekeys)
+    mdl.add_set('base', 'node', [0])
+    mdl.add_set('top', 'node', [n])
+    mdl.add_material(ElasticIsotropic(name='mat', E=E, v=0.3, p=7850))
+    mdl.add_section(RectangularSection(name='sec', b=b, h=h))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='elements'))
+    mdl.add_displacement(GeneralDisplacement(name='pin', nodes='base', x=0, y=0, z=0, zz=0))
+    mdl.add_displacement(GeneralDisplacement(name='roll', nodes='top', x=0, y=0))
+    mdl.add_load(PointLoad(name='p', nodes='top', z=-P))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'roll']))
+    order = ['bc']
+
+    if preload:
+        mdl.add_load(PointLoad(name='pre', nodes='top', z=-preload))
+        mdl.add_step(GeneralStep(name='pre', loads=['pre']))
+        order.append('pre')
+
+    mdl.add_step(BucklingStep(name='buck', loads=['p'], modes=modes))
+    mdl.steps_order = order + ['buck']
+    mdl.analyse_and_extract(software='native', fields=['u'], output=False)
+
+    return mdl
+
+
+def euler(inertia):
+    return np.pi**2 * E * inertia / L**2
+
+
+def test_euler_loads(tmp_path):
+
+    mdl = column('{0}/'.format(tmp_path))
+    Imin = h * b**3 / 12
+    expected = [euler(Imin), euler(4 * Imin), euler(b * h**3 / 12)]
+
+    assert np.allclose(np.array(mdl.results['buck']['factors']) * P, expected, rtol=1e-3)
+
+
+def test_mode_shapes(tmp_path):
+
+    mdl = column('{0}/'.format(tmp_path))
+    results = mdl.results['buck']
+
+    assert results['modes'] == [1, 2, 3]
+    assert results['shapes']['u'].shape == (3, 21, 3)
+
+    um = mdl.get_nodal_results('buck', 'um1')
+    z = np.array([mdl.node_xyz(i)[2] for i in sorted(um)])
+    shape = np.array([um[i] for i in sorted(um)])
+
+    assert np.allclose(shape / shape.max(), np.sin(np.pi * z / L), atol=1e-3)
+
+
+def test_preload_reduces_factor(tmp_path):
+
+    mdl = column('{0}/'.format(tmp_path), preload=1e6, modes=1)
+
+    assert abs(mdl.results['buck']['factors'][0] * P - (euler(h * b**3 / 12) - 1e6)) < 1e-3 * euler(h * b**3 / 12)
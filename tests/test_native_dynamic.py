@@ -0,0 +1,99 @@
+import numpy as np
+
+from compas_fea.fea.native import read_history
+from compas_fea.structure import Amplitude
+from compas_fea.structure import DynamicStep
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PinnedDisplacement
+from compas_fea.structure import PointLoad
+from compas_fea.structure import Structure
+from compas_fea.structure import TrussSection
+
+
+def oscillator(path, k=1000., m=10., P=100., alpha=0., damping=[0, 0], duration=2., increment=0.001):
+
+    mdl = Structure(name='sdof', path=path)
+    mdl.add_node([0, 0, 0])
+    mdl.add_node([1, 0, 0], mass=m)
+    mdl.add_set('bar', 'element', [mdl.add_element(nodes=[0, 1], type='TrussElement')])
+    mdl.add_set('base', 'node', [0])
+    mdl.add_set('tip', 'node', [1])
+    mdl.add_material(ElasticIsotropic(name='mat', E=k, v=0.3, p=0))
+    mdl.add_section(TrussSection(name='sec', A=1.))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='bar'))
+    mdl.add_displacement(PinnedDisplacement(name='pin', nodes='base'))
+    mdl.add_displacement(GeneralDisplacement(name='roll', nodes='tip', y=0, z=0))
+    mdl.add_load(PointLoad(name='p', nodes='tip', x=P))
+    mdl.add_misc(Amplitude(name='step', values=[[0, 1], [10, 1]]))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'roll']))
+    mdl.add_step(DynamicStep(name='dyn', duration=duration, increment=increment, loads=['p'], amplitude='step',
+                             damping=damping, alpha=alpha))
+    mdl.steps_order = ['bc', 'dyn']
+    mdl.analyse_and_extract(software='native', fields=['u', 's'], output=False)
+
+    return mdl
+
+
+def test_step_load_doubles_static_deflection(tmp_path):
+
+    mdl = oscillator('{0}/'.format(tmp_path))
+    t, U = read_history(mdl, 'dyn')
+
+    assert U.shape == (len(t), 2, 6)
+    assert abs(U[:, 1, 0].max() - 2 * 100. / 1000.) < 1e-4
+    assert np.allclose(U[:, 1, 0], 0.1 * (1 - np.cos(10. * t)), atol=1e-4)
+
+
+def test_final_state_in_results(tmp_path):
+
+    mdl = oscillator('{0}/'.format(tmp_path))
+    t, U = read_history(mdl, 'dyn', mmap_mode=None)
+
+    assert abs(mdl.results['dyn']['nodal']['ux'][1] - U[-1, 1, 0]) < 1e-12
+    assert abs(mdl.results['dyn']['element']['sxx'][0]['ip1_sp0'] - 1000. * U[-1, 1, 0]) < 1e-6
+    assert mdl.results['dyn']['info']['time'][-1] == t[-1]
+
+
+def hht_amplification(alpha, k, m, dt):
+
+    beta = 0.25 * (1 - alpha)**2
+    gamma = 0.5 * (1 - 2 * alpha)
+    L = np.array([[(1 + alpha) * k, 0, m], [1, 0, -beta * dt**2], [0, 1, -gamma * dt]])
+    R = np.array([[alpha * k, 0, 0], [1, dt, dt**2 * (0.5 - beta)], [0, 1, dt * (1 - gamma)]])
+
+    return np.linalg.solve(L, R)
+
+
+def test_hht_alpha_dissipation(tmp_path):
+
+    ptp = {}
+
+    for alpha in [0., -0.1]:
+
+        mdl = oscillator('{0}/{1}/'.format(tmp_path, alpha), alpha=alpha, duration=20., increment=0.1)
+        u = read_history(mdl, 'dyn')[1][:, 1, 0]
+        A = hht_amplification(alpha, 1000., 10., 0.1)
+        x = np.array([-0.1, 0., 10.])
+        w = [x[0]]
+
+        for i in range(len(u) - 1):
+            x = A.dot(x)
+            w.append(x[0])
+
+        assert np.allclose(u, 0.1 + np.array(w), rtol=0, atol=1e-12)
+        ptp[alpha] = np.ptp(u[:50]), np.ptp(u[-50:])
+
+    assert abs(ptp[0.][1] - ptp[0.][0]) < 1e-3
+    assert ptp[-0.1][1] < 0.5 * ptp[-0.1][0]
+
+
+def test_rayleigh_damping_damps_response(tmp_path):
+
+    undamped = read_history(oscillator('{0}/a/'.format(tmp_path)), 'dyn')[1][:, 1, 0]
+    damped = read_history(oscillator('{0}/b/'.format(tmp_path), damping=[1., 0.]), 'dyn')[1][:, 1, 0]
+
+    assert np.ptp(damped[-500:]) < np.ptp(undamped[-500:])
+    assert abs(damped[-1] - 0.1) < 0.02
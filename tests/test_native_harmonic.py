@@ -0,0 +1,79 @@
+import numpy as np
+
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import HarmonicPointLoad
+from compas_fea.structure import HarmonicStep
+from compas_fea.structure import PinnedDisplacement
+from compas_fea.structure import Structure
+from compas_fea.structure import TrussSection
+
+
+k1, k2 = 1000., 500.
+m1, m2 = 10., 5.
+P = 100.
+damping = 0.02
+frequencies = list(np.linspace(0.5, 5., 40))
+
+
+def chain(path, cpus=1):
+
+    mdl = Structure(name='chain', path=path)
+    mdl.add_node([0, 0, 0])
+    mdl.add_node([1, 0, 0], mass=m1)
+    mdl.add_node([2, 0, 0], mass=m2)
+    mdl.add_set('bar1', 'element', [mdl.add_element(nodes=[0, 1], type='TrussElement')])
+    mdl.add_set('bar2', 'element', [mdl.add_element(nodes=[1, 2], type='TrussElement')])
+    mdl.add_set('base', 'node', [0])
+    mdl.add_set('free', 'node', [1, 2])
+    mdl.add_set('tip', 'node', [2])
+    mdl.add_section(TrussSection(name='sec', A=1.))
+
+    for i, k in [(1, k1), (2, k2)]:
+        mdl.add_material(ElasticIsotropic(name='mat{0}'.format(i), E=k, v=0.3, p=0))
+        mdl.add_element_properties(ElementProperties(name='ep{0}'.format(i), material='mat{0}'.format(i), section='sec',
+                                                     elset='bar{0}'.format(i)))
+
+    mdl.add_displacement(PinnedDisplacement(name='pin', nodes='base'))
+    mdl.add_displacement(GeneralDisplacement(name='roll', nodes='free', y=0, z=0))
+    mdl.add_load(HarmonicPointLoad(name='h', nodes='tip', x=P))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'roll']))
+    mdl.add_step(HarmonicStep(name='harm', freq_list=frequencies, loads=['h'], damping=damping))
+    mdl.steps_order = ['bc', 'harm']
+    mdl.write_input_file('native', output=False)
+    mdl.analyse('native', cpus=cpus, output=False)
+    mdl.extract_data('native', fields=['u'], output=False)
+
+    return mdl
+
+
+def direct(f):
+
+    K = np.array([[k1 + k2, -k2], [-k2, k2]]) * (1 + 2j * damping)
+    M = np.diag([m1, m2])
+    w = 2 * np.pi * f
+
+    return np.linalg.solve(K - w**2 * M, [0, P])
+
+
+def test_direct_complex_solve(tmp_path):
+
+    results = chain('{0}/'.format(tmp_path)).results['harm']
+    U = results['harmonic']['u']
+    expected = np.array([direct(f) for f in frequencies])
+
+    assert U.shape == (len(frequencies), 3, 3)
+    assert np.iscomplexobj(U)
+    assert np.allclose(results['frequencies'], frequencies)
+    assert np.allclose(U[:, 1:, 0], expected, rtol=1e-8, atol=1e-12)
+    assert np.allclose(U[:, :, 1:], 0)
+
+
+def test_parallel_frequencies(tmp_path):
+
+    serial = chain('{0}/a/'.format(tmp_path)).results['harm']['harmonic']['u']
+    parallel = chain('{0}/b/'.format(tmp_path), cpus=2).results['harm']['harmonic']['u']
+
+    assert np.allclose(serial, parallel, rtol=1e-12, atol=0)
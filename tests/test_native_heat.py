@@ -0,0 +1,82 @@
+import numpy as np
+
+from compas_fea.fea.native import read_history
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import HeatStep
+from compas_fea.structure import HeatTransfer
+from compas_fea.structure import SolidSection
+from compas_fea.structure import Structure
+from compas_fea.structure import ThermalMaterial
+
+
+rho, c = 8000., 500.
+
+
+def bar(path, n, L=1., k=50.):
+
+    mdl = Structure(name='heat', path=path)
+
+    for x in np.linspace(0, L, n + 1):
+        for y, z in [(0, 0), (0.1, 0), (0.1, 0.1), (0, 0.1)]:
+            mdl.add_node([x, y, z])
+
+    ekeys = [mdl.add_element(nodes=list(range(4 * i, 4 * i + 8)), type='SolidElement') for i in range(n)]
+    mdl.add_set('all', 'element', ekeys)
+    mdl.add_set('left', 'element', [ekeys[0]])
+    mdl.add_set('right', 'element', [ekeys[-1]])
+    mdl.add_material(ThermalMaterial(name='mat', conductivity=[[k, 0]], p=[[rho, 0]], sheat=[[c, 0]]))
+    mdl.add_section(SolidSection(name='sec'))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='all'))
+    mdl.add_step(GeneralStep(name='bc'))
+
+    return mdl
+
+
+def test_steady_state_linear_profile(tmp_path):
+
+    mdl = bar('{0}/'.format(tmp_path), 10)
+    mdl.add_interaction(HeatTransfer(name='h1', amplitude=None, interface='left', sink_temp=400., film_coef=1e9,
+                                     ambient_temp=0, emissivity=0))
+    mdl.add_interaction(HeatTransfer(name='h2', amplitude=None, interface='right', sink_temp=300., film_coef=1e9,
+                                     ambient_temp=0, emissivity=0))
+    mdl.add_step(HeatStep(name='heat', interaction=['h1', 'h2'], steady=True))
+    mdl.steps_order = ['bc', 'heat']
+    mdl.analyse_and_extract('native', fields=['nt'], output=False)
+    nt = mdl.results['heat']['nodal']['nt']
+    T = np.array([nt[4 * i] for i in range(11)])
+
+    assert np.allclose(T[1:-1], np.linspace(400., 300., 9), atol=1e-3)
+    assert all(abs(nt[4 * i + j] - T[i]) < 1e-6 for i in range(11) for j in range(4))
+
+
+def test_lumped_transient_film(tmp_path):
+
+    mdl = bar('{0}/'.format(tmp_path), 2, L=0.1, k=1e4)
+    mdl.add_interaction(HeatTransfer(name='h', amplitude=None, interface='all', sink_temp=20., film_coef=100.,
+                                     ambient_temp=0, emissivity=0))
+    mdl.add_step(HeatStep(name='heat', interaction='h', temp0=600., increments=200, duration=2000., dTmax=None))
+    mdl.steps_order = ['bc', 'heat']
+    mdl.analyse_and_extract('native', fields=['nt'], output=False)
+    tau = rho * c * 0.001 / (100. * 0.06)
+    t, H = read_history(mdl, 'heat')
+
+    assert H.shape == (201, 12)
+    assert abs(mdl.results['heat']['nodal']['nt'][0] - (20 + 580 * np.exp(-2000 / tau))) < 1.
+    assert np.all(np.diff(H[:, 0]) < 0)
+
+
+def test_temperature_increment_limit(tmp_path):
+
+    mdl = bar('{0}/'.format(tmp_path), 2, L=0.1, k=1e4)
+    mdl.add_interaction(HeatTransfer(name='h', amplitude=None, interface='all', sink_temp=20., film_coef=100.,
+                                     ambient_temp=0, emissivity=0))
+    mdl.add_step(HeatStep(name='heat', interaction='h', temp0=600., increments=200, duration=2000., dTmax=1.))
+    mdl.steps_order = ['bc', 'heat']
+    mdl.analyse_and_extract('native', fields=['nt'], output=False)
+    t, H = read_history(mdl, 'heat')
+
+    assert len(t) > 201 and len(H) == len(t)
+    assert np.max(np.abs(np.diff(H, axis=0))) <= 1.
+    assert np.allclose(H[-1], [mdl.results['heat']['nodal']['nt'][i] for i in range(12)], rtol=0, atol=1e-12)
+    assert abs(t[-1] - 2000.) < 1e-9
@@ -0,0 +1,115 @@
+import numpy as np
+
+from scipy.optimize import brentq
+
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PinnedDisplacement
+from compas_fea.structure import PointLoad
+from compas_fea.structure import PrestressLoad
+from compas_fea.structure import RectangularSection
+from compas_fea.structure import Structure
+from compas_fea.structure import TieSection
+
+
+EA = 1e5
+P = 500.
+
+
+def cable(path, N0, increments=10, iterations=30, output=False):
+
+    mdl = Structure(name='cable', path=path)
+
+    for x in [-1, 0, 1]:
+        mdl.add_node([x, 0, 0])
+
+    mdl.add_set('cable', 'element', [mdl.add_element(nodes=[0, 1], type='TieElement'),
+                                     mdl.add_element(nodes=[1, 2], type='TieElement')])
+    mdl.add_set('ends', 'node', [0, 2])
+    mdl.add_set('middle', 'node', [1])
+    mdl.add_material(ElasticIsotropic(name='mat', E=EA, v=0.3, p=0))
+    mdl.add_section(TieSection(name='sec', A=1.))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='cable'))
+    mdl.add_displacement(PinnedDisplacement(name='pin', nodes='ends'))
+    mdl.add_displacement(GeneralDisplacement(name='plane', nodes='middle', y=0))
+    mdl.add_load(PrestressLoad(name='pre', elements='cable', sxx=N0))
+    mdl.add_load(PointLoad(name='p', nodes='middle', z=-P))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'plane']))
+    mdl.add_step(GeneralStep(name='pre', loads=['pre'], increments=1, tolerance=1e-8, iterations=30))
+    mdl.add_step(GeneralStep(name='load', loads=['p'], increments=increments, tolerance=1e-8, iterations=iterations))
+    mdl.steps_order = ['bc', 'pre', 'load']
+    mdl.analyse_and_extract('native', fields=['u', 'rf', 'sf'], output=output)
+
+    return mdl
+
+
+def test_prestressed_cable(tmp_path):
+
+    N0 = 100.
+    mdl = cable('{0}/'.format(tmp_path), N0)
+
+    def equilibrium(w):
+        L = np.sqrt(1 + w**2)
+        return 2 * (N0 + EA * (L - 1)) * w / L - P
+
+    w = brentq(equilibrium, 1e-9, 1.)
+    N = N0 + EA * (np.sqrt(1 + w**2) - 1)
+    results = mdl.results['load']
+
+    assert abs(results['nodal']['uz'][1] + w) < 1e-8
+    assert abs(results['element']['sf1'][0]['ip1_sp0'] - N) < 1e-6 * N
+    assert abs(results['nodal']['rfz'][0] - P / 2) < 1e-6 * P
+    assert abs(results['nodal']['rfx'][0] + N / np.sqrt(1 + w**2)) < 1e-6 * N
+    assert results['info']['converged']
+    assert results['info']['factor'] == 1.
+    assert results['info']['nlgeom'] is True
+    assert all(i['residual'] <= 1e-8 for i in results['info']['convergence'])
+    assert mdl.results['pre']['element']['sf1'][0]['ip1_sp0'] == N0
+
+
+def test_increments_grow_after_cutback(tmp_path):
+
+    factors = [i['factor'] for i in cable('{0}/'.format(tmp_path), 10., increments=4, iterations=8).results['load']['info']['convergence']]
+
+    assert factors[0] < 0.25
+    assert np.allclose(np.diff(factors)[:3], 0.25)
+    assert factors[-1] == 1.
+
+
+def test_slack_cable_not_converged(tmp_path, capsys):
+
+    results = cable('{0}/'.format(tmp_path), 0.).results['load']
+
+    assert results['info']['converged'] is False
+    assert results['info']['factor'] == 0.
+    assert np.isfinite(results['nodal']['uz'][1])
+    assert capsys.readouterr().out == ''
+
+    cable('{0}/'.format(tmp_path), 0., output=True)
+    assert capsys.readouterr().out.count('stopped at load factor 0, singular tangent stiffness') == 1
+
+
+def test_nlgeom_beams_analysed_linearly(tmp_path, capsys):
+
+    mdl = Structure(name='beam', path='{0}/'.format(tmp_path))
+    mdl.add_node([0, 0, 0])
+    mdl.add_node([1, 0, 0])
+    mdl.add_set('beam', 'element', [mdl.add_element(nodes=[0, 1], type='BeamElement', axes={'ex': [0, 1, 0]})])
+    mdl.add_set('base', 'node', [0])
+    mdl.add_set('tip', 'node', [1])
+    mdl.add_material(ElasticIsotropic(name='mat', E=EA, v=0.3, p=0))
+    mdl.add_section(RectangularSection(name='sec', b=1., h=1.))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='beam'))
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='base'))
+    mdl.add_load(PointLoad(name='p', nodes='tip', z=-1.))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix']))
+    mdl.add_step(GeneralStep(name='load', loads=['p']))
+    mdl.steps_order = ['bc', 'load']
+    mdl.analyse_and_extract('native', fields=['u'], output=True)
+
+    assert mdl.results['load']['info']['nlgeom'] is False
+    assert 'step load analysed linearly' in capsys.readouterr().out
+    assert abs(mdl.results['load']['nodal']['uz'][1] + 4. / EA) < 1e-12
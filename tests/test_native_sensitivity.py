@@ -0,0 +1,116 @@
+import numpy as np
+
+from compas_fea.fea.native import sensitivities
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import GravityLoad
+from compas_fea.structure import PipeSection
+from compas_fea.structure import PointLoad
+from compas_fea.structure import RectangularSection
+from compas_fea.structure import ShellSection
+from compas_fea.structure import Structure
+
+
+def plate(path, ta=0.01, tb=0.02):
+
+    mdl = Structure(name='plate', path=path)
+    n = 6
+
+    for j in range(n + 1):
+        for i in range(n + 1):
+            mdl.add_node([i / n, j / n, 0])
+
+    A, B = [], []
+
+    for j in range(n):
+        for i in range(n):
+            a = j * (n + 1) + i
+            (A if i < 3 else B).append(mdl.add_element(nodes=[a, a + 1, a + n + 2, a + n + 1], type='ShellElement'))
+
+    mdl.add_set('A', 'element', A)
+    mdl.add_set('B', 'element', B)
+    mdl.add_set('edge', 'node', [j * (n + 1) for j in range(n + 1)])
+    mdl.add_set('tip', 'node', [j * (n + 1) + n for j in range(n + 1)])
+    mdl.add_material(ElasticIsotropic(name='mat', E=200e9, v=0.3, p=7850))
+    mdl.add_section(ShellSection(name='sa', t=ta))
+    mdl.add_section(ShellSection(name='sb', t=tb))
+    mdl.add_element_properties(ElementProperties(name='ea', material='mat', section='sa', elset='A'))
+    mdl.add_element_properties(ElementProperties(name='eb', material='mat', section='sb', elset='B'))
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='edge'))
+    mdl.add_load(PointLoad(name='p', nodes='tip', z=-100))
+    mdl.add_load(GravityLoad(name='g', elements=['A', 'B']))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix']))
+    mdl.add_step(GeneralStep(name='load', loads=['p', 'g'], nlgeom=False))
+    mdl.steps_order = ['bc', 'load']
+
+    return mdl
+
+
+def frame(path, b=0.1, h=0.2, r=0.05, t=0.005):
+
+    mdl = Structure(name='frame', path=path)
+
+    for xyz in [[0, 0, 0], [0, 0, 1], [1, 0, 1], [1, 0, 2]]:
+        mdl.add_node(xyz)
+
+    ekeys = [mdl.add_element(nodes=[i, i + 1], type='BeamElement', axes={'ex': [0, 1, 0]}) for i in range(3)]
+    mdl.add_set('rect', 'element', ekeys[:2])
+    mdl.add_set('pipe', 'element', ekeys[2:])
+    mdl.add_set('base', 'node', [0])
+    mdl.add_set('top', 'node', [3])
+    mdl.add_material(ElasticIsotropic(name='mat', E=200e9, v=0.3, p=7850))
+    mdl.add_section(RectangularSection(name='rect', b=b, h=h))
+    mdl.add_section(PipeSection(name='pipe', r=r, t=t))
+    mdl.add_element_properties(ElementProperties(name='er', material='mat', section='rect', elset='rect'))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='pipe', elset='pipe'))
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='base'))
+    mdl.add_load(PointLoad(name='p', nodes='top', x=1000, y=500, z=-2000))
+    mdl.add_load(GravityLoad(name='g', elements=['rect', 'pipe']))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix']))
+    mdl.add_step(GeneralStep(name='load', loads=['p', 'g'], nlgeom=False))
+    mdl.steps_order = ['bc', 'load']
+
+    return mdl
+
+
+def check(builder, path, design, parameters, responses, rtol):
+
+    out = sensitivities(builder(path, **design), 'load', responses, [i[:2] for i in parameters])
+
+    for section, name, key in parameters:
+        step = 1e-6 * design[key]
+        plus, minus = dict(design), dict(design)
+        plus[key] += step
+        minus[key] -= step
+        fp = sensitivities(builder(path, **plus), 'load', responses, [])['responses']
+        fm = sensitivities(builder(path, **minus), 'load', responses, [])['responses']
+        gradient = out['gradients']['{0}.{1}'.format(section, name)].sum(axis=1)
+
+        assert np.allclose(gradient, (np.array(fp) - np.array(fm)) / (2 * step), rtol=rtol)
+
+
+def test_shell_thickness_gradients(tmp_path):
+
+    responses = ['compliance', ('u', 48, 'z'), ('s', 2, 'sxx', 'ip1_sp1')]
+    parameters = [('sa', 't', 'ta'), ('sb', 't', 'tb')]
+    check(plate, '{0}/'.format(tmp_path), {'ta': 0.01, 'tb': 0.02}, parameters, responses, 1e-4)
+
+
+def test_beam_section_gradients(tmp_path):
+
+    responses = ['compliance', ('u', 3, 'y'), ('s', 1, 'sm1', 'ip1_sp0')]
+    design = {'b': 0.1, 'h': 0.2, 'r': 0.05, 't': 0.005}
+    parameters = [('rect', 'b', 'b'), ('rect', 'h', 'h'), ('pipe', 'r', 'r'), ('pipe', 't', 't')]
+    check(frame, '{0}/'.format(tmp_path), design, parameters, responses, 1e-6)
+
+
+def test_element_gradients_cover_section(tmp_path):
+
+    mdl = plate('{0}/'.format(tmp_path))
+    out = sensitivities(mdl, 'load', ['compliance'], [('sa', 't')])
+
+    assert sorted(out['elements']['sa.t']) == sorted(mdl.sets['A'].selection)
+    assert out['gradients']['sa.t'].shape == (1, 18)
+    assert np.all(out['gradients']['sa.t'] < 0)
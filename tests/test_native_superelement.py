@@ -0,0 +1,90 @@
+import numpy as np
+
+from compas_fea.fea.native import superelement
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import GravityLoad
+from compas_fea.structure import PointLoad
+from compas_fea.structure import ShellSection
+from compas_fea.structure import Structure
+from compas_fea.structure import Superelement
+
+
+n = 10
+
+
+def plate(path, t=0.01, condensed=True):
+
+    mdl = Structure(name='plate', path=path)
+
+    for j in range(n + 1):
+        for i in range(n + 1):
+            mdl.add_node([i / n, j / n, 0])
+
+    A, B = [], []
+
+    for j in range(n):
+        for i in range(n):
+            a = j * (n + 1) + i
+            ekey = mdl.add_element(nodes=[a, a + 1, a + n + 2, a + n + 1], type='ShellElement')
+            (A if i < n // 2 else B).append(ekey)
+
+    mdl.add_set('A', 'element', A)
+    mdl.add_set('B', 'element', B)
+    mdl.add_set('edge', 'node', [j * (n + 1) for j in range(n + 1)])
+    mdl.add_set('tip', 'node', [j * (n + 1) + n for j in range(n + 1)])
+    mdl.add_material(ElasticIsotropic(name='mat', E=200e9, v=0.3, p=7850))
+    mdl.add_section(ShellSection(name='sa', t=0.01))
+    mdl.add_section(ShellSection(name='sb', t=t))
+    mdl.add_element_properties(ElementProperties(name='ea', material='mat', section='sa', elset='A'))
+    mdl.add_element_properties(ElementProperties(name='eb', material='mat', section='sb', elset='B'))
+
+    if condensed:
+        mdl.add_misc(Superelement(name='core', elements='A'))
+
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='edge'))
+    mdl.add_load(PointLoad(name='p', nodes='tip', z=-100))
+    mdl.add_load(GravityLoad(name='g', elements=['A', 'B']))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix']))
+    mdl.add_step(GeneralStep(name='load', loads=['p', 'g'], nlgeom=False))
+    mdl.steps_order = ['bc', 'load']
+    mdl.analyse_and_extract('native', fields=['u', 'rf', 's'], output=False)
+
+    return mdl.results['load']
+
+
+def compare(results, full):
+
+    for field in ['ux', 'uy', 'uz']:
+        a = np.array([results['nodal'][field][i] for i in range((n + 1)**2)])
+        b = np.array([full['nodal'][field][i] for i in range((n + 1)**2)])
+        assert np.allclose(a, b, rtol=1e-8, atol=1e-12 * np.abs(b).max())
+
+    assert abs(sum(results['nodal']['rfz'].values()) - sum(full['nodal']['rfz'].values())) < 1e-6
+
+    for ekey in [0, n // 2, n * n - 1]:
+        for ip, value in full['element']['smises'][ekey].items():
+            assert abs(results['element']['smises'][ekey][ip] - value) < 1e-6 * abs(value) + 1.
+
+
+def test_superelement_equals_full_solve(tmp_path):
+
+    superelement.clear_cache()
+    full = plate('{0}/a/'.format(tmp_path), condensed=False)
+    results = plate('{0}/b/'.format(tmp_path))
+
+    compare(results, full)
+    assert len(superelement._cache) == 1
+
+
+def test_cache_reused_when_rest_changes(tmp_path):
+
+    superelement.clear_cache()
+    plate('{0}/a/'.format(tmp_path))
+    full = plate('{0}/b/'.format(tmp_path), t=0.02, condensed=False)
+    results = plate('{0}/c/'.format(tmp_path), t=0.02)
+
+    compare(results, full)
+    assert len(superelement._cache) == 1
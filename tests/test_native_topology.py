@@ -0,0 +1,84 @@
+import numpy as np
+
+from compas_fea.fea.native import topology_optimisation
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PointLoad
+from compas_fea.structure import ShellSection
+from compas_fea.structure import Structure
+
+
+nx, ny = 12, 6
+
+
+def cantilever(path):
+
+    mdl = Structure(name='topology', path=path)
+
+    for j in range(ny + 1):
+        for i in range(nx + 1):
+            mdl.add_node([i / ny, j / ny, 0])
+
+    ekeys = []
+
+    for j in range(ny):
+        for i in range(nx):
+            a = j * (nx + 1) + i
+            ekeys.append(mdl.add_element(nodes=[a, a + 1, a + nx + 2, a + nx + 1], type='ShellElement'))
+
+    mdl.add_set('plate', 'element', ekeys)
+    mdl.add_set('left', 'element', [ekey for ekey in ekeys if ekey % nx < nx // 2])
+    mdl.add_set('nodes', 'node', list(range(mdl.node_count())))
+    mdl.add_set('edge', 'node', [j * (nx + 1) for j in range(ny + 1)])
+    mdl.add_set('tip', 'node', [(ny // 2) * (nx + 1) + nx])
+    mdl.add_material(ElasticIsotropic(name='mat', E=1., v=0.3, p=0))
+    mdl.add_section(ShellSection(name='sec', t=1.))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='plate'))
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='edge'))
+    mdl.add_displacement(GeneralDisplacement(name='plane', nodes='nodes', z=0, xx=0, yy=0))
+    mdl.add_load(PointLoad(name='p', nodes='tip', y=-1.))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix', 'plane']))
+    mdl.add_step(GeneralStep(name='load', loads=['p'], nlgeom=False))
+    mdl.steps_order = ['bc', 'load']
+
+    return mdl
+
+
+def optimise(path, method, elements='plate'):
+    return topology_optimisation(cantilever(path), 'load', elements, volume_fraction=0.4, iterations=60, method=method,
+                                 output=False)
+
+
+def check(out):
+
+    history = out['history']
+
+    assert abs(history[-1]['volume'] - 0.4) < 1e-3
+    assert history[-1]['change'] < 0.01
+    assert history[-1]['compliance'] < 0.5 * history[0]['compliance']
+    assert np.all((out['densities'] > 0) & (out['densities'] <= 1))
+    assert sorted(out['elements']) == list(range(nx * ny))
+
+
+def test_optimality_criteria(tmp_path):
+    check(optimise('{0}/'.format(tmp_path), 'oc'))
+
+
+def test_method_of_moving_asymptotes(tmp_path):
+
+    mma = optimise('{0}/a/'.format(tmp_path), 'mma')
+    oc = optimise('{0}/b/'.format(tmp_path), 'oc')
+
+    check(mma)
+    assert abs(mma['history'][-1]['compliance'] / oc['history'][-1]['compliance'] - 1) < 0.05
+
+
+def test_design_domain_subset(tmp_path):
+
+    out = optimise('{0}/'.format(tmp_path), 'oc', elements='left')
+
+    assert sorted(out['elements']) == [ekey for ekey in range(nx * ny) if ekey % nx < nx // 2]
+    assert abs(out['history'][-1]['volume'] - 0.4) < 1e-3
@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+
+from compas_fea.fea import Writer
+from compas_fea.fea.ansys.writing import write_static_results_from_ansys_rst
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import ModalStep
+from compas_fea.structure import PointLoad
+from compas_fea.structure import RectangularSection
+from compas_fea.structure import Structure
+
+
+def column(path, n=10):
+
+    mdl = Structure(name='column', path=path)
+
+    for i in range(n + 1):
+        mdl.add_node([0, 0, 3. * i / n])
+
+    elements = [mdl.add_element(nodes=[i, i + 1], type='BeamElement', axes={'ex': [1, 0, 0]}) for i in range(n)]
+    mdl.add_set('elements', 'element', elements)
+    mdl.add_set('base', 'node', [0])
+    mdl.add_set('top', 'node', [n])
+    mdl.add_set('sensors', 'node', [10, 5])
+    mdl.add_set('crit', 'element', [0, 1])
+    mdl.add_material(ElasticIsotropic(name='mat', E=200e9, v=0.3, p=7850))
+    mdl.add_section(RectangularSection(name='sec', b=0.1, h=0.2))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='elements'))
+    mdl.add_displacement(GeneralDisplacement(name='fixed', nodes='base', x=0, y=0, z=0, xx=0, yy=0, zz=0))
+    mdl.add_load(PointLoad(name='p', nodes='top', x=1000.))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fixed']))
+    mdl.add_step(GeneralStep(name='all', loads=['p'], nlgeom=False))
+    mdl.add_step(GeneralStep(name='scoped', loads=['p'], nlgeom=False, output_nodes='sensors', output_elements=['crit']))
+    mdl.steps_order = ['bc', 'all', 'scoped']
+
+    return mdl
+
+
+def test_output_selection(tmp_path):
+
+    mdl = column('{0}/'.format(tmp_path))
+    mdl.add_step(ModalStep(name='modal', modes=2, output_nodes=['sensors', 'top']))
+
+    assert mdl.output_selection('all') == (None, None)
+    assert mdl.output_selection('scoped') == ([5, 10], [0, 1])
+    assert mdl.output_selection('modal') == ([5, 10], None)
+
+
+def test_native_scoped_results(tmp_path, capsys):
+
+    mdl = column('{0}/'.format(tmp_path))
+    mdl.analyse_and_extract(software='native', fields=['u', 'sf'], output=False)
+    assert capsys.readouterr().out == ''
+    full = mdl.results['all']
+    scoped = mdl.results['scoped']
+
+    assert sorted(scoped['nodal']['ux']) == [5, 10]
+    assert sorted(scoped['element']['sf1']) == [0, 1]
+    assert len(full['nodal']['ux']) == 11
+
+    for node in [5, 10]:
+        assert abs(scoped['nodal']['ux'][node] - full['nodal']['ux'][node]) < 1e-15
+
+    tip = 1000. * 3.**3 / (3 * 200e9 * 0.2 * 0.1**3 / 12)
+    assert abs(abs(scoped['nodal']['ux'][10]) - tip) < 1e-6 * tip
+
+    values = mdl.get_nodal_results('scoped', 'um', nodes=[0, 5, 10])
+    assert values[0] is None
+    assert values[10] == abs(scoped['nodal']['ux'][10])
+    assert list(mdl.get_nodal_results('scoped', 'um')) == list(scoped['nodal']['um'])
+
+    entry = mdl.processed_results('scoped', 'um')
+    assert np.allclose(entry['dU'][[0, 1, 2, 3, 4, 6, 7, 8, 9]], 0)
+    assert np.isnan(entry['vn'][:5]).sum() == 5
+    assert abs(entry['vn'][10] - tip) < 1e-6 * tip
+
+
+def test_written_output_requests(tmp_path):
+
+    mdl = column('{0}/'.format(tmp_path))
+    mdl.fields = ['u', 'sf']
+
+    for software in ['abaqus', 'opensees']:
+        filename = '{0}/{1}.txt'.format(tmp_path, software)
+
+        with Writer(structure=mdl, software=software, filename=filename, fields=['u', 'sf'], ndof=6) as writer:
+            writer.write_steps()
+
+        with open(filename) as f:
+            text = f.read()
+
+        if software == 'abaqus':
+            assert '*NODE OUTPUT, NSET=sensors' in text
+            assert '*ELEMENT OUTPUT, ELSET=crit' in text
+        else:
+            assert '-node 6 11 -dof' in text
+            assert '-ele 1 2 ' in text
+
+
+def test_ansys_node_mask(tmp_path):
+
+    mdl = column('{0}/'.format(tmp_path))
+    mdl.add_set('few', 'node', [2, 3, 4, 6])
+    mdl.steps['scoped'].output_nodes = 'few'
+
+    write_static_results_from_ansys_rst(mdl, ['u'], step_index=1)
+    write_static_results_from_ansys_rst(mdl, ['u'], step_index=2)
+
+    with open(os.path.join(mdl.path, mdl.name + '_extract.txt')) as f:
+        text = f.read()
+
+    unscoped, scoped = text.split('*cfclose', 1)
+
+    assert 'NSEL' not in unscoped and '*VMASK' not in unscoped
+    assert 'NSEL, A, NODE, , 3, 5, 1' in scoped
+    assert 'NSEL, A, NODE, , 7, 7, 1' in scoped
+    assert scoped.index('*VMASK, nds_mask(1)') < scoped.index('*vwrite')
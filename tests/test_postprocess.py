@@ -0,0 +1,59 @@
+import numpy as np
+
+from compas_fea.utilities.functions import colorbar
+from compas_fea.utilities.functions import postprocess
+from compas_fea.utilities.functions import postprocess_arrays
+
+
+nodes = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+elements = [[0, 1, 2], [0, 2, 3]]
+ux, uy, uz = [0, 0.1, 0.2, 0], [0, 0, 0.1, 0.1], [0, 0, 0, -0.5]
+
+
+def test_nodal_arrays():
+
+    toc, U, cnodes, fabs, fscaled, celements, eabs = postprocess_arrays(
+        nodes, elements, ux, uy, uz, [-2., 0., 1., 0.5], 'nodal', 2., [None, None], 255, 'mean', 'mean')
+
+    assert np.allclose(U, np.array(nodes) + 2 * np.column_stack([ux, uy, uz]))
+    assert U.dtype == np.float64 and U.flags['C_CONTIGUOUS']
+    assert fabs == 2.
+    assert np.allclose(fscaled, [-1., 0., 0.5, 0.25])
+    assert cnodes.dtype == np.uint8 and cnodes.shape == (4, 3)
+    assert cnodes.tolist() == [[int(i) for i in colorbar(f, input='float', type=255)] for f in fscaled]
+    assert celements.shape == (0, 3) and eabs == 0
+
+
+def test_element_arrays_and_limits():
+
+    data = {0: {'ip1_sp1': 4., 'ip2_sp1': 2.}, 1: {'ip1_sp1': -1.}}
+    _, _, cnodes, fabs, fscaled, celements, eabs = postprocess_arrays(
+        nodes, np.array(elements), ux, uy, uz, data, 'element', 1., [None, 2.], 1, 'max', 'mean')
+
+    assert eabs == 2.
+    assert np.allclose(fscaled, [0.75, 1., 0.75, -0.5])
+    assert celements.dtype == np.float32
+    assert np.allclose(celements, colorbar(np.array([[1.], [-0.5]]), input='array', type=1))
+
+
+def test_buffers_and_lists():
+
+    args = (nodes, elements, ux, uy, uz, [-2., 0., 1., 0.5], 'nodal', 2., [None, None], 255, 'mean', 'mean')
+    _, U, cnodes, _, fscaled, _, _ = postprocess_arrays(*args)
+    _, Ub, cnodesb, _, fscaledb, _, _ = postprocess_arrays(*args, buffers=True)
+    _, Ul, cnodesl, _, fscaledl, _, _ = postprocess(*args)
+
+    assert np.allclose(np.frombuffer(Ub, dtype=np.float32).reshape(-1, 3), U)
+    assert np.frombuffer(cnodesb, dtype=np.uint8).reshape(-1, 3).tolist() == cnodes.tolist()
+    assert np.allclose(np.frombuffer(fscaledb, dtype=np.float32), fscaled)
+    assert Ul == U.tolist() and cnodesl == cnodes.tolist() and fscaledl == fscaled.tolist()
+
+
+def test_missing_nodal_data_is_grey():
+
+    _, _, cnodes, fabs, fscaled, _, _ = postprocess_arrays(
+        nodes, elements, ux, uy, uz, [1., None, -3., 2.], 'nodal', 1., [None, None], 255, 'mean', 'mean')
+
+    assert fabs == 3.
+    assert np.isnan(fscaled[1])
+    assert cnodes[1].tolist() == [127, 127, 127]
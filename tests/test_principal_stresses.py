@@ -0,0 +1,74 @@
+import numpy as np
+
+from compas_fea.utilities.functions import principal_stresses
+from compas_fea.utilities.functions import principal_values_2d
+from compas_fea.utilities.functions import principal_values_3d
+
+
+def test_principal_values_2d():
+
+    rng = np.random.default_rng(0)
+    sxx, syy, sxy = rng.normal(size=(3, 1000))
+    sxx[:10], syy[:10], sxy[:10] = 2., 2., 0.
+    w, v = principal_values_2d(sxx, syy, sxy)
+    A = np.stack([np.stack([sxx, sxy], -1), np.stack([sxy, syy], -1)], -2)
+
+    assert np.allclose(w, np.linalg.eigvalsh(A)[:, ::-1])
+    assert np.allclose(np.einsum('eij,ejk->eik', A, v), v * w[:, None, :])
+    assert np.allclose(np.einsum('eji,ejk->eik', v, v), np.eye(2))
+
+
+def test_principal_values_3d():
+
+    rng = np.random.default_rng(1)
+    A = rng.normal(size=(2000, 3, 3))
+    A = A + A.transpose(0, 2, 1)
+    R = np.linalg.qr(rng.normal(size=(3, 3)))[0]
+    A[:100] = np.diag([1., 1., 2.])
+    A[100:200] = 3 * np.eye(3)
+    A[200:300] = np.diag([5., 2., 2.])
+    A[300:400] = R.dot(np.diag([1., 1., -2.])).dot(R.T)
+    w, v = principal_values_3d(A[:, 0, 0], A[:, 1, 1], A[:, 2, 2], A[:, 0, 1], A[:, 1, 2], A[:, 0, 2])
+
+    assert np.allclose(w, np.linalg.eigvalsh(A)[:, ::-1], atol=1e-10)
+    assert np.allclose(np.einsum('eij,ejk->eik', A, v), v * w[:, None, :], atol=1e-8)
+    assert np.allclose(np.einsum('eji,ejk->eik', v, v), np.eye(3), atol=1e-8)
+
+
+def test_shells_and_solids():
+
+    rng = np.random.default_rng(2)
+    data = {}
+
+    for ekey in range(20):
+        for name in ['sxx', 'syy', 'sxy']:
+            data.setdefault(name, {})[ekey] = {'ip{0}_{1}'.format(i, sp): float(rng.normal())
+                                               for i in range(1, 5) for sp in ['sp1', 'sp5']}
+
+    for ekey in range(20, 30):
+        for name in ['sxx', 'syy', 'szz', 'sxy', 'syz', 'sxz']:
+            data.setdefault(name, {})[ekey] = {'ip{0}_sp0'.format(i): float(rng.normal()) for i in range(1, 9)}
+
+    spr, e = principal_stresses(data)
+
+    def mean(name, ekeys, sp):
+        return np.array([np.mean([v for k, v in data[name][i].items() if k.endswith(sp)]) for i in ekeys])
+
+    shells = range(20)
+    S = {name: mean(name, shells, 'sp5') for name in ['sxx', 'syy', 'sxy']}
+    T = np.stack([np.stack([S['sxx'], S['sxy']], -1), np.stack([S['sxy'], S['syy']], -1)], -2)
+    w = np.linalg.eigvalsh(T)[:, ::-1]
+
+    assert np.allclose(spr['sp5']['max'][:20], w[:, 0])
+    assert np.allclose(spr['sp5']['min'][:20], w[:, 1])
+    assert np.allclose(spr['sp5']['max'][20:], 0)
+
+    solids = range(20, 30)
+    S = {name: mean(name, solids, 'sp0') for name in ['sxx', 'syy', 'szz', 'sxy', 'syz', 'sxz']}
+    T = np.stack([np.stack([S['sxx'], S['sxy'], S['sxz']], -1), np.stack([S['sxy'], S['syy'], S['syz']], -1),
+                  np.stack([S['sxz'], S['syz'], S['szz']], -1)], -2)
+    w = np.linalg.eigvalsh(T)[:, ::-1]
+
+    assert np.allclose(np.stack([spr['sp0'][k][20:] for k in ['max', 'mid', 'min']], 1), w)
+    assert e['sp0']['max'].shape == (3, 30)
+    assert np.allclose(np.linalg.norm(e['sp0']['max'][:, 20:], axis=0), 1)
@@ -0,0 +1,94 @@
+import numpy as np
+
+from scipy.sparse import csr_matrix
+
+from compas_fea.utilities.functions import process_data
+
+
+def reference(data, iptype, nodal, elements, n):
+
+    reduce = {'mean': np.mean, 'max': max, 'min': min, 'abs': lambda values: max(abs(i) for i in values)}
+    ve = np.zeros(len(elements))
+
+    for ekey, item in data.items():
+        values = [i for i in item.values() if i is not None]
+        if values:
+            ve[int(ekey)] = reduce[iptype](values)
+
+    vn = np.zeros(n)
+
+    for node in range(n):
+        values = [ve[ekey] for ekey, nodes in enumerate(elements) if node in nodes]
+        if values:
+            vn[node] = reduce[nodal](values)
+
+    return vn, ve
+
+
+def test_hand_example():
+
+    elements = [[0, 1], [1, 2, 3]]
+    data = {0: {'ip1_sp1': 1., 'ip2_sp1': -4.}, 1: {'ip1_sp1': 2., 'ip2_sp1': None, 'ip3_sp1': 6.}}
+
+    vn, ve = process_data(data, 'element', 'abs', 'mean', elements, 5)
+    assert np.allclose(ve[:, 0], [4., 6.])
+    assert np.allclose(vn[:, 0], [4., 5., 6., 6., 0.])
+
+    vn, ve = process_data(data, 'element', 'min', 'max', elements, 5)
+    assert np.allclose(ve[:, 0], [-4., 2.])
+    assert np.allclose(vn[:, 0], [-4., 2., 2., 2., 0.])
+
+    vn, ve = process_data(data, 'element', 'mean', 'min', elements, 5)
+    assert np.allclose(ve[:, 0], [-1.5, 4.])
+    assert np.allclose(vn[:, 0], [-1.5, -1.5, 4., 4., 0.])
+
+
+def test_parity_with_loops():
+
+    rng = np.random.default_rng(1)
+    n, m = 60, 80
+    elements = [list(rng.choice(n, rng.integers(2, 9), replace=False)) for _ in range(m)]
+    data = {str(e): {'ip{0}_sp1'.format(i): float(rng.normal()) for i in range(rng.integers(1, 9))} for e in range(m)}
+    data['5']['ip0_sp1'] = None
+    del data['7']
+
+    for iptype in ['mean', 'max', 'min', 'abs']:
+        for nodal in ['mean', 'max', 'min']:
+            vn, ve = process_data(data, 'element', iptype, nodal, elements, n)
+            expected = reference(data, iptype, nodal, elements, n)
+
+            assert np.allclose(vn[:, 0], expected[0])
+            assert np.allclose(ve[:, 0], expected[1])
+
+
+def test_element_input_forms():
+
+    rng = np.random.default_rng(2)
+    n, m = 30, 40
+    elements = [list(rng.choice(n, rng.integers(2, 5), replace=False)) for _ in range(m)]
+    table = rng.normal(size=(m, 4))
+    table[3, 2:] = np.nan
+    data = {e: {'ip{0}'.format(i): v for i, v in enumerate(row) if not np.isnan(v)} for e, row in enumerate(table)}
+
+    padded = -np.ones((m, 4), dtype=int)
+    for e, nodes in enumerate(elements):
+        padded[e, :len(nodes)] = nodes
+
+    rows = np.concatenate(elements)
+    cols = np.repeat(np.arange(m), [len(i) for i in elements])
+    incidence = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, m))
+
+    vn, ve = process_data(data, 'element', 'max', 'mean', elements, n)
+
+    for form, values in [(padded, data), (incidence, data), (elements, table)]:
+        a, b = process_data(values, 'element', 'max', 'mean', form, n)
+        assert np.allclose(a, vn)
+        assert np.allclose(b, ve)
+
+
+def test_nodal_data():
+
+    vn, ve = process_data([1., 2., 3.], 'nodal', None, None, None, 3)
+
+    assert vn.shape == (3, 1)
+    assert ve is None
@@ -0,0 +1,89 @@
+import numpy as np
+
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import GeneralDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PinnedDisplacement
+from compas_fea.structure import PointLoad
+from compas_fea.structure import Structure
+from compas_fea.structure import TrussSection
+from compas_fea.utilities.functions import postprocess_arrays
+
+
+def truss(path):
+
+    mdl = Structure(name='truss', path=path)
+
+    for xyz in [[0, 0, 0], [1, 0, 0], [2, 0, 0], [1, 0, 1]]:
+        mdl.add_node(xyz)
+
+    elements = [[0, 1], [1, 2], [0, 3], [1, 3], [2, 3]]
+    mdl.add_set('bars', 'element', [mdl.add_element(nodes=nodes, type='TrussElement') for nodes in elements])
+    mdl.add_set('supports', 'node', [0, 2])
+    mdl.add_set('nodes', 'node', [0, 1, 2, 3])
+    mdl.add_set('top', 'node', [3])
+    mdl.add_material(ElasticIsotropic(name='mat', E=1e6, v=0.3, p=0))
+    mdl.add_section(TrussSection(name='sec', A=1.))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='bars'))
+    mdl.add_displacement(PinnedDisplacement(name='pin', nodes='supports'))
+    mdl.add_displacement(GeneralDisplacement(name='plane', nodes='nodes', y=0))
+    mdl.add_load(PointLoad(name='p', nodes='top', z=-100.))
+    mdl.add_step(GeneralStep(name='bc', displacements=['pin', 'plane']))
+    mdl.add_step(GeneralStep(name='load', loads=['p'], nlgeom=False))
+    mdl.steps_order = ['bc', 'load']
+    mdl.analyse_and_extract('native', fields=['u', 's'], output=False)
+
+    return mdl, elements
+
+
+def test_matches_postprocess_arrays(tmp_path):
+
+    mdl, elements = truss('{0}/'.format(tmp_path))
+    nodal = mdl.results['load']['nodal']
+    displacements = [[nodal[i][node] for node in range(4)] for i in ['ux', 'uy', 'uz']]
+    xyz = [mdl.node_xyz(node) for node in range(4)]
+
+    for field, data in [('um', [nodal['um'][node] for node in range(4)]), ('sxx', mdl.results['load']['element']['sxx'])]:
+        dtype = 'nodal' if field == 'um' else 'element'
+        expected = postprocess_arrays(xyz, elements, *displacements, data, dtype, 10., [None, None], 1, 'mean', 'mean')
+        out = mdl.postprocess_results('load', field, scale=10.)
+
+        for a, b in zip(out[1:], expected[1:]):
+            assert np.allclose(a, b)
+
+
+def test_cache_hits_and_invalidation(tmp_path):
+
+    mdl, _ = truss('{0}/'.format(tmp_path))
+    entry = mdl.processed_results('load', 'sxx')
+
+    assert mdl.processed_results('load', 'sxx') is entry
+    assert mdl.processed_results('load', 'sxx', iptype='max') is not entry
+
+    mdl.postprocess_results('load', 'sxx', scale=5., cbar=[-10, 10])
+    assert mdl.processed_results('load', 'sxx') is entry
+
+    mdl.invalidate_results('load')
+    assert mdl.processed_results('load', 'sxx') is not entry
+
+    entry = mdl.processed_results('load', 'sxx')
+    mdl.results['load']['element']['sxx'] = {ekey: {'ip1_sp0': 1.} for ekey in range(5)}
+    assert np.allclose(mdl.processed_results('load', 'sxx')['ve'], 1.)
+
+    entry = mdl.processed_results('load', 'sxx')
+    mdl.add_node([5, 5, 5])
+    assert mdl.processed_results('load', 'sxx') is not entry
+
+
+def test_least_recently_used_dropped(tmp_path):
+
+    mdl, _ = truss('{0}/'.format(tmp_path))
+    mdl.postprocess_cache_size = 2
+    first = mdl.processed_results('load', 'sxx')
+    mdl.processed_results('load', 'um')
+    mdl.processed_results('load', 'sxx')
+    mdl.processed_results('load', 'ux')
+
+    assert mdl.processed_results('load', 'sxx') is first
+    assert len(mdl._postprocessed) == 2
@@ -0,0 +1,65 @@
+import numpy as np
+
+from tests.buildings import V
+from tests.buildings import m
+from tests.buildings import natural_frequencies as frequencies
+from tests.buildings import shear_building
+from tests.buildings import w2
+from compas_fea.utilities.spectrum import combine_modal
+from compas_fea.utilities.spectrum import cqc_correlation
+from compas_fea.utilities.spectrum import response_spectrum
+
+
+def test_participation_and_srss():
+
+    Sa = 2.
+    out = response_spectrum(shear_building(), m, lambda T: Sa + 0 * T, 'x', method='srss')
+    participation = out['spectrum']['participation']
+    gamma = V.T.dot(m)
+    modal = (gamma * Sa / w2)[None, :] * V
+
+    assert abs(participation['effective'][:, 0].sum() - m.sum()) < 1e-8
+    assert np.allclose(participation['cumulative'][-1], [1, 0, 0])
+    assert np.allclose([out['nodal']['ux'][i] for i in [1, 2, 3]], np.sqrt(np.sum(modal**2, axis=1)))
+    assert abs(out['spectrum']['base_shear'][0] - np.sqrt(np.sum((gamma**2 * Sa)**2))) < 1e-6
+    assert np.allclose(out['spectrum']['modal_base_shear'], np.column_stack([gamma**2 * Sa, [0] * 3, [0] * 3]))
+    assert np.allclose([out['nodal']['cfx'][i] for i in [1, 2, 3]],
+                       np.sqrt(np.sum(((gamma * Sa)[None, :] * m[:, None] * V)**2, axis=1)))
+
+
+def test_cqc():
+
+    rho = cqc_correlation(frequencies, 0.05)
+    values = np.array([[1., -2.], [3., 1.], [-1., 0.5]])
+
+    assert np.allclose(np.diag(rho), 1)
+    assert np.allclose(rho, rho.T)
+    assert abs(cqc_correlation([1., 1.05], 0.05)[0, 1] - 0.8074520303382797) < 1e-12
+    assert np.allclose(combine_modal(values, 'cqc', np.eye(3)), combine_modal(values, 'srss'))
+    assert np.allclose(combine_modal(values, 'cqc', np.ones((3, 3))), abs(values.sum(axis=0)))
+    assert np.allclose(combine_modal(values, 'abs'), [5., 3.5])
+
+    table = response_spectrum(shear_building(), m, [[0, 2.], [10, 2.]], 'x', method='cqc')
+    srss = response_spectrum(shear_building(), m, lambda T: 2. + 0 * T, 'x', method='srss')
+    gamma = V.T.dot(m)
+    modal = (gamma * 2. / w2)[None, :] * V
+    expected = np.sqrt(np.einsum('ni,ij,nj->n', modal, cqc_correlation(2 * np.pi * frequencies, 0.05), modal))
+
+    assert np.allclose([table['nodal']['ux'][i] for i in [1, 2, 3]], expected)
+    assert all(abs(table['nodal']['ux'][i] / srss['nodal']['ux'][i] - 1) < 0.01 for i in [1, 2, 3])
+
+
+def test_directions():
+
+    def spectrum(T):
+        return 2. + 0 * T
+
+    results = shear_building()
+
+    for i in range(3):
+        results['nodal']['uy{0}'.format(i + 1)] = dict(results['nodal']['ux{0}'.format(i + 1)])
+
+    x = response_spectrum(results, m, spectrum, 'x', method='srss')
+    xy = response_spectrum(results, m, spectrum, {'x': 1., 'y': 0.3}, method='srss')
+
+    assert np.allclose(xy['spectrum']['base_shear'][:2], np.array(x['spectrum']['base_shear'][0]) * np.hypot(1, 0.3))
@@ -0,0 +1,96 @@
+import numpy as np
+
+from compas_fea.structure import ElasticIsotropic
+from compas_fea.structure import ElementProperties
+from compas_fea.structure import FixedDisplacement
+from compas_fea.structure import GeneralStep
+from compas_fea.structure import PointLoad
+from compas_fea.structure import RectangularSection
+from compas_fea.structure import Structure
+from compas_fea.utilities.surrogate import Surrogate
+from compas_fea.utilities.surrogate import surrogate_from_results
+
+
+E, b, L = 200e9, 0.1, 2.
+x = np.linspace(0, L, 11)
+
+
+def deflection(h, P):
+    return P * x**2 * (3 * L - x) / (6 * E * b * h**3 / 12)
+
+
+def sweep(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(0.15, 0.25, n), rng.uniform(500, 1500, n)])
+
+
+def cantilever(path, P):
+
+    mdl = Structure(name='cantilever', path=path)
+
+    for xi in x:
+        mdl.add_node([xi, 0, 0])
+
+    ekeys = [mdl.add_element(nodes=[i, i + 1], type='BeamElement', axes={'ex': [0, 0, 1]}) for i in range(10)]
+    mdl.add_set('elements', 'element', ekeys)
+    mdl.add_set('support', 'node', [0])
+    mdl.add_set('tip', 'node', [10])
+    mdl.add_material(ElasticIsotropic(name='mat', E=E, v=0.3, p=7850))
+    mdl.add_section(RectangularSection(name='sec', b=b, h=0.2))
+    mdl.add_element_properties(ElementProperties(name='ep', material='mat', section='sec', elset='elements'))
+    mdl.add_displacement(FixedDisplacement(name='fix', nodes='support'))
+    mdl.add_load(PointLoad(name='pl', nodes='tip', y=P, z=P))
+    mdl.add_step(GeneralStep(name='bc', displacements=['fix']))
+    mdl.add_step(GeneralStep(name='st', loads=['pl']))
+    mdl.steps_order = ['bc', 'st']
+    mdl.analyse_and_extract(software='native', fields=['u', 'sf'], output=False)
+
+    return mdl
+
+
+def test_prediction_error():
+
+    parameters = sweep(40, 0)
+    snapshots = np.array([deflection(*p) for p in parameters])
+    test = sweep(20, 1) * [0.8, 0.8] + [0.04, 200.]
+    expected = np.array([deflection(*p) for p in test])
+
+    for method, tolerance in [('rbf', 0.05), ('gp', 0.01)]:
+        surrogate = Surrogate(parameters, snapshots, method=method)
+        X, _ = surrogate.predict(test)
+        error = np.max(np.abs(X - expected).max(axis=1) / np.abs(expected).max(axis=1))
+
+        assert surrogate.basis.shape == (11, 1)
+        assert surrogate.errors['truncation'] < 1e-6
+        assert error < tolerance
+        assert surrogate.errors['loo'] < 5 * tolerance
+
+
+def test_interpolates_snapshots():
+
+    parameters = sweep(20, 0)
+    snapshots = np.array([deflection(*p) for p in parameters])
+
+    rbf = Surrogate(parameters, snapshots, method='rbf')
+    gp = Surrogate(parameters, snapshots, method='gp')
+    X, E = gp.predict(parameters)
+
+    assert np.allclose(rbf.predict(parameters)[0], snapshots, rtol=0, atol=1e-9 * snapshots.max())
+    assert np.allclose(X, snapshots, rtol=0, atol=1e-4 * snapshots.max())
+    assert np.all(gp.predict([0.2, 1000.])[1][0, 1:] > E.max(axis=0)[1:])
+
+
+def test_surrogate_from_results(tmp_path):
+
+    loads = [500., 800., 1100., 1400., 1700.]
+    results = [cantilever('{0}/{1}/'.format(tmp_path, i), P) for i, P in enumerate(loads)]
+    surrogate = surrogate_from_results(results, loads, 'st', ['uy', 'uz', 'sf1'], method='rbf')
+    fields, errors = surrogate.fields([1000.])
+    reference = cantilever('{0}/ref/'.format(tmp_path), 1000.).results['st']
+
+    assert surrogate.basis.shape[1] == 1
+    assert set(fields['nodal']) == {'uy', 'uz'}
+    assert abs(fields['nodal']['uy'][10] - reference['nodal']['uy'][10]) < 1e-8 * abs(reference['nodal']['uy'][10])
+    assert abs(fields['nodal']['uz'][10] - reference['nodal']['uz'][10]) < 1e-8 * abs(reference['nodal']['uz'][10])
+    assert fields['element']['sf1'][0] == {'ip1_sp0': 0.0, 'ip2_sp0': 0.0}
+    assert errors['nodal']['uy'][10] < 1e-8 * abs(reference['nodal']['uy'][10])
@@ -0,0 +1,78 @@
+import numpy as np
+
+from compas_fea.structure import Structure
+from compas_fea.utilities.functions import process_data
+
+
+def strip(path):
+
+    mdl = Structure(name='strip', path=path)
+
+    for j in range(3):
+        for i in range(3):
+            mdl.add_node([i, j, 0])
+
+    mdl.add_element(nodes=[0, 1, 4, 3], type='ShellElement')
+    mdl.add_element(nodes=[1, 2, 5, 4], type='ShellElement')
+    mdl.add_element(nodes=[4, 5, 8, 7], type='ShellElement')
+    mdl.add_element(nodes=[6, 7], type='BeamElement')
+
+    return mdl
+
+
+def test_connectivity_and_incidence(tmp_path):
+
+    mdl = strip('{0}/'.format(tmp_path))
+    connectivity = mdl.element_nodes_array()
+    incidence = mdl.node_element_incidence().toarray()
+
+    assert connectivity.tolist() == [[0, 1, 4, 3], [1, 2, 5, 4], [4, 5, 8, 7], [6, 7, -1, -1]]
+    assert incidence.shape == (9, 4)
+    assert incidence.sum(axis=1).tolist() == [1, 2, 1, 1, 3, 2, 1, 2, 1]
+    assert incidence[4].tolist() == [1, 1, 1, 0]
+
+
+def test_adjacency(tmp_path):
+
+    mdl = strip('{0}/'.format(tmp_path))
+    elements = mdl.element_adjacency().toarray()
+    nodes = mdl.node_adjacency().toarray()
+
+    assert elements.tolist() == [[0, 2, 1, 0], [2, 0, 2, 0], [1, 2, 0, 1], [0, 0, 1, 0]]
+    assert np.all(np.diag(nodes) == 0)
+    assert nodes[4].tolist() == [1, 2, 1, 1, 0, 2, 0, 1, 1]
+    assert np.all(nodes == nodes.T)
+
+
+def test_cache_invalidation(tmp_path):
+
+    mdl = strip('{0}/'.format(tmp_path))
+    incidence = mdl.node_element_incidence()
+    connectivity = mdl.element_nodes_array()
+
+    assert mdl.node_element_incidence() is incidence
+
+    mdl.elements[3].nodes = [6, 3]
+    assert mdl.element_nodes_array() is connectivity
+
+    mdl.invalidate_topology()
+    assert mdl.element_nodes_array()[3].tolist() == [6, 3, -1, -1]
+
+    mdl.add_node([5, 5, 5])
+    assert mdl.node_element_incidence().shape == (10, 4)
+
+    mdl.add_element(nodes=[8, 9], type='BeamElement')
+    assert mdl.element_nodes_array().shape == (5, 4)
+
+
+def test_process_data_with_incidence(tmp_path):
+
+    mdl = strip('{0}/'.format(tmp_path))
+    data = {ekey: {'ip1_sp1': float(ekey + 1), 'ip2_sp1': -float(ekey)} for ekey in range(4)}
+    elements = [mdl.elements[ekey].nodes for ekey in range(4)]
+
+    for nodal in ['mean', 'max', 'min']:
+        a = process_data(data, 'element', 'max', nodal, mdl.node_element_incidence(), mdl.node_count())
+        b = process_data(data, 'element', 'max', nodal, elements, mdl.node_count())
+        assert np.allclose(a[0], b[0])
+        assert np.allclose(a[1], b[1])
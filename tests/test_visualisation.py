@@ -0,0 +1,82 @@
+import numpy as np
+
+from compas_fea.utilities.visualisation import connectivity_array
+from compas_fea.utilities.visualisation import element_mesh
+from compas_fea.utilities.visualisation import external_faces
+from compas_fea.utilities.visualisation import pipe_mesh
+
+
+xyz = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+                [0, 0, 2], [1, 0, 2], [1, 1, 2], [0, 1, 2]], dtype=float)
+hexes = np.array([[0, 1, 2, 3, 4, 5, 6, 7], [4, 5, 6, 7, 8, 9, 10, 11]])
+
+
+def normal(points, face):
+    a, b, c, d = points[face]
+    return np.cross(c - a, d - b) if face[2] != face[3] else np.cross(b - a, c - a)
+
+
+def test_two_hexes_sharing_a_face():
+
+    faces, owners = external_faces(hexes)
+    keys = {tuple(sorted(face)) for face in faces.tolist()}
+
+    assert faces.shape == (10, 4)
+    assert (4, 5, 6, 7) not in keys
+    assert sorted(np.bincount(owners)) == [5, 5]
+    assert len(external_faces(hexes, cull=False)[0]) == 12
+
+    for face, owner in zip(faces, owners):
+        outward = xyz[face].mean(axis=0) - xyz[hexes[owner]].mean(axis=0)
+        assert np.dot(normal(xyz, face), outward) > 0
+
+
+def test_tetrahedron_and_pentahedron_normals():
+
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [0, 1, 1]], dtype=float)
+
+    for n, count in [(4, 4), (6, 5)]:
+        faces, _ = external_faces(np.arange(n)[None])
+        centroid = points[:n].mean(axis=0)
+
+        assert len(faces) == count
+        assert all(np.dot(normal(points, face), points[face].mean(axis=0) - centroid) > 0 for face in faces)
+
+
+def test_pipe_mesh():
+
+    vertices, faces = pipe_mesh([[0, 0, 0], [0, 0, 0]], [[1, 0, 0], [0, 0, 2]], radius=0.1, sides=6)
+
+    assert vertices.shape == (24, 3)
+    assert faces.shape == (12, 4)
+    assert np.allclose(np.linalg.norm(vertices[:6, 1:], axis=1), 0.1)
+    assert np.allclose(vertices[6:12, 0], 1.)
+    assert np.allclose(np.linalg.norm(vertices[12:18, :2], axis=1), 0.1)
+
+
+def test_element_mesh():
+
+    elements = hexes.tolist() + [[8, 9], [0, 1, 5], [1, 2, 6, 5]]
+    types = ['HexahedronElement'] * 2 + ['BeamElement', 'ShellElement', 'ShellElement']
+    colours = np.arange(36, dtype=float).reshape(12, 3)
+    vertices, faces, vertex_colours = element_mesh(xyz, elements, types, node_colours=colours, sides=4)
+
+    assert vertices.shape == (12 + 8, 3)
+    assert faces.shape == (10 + 2 + 4, 4)
+    assert faces.max() == len(vertices) - 1
+    assert np.allclose(vertices[:12], xyz)
+    assert np.allclose(vertex_colours[:12], colours)
+    assert np.allclose(vertex_colours[12:16], colours[8])
+    assert np.allclose(vertex_colours[16:], colours[9])
+    assert faces[:2].tolist() == [[0, 1, 5, 5], [1, 2, 6, 5]]
+
+    _, _, vertex_colours = element_mesh(xyz, elements, types, element_colours=np.ones((5, 3)))
+    assert np.allclose(vertex_colours[12:], 1)
+
+
+def test_connectivity_array():
+
+    connectivity = connectivity_array([[0, 1], [2, 3, 4]])
+
+    assert connectivity.tolist() == [[0, 1, -1], [2, 3, 4]]
+    assert connectivity_array(np.array([[0, 1]])).dtype == np.int64